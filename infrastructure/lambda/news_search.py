@@ -10,6 +10,7 @@ Reference: SPEC_Version2.md - Investigator Agent Tools
 import json
 import os
 import logging
+import time
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import traceback
@@ -44,16 +45,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         supplier_name = parameters.get("supplier_name", "")
         categories = parameters.get("categories", ["labor", "environment", "governance"])
         date_range = parameters.get("date_range", "2y")
+        # Candidates per category; the caller ranks them and keeps its own top K
+        max_per_category = int(parameters.get("max_per_category") or 20)
+        # Caller's remaining audit budget, capped by this invocation's own limit
+        timeout_seconds = parameters.get("timeout_seconds")
+        timeout_seconds = 30.0 if timeout_seconds is None else float(timeout_seconds)
+        if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+            timeout_seconds = min(timeout_seconds, context.get_remaining_time_in_millis() / 1000 - 1)
         
         if not supplier_name:
             return create_error_response(400, "supplier_name is required")
         
+        if timeout_seconds <= 0:
+            # Nothing was searched: answer at once with an empty partial result,
+            # which is the caller running out of time rather than a failed search
+            logger.warning(f"No search budget left for supplier: {supplier_name}")
+            return create_success_response({
+                "supplier": supplier_name,
+                "search_date": datetime.now().isoformat(),
+                "findings": [],
+                "partial": True,
+                "errors": ["search budget exhausted"]
+            })
+        
         logger.info(f"Searching news for supplier: {supplier_name}")
         logger.info(f"Categories: {categories}, Date range: {date_range}")
         
         # Search for news
         if ENABLE_REAL_API and NEWS_API_KEY:
-            results = search_real_news(supplier_name, categories, date_range)
+            results = search_real_news(
+                supplier_name, categories, date_range, timeout_seconds, max_per_category
+            )
         else:
             logger.info("Using mock data (real API not enabled)")
             results = mock_news_search(supplier_name, categories)
@@ -144,11 +166,19 @@ def create_error_response(status_code: int, error_message: str) -> Dict[str, Any
 def search_real_news(
     supplier_name: str, 
     categories: List[str], 
-    date_range: str
+    date_range: str,
+    timeout_seconds: float = 30.0,
+    max_per_category: int = 20
 ) -> Dict[str, Any]:
     """
     Search real news APIs for supplier information.
     
+    Categories are searched in order until ``timeout_seconds`` runs out,
+    keeping up to ``max_per_category`` articles each. Whatever was found by
+    then is returned, with ``partial`` and ``errors`` set if any category
+    failed or was never searched. If no category succeeds, RuntimeError is
+    raised so the caller sees an error response instead of a clean result.
+    
     TODO: Integrate with actual news APIs:
     - NewsAPI.org
     - Google News API
@@ -163,52 +193,80 @@ def search_real_news(
     days_back = parse_date_range(date_range)
     from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
     
+    errors = []
+    
     # Example: NewsAPI integration
     if NEWS_API_KEY:
-        try:
-            # Build search query with categories
-            category_keywords = {
-                "labor": "labor OR workers OR strike OR wages OR safety OR union",
-                "environment": "pollution OR environmental OR emissions OR fine OR EPA",
-                "governance": "corruption OR bribery OR fraud OR ethics OR scandal"
+        # Build search query with categories
+        category_keywords = {
+            "labor": "labor OR workers OR strike OR wages OR safety OR union",
+            "environment": "pollution OR environmental OR emissions OR fine OR EPA",
+            "governance": "corruption OR bribery OR fraud OR ethics OR scandal"
+        }
+        
+        succeeded = 0
+        deadline = time.monotonic() + timeout_seconds
+        for category in categories:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.5:
+                logger.warning(f"Search budget exhausted before category: {category}")
+                errors.append(f"{category}: search budget exhausted")
+                break
+            keywords = category_keywords.get(category, "")
+            query = f'"{supplier_name}" AND ({keywords})'
+            
+            url = "https://newsapi.org/v2/everything"
+            params = {
+                "q": query,
+                "from": from_date,
+                "sortBy": "relevancy",
+                "pageSize": max_per_category,
+                "language": "en",
+                "apiKey": NEWS_API_KEY
             }
             
-            for category in categories:
-                keywords = category_keywords.get(category, "")
-                query = f'"{supplier_name}" AND ({keywords})'
-                
-                url = "https://newsapi.org/v2/everything"
-                params = {
-                    "q": query,
-                    "from": from_date,
-                    "sortBy": "relevancy",
-                    "language": "en",
-                    "apiKey": NEWS_API_KEY
-                }
-                
-                response = requests.get(url, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    articles = data.get("articles", [])
-                    
-                    for article in articles[:5]:  # Limit to 5 per category
-                        findings.append({
-                            "date": article.get("publishedAt", "")[:10],
-                            "source": article.get("source", {}).get("name", "Unknown"),
-                            "url": article.get("url", ""),
-                            "category": category.capitalize(),
-                            "snippet": article.get("description", article.get("title", ""))
-                        })
-                        
-        except Exception as e:
-            logger.error(f"Error fetching from NewsAPI: {str(e)}")
+            try:
+                response = requests.get(url, params=params, timeout=min(10, remaining))
+            except Exception as e:
+                logger.error(f"Error fetching {category} news from NewsAPI: {str(e)}")
+                errors.append(f"{category}: {e}")
+                continue
+            
+            if response.status_code != 200:
+                logger.error(f"NewsAPI returned {response.status_code} for {category}")
+                errors.append(f"{category}: HTTP {response.status_code}")
+                continue
+            
+            data = response.json()
+            articles = data.get("articles", [])
+            succeeded += 1
+            
+            for article in articles[:max_per_category]:
+                findings.append({
+                    "date": article.get("publishedAt", "")[:10],
+                    "source": article.get("source", {}).get("name", "Unknown"),
+                    "url": article.get("url", ""),
+                    "category": category.capitalize(),
+                    # The headline names the company far more often than the description
+                    "title": article.get("title") or "",
+                    "snippet": article.get("description") or article.get("title") or ""
+                })
+        
+        # No category succeeded (some may never have been tried once the
+        # budget ran out): surface it rather than report a clean supplier
+        if errors and not succeeded:
+            raise RuntimeError(f"News search failed: {'; '.join(errors)}")
     
-    return {
+    result = {
         "supplier": supplier_name,
         "search_date": datetime.now().isoformat(),
         "findings": findings
     }
+    if errors:
+        # Partial results: the caller marks the source as incomplete
+        result["partial"] = True
+        result["errors"] = errors
+    return result
 
 
 def parse_date_range(date_range: str) -> int:
@@ -1,6 +1,7 @@
-def main():
-    print("Hello from Sentinel!")
+import sys
+
+from src.main import main
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -3,6 +3,9 @@ Agent modules for Sentinel multi-agent system.
 
 Agents:
 - Supervisor: Orchestrates the audit workflow
+- BedrockSupervisorAgent: Agentic orchestration through the deployed Supervisor Bedrock agent
 - Investigator: Gathers external intelligence
 - Auditor: Enforces policy compliance using RAG
+- PolicyEvaluator: LLM verdicts for findings the Auditor's rules cannot decide
+- PolicyPrefetch: Policy sections retrieved for the Auditor while the Investigator runs
 """
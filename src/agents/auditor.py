@@ -1,10 +1,64 @@
 """
 Auditor Agent - Applies internal policy to findings using RAG.
 
+Findings are evaluated in two tiers. Keyword rules decide the obvious
+cases (awards and certifications are not violations; fines, hazardous
+waste and lawsuits are) and attach a confidence to each verdict. Only
+findings below APP_AUDITOR_ESCALATION_THRESHOLD are escalated to the
+Auditor Bedrock agent with retrieved Code of Conduct excerpts, batched
+several findings per call (see PolicyEvaluator), so most findings never
+cost a model call of their own. Knowledge Base retrievals for one audit
+run concurrently, as do its agent batches. Excerpts the Supervisor
+prefetched for the audit (see policy_prefetch) are used when they match a
+finding, saving its retrieval.
+
 Reference: SPEC_Version2.md - Section 2: Agent Definitions
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.agents.policy_evaluator import PolicyEvaluator, fan_out, submit
+from src.agents.policy_prefetch import PolicyPrefetch, current_prefetch
+from src.config import get_settings
+from src.exceptions import AWSServiceError, CircuitOpenError, TimeoutError
+from src.sources.base import CATEGORY_KEYWORDS, tokenize
+from src.utils.aws_clients import query_knowledge_base
+from src.utils.deadline import hedged_call, mark_degraded
+from src.utils.metrics import get_registry
+from src.utils.token_budget import compact_text, current_ledger
+from src.utils.tracing import get_span_recorder, span
+
+_metrics = get_registry()
+FINDINGS_EVALUATED = _metrics.counter(
+    "sentinel_auditor_findings_total", "Findings evaluated by the Auditor, by deciding tier", ["tier"]
+)
+ESCALATION_FAILURES = _metrics.counter(
+    "sentinel_auditor_escalation_failures_total", "Escalated findings that fell back to the rule verdict"
+)
+
+POSITIVE_WORDS = ['award', 'certification', 'certified', 'maintains', 'receives']
+CRITICAL_PHRASES = ['critical', 'severe', '$3m', 'hazardous', 'lawsuit', 'abuses']
+MAJOR_WORDS = ['fined', 'violation', 'investigation', 'contamination']
+MINOR_WORDS = ['concerns', 'questions', 'allegations', 'accused', 'report']
+
+# Confidence of each rule outcome; below the escalation threshold the LLM decides
+RULE_CONFIDENCE = {
+    "positive": 0.95,
+    "critical": 0.9,
+    "major": 0.8,
+    "clear": 0.85,
+    "minor": 0.5,
+    "conflicting": 0.3,
+    "unmatched_risk": 0.3,
+}
+
+# Smallest snippet share worth escalating when the token budget is tight
+MIN_FINDING_TOKENS = 24
+
+# Policy excerpts attached to a finding
+POLICY_RESULTS = 3
+
+_RISK_TERMS = frozenset(keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords)
 
 
 class AuditorAgent:
@@ -13,20 +67,48 @@ class AuditorAgent:
     
     Responsibilities:
     - Take list of facts from Investigator
-    - Query Knowledge Base: "Does [Fact X] violate our policy?"
+    - Decide obvious findings with keyword rules
+    - Query Knowledge Base and the Auditor agent for the uncertain rest:
+      "Does [Fact X] violate our policy?"
     - Assign severity scores (Minor/Major/Critical)
     
-    Tools: AWS Bedrock Knowledge Base (RAG)
+    Tools: AWS Bedrock Knowledge Base (RAG), Auditor Bedrock agent
     """
     
-    def __init__(self, knowledge_base_client=None):
+    def __init__(
+        self,
+        knowledge_base_client=None,
+        knowledge_base_id: Optional[str] = None,
+        policy_evaluator: Optional[PolicyEvaluator] = None,
+        escalation_threshold: Optional[float] = None,
+        max_workers: Optional[int] = None
+    ):
         """
         Initialize the Auditor Agent.
         
         Args:
             knowledge_base_client: AWS Bedrock Knowledge Base client
+                (a ``bedrock-agent-runtime`` client)
+            knowledge_base_id: Knowledge Base holding the Code of Conduct
+                (defaults to AWS_KNOWLEDGE_BASE_ID)
+            policy_evaluator: LLM tier for uncertain findings (defaults to the
+                AWS_AUDITOR_AGENT_ID agent on ``knowledge_base_client``)
+            escalation_threshold: Rule confidence below which a finding is
+                escalated (defaults to APP_AUDITOR_ESCALATION_THRESHOLD)
+            max_workers: Knowledge Base retrievals in flight at once, and
+                agent calls for the default ``policy_evaluator``
+                (defaults to APP_AUDITOR_MAX_WORKERS)
         """
         self.kb_client = knowledge_base_client
+        self.knowledge_base_id = knowledge_base_id or get_settings().aws.knowledge_base_id
+        self.policy_evaluator = policy_evaluator or PolicyEvaluator(
+            client=knowledge_base_client, max_workers=max_workers
+        )
+        self.max_workers = max_workers
+        self.escalation_threshold = (
+            escalation_threshold if escalation_threshold is not None
+            else get_settings().app.auditor_escalation_threshold
+        )
     
     def evaluate_findings(self, findings_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -45,71 +127,275 @@ class AuditorAgent:
         - risk_scores: {"Labor": score, "Environment": score, "Governance": score}
         - violations: List of violations with severity
         - recommendations: Suggested actions
+        - evaluation: findings escalated to the LLM tier, agent calls made,
+          and the calls and estimated seconds saved against one call per finding
         """
-        findings = findings_data.get("findings", [])
-        
-        violations = []
-        risk_scores = {"Labor": 0, "Environment": 0, "Governance": 0}
+        with span("auditor.evaluate_findings"):
+            findings = findings_data.get("findings", [])
+            
+            violations = []
+            risk_scores = {"Labor": 0, "Environment": 0, "Governance": 0}
+            
+            # Tier 1: keyword rules, with a confidence per verdict
+            verdicts = []
+            confidences = []
+            for finding in findings:
+                with span("auditor.check_policy"):
+                    violation, confidence = self._classify(finding)
+                verdicts.append(violation)
+                confidences.append(confidence)
+            uncertain = []
+            if self.policy_evaluator.available:
+                # Least confident first, so a tight token budget goes where rules are weakest
+                uncertain = sorted(
+                    (i for i, confidence in enumerate(confidences) if confidence < self.escalation_threshold),
+                    key=lambda i: confidences[i]
+                )
+            
+            # Policy excerpts for the uncertain findings and the rule-tier violations, fetched at once
+            wanted = sorted(set(uncertain).union(i for i, violation in enumerate(verdicts) if violation))
+            contexts = dict(zip(wanted, fan_out(lambda i: self._policy_context(findings[i]), wanted, self.max_workers)))
+            
+            # Tier 2: uncertain findings go to the Auditor agent, batched and compacted
+            uncertain = self._fit_token_budget(findings, uncertain, contexts)
+            FINDINGS_EVALUATED.labels(tier="rules").inc(len(findings) - len(uncertain))
+            llm_calls = self._escalate(findings_data.get("supplier"), findings, uncertain, verdicts, contexts)
+            
+            for index, (finding, violation) in enumerate(zip(findings, verdicts)):
+                if violation:
+                    policy_context = contexts[index] if index in contexts else self._policy_context(finding)
+                    if policy_context is not None:
+                        violation["policy_context"] = policy_context
+                    violations.append(violation)
+                    # Update risk scores based on category and severity
+                    category = finding.get("category", "Governance")
+                    severity_points = self._get_severity_points(violation["severity"])
+                    risk_scores[category] = max(risk_scores[category], severity_points)
+            
+            overall_risk = self._calculate_overall_risk(risk_scores)
+            recommendations = self._generate_recommendations(violations)
+            
+            return {
+                "overall_risk": overall_risk,
+                "risk_scores": risk_scores,
+                "violations": violations,
+                "recommendations": recommendations,
+                "evaluation": self._evaluation_stats(len(findings), len(uncertain), llm_calls)
+            }
+    
+    def _fit_token_budget(
+        self,
+        findings: List[Dict[str, Any]],
+        uncertain: List[int],
+        contexts: Dict[int, Optional[List[Dict[str, Any]]]]
+    ) -> List[int]:
+        """
+        The uncertain findings the audit's token budget can pay for.
         
-        for finding in findings:
-            violation = self._check_against_policy(finding)
-            if violation:
-                violations.append(violation)
-                # Update risk scores based on category and severity
-                category = finding.get("category", "Governance")
-                severity_points = self._get_severity_points(violation["severity"])
-                risk_scores[category] = max(risk_scores[category], severity_points)
+        Each finding is compacted to at least MIN_FINDING_TOKENS; the ones
+        that do not fit keep their rule verdict and the audit is degraded.
+        """
+        ledger = current_ledger()
+        if ledger is None or not uncertain:
+            return uncertain
+        items = [(findings[index], contexts[index]) for index in uncertain]
+        available = ledger.remaining() - self.policy_evaluator.overhead_tokens(items)
+        fits = max(0, min(len(uncertain), available // MIN_FINDING_TOKENS))
+        if fits < len(uncertain):
+            mark_degraded(
+                "auditor.token_budget",
+                f"{len(uncertain) - fits} uncertain findings kept rule verdicts "
+                f"({ledger.remaining()} of {ledger.budget} prompt tokens left)"
+            )
+        return uncertain[:fits]
+    
+    def _escalate(
+        self,
+        supplier_name: Optional[str],
+        findings: List[Dict[str, Any]],
+        uncertain: List[int],
+        verdicts: List[Optional[Dict[str, Any]]],
+        contexts: Dict[int, Optional[List[Dict[str, Any]]]]
+    ) -> int:
+        """
+        Replace the rule verdicts of ``uncertain`` findings with the agent's.
         
-        overall_risk = self._calculate_overall_risk(risk_scores)
-        recommendations = self._generate_recommendations(violations)
+        Snippets are compacted to their share of the token budget first.
+        Findings the agent gives no valid verdict for keep their rule verdict.
         
+        Returns:
+            Agent calls made
+        """
+        if not uncertain:
+            return 0
+        items = [(findings[index], contexts[index]) for index in uncertain]
+        allowance = get_settings().app.finding_max_tokens
+        ledger = current_ledger()
+        if ledger is not None:
+            share = (ledger.remaining() - self.policy_evaluator.overhead_tokens(items)) // len(items)
+            allowance = max(MIN_FINDING_TOKENS, min(allowance, share))
+        items = [
+            ({**finding, "snippet": compact_text(finding.get("snippet", ""), supplier_name, allowance)}, context)
+            for finding, context in items
+        ]
+        try:
+            with span("auditor.escalate"):
+                result = self.policy_evaluator.evaluate_batch(items)
+        except (TimeoutError, CircuitOpenError, AWSServiceError) as e:
+            # Agent unreachable: every uncertain finding keeps its rule verdict
+            ESCALATION_FAILURES.inc(len(uncertain))
+            FINDINGS_EVALUATED.labels(tier="rules").inc(len(uncertain))
+            mark_degraded("auditor.llm_evaluate", str(e))
+            return 0
+        for position, index in enumerate(uncertain):
+            if position in result.verdicts:
+                verdict = result.verdicts[position]
+                if verdict is not None:
+                    # Report the finding as found, not as compacted for the prompt
+                    verdict["finding"] = findings[index]
+                verdicts[index] = verdict
+        FINDINGS_EVALUATED.labels(tier="llm").inc(len(result.verdicts))
+        FINDINGS_EVALUATED.labels(tier="rules").inc(len(result.failures))
+        if result.failures:
+            ESCALATION_FAILURES.inc(len(result.failures))
+            mark_degraded(
+                "auditor.llm_evaluate",
+                f"{len(result.failures)} findings kept rule verdicts: {next(iter(result.failures.values()))}"
+            )
+        return result.calls
+    
+    def _evaluation_stats(self, total: int, escalated: int, llm_calls: int) -> Dict[str, Any]:
+        # Against one agent call per finding, saved by the rule tier and by batching;
+        # without an agent there was nothing to save
+        saved = max(0, total - llm_calls) if self.policy_evaluator.available else 0
+        latency = get_span_recorder().histogram("auditor.llm_evaluate")
+        mean = latency.total / latency.count if latency.count else 0.0
         return {
-            "overall_risk": overall_risk,
-            "risk_scores": risk_scores,
-            "violations": violations,
-            "recommendations": recommendations
+            "findings": total,
+            "escalated": escalated,
+            "escalation_rate": round(escalated / total, 3) if total else 0.0,
+            "llm_calls": llm_calls,
+            "llm_calls_saved": saved,
+            "estimated_seconds_saved": round(saved * mean, 3),
         }
     
     def _check_against_policy(self, finding: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Check a single finding against the policy using Knowledge Base.
-        
-        TODO: Integrate with AWS Bedrock Knowledge Base
+        Check a single finding against the policy with the keyword rules.
         
         Returns:
             Dict with violation details or None if no violation
         """
-        # TODO: Replace with actual RAG query to Knowledge Base
-        # For now, mock the policy check
+        return self._classify(finding)[0]
+    
+    def _classify(self, finding: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Rule-tier verdict for a finding and how confident the rules are in it.
         
+        Returns:
+            ``(violation or None, confidence in [0, 1])``
+        """
         snippet = finding.get("snippet", "").lower()
+        negative = any(
+            word in snippet for word in CRITICAL_PHRASES + MAJOR_WORDS + MINOR_WORDS
+        )
         
         # Positive findings - no violation
-        if any(word in snippet for word in ['award', 'certification', 'certified', 'maintains', 'receives']):
-            return None
+        if any(word in snippet for word in POSITIVE_WORDS):
+            # "receives fine" or "certification revoked after lawsuit" needs a closer look
+            return None, RULE_CONFIDENCE["conflicting" if negative else "positive"]
         
         # Critical violations
-        if any(phrase in snippet for phrase in ['critical', 'severe', '$3m', 'hazardous', 'lawsuit', 'abuses']):
+        if any(phrase in snippet for phrase in CRITICAL_PHRASES):
             severity = "CRITICAL"
             policy_ref = "Section 2.1: Critical Violations - Zero Tolerance"
+            outcome = "critical"
         # Major violations
-        elif any(word in snippet for word in ['fined', 'violation', 'investigation', 'contamination']):
+        elif any(word in snippet for word in MAJOR_WORDS):
             severity = "MAJOR"
             policy_ref = "Section 3.2: Environmental and Labor Standards"
+            outcome = "major"
         # Minor concerns
-        elif any(word in snippet for word in ['concerns', 'questions', 'allegations', 'accused', 'report']):
+        elif any(word in snippet for word in MINOR_WORDS):
             severity = "MINOR"
             policy_ref = "Section 4.1: Monitoring and Improvement"
-        # No violation found
+            outcome = "minor"
+        # No violation found, unless the text carries risk terms the rules do not know
         else:
-            return None
+            unmatched = bool(_RISK_TERMS.intersection(tokenize(snippet)))
+            return None, RULE_CONFIDENCE["unmatched_risk" if unmatched else "clear"]
         
         return {
             "finding": finding,
             "severity": severity,  # "MINOR" | "MAJOR" | "CRITICAL"
             "policy_reference": policy_ref,
             "evidence_type": "PROVEN" if any(word in snippet for word in ['fined', 'found', 'confirmed']) else "ALLEGATION"
-        }
+        }, RULE_CONFIDENCE[outcome]
+    
+    def prefetch_policy(self, supplier_record: Optional[Dict[str, Any]] = None) -> Optional[PolicyPrefetch]:
+        """
+        Start retrieving the policy sections likely to apply to a supplier.
+        
+        Returns:
+            The running prefetch, to install with ``prefetch_scope`` for the
+            audit, or None without a Knowledge Base
+        """
+        if self.kb_client is None or not self.knowledge_base_id:
+            return None
+        results = get_settings().app.policy_prefetch_results
+        prefetch = PolicyPrefetch(
+            lambda query: hedged_call(
+                lambda: self._query_policy(query, results),
+                "aws.knowledge_base.retrieve"
+            ),
+            supplier_record,
+            max_results=POLICY_RESULTS
+        )
+        return prefetch.start(submit)
+    
+    def _policy_context(self, finding: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Policy excerpts for a finding: prefetched for the audit when they
+        match, else retrieved. None without a Knowledge Base or when it fails.
+        """
+        if self.kb_client is None or not self.knowledge_base_id:
+            return None
+        prefetch = current_prefetch()
+        if prefetch is not None:
+            excerpts = prefetch.lookup(finding)
+            if excerpts is not None:
+                return excerpts
+        try:
+            return hedged_call(
+                lambda: self._retrieve_policy_context(finding),
+                "aws.knowledge_base.retrieve"
+            )
+        except (TimeoutError, CircuitOpenError, AWSServiceError) as e:
+            # KB slow or down: keep the verdict without policy excerpts
+            mark_degraded("auditor.policy_context", str(e))
+            return None
+    
+    def _retrieve_policy_context(self, finding: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Retrieve the Code of Conduct sections relevant to a finding.
+        
+        Returns:
+            List of {"text", "score"} policy excerpts, best match first
+        """
+        query = f"{finding.get('category', 'Governance')} policy: {finding.get('snippet', '')}"
+        return self._query_policy(query, POLICY_RESULTS)
+    
+    def _query_policy(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        response = query_knowledge_base(
+            self.knowledge_base_id,
+            query,
+            max_results=max_results,
+            client=self.kb_client
+        )
+        return [
+            {"text": result.get("content", {}).get("text", ""), "score": result.get("score")}
+            for result in response.get("retrievalResults", [])
+        ]
     
     def _get_severity_points(self, severity: str) -> int:
         """Convert severity to numeric points for risk scoring."""
@@ -0,0 +1,144 @@
+"""
+Agentic orchestration through the Supervisor Bedrock agent.
+
+``infrastructure/bedrock/supervisor-agent-config.json`` deploys a Supervisor
+LLM agent that delegates to the Investigator and Auditor agents. This
+client sends the whole audit to that agent and parses the JSON report it
+returns. Each audit pays the Supervisor's own model turns for routing and
+report writing, and the sub-agents run one after another.
+
+The default ``hybrid`` mode (``SupervisorAgent``) runs the same fixed
+workflow in Python and calls the tools directly: news sources, Knowledge
+Base retrievals and Auditor agent batches, each fanned out concurrently.
+``APP_ORCHESTRATION_MODE=agentic`` selects this client instead, and
+``python -m src.benchmark.orchestration`` compares the two paths.
+
+Reference: SPEC_Version2.md - Section 2: Agent Definitions
+"""
+
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from src.agents.policy_evaluator import completion_text
+from src.config import get_settings
+from src.exceptions import AuditError, ConfigurationError
+from src.utils.aws_clients import get_bedrock_agent_runtime_client, invoke_bedrock_agent
+from src.utils.deadline import deadline_scope
+from src.utils.token_budget import estimate_tokens, record_tokens, token_scope
+from src.utils.tracing import span, start_trace
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class BedrockSupervisorAgent:
+    """Runs each audit as one call to the Supervisor Bedrock agent."""
+
+    def __init__(
+        self,
+        client=None,
+        agent_id: Optional[str] = None,
+        agent_alias_id: Optional[str] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            client: ``bedrock-agent-runtime`` client (defaults to the shared one)
+            agent_id: Supervisor agent (defaults to AWS_SUPERVISOR_AGENT_ID)
+            agent_alias_id: Agent alias (defaults to AWS_SUPERVISOR_AGENT_ALIAS_ID)
+            timeout_seconds: Audit budget (defaults to APP_AUDIT_TIMEOUT_SECONDS)
+
+        Raises:
+            ConfigurationError: If no Supervisor agent ID is configured
+        """
+        settings = get_settings()
+        self.client = client
+        self.agent_id = agent_id or settings.aws.supervisor_agent_id
+        self.agent_alias_id = agent_alias_id or settings.aws.supervisor_agent_alias_id
+        self.timeout_seconds = timeout_seconds or settings.app.audit_timeout_seconds
+        if not self.agent_id:
+            raise ConfigurationError("Agentic orchestration needs AWS_SUPERVISOR_AGENT_ID")
+
+    def audit_supplier(
+        self,
+        supplier_name: str,
+        findings: Optional[Dict[str, Any]] = None,
+        on_stage: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        supplier_record: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Audit a supplier through the Supervisor agent.
+
+        Takes the same arguments as ``SupervisorAgent.audit_supplier`` so the
+        batch runner and scheduler can use either. The agent investigates
+        and audits in one call, so ``on_stage`` is only invoked as
+        ``on_stage("investigating", None)`` before it (and may raise
+        AuditPreempted there), and stored ``findings`` cannot be re-audited.
+
+        Returns:
+            Report in the ``SupervisorAgent`` shape; fields the agent left
+            out are filled with empty values
+
+        Raises:
+            ConfigurationError: If ``findings`` are given
+            BedrockAgentError: If the agent call fails
+            AuditError: If the answer holds no JSON report
+        """
+        if findings is not None:
+            raise ConfigurationError(
+                "Agentic orchestration cannot re-audit stored findings; use APP_ORCHESTRATION_MODE=hybrid"
+            )
+        if on_stage:
+            on_stage("investigating", None)
+        prompt = f"Audit {supplier_name}"
+        if supplier_record:
+            context = {key: supplier_record[key] for key in ("country", "category") if supplier_record.get(key)}
+            if context:
+                prompt += f" ({json.dumps(context)})"
+        with start_trace(supplier=supplier_name), \
+                deadline_scope(self.timeout_seconds) as deadline, \
+                token_scope() as tokens, \
+                span("supervisor.agentic_audit"):
+            response = invoke_bedrock_agent(
+                self.agent_id,
+                self.agent_alias_id,
+                session_id=uuid.uuid4().hex,
+                input_text=prompt,
+                client=self.client or get_bedrock_agent_runtime_client()
+            )
+            text = completion_text(response)
+            record_tokens(estimate_tokens(prompt), estimate_tokens(text))
+            report = self._parse_report(supplier_name, text)
+            report["tokens"] = tokens.summary()
+            report["degraded"] = report["degraded"] or bool(deadline.degradations)
+            report["degraded_reasons"] = report["degraded_reasons"] + list(deadline.degradations)
+        return report
+
+    def _parse_report(self, supplier_name: str, text: str) -> Dict[str, Any]:
+        match = _JSON_OBJECT.search(text)
+        if not match:
+            raise AuditError(f"No JSON report in Supervisor agent answer: {text[:200]!r}")
+        try:
+            answer = json.loads(match.group(0))
+        except json.JSONDecodeError as e:
+            raise AuditError(f"Malformed Supervisor agent report: {e}")
+        if not isinstance(answer, dict):
+            raise AuditError("Supervisor agent report is not a JSON object")
+        return {
+            "supplier": answer.get("supplier") or supplier_name,
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "overall_risk": answer.get("overall_risk", "UNKNOWN"),
+            "risk_scores": answer.get("risk_scores", {}),
+            "findings": answer.get("findings", []),
+            "sources": answer.get("sources", []),
+            "screening": answer.get("screening", {}),
+            "evaluation": answer.get("evaluation", {}),
+            "tokens": {},
+            "prefetch": {},
+            "violations": answer.get("violations", []),
+            "recommendations": answer.get("recommendations", []),
+            "degraded": bool(answer.get("degraded")),
+            "degraded_reasons": list(answer.get("degraded_reasons", [])),
+        }
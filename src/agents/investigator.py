@@ -4,9 +4,17 @@ Investigator Agent - Gathers external intelligence on suppliers.
 Reference: SPEC_Version2.md - Section 2: Agent Definitions
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from src.config import get_settings
+from src.logging_config import get_logger
+from src.sources import CallableSourceAdapter, LambdaNewsAdapter, NewsAPIAdapter, SourceRegistry
+from src.utils.findings_cache import FindingsCache
+from src.utils.tracing import span
+
+logger = get_logger(__name__)
+
 
 class InvestigatorAgent:
     """
@@ -17,17 +25,38 @@ class InvestigatorAgent:
     - Search for labor violations, environmental fines, strikes
     - Return list of facts with sources and dates
     
-    Tools: Mocked News Search / API (to be replaced with real APIs)
+    Tools: Pluggable source adapters (news API, NGO feeds, sanctions lists,
+    local corpora) searched concurrently; mocked news search by default
     """
     
-    def __init__(self, news_api_client=None):
+    def __init__(
+        self,
+        news_api_client=None,
+        findings_cache: Optional[FindingsCache] = None,
+        sources: Optional[SourceRegistry] = None
+    ):
         """
         Initialize the Investigator Agent.
         
         Args:
-            news_api_client: Optional API client for news search
+            news_api_client: Optional API client for news search, exposing
+                ``search_news(supplier_name) -> List[Dict]`` of findings
+            findings_cache: Last-known-good findings served when a source
+                fails (defaults to the process-wide cache)
+            sources: Source adapters to search; defaults to the news API
+                client if given, then the news search Lambda if
+                AWS_NEWS_SEARCH_LAMBDA_ARN is set, otherwise the mock search
         """
         self.news_api = news_api_client
+        if sources is None:
+            if news_api_client is not None:
+                adapter = NewsAPIAdapter(news_api_client)
+            elif get_settings().aws.news_search_lambda_arn:
+                adapter = LambdaNewsAdapter()
+            else:
+                adapter = CallableSourceAdapter("mock", self._mock_search, protected=False)
+            sources = SourceRegistry([adapter], findings_cache=findings_cache)
+        self.sources = sources
     
     def search_supplier_news(self, supplier_name: str) -> Dict[str, Any]:
         """
@@ -37,7 +66,10 @@ class InvestigatorAgent:
             supplier_name: Name of the supplier to investigate
             
         Returns:
-            Dict with supplier name and list of findings
+            Dict with supplier name, findings merged from every source in
+            priority order, and the status of each source ("ok", "partial"
+            when only some queries answered, "stale" when served from cache,
+            or "missing")
             
         Reference: SPEC_Version2.md - Interface: Investigator -> Supervisor
         
@@ -52,15 +84,17 @@ class InvestigatorAgent:
                     "category": "Environment",
                     "url": "https://example.com/news/123"
                 }
-            ]
+            ],
+            "sources": [{"name": "news", "status": "ok"}]
         }
         """
-        # TODO: Replace with real API calls
-        findings = self._mock_search(supplier_name)
+        with span("investigator.search_supplier_news"):
+            findings, sources = self.sources.search(supplier_name)
         
         return {
             "supplier": supplier_name,
-            "findings": findings
+            "findings": findings,
+            "sources": sources
         }
     
     def _mock_search(self, supplier_name: str) -> List[Dict[str, Any]]:
@@ -0,0 +1,386 @@
+"""
+LLM policy evaluation for findings the Auditor's rules cannot decide.
+
+Findings are sent to the Auditor Bedrock agent in batches. One prompt
+carries the instructions once, the Code of Conduct excerpts retrieved for
+every finding in the batch (de-duplicated) and the numbered findings. The
+agent answers with a JSON array of verdicts:
+
+    [{"id": 0, "violation": true, "severity": "MAJOR",
+      "policy_reference": "Section 3.2: ...", "evidence_type": "ALLEGATION"},
+     {"id": 1, "violation": false}]
+
+Batches are packed up to APP_AUDITOR_BATCH_MAX_FINDINGS findings and
+APP_AUDITOR_BATCH_MAX_PROMPT_TOKENS estimated prompt tokens. When an answer
+is malformed or leaves findings out, only those findings are evaluated
+again, in halves, down to single findings; so is a batch whose prompt
+Bedrock rejects as invalid (e.g. too long). A finding that still fails is
+reported back with its error so the caller can keep the rule verdict. Any
+other agent error (throttling, access denied) is raised at once rather
+than multiplied across smaller batches. Every attempt, failed or not, is
+charged to the audit's token ledger, and a re-split the remaining budget
+cannot pay for is not sent.
+
+Batches are sent concurrently, up to APP_AUDITOR_MAX_WORKERS at a time
+(``fan_out``), so an audit with many escalated findings waits for about one
+agent round-trip rather than one per batch.
+"""
+
+import contextvars
+import json
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar
+
+from src.config import get_settings
+from src.exceptions import AuditError, BedrockAgentError
+from src.models import EvidenceType, Severity
+from src.utils.aws_clients import invoke_bedrock_agent
+from src.utils.metrics import get_registry
+from src.utils.token_budget import current_ledger, estimate_tokens, record_tokens
+from src.utils.tracing import span
+
+_metrics = get_registry()
+LLM_CALLS = _metrics.counter(
+    "sentinel_policy_llm_calls_total", "Auditor agent calls for policy verdicts"
+)
+LLM_BATCH_RETRIES = _metrics.counter(
+    "sentinel_policy_llm_resplits_total", "Findings re-sent in smaller batches after a failed answer"
+)
+
+SYSTEM_PROMPT = (
+    "You are a supply chain compliance auditor. For each numbered finding below, decide "
+    "whether it violates the Code of Conduct excerpts provided. Answer with a JSON array "
+    "and nothing else, one object per finding: "
+    '{"id": <finding id>, "violation": true|false, "severity": "MINOR"|"MAJOR"|"CRITICAL", '
+    '"policy_reference": "<section>", "evidence_type": "PROVEN"|"ALLEGATION"|"UNDER_INVESTIGATION"}. '
+    "Severity, policy_reference and evidence_type are required only when violation is true."
+)
+
+_JSON_DECODER = json.JSONDecoder()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Findings (with their policy excerpts) to evaluate: (finding, policy_context)
+Item = Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]
+
+
+class BatchVerdicts(NamedTuple):
+    """Outcome of evaluating a list of items."""
+    verdicts: Dict[int, Optional[Dict[str, Any]]]  # item index -> violation or None
+    failures: Dict[int, Exception]  # item index -> why no verdict was obtained
+    calls: int  # agent calls made
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().app.auditor_max_workers,
+                    thread_name_prefix="sentinel-auditor",
+                )
+    return _executor
+
+
+def submit(fn: Callable[[], R]) -> "Future[R]":
+    """Start ``fn()`` on the Auditor pool in a copy of the caller's context."""
+    return _get_executor().submit(contextvars.copy_context().run, fn)
+
+
+def fan_out(fn: Callable[[T], R], items: Sequence[T], max_workers: Optional[int] = None) -> List[R]:
+    """
+    ``[fn(item) for item in items]``, run concurrently on the Auditor pool.
+
+    Each call runs in a copy of the caller's context, so the audit's
+    deadline, token ledger and trace follow it. Every call finishes before
+    the first error, if any, is raised.
+
+    Args:
+        max_workers: Calls in flight at once (defaults to
+            APP_AUDITOR_MAX_WORKERS; 1 runs them in order on the calling thread)
+    """
+    workers = max_workers if max_workers is not None else get_settings().app.auditor_max_workers
+    if len(items) <= 1 or workers <= 1:
+        return [fn(item) for item in items]
+    executor = _get_executor()
+    futures: List[Future] = []
+    running: Set[Future] = set()
+    for item in items:
+        if len(running) >= workers:
+            _, running = wait(running, return_when=FIRST_COMPLETED)
+        future = executor.submit(contextvars.copy_context().run, fn, item)
+        futures.append(future)
+        running.add(future)
+    wait(futures)
+    return [future.result() for future in futures]
+
+
+def completion_text(response: Dict[str, Any]) -> str:
+    """Concatenate the text chunks of an ``invoke_agent`` event stream."""
+    parts = []
+    for event in response.get("completion", []):
+        chunk = event.get("chunk")
+        if chunk and chunk.get("bytes"):
+            parts.append(chunk["bytes"].decode("utf-8"))
+    return "".join(parts)
+
+
+def prompt_rejected(error: BedrockAgentError) -> bool:
+    """Whether Bedrock rejected the prompt itself (e.g. too long), which a smaller batch can fix."""
+    cause = error.__cause__ or error.__context__
+    response = getattr(cause, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") == "ValidationException"
+
+
+def format_finding(finding_id: int, finding: Dict[str, Any]) -> str:
+    fields = {key: finding.get(key) for key in ("date", "source", "category", "snippet")}
+    return json.dumps({"id": finding_id, **fields}, ensure_ascii=False)
+
+
+def excerpt_texts(policy_context: Optional[List[Dict[str, Any]]]) -> List[str]:
+    return [excerpt.get("text", "") for excerpt in policy_context or [] if excerpt.get("text")]
+
+
+def to_violation(finding: Dict[str, Any], verdict: Any) -> Optional[Dict[str, Any]]:
+    """
+    Turn a parsed verdict into the Auditor's violation dict.
+
+    Raises:
+        AuditError: If the verdict is not a well-formed object
+    """
+    if not isinstance(verdict, dict) or not isinstance(verdict.get("violation"), bool):
+        raise AuditError(f"Malformed policy verdict: {verdict!r}")
+    if not verdict["violation"]:
+        return None
+    try:
+        severity = Severity(str(verdict.get("severity", "")).upper())
+        evidence_type = EvidenceType(str(verdict.get("evidence_type", "ALLEGATION")).upper())
+    except ValueError as e:
+        raise AuditError(f"Malformed policy verdict: {e}")
+    return {
+        "finding": finding,
+        "severity": severity.value,
+        "policy_reference": str(verdict.get("policy_reference") or "Code of Conduct"),
+        "evidence_type": evidence_type.value,
+    }
+
+
+def parse_verdicts(text: str) -> Dict[int, Any]:
+    """
+    Verdict objects from an agent answer, keyed by finding id.
+
+    Raises:
+        AuditError: If the answer holds no JSON array
+    """
+    start = text.find("[")
+    if start < 0:
+        raise AuditError(f"No JSON verdicts in agent answer: {text[:200]!r}")
+    try:
+        # Decodes just the array, so brackets in any prose after it are ignored
+        verdicts, _end = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise AuditError(f"Malformed policy verdicts: {e}")
+    keyed = {}
+    for verdict in verdicts:
+        if isinstance(verdict, dict) and isinstance(verdict.get("id"), int):
+            keyed[verdict["id"]] = verdict
+    return keyed
+
+
+class PolicyEvaluator:
+    """Asks the Auditor Bedrock agent for verdicts on batches of findings."""
+
+    def __init__(
+        self,
+        client=None,
+        agent_id: Optional[str] = None,
+        agent_alias_id: Optional[str] = None,
+        max_batch_findings: Optional[int] = None,
+        max_prompt_tokens: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            client: ``bedrock-agent-runtime`` client (the Knowledge Base client works)
+            agent_id: Auditor agent (defaults to AWS_AUDITOR_AGENT_ID)
+            agent_alias_id: Agent alias (defaults to AWS_AUDITOR_AGENT_ALIAS_ID)
+            max_batch_findings: Findings per call (defaults to APP_AUDITOR_BATCH_MAX_FINDINGS;
+                1 sends one prompt per finding)
+            max_prompt_tokens: Estimated prompt budget per call
+                (defaults to APP_AUDITOR_BATCH_MAX_PROMPT_TOKENS)
+            max_workers: Agent calls in flight at once for one batch
+                (defaults to APP_AUDITOR_MAX_WORKERS)
+        """
+        settings = get_settings()
+        self.client = client
+        self.agent_id = agent_id or settings.aws.auditor_agent_id
+        self.agent_alias_id = agent_alias_id or settings.aws.auditor_agent_alias_id
+        self.max_batch_findings = max_batch_findings or settings.app.auditor_batch_max_findings
+        self.max_prompt_tokens = max_prompt_tokens or settings.app.auditor_batch_max_prompt_tokens
+        self.max_workers = max_workers
+
+    @property
+    def available(self) -> bool:
+        """Whether a client and agent are configured."""
+        return self.client is not None and bool(self.agent_id)
+
+    def build_prompt(self, items: List[Item]) -> str:
+        """One prompt for a batch: instructions, shared excerpts, numbered findings."""
+        excerpts = list(dict.fromkeys(text for _, context in items for text in excerpt_texts(context)))
+        policy = "\n".join(f"- {text}" for text in excerpts) or "(no policy excerpts retrieved)"
+        findings = "\n".join(format_finding(i, finding) for i, (finding, _) in enumerate(items))
+        return f"{SYSTEM_PROMPT}\n\nCode of Conduct excerpts:\n{policy}\n\nFindings:\n{findings}"
+
+    def overhead_tokens(self, items: List[Item]) -> int:
+        """Upper estimate of the prompt tokens ``items`` cost besides their own fields."""
+        calls = -(-len(items) // self.max_batch_findings)
+        excerpts = set(text for _, context in items for text in excerpt_texts(context))
+        per_call = estimate_tokens(SYSTEM_PROMPT) + 20 + sum(estimate_tokens(text) + 1 for text in excerpts)
+        return calls * per_call + 8 * len(items)
+
+    def batches(self, items: List[Item]) -> Iterator[List[int]]:
+        """Greedily pack item indices into batches within the finding and token limits."""
+        base = estimate_tokens(SYSTEM_PROMPT) + 20
+        batch: List[int] = []
+        seen: set = set()
+        tokens = base
+        for index, (finding, context) in enumerate(items):
+            new_excerpts = [text for text in excerpt_texts(context) if text not in seen]
+            cost = estimate_tokens(format_finding(index, finding)) + sum(
+                estimate_tokens(text) + 1 for text in new_excerpts
+            )
+            if batch and (len(batch) >= self.max_batch_findings or tokens + cost > self.max_prompt_tokens):
+                yield batch
+                batch, seen, tokens = [], set(), base
+                new_excerpts = excerpt_texts(context)
+                cost = estimate_tokens(format_finding(index, finding)) + sum(
+                    estimate_tokens(text) + 1 for text in new_excerpts
+                )
+            batch.append(index)
+            seen.update(new_excerpts)
+            tokens += cost
+        if batch:
+            yield batch
+
+    def invoke(self, prompt: str) -> str:
+        """Send one prompt to the agent and return its completion text."""
+        LLM_CALLS.inc()
+        prompt_tokens = estimate_tokens(prompt)
+        try:
+            response = invoke_bedrock_agent(
+                self.agent_id,
+                self.agent_alias_id,
+                session_id=uuid.uuid4().hex,
+                input_text=prompt,
+                client=self.client
+            )
+        except BaseException:
+            # A failed attempt still counts against the audit's budget
+            record_tokens(prompt_tokens)
+            raise
+        text = completion_text(response)
+        record_tokens(prompt_tokens, estimate_tokens(text))
+        return text
+
+    def evaluate_batch(self, items: List[Item]) -> BatchVerdicts:
+        """
+        Verdicts for many findings in as few agent calls as the limits allow.
+
+        Args:
+            items: ``(finding, policy_context)`` pairs
+
+        Returns:
+            BatchVerdicts with a violation dict or None per item index, the
+            error for items no answer could be obtained for, and the call count
+
+        Raises:
+            TimeoutError, CircuitOpenError, BedrockAgentError: The agent is
+                unreachable, throttling or refusing the call
+        """
+        def evaluate(batch: List[int]) -> BatchVerdicts:
+            partial = BatchVerdicts({}, {}, 0)
+            return partial._replace(calls=self._evaluate(items, batch, partial))
+
+        result = BatchVerdicts({}, {}, 0)
+        calls = 0
+        for partial in fan_out(evaluate, list(self.batches(items)), self.max_workers):
+            result.verdicts.update(partial.verdicts)
+            result.failures.update(partial.failures)
+            calls += partial.calls
+        return result._replace(calls=calls)
+
+    def _evaluate(self, items: List[Item], batch: List[int], result: BatchVerdicts) -> int:
+        """Evaluate one batch into ``result``, re-splitting failed items; returns calls made."""
+        pending: Dict[int, Exception] = {}
+        try:
+            with span("auditor.llm_evaluate", findings=len(batch)):
+                answers = parse_verdicts(self.invoke(self.build_prompt([items[i] for i in batch])))
+        except AuditError as e:
+            # Malformed answer: every item is retried, in halves
+            pending = {index: e for index in batch}
+        except BedrockAgentError as e:
+            if not prompt_rejected(e):
+                # Throttled, denied or down: smaller batches would only multiply the calls
+                raise
+            pending = {index: e for index in batch}
+        else:
+            for position, index in enumerate(batch):
+                try:
+                    if position not in answers:
+                        raise AuditError(f"No verdict for finding {position}")
+                    result.verdicts[index] = to_violation(items[index][0], answers[position])
+                except AuditError as e:
+                    pending[index] = e
+        if not pending:
+            return 1
+        if len(batch) == 1:
+            result.failures.update(pending)
+            return 1
+        retry = list(pending)
+        # A wholly failed batch is halved; a partial failure retries just the failed items
+        middle = len(retry) // 2 if len(retry) == len(batch) else len(retry)
+        calls = 1
+        for part in (retry[:middle], retry[middle:]):
+            if not part:
+                continue
+            if not self._affordable([items[i] for i in part]):
+                error = AuditError(f"Token budget exhausted before retrying: {pending[part[0]]}")
+                result.failures.update({index: error for index in part})
+                continue
+            LLM_BATCH_RETRIES.inc(len(part))
+            calls += self._evaluate(items, part, result)
+        return calls
+
+    def _affordable(self, items: List[Item]) -> bool:
+        """Whether the audit's token budget still covers a prompt for ``items``."""
+        ledger = current_ledger()
+        return ledger is None or estimate_tokens(self.build_prompt(items)) <= ledger.remaining()
+
+    def evaluate(
+        self,
+        finding: Dict[str, Any],
+        policy_context: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Verdict for one finding.
+
+        Returns:
+            Violation dict, or None if the agent finds no violation
+
+        Raises:
+            AuditError: If no valid verdict came back
+            BedrockAgentError, TimeoutError, CircuitOpenError: From the agent call
+        """
+        result = self.evaluate_batch([(finding, policy_context)])
+        if 0 in result.failures:
+            raise result.failures[0]
+        return result.verdicts[0]
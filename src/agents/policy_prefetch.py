@@ -0,0 +1,209 @@
+"""
+Speculative Code of Conduct retrieval while an audit's investigation runs.
+
+The audit categories are fixed (Labor, Environment, Governance), and the
+supplier's industry and country are known before any finding is. So the
+Supervisor starts one Knowledge Base retrieval per category on the
+Auditor pool before calling the Investigator, asking for
+APP_POLICY_PREFETCH_RESULTS sections each.
+
+When the Auditor needs excerpts for a finding, it re-ranks the prefetched
+sections of the finding's category by the words they share with the
+snippet, leaving out the words of the prefetch query itself: every section
+was retrieved for those, so matching them says nothing about the finding.
+If the best section shares at least APP_POLICY_PREFETCH_MIN_OVERLAP other
+words, that is a hit and the top sections are used. Otherwise, or if that
+category's retrieval failed, it is a miss and the Auditor retrieves on
+demand as before. A retrieval still waiting for a pool thread when the
+Auditor gets to it is cancelled and counts as a miss, and so is any still
+queued when the audit ends, whether it finished, failed or was preempted.
+
+The prefetch reaches the Auditor through a context variable
+(``prefetch_scope``), like the audit deadline, so ``AuditorAgent`` keeps its
+signature. The report's ``prefetch`` block gives the hit rate, the
+retrieval seconds the hits saved and how long the Auditor waited for a
+prefetch still in flight.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.config import get_settings
+from src.models import Category
+from src.sources.base import CATEGORY_KEYWORDS, tokenize
+from src.utils.deadline import remaining_time
+from src.utils.metrics import get_registry
+
+_metrics = get_registry()
+PREFETCH_LOOKUPS = _metrics.counter(
+    "sentinel_policy_prefetch_lookups_total", "Auditor policy lookups by prefetch outcome", ["outcome"]
+)
+PREFETCH_SECONDS_SAVED = _metrics.counter(
+    "sentinel_policy_prefetch_seconds_saved_total", "Estimated Knowledge Base retrieval seconds saved by hits"
+)
+
+# Too common in snippets and policy text to show a section is relevant
+_COMMON_WORDS = frozenset({
+    "about", "after", "against", "also", "been", "from", "have", "into", "must", "over",
+    "policy", "that", "their", "this", "under", "were", "which", "with",
+})
+
+Excerpts = List[Dict[str, Any]]
+
+_current: ContextVar[Optional["PolicyPrefetch"]] = ContextVar("sentinel_policy_prefetch", default=None)
+
+
+def _terms(text: str) -> set:
+    return {term for term in tokenize(text) if len(term) > 3 and term not in _COMMON_WORDS}
+
+
+def prefetch_query(category: str, supplier_record: Optional[Dict[str, Any]] = None) -> str:
+    """Knowledge Base query for the sections of ``category`` likely to apply to a supplier."""
+    record = supplier_record or {}
+    industry = record.get("category") or "all"
+    where = f" in {record['country']}" if record.get("country") else ""
+    keywords = " ".join(CATEGORY_KEYWORDS.get(Category(category), []))
+    return f"{category} policy for {industry} suppliers{where}: {keywords}"
+
+
+class PolicyPrefetch:
+    """Prefetched policy sections for one audit, with hit and miss counts."""
+
+    def __init__(
+        self,
+        retrieve: Callable[[str], Excerpts],
+        supplier_record: Optional[Dict[str, Any]] = None,
+        max_results: int = 3,
+        min_overlap: Optional[int] = None
+    ):
+        """
+        Args:
+            retrieve: ``retrieve(query)`` returning ``{"text", "score"}`` excerpts
+            supplier_record: Supplier metadata; its ``category`` (industry)
+                and ``country`` narrow the queries
+            max_results: Excerpts returned per hit, as on-demand retrieval does
+            min_overlap: Words the best section must share with a snippet
+                (defaults to APP_POLICY_PREFETCH_MIN_OVERLAP)
+        """
+        self.retrieve = retrieve
+        self.supplier_record = supplier_record
+        self.max_results = max_results
+        self.min_overlap = min_overlap if min_overlap is not None else get_settings().app.policy_prefetch_min_overlap
+        self._futures: Dict[str, Future] = {}
+        self._query_terms: Dict[str, set] = {}
+        self._seconds: List[float] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.wait_seconds = 0.0
+
+    def start(self, submit: Callable[[Callable[[], Excerpts]], Future]) -> "PolicyPrefetch":
+        """Submit one retrieval per audit category; returns self."""
+        for category in Category:
+            query = prefetch_query(category.value, self.supplier_record)
+            self._query_terms[category.value] = _terms(query)
+            self._futures[category.value] = submit(lambda query=query: self._timed(query))
+        return self
+
+    def _timed(self, query: str) -> Excerpts:
+        started = time.perf_counter()
+        excerpts = self.retrieve(query)
+        with self._lock:
+            self._seconds.append(time.perf_counter() - started)
+        return excerpts
+
+    def _sections(self, category: str) -> Optional[Excerpts]:
+        future = self._futures.get(category)
+        if future is None or future.cancel():
+            # Never started: waiting on it could queue behind the lookups themselves
+            return None
+        if not future.done():
+            started = time.perf_counter()
+            wait([future], timeout=remaining_time())
+            with self._lock:
+                self.wait_seconds += time.perf_counter() - started
+        if not future.done():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            # That category's retrieval failed; the Auditor retries on demand
+            return None
+
+    def lookup(self, finding: Dict[str, Any]) -> Optional[Excerpts]:
+        """
+        Prefetched excerpts for a finding, best first, or None on a miss.
+
+        A miss means the caller should retrieve on demand.
+        """
+        category = finding.get("category", "Governance")
+        sections = self._sections(category)
+        excerpts = None
+        if sections:
+            words = _terms(finding.get("snippet", "")) - self._query_terms.get(category, set())
+            ranked = sorted(
+                ((len(words & _terms(section.get("text", ""))), i) for i, section in enumerate(sections)),
+                key=lambda item: (-item[0], item[1])
+            )
+            if ranked[0][0] >= self.min_overlap:
+                excerpts = [sections[i] for _, i in ranked[:self.max_results]]
+        with self._lock:
+            if excerpts is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                saved = sum(self._seconds) / len(self._seconds) if self._seconds else 0.0
+        PREFETCH_LOOKUPS.labels(outcome="miss" if excerpts is None else "hit").inc()
+        if excerpts is not None:
+            PREFETCH_SECONDS_SAVED.inc(saved)
+        return excerpts
+
+    def cancel(self) -> int:
+        """
+        Cancel the retrievals still waiting for a pool thread; returns how many.
+
+        Retrievals already running finish on their own, bounded by the
+        audit deadline, and their results are dropped.
+        """
+        return sum(future.cancel() for future in self._futures.values())
+
+    def summary(self) -> Dict[str, Any]:
+        """Queries, lookups, hits, misses, hit rate, retrieval seconds saved and wait seconds."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            mean = sum(self._seconds) / len(self._seconds) if self._seconds else 0.0
+            return {
+                "queries": len(self._futures),
+                "lookups": lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "retrieval_seconds_saved": round(self.hits * mean, 3),
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+@contextmanager
+def prefetch_scope(prefetch: Optional[PolicyPrefetch]) -> Iterator[Optional[PolicyPrefetch]]:
+    """
+    Make ``prefetch`` the current audit's prefetch for the duration of the block.
+
+    On exit, however the block ends, retrievals not yet started are
+    cancelled so they do not hold Auditor pool threads for a finished audit.
+    """
+    token = _current.set(prefetch)
+    try:
+        yield prefetch
+    finally:
+        _current.reset(token)
+        if prefetch is not None:
+            prefetch.cancel()
+
+
+def current_prefetch() -> Optional[PolicyPrefetch]:
+    """The prefetch of the audit running in this context, if any."""
+    return _current.get()
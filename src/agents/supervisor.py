@@ -4,8 +4,38 @@ Supervisor Agent - Orchestrates the multi-agent audit workflow.
 Reference: SPEC_Version2.md - Section 2: Agent Definitions
 """
 
+import asyncio
+import functools
 import json
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.agents.auditor import AuditorAgent
+from src.agents.policy_prefetch import PolicyPrefetch, prefetch_scope
+from src.config import get_settings
+from src.exceptions import AuditPreempted, TimeoutError
+from src.pipeline.entity_linking import EntityLinker, SupplierDirectory
+from src.pipeline.ranking import FindingRanker
+from src.sources.base import tokenize
+from src.utils.deadline import deadline_scope
+from src.utils.metrics import get_registry
+from src.utils.single_flight import get_single_flight
+from src.utils.token_budget import token_scope
+from src.utils.tracing import span, start_trace
+
+_metrics = get_registry()
+AUDITS_TOTAL = _metrics.counter("sentinel_audits_total", "Completed supplier audits")
+AUDITS_FAILED = _metrics.counter("sentinel_audits_failed_total", "Supplier audits that raised")
+AUDITS_IN_FLIGHT = _metrics.gauge("sentinel_audits_in_flight", "Supplier audits in progress")
+AUDIT_RISK_LEVELS = _metrics.counter(
+    "sentinel_audit_risk_level_total", "Completed audits by overall risk", ["risk"]
+)
+VIOLATIONS_TOTAL = _metrics.counter(
+    "sentinel_violations_total", "Policy violations reported", ["severity"]
+)
+AUDITS_DEGRADED = _metrics.counter(
+    "sentinel_audits_degraded_total", "Audits returned with partial results"
+)
 
 
 class SupervisorAgent:
@@ -16,49 +46,241 @@ class SupervisorAgent:
     Responsibilities:
     1. Receive user query (e.g., "Audit Acme Corp")
     2. Call Investigator to get raw data
-    3. Call Auditor with that data to get compliance score
-    4. Format final JSON for UI rendering
+    3. Optionally discard findings that are not about the supplier, then
+       rank the rest and keep the most relevant for the Auditor
+    4. Call Auditor with that data to get compliance score
+    5. Format final JSON for UI rendering
     """
     
-    def __init__(self, investigator_agent, auditor_agent):
+    def __init__(
+        self,
+        investigator_agent,
+        auditor_agent,
+        timeout_seconds: Optional[float] = None,
+        ranker: Optional[FindingRanker] = None,
+        linker: Optional[EntityLinker] = None,
+        coalesce: Optional[bool] = None,
+        prefetch_policy: Optional[bool] = None
+    ):
         """
         Initialize the Supervisor Agent.
         
         Args:
             investigator_agent: Instance of InvestigatorAgent
             auditor_agent: Instance of AuditorAgent
+            timeout_seconds: Audit budget shared by every stage
+                (defaults to APP_AUDIT_TIMEOUT_SECONDS)
+            ranker: Keeps the most relevant findings for the Auditor
+                (defaults to the top APP_MAX_FINDINGS_PER_AUDIT)
+            linker: Discards findings that are not about the supplier
+                (defaults to one over the APP_SUPPLIERS_FILE directory when
+                APP_ENTITY_LINKING is on, otherwise no screening)
+            coalesce: Share one in-flight audit between concurrent callers
+                for the same supplier (defaults to APP_COALESCE_AUDITS)
+            prefetch_policy: Retrieve likely policy sections while the
+                Investigator runs (defaults to APP_POLICY_PREFETCH)
         """
         self.investigator = investigator_agent
         self.auditor = auditor_agent
+        self.timeout_seconds = timeout_seconds or get_settings().app.audit_timeout_seconds
+        self.ranker = ranker or FindingRanker()
+        if linker is None and get_settings().app.entity_linking:
+            linker = EntityLinker()
+        self.linker = linker
+        self.directory = linker.directory if linker is not None else SupplierDirectory.from_settings()
+        self.coalesce = coalesce if coalesce is not None else get_settings().app.coalesce_audits
+        self.prefetch_policy = (
+            prefetch_policy if prefetch_policy is not None else get_settings().app.policy_prefetch
+        )
+    
+    @staticmethod
+    def coalescing_key(supplier_name: str, supplier_record: Optional[Dict[str, Any]] = None) -> str:
+        """Key under which concurrent audits are shared: normalised name plus options."""
+        record = json.dumps(supplier_record or {}, sort_keys=True, default=str)
+        return f"{' '.join(tokenize(supplier_name))}|{record}"
+    
+    def _flight_key(self, supplier_name: str, supplier_record: Optional[Dict[str, Any]]) -> Tuple[int, str]:
+        # The in-flight audit holds a reference to self, so its id cannot be reused meanwhile
+        return id(self), self.coalescing_key(supplier_name, supplier_record)
     
-    def audit_supplier(self, supplier_name: str) -> Dict[str, Any]:
+    def audit_supplier(
+        self,
+        supplier_name: str,
+        findings: Optional[Dict[str, Any]] = None,
+        on_stage: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+        supplier_record: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Orchestrate the complete supplier audit workflow.
         
         Args:
             supplier_name: Name of the supplier to audit
+            findings: Optional Investigator output from an earlier run; when
+                given, the investigation step is skipped
+            on_stage: Optional callback invoked as ``on_stage("investigating", None)``
+                and ``on_stage("auditing", findings)`` before each step; it may
+                raise AuditPreempted to pause the audit at that boundary. The
+                findings are the Investigator's output before screening, so a
+                resumed audit screens them once, as a fresh one would
+            supplier_record: Optional supplier metadata (country, category,
+                aliases) used to screen findings; defaults to the directory entry
+            
+        If entity linking discards every finding, the report is UNKNOWN and
+        degraded rather than GREEN: the linker may have dropped real findings.
             
+        Every stage runs against the remaining audit budget. A stage that
+        runs out of time or loses a dependency contributes partial results, and the report comes
+        back with ``degraded`` set and the cut-short stages listed in
+        ``degraded_reasons``. If no intelligence source answered, the
+        overall risk is UNKNOWN rather than a misleading GREEN. The report's
+        ``sources`` list marks each intelligence source as ok, partial (only
+        some of its queries answered), stale (served from cached findings)
+        or missing. ``tokens`` gives the estimated LLM
+        tokens the audit used against APP_AUDIT_TOKEN_BUDGET. ``prefetch``
+        gives the hit rate of the policy sections retrieved while the
+        Investigator ran, and the retrieval seconds the hits saved.
+        
+        Concurrent calls to this supervisor for the same supplier (by
+        normalised name and record) share one in-flight audit and each
+        receive a copy of its report. Supervisors never share audits with
+        each other, since their agents and settings may differ. Calls given
+        ``findings`` or ``on_stage`` always run on their own.
+        
         Returns:
             Dict containing the complete audit report in JSON format
             
         Reference: SPEC_Version2.md - Section 3: API Contracts
         """
-        # Step 1: Gather intelligence
-        findings = self.investigator.search_supplier_news(supplier_name)
+        run = functools.partial(self._audit, supplier_name, findings, on_stage, supplier_record)
+        if not self.coalesce or findings is not None or on_stage is not None:
+            return run()
+        return get_single_flight("audits").do(self._flight_key(supplier_name, supplier_record), run)
+    
+    async def audit_supplier_async(
+        self,
+        supplier_name: str,
+        supplier_record: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        ``audit_supplier`` for asyncio callers.
         
-        # Step 2: Audit against policy
-        audit_results = self.auditor.evaluate_findings(findings)
+        The audit runs in the event loop's default executor, and coroutines
+        and threads auditing the same supplier share one in-flight audit.
+        """
+        run = functools.partial(self._audit, supplier_name, None, None, supplier_record)
+        if not self.coalesce:
+            return await asyncio.get_running_loop().run_in_executor(None, run)
+        return await get_single_flight("audits").do_async(
+            self._flight_key(supplier_name, supplier_record), run
+        )
+    
+    def _audit(
+        self,
+        supplier_name: str,
+        findings: Optional[Dict[str, Any]],
+        on_stage: Optional[Callable[[str, Optional[Dict[str, Any]]], None]],
+        supplier_record: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        AUDITS_IN_FLIGHT.inc()
+        try:
+            with start_trace(supplier=supplier_name), \
+                    deadline_scope(self.timeout_seconds) as deadline, \
+                    token_scope() as tokens, \
+                    span("supervisor.audit_supplier"), \
+                    prefetch_scope(self._start_prefetch(supplier_name, findings, supplier_record)) as prefetch:
+                # Step 1: Gather intelligence
+                if findings is None:
+                    if on_stage:
+                        on_stage("investigating", None)
+                    try:
+                        with span("supervisor.investigate"):
+                            findings = self.investigator.search_supplier_news(supplier_name)
+                    except TimeoutError as e:
+                        deadline.degrade("investigate", str(e))
+                        findings = {
+                            "supplier": supplier_name,
+                            "findings": [],
+                            "sources": [{"name": "investigator", "status": "missing", "error": str(e)}]
+                        }
+                
+                # Step 2: Drop findings about other entities, then keep the most
+                # relevant, bounding the policy/KB work
+                investigated = findings
+                found = findings.get("findings", [])
+                linked, irrelevant = found, []
+                if self.linker is not None:
+                    with span("supervisor.link"):
+                        linked, irrelevant = self.linker.filter(supplier_name, found, supplier_record)
+                    if found and not linked:
+                        deadline.degrade("link", f"all {len(found)} findings discarded as not about the supplier")
+                with span("supervisor.rank"):
+                    kept = self.ranker.select(supplier_name, linked)
+                    findings = {**findings, "findings": kept}
+                screening = {
+                    "found": len(found),
+                    "irrelevant": len(irrelevant),
+                    "discard_rate": round(len(irrelevant) / len(found), 3) if found else 0.0,
+                    "kept": len(kept),
+                }
+                
+                # Step 3: Audit against policy
+                if on_stage:
+                    on_stage("auditing", investigated)
+                with span("supervisor.evaluate"):
+                    audit_results = self.auditor.evaluate_findings(findings)
+                sources = findings.get("sources", [])
+                if sources and all(source["status"] == "missing" for source in sources):
+                    # No intelligence at all: an empty finding list is not evidence of GREEN
+                    audit_results["overall_risk"] = "UNKNOWN"
+                elif found and not linked:
+                    # Nothing left to audit because the linker dropped it all
+                    audit_results["overall_risk"] = "UNKNOWN"
+                
+                # Step 4: Format final report
+                with span("supervisor.format_report"):
+                    report = self._format_report(
+                        supplier_name, findings, audit_results, deadline.degradations, screening,
+                        tokens.summary(), prefetch.summary() if prefetch else None
+                    )
+        except AuditPreempted:
+            # Paused by the scheduler at a stage boundary, not a failure
+            raise
+        except Exception:
+            AUDITS_FAILED.inc()
+            raise
+        finally:
+            AUDITS_IN_FLIGHT.dec()
         
-        # Step 3: Format final report
-        report = self._format_report(supplier_name, findings, audit_results)
+        AUDITS_TOTAL.inc()
+        if report["degraded"]:
+            AUDITS_DEGRADED.inc()
+        AUDIT_RISK_LEVELS.labels(risk=report["overall_risk"]).inc()
+        for violation in report["violations"]:
+            VIOLATIONS_TOTAL.labels(severity=violation.get("severity", "UNKNOWN")).inc()
         
         return report
     
+    def _start_prefetch(
+        self,
+        supplier_name: str,
+        findings: Optional[Dict[str, Any]],
+        supplier_record: Optional[Dict[str, Any]]
+    ) -> Optional[PolicyPrefetch]:
+        # Only worth it with an investigation to overlap, and only our Auditor reads it
+        if not self.prefetch_policy or findings is not None or not isinstance(self.auditor, AuditorAgent):
+            return None
+        known = self.directory.get(supplier_name) or {}
+        return self.auditor.prefetch_policy({**known, **(supplier_record or {})})
+    
     def _format_report(
         self, 
         supplier_name: str, 
         findings: Dict[str, Any], 
-        audit_results: Dict[str, Any]
+        audit_results: Dict[str, Any],
+        degraded_reasons: Optional[List[str]] = None,
+        screening: Optional[Dict[str, Any]] = None,
+        tokens: Optional[Dict[str, int]] = None,
+        prefetch: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Format the final JSON report for UI consumption.
@@ -68,10 +290,17 @@ class SupervisorAgent:
         """
         return {
             "supplier": supplier_name,
-            "timestamp": "2025-11-26T00:00:00Z",  # TODO: Use actual timestamp
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
             "overall_risk": audit_results.get("overall_risk", "UNKNOWN"),
             "risk_scores": audit_results.get("risk_scores", {}),
             "findings": findings.get("findings", []),
+            "sources": findings.get("sources", []),
+            "screening": dict(screening or {}),
+            "evaluation": audit_results.get("evaluation", {}),
+            "tokens": dict(tokens or {}),
+            "prefetch": dict(prefetch or {}),
             "violations": audit_results.get("violations", []),
-            "recommendations": audit_results.get("recommendations", [])
+            "recommendations": audit_results.get("recommendations", []),
+            "degraded": bool(degraded_reasons),
+            "degraded_reasons": list(degraded_reasons or [])
         }
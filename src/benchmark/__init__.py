@@ -0,0 +1,23 @@
+"""
+Offline benchmark harness for the Sentinel audit pipeline.
+
+Modules:
+    workload: Synthetic supplier portfolios and findings corpora
+    runner: Runs the Supervisor pipeline against latency-injected fakes
+        and records throughput, per-stage percentiles and peak memory
+
+Usage:
+    python -m src.benchmark --suppliers 500 --workers 16 --news-latency-ms 40
+"""
+
+from src.benchmark.runner import BenchmarkConfig, compare_results, run_benchmark, save_results
+from src.benchmark.workload import FindingsCorpus, build_portfolio
+
+__all__ = [
+    "BenchmarkConfig",
+    "FindingsCorpus",
+    "build_portfolio",
+    "compare_results",
+    "run_benchmark",
+    "save_results",
+]
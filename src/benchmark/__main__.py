@@ -0,0 +1,87 @@
+"""
+Run the pipeline benchmark from the command line.
+
+Usage:
+    python -m src.benchmark --suppliers 1000 --workers 16 --news-latency-ms 40 --kb-latency-ms 15
+    python -m src.benchmark --baseline benchmarks/results/<previous>.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from src.benchmark.runner import (
+    BenchmarkConfig,
+    compare_results,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+from src.logging_config import configure_logging
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmark",
+        description="Benchmark the audit pipeline against latency-injected fakes.",
+    )
+    parser.add_argument("--suppliers", type=int, default=200, help="Portfolio size")
+    parser.add_argument("--findings-per-supplier", type=int, help="Findings per supplier")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent audits")
+    parser.add_argument("--news-latency-ms", type=float, default=0.0, help="Fake news API latency")
+    parser.add_argument("--kb-latency-ms", type=float, default=0.0, help="Fake Knowledge Base latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform latency per call")
+    parser.add_argument("--seed", type=int, default=0, help="Workload seed")
+    parser.add_argument(
+        "--rate-limited",
+        action="store_true",
+        help="Keep the configured client-side rate limits (APP_*_REQUESTS_PER_SECOND)",
+    )
+    parser.add_argument("--no-trace-memory", action="store_true", help="Skip tracemalloc")
+    parser.add_argument("--output-dir", type=Path, help="Results directory (default benchmarks/results)")
+    parser.add_argument("--no-save", action="store_true", help="Print results without saving")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Relative change treated as a regression (default 0.10)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run one benchmark; exit 1 if it regresses against --baseline."""
+    args = build_parser().parse_args(argv)
+    configure_logging(stream=sys.stderr)
+
+    config = BenchmarkConfig(
+        suppliers=args.suppliers,
+        findings_per_supplier=args.findings_per_supplier,
+        workers=args.workers,
+        news_latency_ms=args.news_latency_ms,
+        kb_latency_ms=args.kb_latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+        rate_limited=args.rate_limited,
+        trace_memory=not args.no_trace_memory,
+    )
+    results = run_benchmark(config)
+    print(json.dumps(results, indent=2))
+
+    if not args.no_save:
+        path = save_results(results, args.output_dir)
+        print(f"Results written to {path}", file=sys.stderr)
+
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
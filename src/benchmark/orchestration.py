@@ -0,0 +1,240 @@
+"""
+Latency comparison of hybrid and agentic orchestration.
+
+Audits the same synthetic suppliers three ways against latency-injected
+fakes:
+
+- ``agentic``: ``BedrockSupervisorAgent`` calls a fake Supervisor agent that
+  replays the deployed agent graph step by step. The Supervisor routes to
+  the Investigator agent, which takes a model turn, calls the news tool and
+  takes another turn. The Supervisor then routes to the Auditor agent,
+  which takes a turn, retrieves policy excerpts one finding at a time and
+  takes another turn. Finally the Supervisor writes the report. That is
+  seven model turns, all sequential.
+- ``hybrid_sequential``: ``SupervisorAgent`` with an Auditor that runs one
+  call at a time and no policy prefetch. The workflow runs in Python, the tools are called
+  directly and the only model calls are Auditor agent batches for uncertain
+  findings.
+- ``hybrid_no_prefetch``: the same with concurrent Knowledge Base
+  retrievals and agent batches, but no policy prefetch.
+- ``hybrid``: the default, which also prefetches the likely policy sections
+  while the Investigator runs. Its ``prefetch`` block gives the hit rate
+  and the retrieval seconds the hits saved.
+
+Audits run one at a time, so the numbers are per-audit latency, not
+throughput.
+
+Usage:
+    python -m src.benchmark.orchestration --suppliers 20 --llm-latency-ms 800 --kb-latency-ms 40
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.agents.auditor import AuditorAgent
+from src.agents.bedrock_supervisor import BedrockSupervisorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.policy_evaluator import PolicyEvaluator
+from src.agents.supervisor import SupervisorAgent
+from src.benchmark.runner import _install_unlimited_limiters
+from src.benchmark.workload import FindingsCorpus, build_portfolio
+from src.config import get_settings
+from src.logging_config import configure_logging
+from src.utils.fakes import FakeBedrockAgentRuntime, FakeNewsAPI
+from src.utils.rate_limit import reset_rate_limiters
+from src.utils.tracing import LatencyHistogram, get_span_recorder
+
+MODES = ("agentic", "hybrid_sequential", "hybrid_no_prefetch", "hybrid")
+
+_FINDING_ID = re.compile(r'^\{"id": (\d+)', re.MULTILINE)
+
+
+def clear_verdicts(prompt: str) -> str:
+    """Auditor agent answer that clears every finding in a batch prompt."""
+    return json.dumps([{"id": int(i), "violation": False} for i in _FINDING_ID.findall(prompt)])
+
+
+class AgentGraphReplay:
+    """
+    Responder for the fake Supervisor agent that replays its delegation chain.
+
+    The Supervisor call itself costs one model turn (the fake's latency).
+    Every other turn is an ``invoke_agent`` on ``turns``, and tool calls go to
+    the news and Knowledge Base fakes.
+    """
+
+    def __init__(self, news: FakeNewsAPI, kb: FakeBedrockAgentRuntime, turns: FakeBedrockAgentRuntime):
+        self.news = news
+        self.kb = kb
+        self.turns = turns
+        # Reaches the same verdicts as the hybrid Auditor; the turns above carry the cost
+        self.verdicts = AuditorAgent(
+            knowledge_base_client=FakeBedrockAgentRuntime(latency=0),
+            knowledge_base_id="benchmark-kb",
+            policy_evaluator=PolicyEvaluator(
+                client=FakeBedrockAgentRuntime(responder=clear_verdicts, latency=0), agent_id="auditor"
+            ),
+        )
+
+    def _turn(self, agent: str, text: str) -> None:
+        self.turns.invoke_agent(agentId=agent, agentAliasId="TSTALIASID", sessionId="replay", inputText=text)
+
+    def __call__(self, prompt: str) -> str:
+        supplier = prompt[len("Audit "):].split(" (", 1)[0]
+        # Investigator agent: choose the tool, call it, summarise the findings
+        self._turn("investigator", prompt)
+        findings = self.news.search_news(supplier)
+        self._turn("investigator", json.dumps(findings))
+        self._turn("supervisor", "route to auditor")
+        # Auditor agent: plan, retrieve excerpts one finding at a time, give verdicts
+        self._turn("auditor", json.dumps(findings))
+        for finding in findings:
+            violation, confidence = self.verdicts._classify(finding)
+            if violation or confidence < self.verdicts.escalation_threshold:
+                self.kb.retrieve(
+                    knowledgeBaseId="benchmark-kb",
+                    retrievalQuery={"text": f"{finding.get('category')} policy: {finding.get('snippet')}"},
+                )
+        self._turn("auditor", "verdicts")
+        # Supervisor writes the report
+        self._turn("supervisor", "compile report")
+        return json.dumps({"supplier": supplier, **self.verdicts.evaluate_findings({"findings": findings})})
+
+
+def _fakes(config: Dict[str, Any], corpus: FindingsCorpus) -> Dict[str, Any]:
+    return {
+        "news": FakeNewsAPI(findings_for=corpus.findings_for, latency=config["news_latency_ms"] / 1000),
+        "kb": FakeBedrockAgentRuntime(latency=config["kb_latency_ms"] / 1000),
+        "llm": FakeBedrockAgentRuntime(responder=clear_verdicts, latency=config["llm_latency_ms"] / 1000),
+    }
+
+
+def _build(mode: str, fakes: Dict[str, Any], max_workers: int) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    if mode == "agentic":
+        replay = AgentGraphReplay(fakes["news"], fakes["kb"], fakes["llm"])
+        fakes["supervisor"] = FakeBedrockAgentRuntime(responder=replay, latency=fakes["llm"].latency)
+        agent = BedrockSupervisorAgent(client=fakes["supervisor"], agent_id="supervisor")
+    else:
+        workers = 1 if mode == "hybrid_sequential" else max_workers
+        agent = SupervisorAgent(
+            InvestigatorAgent(news_api_client=fakes["news"]),
+            AuditorAgent(
+                knowledge_base_client=fakes["kb"],
+                knowledge_base_id="benchmark-kb",
+                policy_evaluator=PolicyEvaluator(client=fakes["llm"], agent_id="auditor", max_workers=workers),
+                max_workers=workers,
+            ),
+            coalesce=False,
+            prefetch_policy=mode == "hybrid",
+        )
+    return lambda supplier: agent.audit_supplier(supplier["name"], supplier_record=supplier)
+
+
+def run_orchestration_benchmark(
+    suppliers: int = 10,
+    findings_per_supplier: Optional[int] = None,
+    llm_latency_ms: float = 200.0,
+    news_latency_ms: float = 50.0,
+    kb_latency_ms: float = 30.0,
+    modes: List[str] = list(MODES),
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Audit the same portfolio in each mode and report per-audit latency.
+
+    ``max_workers`` bounds the concurrent Auditor calls of the concurrent
+    hybrid modes (defaults to APP_AUDITOR_MAX_WORKERS, at least 2).
+    """
+    max_workers = max(2, max_workers if max_workers is not None else get_settings().app.auditor_max_workers)
+    config = {
+        "suppliers": suppliers,
+        "findings_per_supplier": findings_per_supplier,
+        "llm_latency_ms": llm_latency_ms,
+        "news_latency_ms": news_latency_ms,
+        "kb_latency_ms": kb_latency_ms,
+        "seed": seed,
+        "max_workers": max_workers,
+    }
+    portfolio = build_portfolio(suppliers, seed=seed)
+    corpus = FindingsCorpus(findings_per_supplier, seed=seed)
+    results: Dict[str, Any] = {}
+    _install_unlimited_limiters()
+    try:
+        for mode in modes:
+            # Hedge delays come from recorded latencies; start each mode from the defaults
+            get_span_recorder().reset()
+            fakes = _fakes(config, corpus)
+            audit = _build(mode, fakes, max_workers)
+            latencies = LatencyHistogram()
+            risks: Dict[str, int] = {}
+            prefetch = {"lookups": 0, "hits": 0, "retrieval_seconds_saved": 0.0}
+            for supplier in portfolio:
+                started = time.perf_counter()
+                report = audit(supplier)
+                latencies.add(time.perf_counter() - started)
+                risks[report["overall_risk"]] = risks.get(report["overall_risk"], 0) + 1
+                for key in prefetch:
+                    prefetch[key] += report.get("prefetch", {}).get(key, 0)
+            model_calls = fakes["llm"].calls + (fakes["supervisor"].calls if "supervisor" in fakes else 0)
+            summary = latencies.summary()
+            results[mode] = {
+                "latency_mean_ms": summary["mean_ms"],
+                "latency_p50_ms": summary["p50_ms"],
+                "latency_p95_ms": summary["p95_ms"],
+                "model_calls_per_audit": round(model_calls / suppliers, 2),
+                "kb_calls_per_audit": round(fakes["kb"].calls / suppliers, 2),
+                "kb_max_in_flight": fakes["kb"].max_in_flight,
+                "risk_levels": risks,
+            }
+            if prefetch["lookups"]:
+                results[mode]["prefetch_hit_rate"] = round(prefetch["hits"] / prefetch["lookups"], 3)
+                results[mode]["prefetch_seconds_saved_per_audit"] = round(
+                    prefetch["retrieval_seconds_saved"] / suppliers, 3
+                )
+    finally:
+        reset_rate_limiters()
+
+    if "agentic" in results:
+        baseline = results["agentic"]["latency_mean_ms"]
+        for mode, result in results.items():
+            result["speedup_vs_agentic"] = round(baseline / result["latency_mean_ms"], 2)
+    return {"config": config, "modes": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmark.orchestration",
+        description="Compare per-audit latency of agentic and hybrid orchestration against fakes.",
+    )
+    parser.add_argument("--suppliers", type=int, default=10, help="Suppliers audited per mode")
+    parser.add_argument("--findings-per-supplier", type=int, help="Findings per supplier")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Latency of one agent model turn")
+    parser.add_argument("--news-latency-ms", type=float, default=50.0, help="Fake news API latency")
+    parser.add_argument("--kb-latency-ms", type=float, default=30.0, help="Fake Knowledge Base latency")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes to run")
+    parser.add_argument("--seed", type=int, default=0, help="Workload seed")
+    parser.add_argument("--max-workers", type=int, help="Concurrent Auditor calls in the hybrid modes")
+    args = parser.parse_args(argv)
+    configure_logging(stream=sys.stderr)
+
+    results = run_orchestration_benchmark(
+        suppliers=args.suppliers,
+        findings_per_supplier=args.findings_per_supplier,
+        llm_latency_ms=args.llm_latency_ms,
+        news_latency_ms=args.news_latency_ms,
+        kb_latency_ms=args.kb_latency_ms,
+        modes=[mode.strip() for mode in args.modes.split(",") if mode.strip()],
+        seed=args.seed,
+        max_workers=args.max_workers,
+    )
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Scaling benchmark for multi-process re-scoring.
+
+Builds a synthetic findings file in memory (one NDJSON line per supplier)
+and re-scores it with ``ParallelRescorer`` at each requested process count,
+reporting throughput, speedup over one process and parallel efficiency
+(speedup / processes). Efficiency near 1.0 up to the core count means the
+CPU-bound stages scale linearly. Worker start-up is excluded: each pool is
+started before the clock starts.
+
+Usage:
+    python -m src.benchmark.rescore --suppliers 5000 --findings-per-supplier 40 --processes 1,2,4,8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.benchmark.workload import FindingsCorpus, build_portfolio
+from src.logging_config import configure_logging
+from src.pipeline.rescoring import ParallelRescorer
+
+
+def build_findings_file(
+    suppliers: int, findings_per_supplier: Optional[int] = None, seed: int = 0
+) -> Tuple[List[bytes], int]:
+    """Synthetic stored-findings NDJSON lines (one per supplier) and the finding count."""
+    corpus = FindingsCorpus(findings_per_supplier, seed=seed)
+    lines = []
+    findings = 0
+    for supplier in build_portfolio(suppliers, seed=seed):
+        record = {
+            "supplier": supplier["name"],
+            "supplier_id": supplier["id"],
+            "findings": corpus.findings_for(supplier["name"]),
+            "sources": [{"name": "news_api", "status": "ok"}],
+        }
+        findings += len(record["findings"])
+        lines.append(json.dumps(record).encode("utf-8") + b"\n")
+    return lines, findings
+
+
+def run_rescore_benchmark(
+    suppliers: int = 2000,
+    findings_per_supplier: Optional[int] = None,
+    processes: Sequence[int] = (1, 2, 4),
+    shard_bytes: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Re-score the same synthetic file at each process count."""
+    lines, findings = build_findings_file(suppliers, findings_per_supplier, seed)
+    runs = []
+    for count in processes:
+        with ParallelRescorer(processes=count, shard_bytes=shard_bytes) as rescorer:
+            start = time.perf_counter()
+            reports = sum(shard.count(b"\n") for shard in rescorer.run(lines))
+            elapsed = time.perf_counter() - start
+        runs.append({
+            "processes": rescorer.processes,
+            "seconds": round(elapsed, 3),
+            "reports": reports,
+            "suppliers_per_second": round(suppliers / elapsed, 1),
+            "findings_per_second": round(findings / elapsed, 1),
+        })
+
+    base = runs[0]["seconds"] * runs[0]["processes"]
+    for run in runs:
+        speedup = base / run["seconds"]
+        run["speedup"] = round(speedup, 2)
+        run["efficiency"] = round(speedup / run["processes"], 2)
+    return {
+        "suppliers": suppliers,
+        "findings": findings,
+        "input_bytes": sum(len(line) for line in lines),
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmark.rescore",
+        description="Measure how re-scoring throughput scales with worker processes.",
+    )
+    parser.add_argument("--suppliers", type=int, default=2000, help="Portfolio size")
+    parser.add_argument("--findings-per-supplier", type=int, help="Findings per supplier")
+    parser.add_argument("--processes", default="1,2,4", help="Comma-separated process counts")
+    parser.add_argument("--shard-bytes", type=int, help="Target shard size in bytes")
+    parser.add_argument("--seed", type=int, default=0, help="Workload seed")
+    args = parser.parse_args(argv)
+    configure_logging(stream=sys.stderr)
+
+    results = run_rescore_benchmark(
+        suppliers=args.suppliers,
+        findings_per_supplier=args.findings_per_supplier,
+        processes=[int(p) for p in args.processes.split(",") if p.strip()],
+        shard_bytes=args.shard_bytes,
+        seed=args.seed,
+    )
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+End-to-end pipeline benchmark.
+
+Runs the full Supervisor -> Investigator -> Auditor pipeline over a
+synthetic portfolio, with the news API and the Bedrock Agent Runtime
+(Knowledge Base retrieval) replaced by latency-injected fakes. Results are
+plain JSON so runs from different commits can be compared for regressions.
+"""
+
+import json
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.benchmark.workload import REPO_ROOT, FindingsCorpus, build_portfolio
+from src.logging_config import get_logger
+from src.main import run_audits
+from src.utils.fakes import FakeBedrockAgentRuntime, FakeNewsAPI
+from src.utils.rate_limit import ServiceLimiter, reset_rate_limiters, set_rate_limiter
+from src.utils.tracing import get_span_recorder
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = get_logger(__name__)
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+RESULTS_VERSION = 1
+
+
+class BenchmarkConfig(BaseModel):
+    """Benchmark parameters; recorded verbatim in the results file."""
+
+    suppliers: int = Field(default=200, ge=1, description="Portfolio size")
+    findings_per_supplier: Optional[int] = Field(
+        default=None, ge=1, description="Pad/truncate findings per supplier (None = mock templates)"
+    )
+    workers: int = Field(default=8, ge=1, description="Concurrent audits")
+    news_latency_ms: float = Field(default=0.0, ge=0, description="Fake news API latency")
+    kb_latency_ms: float = Field(default=0.0, ge=0, description="Fake Knowledge Base latency")
+    jitter_ms: float = Field(default=0.0, ge=0, description="Uniform extra latency per fake call")
+    seed: int = Field(default=0, description="Workload and jitter seed")
+    rate_limited: bool = Field(
+        default=False, description="Keep the configured client-side rate limits during the run"
+    )
+    trace_memory: bool = Field(default=True, description="Track peak Python heap with tracemalloc")
+
+
+class _NullOutput:
+    """Discards NDJSON reports so output buffering does not skew memory figures."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def git_commit() -> Optional[str]:
+    """Current commit hash, if the tree is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    scale = 1 if platform.system() == "Darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 2)
+
+
+def _install_unlimited_limiters() -> None:
+    for service in ("news", "knowledge_base", "bedrock"):
+        set_rate_limiter(service, ServiceLimiter(service, requests_per_second=1e9, max_concurrency=10_000))
+
+
+def run_benchmark(config: Optional[BenchmarkConfig] = None) -> Dict[str, Any]:
+    """
+    Run one benchmark and return its results.
+
+    Unless ``config.rate_limited`` is set, the shared rate limiters are
+    replaced with effectively unlimited ones for the run, so the numbers
+    reflect pipeline cost rather than the configured API quotas.
+
+    Returns:
+        Results dict with config, throughput, per-stage percentiles and memory
+    """
+    config = config or BenchmarkConfig()
+    portfolio = build_portfolio(config.suppliers, seed=config.seed)
+    corpus = FindingsCorpus(config.findings_per_supplier, seed=config.seed)
+    jitter = config.jitter_ms / 1000
+    news = FakeNewsAPI(
+        findings_for=corpus.findings_for,
+        latency=config.news_latency_ms / 1000,
+        jitter=jitter,
+        seed=config.seed,
+    )
+    kb = FakeBedrockAgentRuntime(
+        latency=config.kb_latency_ms / 1000,
+        jitter=jitter,
+        seed=config.seed,
+    )
+    supervisor = SupervisorAgent(
+        InvestigatorAgent(news_api_client=news),
+        AuditorAgent(knowledge_base_client=kb, knowledge_base_id="benchmark-kb"),
+    )
+
+    if not config.rate_limited:
+        _install_unlimited_limiters()
+    get_span_recorder().reset()
+    if config.trace_memory:
+        tracemalloc.start()
+
+    logger.info("Benchmark started", **config.model_dump())
+    try:
+        summary = run_audits(portfolio, _NullOutput(), supervisor=supervisor, workers=config.workers)
+    finally:
+        peak_traced = tracemalloc.get_traced_memory()[1] if config.trace_memory else None
+        if config.trace_memory:
+            tracemalloc.stop()
+        if not config.rate_limited:
+            reset_rate_limiters()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "config": config.model_dump(),
+        "summary": summary,
+        "stages": get_span_recorder().summary(),
+        "memory": {
+            "peak_traced_mb": round(peak_traced / 2**20, 2) if peak_traced is not None else None,
+            "peak_rss_mb": _peak_rss_mb(),
+        },
+        "fakes": {
+            "news_calls": news.calls,
+            "news_max_in_flight": news.max_in_flight,
+            "kb_calls": kb.calls,
+            "kb_max_in_flight": kb.max_in_flight,
+        },
+    }
+    logger.info(
+        "Benchmark finished",
+        throughput_per_second=summary["throughput_per_second"],
+        latency_p95_ms=summary["latency_p95_ms"],
+    )
+    return results
+
+
+def save_results(results: Dict[str, Any], directory: Optional[Path] = None) -> Path:
+    """
+    Write results to ``<directory>/<timestamp>-<commit>.json``.
+
+    Returns:
+        Path of the written file
+    """
+    directory = Path(directory or RESULTS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = results["timestamp"].replace(":", "").replace("-", "")[:15]
+    commit = (results.get("git_commit") or "nocommit")[:8]
+    path = directory / f"{stamp}-{commit}.json"
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """Read a results file written by ``save_results``."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.10,
+    min_delta_ms: float = 0.5,
+) -> List[str]:
+    """
+    List regressions of ``current`` against ``baseline``.
+
+    Flags a throughput drop, a p95 increase for any stage present in both runs
+    (ignoring changes smaller than ``min_delta_ms``), and peak traced memory
+    growth, each beyond ``tolerance`` (relative).
+
+    Returns:
+        Human-readable regression descriptions; empty when none
+    """
+    regressions = []
+    if current.get("config") != baseline.get("config"):
+        logger.warning("Comparing benchmark runs with different configs")
+
+    old_tp = baseline["summary"]["throughput_per_second"]
+    new_tp = current["summary"]["throughput_per_second"]
+    if old_tp and new_tp < old_tp * (1 - tolerance):
+        regressions.append(f"throughput {old_tp}/s -> {new_tp}/s")
+
+    for stage, old in baseline.get("stages", {}).items():
+        new = current.get("stages", {}).get(stage)
+        if not new:
+            continue
+        delta = new["p95_ms"] - old["p95_ms"]
+        if delta > min_delta_ms and new["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{stage} p95 {old['p95_ms']}ms -> {new['p95_ms']}ms")
+
+    old_mem = (baseline.get("memory") or {}).get("peak_traced_mb")
+    new_mem = (current.get("memory") or {}).get("peak_traced_mb")
+    if old_mem and new_mem and new_mem > old_mem * (1 + tolerance):
+        regressions.append(f"peak traced memory {old_mem}MB -> {new_mem}MB")
+    return regressions
@@ -0,0 +1,164 @@
+"""
+Synthetic workloads for benchmarking.
+
+Supplier portfolios are built from the demo scenarios and the sample
+supplier list; findings reuse the Investigator's mock templates and the
+news-search Lambda's mock templates, so synthetic audits exercise the same
+policy rules as the demo. Generation is seeded and deterministic, and
+findings are produced on demand so large corpora do not sit in memory.
+"""
+
+import importlib.util
+import json
+import logging
+import random
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+from src.agents.investigator import InvestigatorAgent
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEMO_SCENARIOS_PATH = REPO_ROOT / "data" / "sample" / "demo_scenarios.json"
+SUPPLIERS_PATH = REPO_ROOT / "data" / "sample" / "suppliers.json"
+NEWS_LAMBDA_PATH = REPO_ROOT / "infrastructure" / "lambda" / "news_search.py"
+
+RISK_PROFILES = ("GREEN", "YELLOW", "RED", "UNKNOWN")
+DEFAULT_RISK_MIX = {"GREEN": 0.25, "YELLOW": 0.25, "RED": 0.25, "UNKNOWN": 0.25}
+STATUS_WEIGHTS = {"active": 0.8, "under_review": 0.15, "flagged": 0.05}
+NEWS_CATEGORIES = ["labor", "environment", "governance"]
+
+
+@lru_cache(maxsize=1)
+def _news_lambda() -> ModuleType:
+    """Load the news-search Lambda module (its package dir is not importable)."""
+    spec = importlib.util.spec_from_file_location("sentinel_news_search_lambda", NEWS_LAMBDA_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # The Lambda sets the root logger level at import; keep ours untouched
+    root = logging.getLogger()
+    level = root.level
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        root.setLevel(level)
+    return module
+
+
+@lru_cache(maxsize=1)
+def _sample_data() -> Dict[str, Any]:
+    demo = json.loads(DEMO_SCENARIOS_PATH.read_text(encoding="utf-8"))["demo_suppliers"]
+    suppliers = json.loads(SUPPLIERS_PATH.read_text(encoding="utf-8"))["suppliers"]
+    return {"demo": demo, "suppliers": suppliers}
+
+
+@lru_cache(maxsize=1)
+def _profile_names() -> Dict[str, List[str]]:
+    """Base supplier names grouped by the risk profile the mock search gives them."""
+    mock = InvestigatorAgent()._mock_search
+    unknown_urls = [f["url"] for f in mock("")]
+    names: Dict[str, List[str]] = {profile: [] for profile in RISK_PROFILES}
+    for scenario in _sample_data()["demo"]:
+        names[scenario["expected_risk"]].append(scenario["name"])
+    for supplier in _sample_data()["suppliers"]:
+        if [f["url"] for f in mock(supplier["name"])] == unknown_urls:
+            names["UNKNOWN"].append(supplier["name"])
+    return names
+
+
+def classify_supplier(supplier_name: str) -> str:
+    """Risk profile ("GREEN", "YELLOW", "RED" or "UNKNOWN") implied by the mock templates."""
+    mock = InvestigatorAgent()._mock_search
+    urls = [f["url"] for f in mock(supplier_name)]
+    for profile, names in _profile_names().items():
+        if names and urls == [f["url"] for f in mock(names[0])]:
+            return profile
+    return "UNKNOWN"
+
+
+def build_portfolio(
+    size: int,
+    seed: int = 0,
+    risk_mix: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build a synthetic supplier portfolio in the suppliers.json record shape.
+
+    Names are demo/sample supplier names with a numeric suffix, so each keeps
+    the risk profile of its base name. Country and category are drawn from the
+    sample supplier list.
+
+    Args:
+        size: Number of suppliers
+        seed: Random seed
+        risk_mix: Weight per risk profile (defaults to an even split)
+
+    Returns:
+        List of {"id", "name", "country", "category", "status", "risk_profile"} dicts
+    """
+    rng = random.Random(seed)
+    mix = risk_mix or DEFAULT_RISK_MIX
+    names = _profile_names()
+    profiles = [p for p in RISK_PROFILES if mix.get(p, 0) > 0 and names[p]]
+    weights = [mix[p] for p in profiles]
+    samples = _sample_data()["suppliers"]
+    statuses = list(STATUS_WEIGHTS)
+
+    portfolio = []
+    for i in range(size):
+        profile = rng.choices(profiles, weights)[0]
+        sample = rng.choice(samples)
+        portfolio.append({
+            "id": f"BENCH-{i:06d}",
+            "name": f"{rng.choice(names[profile])} {i:06d}",
+            "country": sample["country"],
+            "category": sample["category"],
+            "status": rng.choices(statuses, list(STATUS_WEIGHTS.values()))[0],
+            "risk_profile": profile,
+        })
+    return portfolio
+
+
+class FindingsCorpus:
+    """
+    Deterministic findings source for synthetic suppliers.
+
+    With ``findings_per_supplier`` unset it returns exactly what the
+    Investigator's mock search returns. Otherwise the list is padded (or
+    truncated) to that size: adverse profiles add the Lambda mock templates,
+    and repeated templates get older dates and distinct URLs.
+    """
+
+    def __init__(self, findings_per_supplier: Optional[int] = None, seed: int = 0):
+        self.findings_per_supplier = findings_per_supplier
+        self.seed = seed
+        self._mock = InvestigatorAgent()._mock_search
+
+    def findings_for(self, supplier_name: str) -> List[Dict[str, Any]]:
+        base = self._mock(supplier_name)
+        count = self.findings_per_supplier
+        if count is None:
+            return base
+        if count <= len(base):
+            return base[:count]
+
+        pool = list(base)
+        if classify_supplier(supplier_name) != "GREEN":
+            pool.extend(_news_lambda().mock_news_search(supplier_name, NEWS_CATEGORIES)["findings"])
+
+        rng = random.Random(f"{self.seed}:{supplier_name}")
+        findings = list(base)
+        copy = 0
+        while len(findings) < count:
+            copy += 1
+            for template in pool:
+                if len(findings) >= count:
+                    break
+                published = date.fromisoformat(template["date"]) - timedelta(days=rng.randint(1, 730))
+                findings.append({
+                    **template,
+                    "date": published.isoformat(),
+                    "url": f"{template['url']}?copy={copy}",
+                })
+        return findings
@@ -5,7 +5,7 @@ This module handles all configuration settings using pydantic-settings
 for type-safe configuration with validation.
 """
 
-from typing import Optional
+from typing import Annotated, Dict, Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -47,6 +47,14 @@ class AWSSettings(BaseSettings):
         default=None,
         description="Auditor Agent ID"
     )
+    auditor_agent_alias_id: str = Field(
+        default="TSTALIASID",
+        description="Auditor Agent alias used for LLM policy evaluation"
+    )
+    supervisor_agent_alias_id: str = Field(
+        default="TSTALIASID",
+        description="Supervisor Agent alias used in agentic orchestration mode"
+    )
     
     # Knowledge Base
     knowledge_base_id: Optional[str] = Field(
@@ -59,6 +67,13 @@ class AWSSettings(BaseSettings):
         default=None,
         description="ARN for news search Lambda function"
     )
+    
+    # Client Connection Pools
+    max_pool_connections: int = Field(
+        default=10,
+        ge=1,
+        description="HTTP connections per AWS client (one client per thread or event loop)"
+    )
 
 
 class AppSettings(BaseSettings):
@@ -78,6 +93,10 @@ class AppSettings(BaseSettings):
     debug: bool = Field(default=False, description="Enable debug mode")
     
     # Audit Configuration
+    coalesce_audits: bool = Field(
+        default=True,
+        description="Concurrent audits of the same supplier share one in-flight run"
+    )
     audit_timeout_seconds: int = Field(
         default=30,
         description="Maximum time for audit completion"
@@ -90,6 +109,218 @@ class AppSettings(BaseSettings):
     # Risk Scoring Thresholds
     risk_threshold_yellow: int = Field(default=30, description="Threshold for YELLOW risk")
     risk_threshold_red: int = Field(default=70, description="Threshold for RED risk")
+    
+    # Outbound Rate Limits (shared across all agents in the process)
+    bedrock_requests_per_second: float = Field(
+        default=5.0,
+        gt=0,
+        description="Sustained Bedrock agent invocations per second"
+    )
+    bedrock_max_concurrency: int = Field(
+        default=10,
+        description="Upper bound on concurrent Bedrock agent invocations"
+    )
+    knowledge_base_requests_per_second: float = Field(
+        default=10.0,
+        gt=0,
+        description="Sustained Knowledge Base retrievals per second"
+    )
+    knowledge_base_max_concurrency: int = Field(
+        default=20,
+        description="Upper bound on concurrent Knowledge Base retrievals"
+    )
+    news_requests_per_second: float = Field(
+        default=5.0,
+        gt=0,
+        description="Sustained news search calls per second"
+    )
+    news_max_concurrency: int = Field(
+        default=10,
+        description="Upper bound on concurrent news search calls"
+    )
+    
+    # Tail Latency Control
+    hedging_enabled: bool = Field(
+        default=True,
+        description="Send a duplicate KB/news request when the first is slower than its p95"
+    )
+    hedge_default_delay_seconds: float = Field(
+        default=2.0,
+        description="Hedge delay used until enough latency samples exist"
+    )
+    hedge_budget_ratio: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Hedges earned per request, process-wide, on top of an initial burst of 10"
+    )
+    hedge_max_workers: int = Field(
+        default=128,
+        description="Threads (started on demand) for hedges; original requests run on their own threads"
+    )
+    
+    # Circuit Breakers and Fallbacks
+    circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive failures that open a dependency's circuit"
+    )
+    circuit_recovery_seconds: float = Field(
+        default=30.0,
+        description="Seconds an open circuit fails fast before probing again"
+    )
+    findings_cache_size: int = Field(
+        default=10_000,
+        description="Suppliers whose last good findings are kept for fallback"
+    )
+    
+    # Investigator Sources
+    source_timeout_seconds: float = Field(
+        default=10.0,
+        description="Per-source search budget; slower sources are cut off"
+    )
+    source_max_results: int = Field(
+        default=200,
+        description="Findings kept per source; the ranking stage then keeps the top max_findings_per_audit"
+    )
+    source_max_workers: int = Field(
+        default=64,
+        description="Threads (started on demand) for concurrent source searches"
+    )
+    
+    # Entity Linking
+    entity_linking: bool = Field(
+        default=False,
+        description="Drop findings that do not appear to be about the audited supplier before auditing"
+    )
+    suppliers_file: str = Field(
+        default="data/sample/suppliers.json",
+        description="Supplier directory (names, aliases, country, category) used to screen findings"
+    )
+    entity_link_threshold: float = Field(
+        default=0.5,
+        description="Minimum mention/context relevance for a finding to reach the Auditor"
+    )
+    
+    # Auditor Tiers
+    auditor_escalation_threshold: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Rule confidence below which a finding is escalated to the LLM policy check"
+    )
+    auditor_max_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Knowledge Base retrievals and Auditor agent calls one audit runs at once (1 = sequential)"
+    )
+    auditor_batch_max_findings: int = Field(
+        default=20,
+        ge=1,
+        description="Escalated findings evaluated per Auditor agent call (1 disables batching)"
+    )
+    auditor_batch_max_prompt_tokens: int = Field(
+        default=8000,
+        description="Estimated prompt tokens per batched call; larger batches are split"
+    )
+    audit_token_budget: int = Field(
+        default=20_000,
+        description="Estimated prompt tokens one audit may send to Bedrock agents"
+    )
+    finding_max_tokens: int = Field(
+        default=120,
+        description="Snippets are compacted to this many estimated tokens before LLM calls"
+    )
+    
+    # Orchestration
+    orchestration_mode: Literal["hybrid", "agentic"] = Field(
+        default="hybrid",
+        description="hybrid: Python orchestrates and calls the agents' tools directly; "
+                    "agentic: every audit goes through the Supervisor Bedrock agent"
+    )
+    policy_prefetch: bool = Field(
+        default=True,
+        description="Retrieve likely policy sections from the supplier's industry and country "
+                    "while the Investigator runs"
+    )
+    policy_prefetch_results: int = Field(
+        default=5,
+        ge=1,
+        description="Policy sections prefetched per audit category"
+    )
+    policy_prefetch_min_overlap: int = Field(
+        default=1,
+        ge=1,
+        description="Words besides the prefetch query's own that a prefetched section must share "
+                    "with a finding to be used for it"
+    )
+    
+    # Audit Scheduling
+    priority_weights: Dict[str, Annotated[float, Field(gt=0)]] = Field(
+        default_factory=lambda: {"interactive": 8.0, "scheduled": 3.0, "backfill": 1.0},
+        description="Share of contended AWS concurrency and request rate per priority class (JSON object)"
+    )
+    scheduler_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Audits the AuditScheduler runs at once"
+    )
+    scheduler_interactive_workers: int = Field(
+        default=2,
+        ge=0,
+        description="Scheduler workers reserved for interactive audits"
+    )
+    scheduler_preempt_backfill: bool = Field(
+        default=True,
+        description="Pause running backfill audits at a stage boundary when interactive audits wait"
+    )
+    
+    # Continuous Monitoring
+    monitor_audits_per_hour: float = Field(
+        default=60.0,
+        gt=0,
+        description="Global budget of re-audits per hour, spread evenly across the day"
+    )
+    monitor_risk_interval_hours: Dict[str, float] = Field(
+        default_factory=lambda: {"RED": 24.0, "YELLOW": 72.0, "GREEN": 336.0, "UNKNOWN": 12.0},
+        description="Base hours between re-audits per last overall risk (JSON object)"
+    )
+    
+    # Batch Re-scoring
+    rescore_processes: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes for batch re-scoring (0 = one per CPU, 1 = inline)"
+    )
+    rescore_shard_bytes: int = Field(
+        default=262_144,
+        ge=1,
+        description="Target size of the NDJSON shards sent to each re-scoring process"
+    )
+    
+    # Distributed Workers
+    audit_queue_url: str = Field(
+        default="sqlite:audit-queue.db",
+        description="Audit job queue: sqlite:<path>, memory:, or an SQS queue URL containing {shard}"
+    )
+    audit_queue_visibility_timeout: float = Field(
+        default=900.0,
+        gt=0,
+        description="Seconds a received audit job stays hidden from other deliveries"
+    )
+    audit_queue_max_receives: int = Field(
+        default=5,
+        ge=1,
+        description="Deliveries before a failing queued audit is recorded as failed"
+    )
+    audit_report_store: str = Field(
+        default="audit-reports.db",
+        description="SQLite file distributed workers write reports to"
+    )
+    audit_worker_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Audits each distributed worker runs at once"
+    )
 
 
 class LoggingSettings(BaseSettings):
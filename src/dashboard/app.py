@@ -8,12 +8,12 @@ import streamlit as st
 import sys
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from agents.supervisor import SupervisorAgent
-from agents.investigator import InvestigatorAgent
-from agents.auditor import AuditorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.auditor import AuditorAgent
 
 
 def init_agents():
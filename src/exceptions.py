@@ -48,3 +48,16 @@ class ValidationError(SentinelError):
 class TimeoutError(SentinelError):
     """Raised when an operation times out."""
     pass
+
+
+class CircuitOpenError(SentinelError):
+    """Raised when a dependency's circuit breaker is open and calls fail fast."""
+    pass
+
+
+class AuditPreempted(SentinelError):
+    """Raised at a stage boundary to pause a low-priority audit for interactive work."""
+
+    def __init__(self, message: str = "Audit preempted", findings=None):
+        super().__init__(message)
+        self.findings = findings
@@ -6,7 +6,7 @@ Provides structured logging using structlog for consistent log output.
 
 import logging
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional, TextIO
 
 import structlog
 from structlog.types import EventDict, Processor
@@ -23,14 +23,19 @@ def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> Eve
     return event_dict
 
 
-def configure_logging() -> None:
+def configure_logging(stream: Optional[TextIO] = None) -> None:
     """
     Configure structured logging for the application.
     
     Sets up structlog with appropriate processors and formatters
     based on the LOG_FORMAT setting.
+    
+    Args:
+        stream: Output stream for log lines (defaults to stdout). The CLI
+            passes stderr so stdout carries only NDJSON reports.
     """
     settings = get_settings()
+    stream = stream or sys.stdout
     
     # Set logging level
     log_level = getattr(logging, settings.logging.level.upper(), logging.INFO)
@@ -38,7 +43,7 @@ def configure_logging() -> None:
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
+        stream=stream,
         level=log_level,
     )
     
@@ -68,7 +73,7 @@ def configure_logging() -> None:
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.PrintLoggerFactory(file=stream),
         cache_logger_on_first_use=True,
     )
 
@@ -0,0 +1,437 @@
+"""
+Command-line entry point for Sentinel (``ethos-chain``).
+
+Runs bulk supplier audits and streams one JSON report per line (NDJSON)
+to stdout as each audit completes, so the output can be piped straight
+into an ETL job.
+
+Usage:
+    ethos-chain data/sample/suppliers.json --workers 8 > reports.ndjson
+    ethos-chain suppliers.csv --checkpoint run.ckpt
+    cat suppliers.json | ethos-chain - --workers 4
+
+Reference: SPEC_Version2.md - Section 3: API Contracts
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO
+
+from src.agents.auditor import AuditorAgent
+from src.agents.bedrock_supervisor import BedrockSupervisorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.config import get_settings
+from src.logging_config import configure_logging, get_logger
+from src.pipeline.batch import job_key
+from src.utils.metrics import start_metrics_server
+from src.utils.tracing import LatencyHistogram
+
+logger = get_logger(__name__)
+
+INPUT_FORMATS = ("auto", "json", "csv", "ndjson")
+# Longest first line read to detect the format; an NDJSON record is far shorter
+_DETECT_LINE_LIMIT = 65536
+_JSON_CHUNK_SIZE = 65536
+
+
+def init_supervisor():
+    """Initialize the multi-agent system for APP_ORCHESTRATION_MODE."""
+    if get_settings().app.orchestration_mode == "agentic":
+        return BedrockSupervisorAgent()
+    return SupervisorAgent(InvestigatorAgent(), AuditorAgent())
+
+
+def _normalize_supplier(entry: Any) -> Dict[str, Any]:
+    """Accept either a supplier record or a bare supplier name."""
+    if isinstance(entry, str):
+        return {"name": entry.strip()}
+    return dict(entry)
+
+
+class InvalidRecord(dict):
+    """
+    An input record that could not be parsed, yielded in place of a supplier.
+
+    Holds ``error`` and ``line`` (1-based) so ``run_audits`` can report it as
+    an NDJSON error line and carry on. It has no ``name``, so consumers that
+    skip nameless records skip it too.
+    """
+
+
+def _detect_format(path: str, first_line: str) -> str:
+    """Format from the file suffix, else from the first non-blank line."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if suffix == ".json":
+        return "json"
+    line = first_line.strip()
+    if line.startswith("{"):
+        # One complete supplier record on the first line is NDJSON; a document
+        # spread over several lines (or a one-line {"suppliers": [...]}) is JSON
+        try:
+            value = json.loads(line)
+        except ValueError:
+            return "json"
+        return "json" if isinstance(value, dict) and "suppliers" in value and "name" not in value else "ndjson"
+    if line.startswith("["):
+        return "json"
+    return "csv"
+
+
+class _JSONEntries:
+    """
+    Incremental reader for the entries of a JSON supplier document.
+
+    Yields the items of a top-level list, or of the ``suppliers`` list of a
+    top-level object, one at a time. Only the current item is held in
+    memory, so a large suppliers.json streams like NDJSON.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(_JSON_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at the end)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON supplier input: expected one of {chars!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _items(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def _object(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "suppliers" and self._peek() == "[":
+                yield from self._items()
+            else:
+                self._value()
+            if self._expect(",}") == "}":
+                return
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._items() if self._peek() == "[" else self._object()
+        if self._peek():
+            raise ValueError("Invalid JSON supplier input: extra data after the document")
+
+
+def iter_suppliers(stream: TextIO, fmt: str = "auto", path: str = "-") -> Iterator[Dict[str, Any]]:
+    """
+    Yield supplier records from a JSON, CSV or NDJSON stream.
+
+    JSON input may be the suppliers.json shape (``{"suppliers": [...]}``) or
+    a plain list; CSV needs at least a ``name`` column. All formats are read
+    incrementally. Without a telling file suffix, the format is detected
+    from the first non-blank line. An NDJSON line that is not a JSON object
+    is yielded as an ``InvalidRecord`` instead of ending the stream.
+    """
+    if fmt == "auto":
+        head = ""
+        line = ""
+        while not line.strip():
+            line = stream.readline(_DETECT_LINE_LIMIT)
+            if not line:
+                break
+            head += line
+        fmt = _detect_format(path, line)
+        stream = _ChainedReader(head, stream)
+
+    if fmt == "json":
+        for entry in _JSONEntries(stream):
+            yield _normalize_supplier(entry)
+    elif fmt == "ndjson":
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                yield InvalidRecord(error=f"Invalid JSON: {e}", line=number)
+                continue
+            if not isinstance(value, dict):
+                yield InvalidRecord(error=f"Expected a JSON object, got {type(value).__name__}", line=number)
+                continue
+            yield _normalize_supplier(value)
+    elif fmt == "csv":
+        for row in csv.DictReader(stream):
+            if row.get("name"):
+                yield _normalize_supplier(row)
+    else:
+        raise ValueError(f"Unsupported input format: {fmt}")
+
+
+class _ChainedReader(io.TextIOBase):
+    """Re-attach a peeked prefix to the front of a text stream."""
+
+    def __init__(self, head: str, stream: TextIO):
+        self._head = head
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            data, self._head = self._head + self._stream.read(), ""
+            return data
+        if self._head:
+            data, self._head = self._head[:size], self._head[size:]
+            return data
+        return self._stream.read(size)
+
+    def readline(self, size: int = -1) -> str:
+        if self._head:
+            newline = self._head.find("\n")
+            if newline >= 0:
+                line, self._head = self._head[:newline + 1], self._head[newline + 1:]
+                return line
+            line, self._head = self._head, ""
+            return line + self._stream.readline()
+        return self._stream.readline()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+
+class Checkpoint:
+    """
+    Append-only checkpoint file of completed supplier keys (``job_key``).
+
+    A key is recorded only after its report has been written, so a resumed
+    run re-audits at most the suppliers that were in flight at the crash.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.completed: Set[str] = set()
+        self._file: Optional[TextIO] = None
+        if path:
+            if Path(path).exists():
+                with open(path, encoding="utf-8") as f:
+                    self.completed = {line.rstrip("\n") for line in f if line.strip()}
+            self._file = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.completed
+
+    def mark(self, key: str) -> None:
+        self.completed.add(key)
+        if self._file:
+            self._file.write(key + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+
+
+def _audit_one(supervisor: SupervisorAgent, supplier: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    report = supervisor.audit_supplier(supplier["name"], supplier_record=supplier)
+    if supplier.get("id"):
+        report["supplier_id"] = supplier["id"]
+    return {"report": report, "latency": time.perf_counter() - started}
+
+
+def run_audits(
+    suppliers: Iterable[Dict[str, Any]],
+    output: TextIO,
+    supervisor: Optional[SupervisorAgent] = None,
+    workers: int = 4,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Dict[str, Any]:
+    """
+    Audit suppliers concurrently and write NDJSON reports as they finish.
+
+    At most ``2 * workers`` audits are in flight, so memory stays constant
+    regardless of input size.
+
+    Input records that could not be parsed (``InvalidRecord``) are written
+    as ``{"error": ..., "line": n}`` lines and counted as ``invalid``.
+
+    Returns:
+        Summary dict with counts, throughput and latency percentiles
+    """
+    supervisor = supervisor or init_supervisor()
+    checkpoint = checkpoint or Checkpoint(None)
+    latencies = LatencyHistogram()
+    max_in_flight = max(1, workers * 2)
+    summary = {"audited": 0, "failed": 0, "skipped": 0, "invalid": 0}
+    started = time.perf_counter()
+
+    def drain(pending: Dict[Any, Dict[str, Any]], block_until: int) -> None:
+        while len(pending) > block_until:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                supplier = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    summary["failed"] += 1
+                    logger.error("Audit failed", supplier=supplier.get("name"), error=str(e))
+                    line = {"supplier": supplier.get("name"), "error": str(e)}
+                else:
+                    summary["audited"] += 1
+                    latencies.add(result["latency"])
+                    line = result["report"]
+                output.write(json.dumps(line) + "\n")
+                output.flush()
+                if "error" not in line:
+                    checkpoint.mark(job_key(supplier))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: Dict[Any, Dict[str, Any]] = {}
+        for supplier in suppliers:
+            if isinstance(supplier, InvalidRecord):
+                summary["invalid"] += 1
+                logger.warning("Skipping invalid input record", line=supplier["line"], error=supplier["error"])
+                output.write(json.dumps(dict(supplier)) + "\n")
+                output.flush()
+                continue
+            if not supplier.get("name"):
+                continue
+            if job_key(supplier) in checkpoint:
+                summary["skipped"] += 1
+                continue
+            pending[executor.submit(_audit_one, supervisor, supplier)] = supplier
+            drain(pending, max_in_flight - 1)
+        drain(pending, 0)
+
+    elapsed = time.perf_counter() - started
+    summary.update({
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(summary["audited"] / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(latencies.percentile(50) * 1000, 2),
+        "latency_p95_ms": round(latencies.percentile(95) * 1000, 2),
+        "latency_p99_ms": round(latencies.percentile(99) * 1000, 2),
+    })
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ethos-chain",
+        description="Run bulk supplier audits and stream NDJSON reports to stdout.",
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="Supplier file (JSON, CSV or NDJSON); '-' reads stdin (default)",
+    )
+    parser.add_argument("--format", choices=INPUT_FORMATS, default="auto", help="Input format")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent audits")
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file; completed suppliers are skipped when resuming",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on this port while the run is in progress",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    args = build_parser().parse_args(argv)
+    configure_logging(stream=sys.stderr)
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    checkpoint = Checkpoint(args.checkpoint)
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    try:
+        summary = run_audits(
+            iter_suppliers(stream, args.format, args.input),
+            sys.stdout,
+            workers=max(1, args.workers),
+            checkpoint=checkpoint,
+        )
+    finally:
+        checkpoint.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(
+        "Audited {audited} suppliers ({failed} failed, {skipped} skipped, {invalid} invalid) in "
+        "{elapsed_seconds}s: {throughput_per_second}/s, latency p50={latency_p50_ms}ms "
+        "p95={latency_p95_ms}ms p99={latency_p99_ms}ms".format(**summary),
+        file=sys.stderr,
+    )
+    return 1 if summary["failed"] or summary["invalid"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
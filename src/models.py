@@ -7,7 +7,7 @@ used throughout the application.
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 
@@ -52,6 +52,7 @@ class Finding(BaseModel):
     )
     source: str = Field(..., description="Source of the information")
     snippet: str = Field(..., description="Brief description of the finding")
+    title: Optional[str] = Field(default=None, description="Headline of the source article")
     category: Category = Field(..., description="Category of the finding")
     url: Optional[str] = Field(default=None, description="URL to the source")
     
@@ -129,6 +130,37 @@ class AuditReport(BaseModel):
         default_factory=list,
         description="Actionable recommendations"
     )
+    sources: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Intelligence sources consulted and their status (ok, partial, stale, missing)"
+    )
+    screening: Dict[str, Union[int, float]] = Field(
+        default_factory=dict,
+        description=(
+            "Findings counts through screening, e.g. "
+            "{'found': 120, 'irrelevant': 30, 'discard_rate': 0.25, 'kept': 50}"
+        )
+    )
+    evaluation: Dict[str, Union[int, float]] = Field(
+        default_factory=dict,
+        description="Auditor tiers: findings, escalated, escalation_rate, llm_calls_saved, estimated_seconds_saved"
+    )
+    tokens: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Estimated LLM tokens: budget, prompt, completion, total, calls, compacted_findings, tokens_saved"
+    )
+    prefetch: Dict[str, Union[int, float]] = Field(
+        default_factory=dict,
+        description="Policy prefetch: queries, lookups, hits, misses, hit_rate, retrieval_seconds_saved, wait_seconds"
+    )
+    degraded: bool = Field(
+        default=False,
+        description="True if a stage ran out of audit budget and returned partial results"
+    )
+    degraded_reasons: List[str] = Field(
+        default_factory=list,
+        description="Stages cut short, as '<stage>: <reason>'"
+    )
     
     @property
     def has_critical_violations(self) -> bool:
@@ -0,0 +1,40 @@
+"""
+Pipeline modules for running Sentinel audits at scale.
+
+Modules:
+- batch: Checkpointed, resumable batch audits backed by a SQLite journal
+- distributed: Queue-backed audit workers sharded by supplier ID with consistent hashing
+- entity_linking: Supplier alias index and the prefilter that drops findings about other entities
+- firehose: Aho-Corasick matching of an article stream against every supplier alias to trigger delta audits
+- monitoring: Risk-weighted continuous re-audit scheduling under an audits-per-hour budget
+- ranking: Relevance scoring and top-K selection of findings before the Auditor
+- rescoring: Multi-process re-scoring of stored findings, sharded by supplier
+- scheduler: Priority classes, weighted fair dispatch and backfill preemption in front of the Supervisor
+"""
+
+from src.pipeline.batch import AuditJournal, BatchAuditRunner, JobState
+from src.pipeline.distributed import AuditDispatcher, AuditWorker, ReportStore, open_queue
+from src.pipeline.entity_linking import EntityLinker, SupplierDirectory
+from src.pipeline.firehose import FirehoseIngestor, FirehoseMatcher
+from src.pipeline.monitoring import MonitoringScheduler
+from src.pipeline.ranking import FindingRanker
+from src.pipeline.rescoring import ParallelRescorer
+from src.pipeline.scheduler import AuditScheduler
+
+__all__ = [
+    "AuditJournal",
+    "BatchAuditRunner",
+    "JobState",
+    "AuditDispatcher",
+    "AuditWorker",
+    "ReportStore",
+    "open_queue",
+    "EntityLinker",
+    "SupplierDirectory",
+    "FirehoseIngestor",
+    "FirehoseMatcher",
+    "MonitoringScheduler",
+    "FindingRanker",
+    "ParallelRescorer",
+    "AuditScheduler",
+]
@@ -0,0 +1,359 @@
+"""
+Checkpointed batch audits with crash recovery.
+
+Persists a per-supplier state machine to a local SQLite journal (WAL mode)
+so a portfolio run that dies part-way resumes where it stopped:
+
+    pending -> investigating -> auditing -> done
+                     \\              \\
+                      +--> failed <--+   (retried with exponential backoff)
+
+Findings are journaled when a supplier enters ``auditing``, so a crash
+during the audit step resumes without re-running the investigation, and
+completed reports are never re-fetched.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.exceptions import AuditPreempted
+from src.logging_config import get_logger
+from src.utils.priority import Priority, priority_scope
+
+logger = get_logger(__name__)
+
+
+class JobState(str, Enum):
+    """Lifecycle state of a supplier in a batch run."""
+    PENDING = "pending"
+    INVESTIGATING = "investigating"
+    AUDITING = "auditing"
+    DONE = "done"
+    FAILED = "failed"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    supplier TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    findings TEXT,
+    report TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, next_attempt_at);
+"""
+
+
+class AuditJournal:
+    """
+    SQLite-backed journal of batch audit jobs.
+
+    Uses WAL mode so state transitions are durable with cheap commits and
+    readers (e.g. progress queries) never block the writer.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) a journal.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, suppliers: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add suppliers as pending jobs. Suppliers already journaled are left untouched.
+
+        Returns:
+            Number of newly added jobs
+        """
+        now = time.time()
+        rows = [
+            (job_key(s), s["name"], json.dumps(s), JobState.PENDING.value, now)
+            for s in suppliers if s.get("name")
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (key, name, supplier, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def recover(self) -> int:
+        """
+        Reset jobs interrupted mid-investigation back to pending.
+
+        Jobs interrupted while auditing keep their journaled findings and are
+        resumed from the audit step.
+
+        Returns:
+            Number of jobs reset
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE state = ?",
+                (JobState.PENDING.value, time.time(), JobState.INVESTIGATING.value),
+            )
+            return cursor.rowcount
+
+    def claim_runnable(self, limit: int, max_attempts: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` jobs that are ready to run now."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, name, supplier, state, attempts, findings FROM jobs "
+                "WHERE state IN (?, ?) OR (state = ? AND attempts < ? AND next_attempt_at <= ?) "
+                "ORDER BY next_attempt_at, rowid LIMIT ?",
+                (
+                    JobState.PENDING.value,
+                    JobState.AUDITING.value,
+                    JobState.FAILED.value,
+                    max_attempts,
+                    time.time(),
+                    limit,
+                ),
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "name": name,
+                "supplier": json.loads(supplier),
+                "state": JobState(state),
+                "attempts": attempts,
+                "findings": json.loads(findings) if findings else None,
+            }
+            for key, name, supplier, state, attempts, findings in rows
+        ]
+
+    def next_retry_at(self, max_attempts: int) -> Optional[float]:
+        """Earliest scheduled retry among failed jobs that still have attempts left."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE state = ? AND attempts < ?",
+                (JobState.FAILED.value, max_attempts),
+            ).fetchone()
+        return row[0] if row else None
+
+    def transition(self, key: str, state: JobState, **fields: Any) -> None:
+        """Move a job to ``state``, updating any of findings/report/error/attempts/next_attempt_at."""
+        assignments = ["state = ?", "updated_at = ?"]
+        values: List[Any] = [state.value, time.time()]
+        for column in ("findings", "report"):
+            if column in fields:
+                assignments.append(f"{column} = ?")
+                values.append(json.dumps(fields[column]))
+        for column in ("error", "attempts", "next_attempt_at"):
+            if column in fields:
+                assignments.append(f"{column} = ?")
+                values.append(fields[column])
+        values.append(key)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE key = ?", values)
+
+    def reset_failed(self) -> int:
+        """Re-arm jobs that exhausted their attempts so the next run retries them."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET attempts = 0, next_attempt_at = 0, updated_at = ? WHERE state = ?",
+                (time.time(), JobState.FAILED.value),
+            )
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state.value: 0 for state in JobState}
+        counts.update(dict(rows))
+        return counts
+
+    def iter_reports(self) -> Iterator[Dict[str, Any]]:
+        """Yield completed reports in journal order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT report FROM jobs WHERE state = ? ORDER BY rowid", (JobState.DONE.value,)
+            ).fetchall()
+        for (report,) in rows:
+            yield json.loads(report)
+
+
+def job_key(supplier: Dict[str, Any]) -> str:
+    """Journal key for a supplier: its ID when present, otherwise its name."""
+    return str(supplier.get("id") or supplier.get("name", ""))
+
+
+class BatchAuditRunner:
+    """
+    Runs journaled batch audits through a SupervisorAgent.
+
+    Usage:
+        journal = AuditJournal("nightly.db")
+        journal.enqueue(suppliers)
+        summary = BatchAuditRunner(supervisor, journal, workers=8).run()
+
+    Re-running against the same journal resumes an interrupted run.
+    """
+
+    def __init__(
+        self,
+        supervisor,
+        journal: AuditJournal,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+        priority: Priority = Priority.BACKFILL,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            supervisor: SupervisorAgent used for each audit
+            journal: Journal holding job state
+            workers: Concurrent audits
+            max_attempts: Attempts per supplier before it stays failed
+            backoff_base: Base delay (seconds) for exponential retry backoff
+            backoff_max: Upper bound on the retry delay
+            priority: Priority class the audits take on the shared AWS limiters
+        """
+        self.supervisor = supervisor
+        self.journal = journal
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.priority = Priority(priority)
+
+    def backoff_delay(self, attempts: int) -> float:
+        """Exponential backoff with full jitter for the given attempt count."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+        return random.uniform(0, ceiling)
+
+    def run(self, on_complete: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+        """
+        Process every runnable job until the journal has nothing left to do.
+
+        Args:
+            on_complete: Optional callback receiving each completed report. A
+                callback that raises is logged; the job stays done
+
+        Returns:
+            Job counts per state after the run, plus ``callback_errors``: the
+            reports ``on_complete`` raised on during this run
+        """
+        recovered = self.journal.recover()
+        if recovered:
+            logger.info("Recovered interrupted investigations", count=recovered)
+
+        callback_errors = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending: Dict[Any, str] = {}
+            while True:
+                free = self.workers * 2 - len(pending)
+                if free > 0:
+                    in_flight = set(pending.values())
+                    for job in self.journal.claim_runnable(free + len(pending), self.max_attempts):
+                        if job["key"] in in_flight or len(pending) >= self.workers * 2:
+                            continue
+                        pending[executor.submit(self._process, job, on_complete)] = job["key"]
+                if pending:
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.pop(future)
+                        if future.result() is False:
+                            callback_errors += 1
+                    continue
+                retry_at = self.journal.next_retry_at(self.max_attempts)
+                if retry_at is None:
+                    break
+                time.sleep(max(0.0, retry_at - time.time()))
+
+        counts = {**self.journal.counts(), "callback_errors": callback_errors}
+        logger.info("Batch audit run finished", **counts)
+        return counts
+
+    def _process(
+        self,
+        job: Dict[str, Any],
+        on_complete: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> Optional[bool]:
+        """Run one job; returns False if the job finished but ``on_complete`` raised."""
+        key = job["key"]
+        # Journaled findings survive audit-step failures, so retries skip the investigation
+        findings = job["findings"]
+
+        def on_stage(stage: str, stage_findings: Optional[Dict[str, Any]]) -> None:
+            if stage == "auditing":
+                self.journal.transition(key, JobState.AUDITING, findings=stage_findings)
+            else:
+                self.journal.transition(key, JobState(stage))
+
+        try:
+            with priority_scope(self.priority):
+                report = self.supervisor.audit_supplier(
+                    job["name"], findings=findings, on_stage=on_stage, supplier_record=job["supplier"]
+                )
+        except AuditPreempted as e:
+            # Paused for other work, not a failed attempt: back in the queue
+            # without a retry delay, resuming from its findings if it has any
+            findings = e.findings if e.findings is not None else findings
+            if findings is not None:
+                self.journal.transition(key, JobState.AUDITING, findings=findings)
+            else:
+                self.journal.transition(key, JobState.PENDING)
+            logger.info("Batch audit preempted", supplier=job["name"])
+            return None
+        except Exception as e:
+            attempts = job["attempts"] + 1
+            delay = self.backoff_delay(attempts)
+            self.journal.transition(
+                key,
+                JobState.FAILED,
+                error=str(e),
+                attempts=attempts,
+                next_attempt_at=time.time() + delay,
+            )
+            logger.warning(
+                "Batch audit failed",
+                supplier=job["name"],
+                attempts=attempts,
+                retry_in=round(delay, 2),
+                error=str(e),
+            )
+            return None
+
+        if job["supplier"].get("id"):
+            report["supplier_id"] = job["supplier"]["id"]
+        self.journal.transition(key, JobState.DONE, report=report, error=None)
+        if on_complete:
+            try:
+                on_complete(report)
+            except Exception as e:
+                logger.error("Batch on_complete callback failed", supplier=job["name"], error=str(e))
+                return False
+        return True
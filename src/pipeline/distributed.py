@@ -0,0 +1,821 @@
+"""
+Distributed audit workers over a message queue.
+
+Spreads a portfolio run over many machines:
+
+    AuditDispatcher --(one queue partition per worker)--> AuditWorker x N --> ReportStore
+
+- The dispatcher routes each supplier to a worker by consistent-hashing its
+  ID (``src.utils.hash_ring``). A worker audits the same suppliers every
+  night, so its findings cache and entity-linking state stay warm. Adding a
+  worker moves only about 1/N of the suppliers to it.
+- Workers receive messages under a visibility timeout. A message that a
+  crashed or hung worker never deletes becomes visible again and is
+  redelivered. While an audit runs, the worker keeps extending the
+  visibility of its in-flight messages. A worker leases a new message as
+  soon as one of its audits finishes, so a slow audit never holds the
+  other slots idle.
+- A worker whose own partition is empty takes over expired leases (jobs
+  received before but never deleted) from the other partitions, so the
+  suppliers of a worker that died are still audited that night.
+- Results are written to the ``ReportStore`` keyed by job ID (run ID plus
+  supplier key). The first write wins, so a message delivered twice still
+  yields one report, and a worker skips messages whose job already has a
+  result.
+- A job that keeps failing is retried with backoff until it has been
+  received ``max_receives`` times, then recorded as failed and dropped.
+
+Queue backends:
+    memory:                 InMemoryQueue, threads in one process (tests)
+    sqlite:<path>           SQLiteQueue, processes on one host (local runs)
+    https://sqs...{shard}   SQSQueue, one SQS queue per worker (production)
+
+Usage:
+    python -m src.pipeline.distributed dispatch suppliers.json --workers worker-0,worker-1
+    python -m src.pipeline.distributed work worker-0 --store reports.db
+"""
+
+import argparse
+import itertools
+import json
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from src.config import get_settings
+from src.exceptions import AWSServiceError, ConfigurationError
+from src.logging_config import configure_logging, get_logger
+from src.pipeline.batch import job_key
+from src.utils.client_manager import get_client_manager
+from src.utils.hash_ring import DEFAULT_REPLICAS, HashRing
+from src.utils.metrics import get_registry
+from src.utils.priority import Priority, priority_scope
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+QUEUE_JOBS = _metrics.counter(
+    "sentinel_queue_jobs_total", "Queued audit jobs handled by distributed workers", ["outcome"]
+)
+VISIBILITY_EXTENSIONS = _metrics.counter(
+    "sentinel_queue_visibility_extensions_total", "In-flight messages whose visibility was extended"
+)
+LEASES_TAKEN_OVER = _metrics.counter(
+    "sentinel_queue_leases_taken_over_total", "Expired leases received from another worker's partition"
+)
+
+SQS_BATCH_LIMIT = 10
+
+
+class QueueMessage(NamedTuple):
+    """A received message; ``receipt`` is only valid for this delivery."""
+    message_id: str
+    receipt: str
+    body: Dict[str, Any]
+    receive_count: int
+    shard: str = ""
+
+
+class AuditQueue(ABC):
+    """
+    Partitioned job queue with SQS semantics.
+
+    Each partition (``shard``) is consumed by one worker. Received messages
+    stay invisible for the visibility timeout and are redelivered unless
+    deleted with their receipt.
+    """
+
+    @abstractmethod
+    def send(self, shard: str, bodies: List[Dict[str, Any]]) -> None:
+        """Append messages to a partition."""
+
+    @abstractmethod
+    def receive(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        """Take up to ``max_messages`` visible messages, hiding them for ``visibility_timeout`` seconds."""
+
+    def receive_expired(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        """Like ``receive``, but only messages received before whose lease has run out."""
+        return []
+
+    def shards(self) -> List[str]:
+        """Partitions holding messages, where the backend can list them."""
+        return []
+
+    @abstractmethod
+    def delete(self, shard: str, receipt: str) -> bool:
+        """Acknowledge a message; False if the receipt is stale (it was redelivered)."""
+
+    @abstractmethod
+    def change_visibility(self, shard: str, receipt: str, timeout: float) -> bool:
+        """Hide a received message for ``timeout`` more seconds (0 makes it visible now)."""
+
+    @abstractmethod
+    def depth(self, shard: str) -> int:
+        """Messages not yet deleted, visible or in flight."""
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryQueue(AuditQueue):
+    """Thread-safe queue for workers sharing one process."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        # shard -> message_id -> [body, visible_at, receipt, receive_count]
+        self._messages: Dict[str, Dict[str, List[Any]]] = defaultdict(dict)
+        self._ids = itertools.count(1)
+
+    def send(self, shard: str, bodies: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for body in bodies:
+                self._messages[shard][str(next(self._ids))] = [json.dumps(body), 0.0, None, 0]
+
+    def receive(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        return self._receive(shard, max_messages, visibility_timeout, expired_only=False)
+
+    def receive_expired(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        return self._receive(shard, max_messages, visibility_timeout, expired_only=True)
+
+    def _receive(
+        self, shard: str, max_messages: int, visibility_timeout: float, expired_only: bool
+    ) -> List[QueueMessage]:
+        now = self._clock()
+        received = []
+        with self._lock:
+            for message_id, entry in self._messages[shard].items():
+                if len(received) >= max_messages:
+                    break
+                if entry[1] > now or (expired_only and not entry[3]):
+                    continue
+                entry[1] = now + visibility_timeout
+                entry[2] = f"{message_id}:{uuid.uuid4().hex}"
+                entry[3] += 1
+                received.append(QueueMessage(message_id, entry[2], json.loads(entry[0]), entry[3], shard))
+        return received
+
+    def shards(self) -> List[str]:
+        with self._lock:
+            return [shard for shard, messages in self._messages.items() if messages]
+
+    def _entry(self, shard: str, receipt: str) -> Optional[List[Any]]:
+        entry = self._messages[shard].get(receipt.split(":", 1)[0])
+        return entry if entry is not None and entry[2] == receipt else None
+
+    def delete(self, shard: str, receipt: str) -> bool:
+        with self._lock:
+            if self._entry(shard, receipt) is None:
+                return False
+            del self._messages[shard][receipt.split(":", 1)[0]]
+            return True
+
+    def change_visibility(self, shard: str, receipt: str, timeout: float) -> bool:
+        with self._lock:
+            entry = self._entry(shard, receipt)
+            if entry is None:
+                return False
+            entry[1] = self._clock() + timeout
+            return True
+
+    def depth(self, shard: str) -> int:
+        with self._lock:
+            return len(self._messages[shard])
+
+
+_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    shard TEXT NOT NULL,
+    body TEXT NOT NULL,
+    visible_at REAL NOT NULL DEFAULT 0,
+    receipt TEXT,
+    receive_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS messages_visible ON messages (shard, visible_at, id);
+"""
+
+
+class SQLiteQueue(AuditQueue):
+    """
+    Queue in a SQLite file, shared by worker processes on one host.
+
+    Receives run in ``BEGIN IMMEDIATE`` transactions, so two processes never
+    take the same message.
+    """
+
+    def __init__(self, path: Union[str, Path], clock: Callable[[], float] = time.time):
+        self.path = str(path)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_QUEUE_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def send(self, shard: str, bodies: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO messages (shard, body) VALUES (?, ?)",
+                [(shard, json.dumps(body)) for body in bodies],
+            )
+            self._conn.execute("COMMIT")
+
+    def receive(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        return self._receive(shard, max_messages, visibility_timeout, expired_only=False)
+
+    def receive_expired(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        return self._receive(shard, max_messages, visibility_timeout, expired_only=True)
+
+    def _receive(
+        self, shard: str, max_messages: int, visibility_timeout: float, expired_only: bool
+    ) -> List[QueueMessage]:
+        now = self._clock()
+        received = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, body, receive_count FROM messages "
+                    "WHERE shard = ? AND visible_at <= ? AND receive_count >= ? ORDER BY id LIMIT ?",
+                    (shard, now, 1 if expired_only else 0, max_messages),
+                ).fetchall()
+                for message_id, body, receive_count in rows:
+                    receipt = f"{message_id}:{uuid.uuid4().hex}"
+                    self._conn.execute(
+                        "UPDATE messages SET visible_at = ?, receipt = ?, receive_count = ? WHERE id = ?",
+                        (now + visibility_timeout, receipt, receive_count + 1, message_id),
+                    )
+                    received.append(
+                        QueueMessage(str(message_id), receipt, json.loads(body), receive_count + 1, shard)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return received
+
+    def delete(self, shard: str, receipt: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM messages WHERE id = ? AND receipt = ?", (receipt.split(":", 1)[0], receipt)
+            )
+            return cursor.rowcount > 0
+
+    def change_visibility(self, shard: str, receipt: str, timeout: float) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE messages SET visible_at = ? WHERE id = ? AND receipt = ?",
+                (self._clock() + timeout, receipt.split(":", 1)[0], receipt),
+            )
+            return cursor.rowcount > 0
+
+    def depth(self, shard: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM messages WHERE shard = ?", (shard,)).fetchone()[0]
+
+    def shards(self) -> List[str]:
+        with self._lock:
+            return [shard for (shard,) in self._conn.execute("SELECT DISTINCT shard FROM messages ORDER BY shard")]
+
+
+class SQSQueue(AuditQueue):
+    """
+    One Amazon SQS queue per worker.
+
+    ``url_template`` is a queue URL containing ``{shard}``, e.g.
+    ``https://sqs.eu-west-1.amazonaws.com/123456789012/sentinel-audits-{shard}``.
+    Receives long-poll for ``wait_seconds``.
+
+    SQS cannot tell an expired lease from a message never received without
+    receiving it (which counts as a delivery), so ``receive_expired`` is not
+    supported and a dead worker's queue is drained by restarting the worker.
+    """
+
+    def __init__(self, url_template: str, wait_seconds: int = 10, client: Optional[Any] = None):
+        if "{shard}" not in url_template:
+            raise ConfigurationError("SQS queue URL template must contain {shard}")
+        self.url_template = url_template
+        self.wait_seconds = wait_seconds
+        self._client_override = client
+
+    def _client(self) -> Any:
+        return self._client_override or get_client_manager().client("sqs")
+
+    def _url(self, shard: str) -> str:
+        return self.url_template.format(shard=shard)
+
+    def _call(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            return getattr(self._client(), operation)(**kwargs)
+        except (BotoCoreError, ClientError) as e:
+            raise AWSServiceError(f"SQS {operation} failed: {e}") from e
+
+    def send(self, shard: str, bodies: List[Dict[str, Any]]) -> None:
+        for start in range(0, len(bodies), SQS_BATCH_LIMIT):
+            entries = [
+                {"Id": str(i), "MessageBody": json.dumps(body)}
+                for i, body in enumerate(bodies[start:start + SQS_BATCH_LIMIT])
+            ]
+            response = self._call("send_message_batch", QueueUrl=self._url(shard), Entries=entries)
+            if response.get("Failed"):
+                raise AWSServiceError(f"SQS rejected {len(response['Failed'])} of {len(entries)} messages")
+
+    def receive(self, shard: str, max_messages: int, visibility_timeout: float) -> List[QueueMessage]:
+        response = self._call(
+            "receive_message",
+            QueueUrl=self._url(shard),
+            MaxNumberOfMessages=max(1, min(SQS_BATCH_LIMIT, max_messages)),
+            VisibilityTimeout=int(visibility_timeout),
+            WaitTimeSeconds=self.wait_seconds,
+            AttributeNames=["ApproximateReceiveCount"],
+        )
+        return [
+            QueueMessage(
+                message["MessageId"],
+                message["ReceiptHandle"],
+                json.loads(message["Body"]),
+                int(message.get("Attributes", {}).get("ApproximateReceiveCount", 1)),
+                shard,
+            )
+            for message in response.get("Messages", [])
+        ]
+
+    def delete(self, shard: str, receipt: str) -> bool:
+        try:
+            self._call("delete_message", QueueUrl=self._url(shard), ReceiptHandle=receipt)
+        except AWSServiceError as e:
+            logger.warning("SQS delete failed", shard=shard, error=str(e))
+            return False
+        return True
+
+    def change_visibility(self, shard: str, receipt: str, timeout: float) -> bool:
+        try:
+            self._call(
+                "change_message_visibility",
+                QueueUrl=self._url(shard),
+                ReceiptHandle=receipt,
+                VisibilityTimeout=int(timeout),
+            )
+        except AWSServiceError as e:
+            logger.warning("SQS visibility change failed", shard=shard, error=str(e))
+            return False
+        return True
+
+    def depth(self, shard: str) -> int:
+        attributes = self._call(
+            "get_queue_attributes",
+            QueueUrl=self._url(shard),
+            AttributeNames=["ApproximateNumberOfMessages", "ApproximateNumberOfMessagesNotVisible"],
+        )["Attributes"]
+        return sum(int(value) for value in attributes.values())
+
+
+def open_queue(url: Optional[str] = None) -> AuditQueue:
+    """Queue for a URL (defaults to APP_AUDIT_QUEUE_URL): ``memory:``, ``sqlite:<path>`` or an SQS template."""
+    url = url or get_settings().app.audit_queue_url
+    if url == "memory:":
+        return InMemoryQueue()
+    if url.startswith("sqlite:"):
+        return SQLiteQueue(url[len("sqlite:"):])
+    if url.startswith("https://"):
+        return SQSQueue(url)
+    raise ConfigurationError(f"Unsupported audit queue URL: {url}")
+
+
+_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT PRIMARY KEY,
+    supplier_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    report TEXT,
+    error TEXT,
+    worker TEXT,
+    written_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_supplier ON results (supplier_key, written_at);
+"""
+
+
+class ReportStore:
+    """
+    SQLite store of distributed audit results, one row per job.
+
+    Writes are idempotent: the first result for a job ID wins and later
+    writes (from redelivered messages) are ignored.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_STORE_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def put(
+        self,
+        job_id: str,
+        supplier_key: str,
+        report: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        worker: str = "",
+    ) -> bool:
+        """Record a job's report (or terminal error); returns False if it already had one."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO results (job_id, supplier_key, status, report, error, worker, written_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    supplier_key,
+                    "failed" if report is None else "done",
+                    json.dumps(report) if report is not None else None,
+                    error,
+                    worker,
+                    time.time(),
+                ),
+            )
+            return cursor.rowcount > 0
+
+    def has(self, job_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM results WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Every result row, in write order, without the report bodies."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, supplier_key, status, error, worker FROM results ORDER BY rowid"
+            ).fetchall()
+        return [
+            {"job_id": job_id, "supplier_key": key, "status": status, "error": error, "worker": worker}
+            for job_id, key, status, error, worker in rows
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM results GROUP BY status").fetchall()
+        return {"done": 0, "failed": 0, **dict(rows)}
+
+    def iter_reports(self) -> Iterator[Dict[str, Any]]:
+        """Yield completed reports in write order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT report FROM results WHERE status = 'done' ORDER BY rowid"
+            ).fetchall()
+        for (report,) in rows:
+            yield json.loads(report)
+
+
+class AuditDispatcher:
+    """Routes suppliers to worker partitions by consistent hashing of their key."""
+
+    def __init__(self, queue: AuditQueue, workers: Sequence[str], replicas: int = DEFAULT_REPLICAS):
+        """
+        Args:
+            queue: Queue the jobs are sent to
+            workers: Worker IDs; each consumes the partition of the same name
+            replicas: Virtual nodes per worker on the hash ring
+        """
+        if not workers:
+            raise ConfigurationError("At least one worker is required")
+        self.queue = queue
+        self.ring = HashRing(workers, replicas)
+
+    def shard_for(self, supplier: Dict[str, Any]) -> str:
+        return self.ring.node_for(job_key(supplier))
+
+    def dispatch(self, suppliers: Iterable[Dict[str, Any]], run_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Queue one audit job per supplier.
+
+        Args:
+            suppliers: Supplier records (``name`` required, ``id`` preferred)
+            run_id: Identifies the run in job IDs (defaults to today's UTC
+                date), so dispatching the same run twice audits each supplier once
+
+        Returns:
+            Jobs sent per worker partition
+        """
+        run_id = run_id or datetime.now(timezone.utc).date().isoformat()
+        batches: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for supplier in suppliers:
+            if not supplier.get("name"):
+                continue
+            batches[self.shard_for(supplier)].append(
+                {"job_id": f"{run_id}/{job_key(supplier)}", "supplier": supplier}
+            )
+        for shard, bodies in batches.items():
+            self.queue.send(shard, bodies)
+        sent = {shard: len(bodies) for shard, bodies in batches.items()}
+        logger.info("Dispatched audit jobs", run_id=run_id, **sent)
+        return sent
+
+
+class AuditWorker:
+    """
+    Consumes one queue partition, auditing each supplier through a SupervisorAgent.
+
+    Usage:
+        worker = AuditWorker(supervisor, open_queue(), ReportStore("reports.db"), shard="worker-0")
+        worker.run(stop_event)
+    """
+
+    def __init__(
+        self,
+        supervisor,
+        queue: AuditQueue,
+        store: ReportStore,
+        shard: str,
+        concurrency: Optional[int] = None,
+        visibility_timeout: Optional[float] = None,
+        max_receives: Optional[int] = None,
+        backoff_base: float = 2.0,
+        priority: Priority = Priority.BACKFILL,
+        peers: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            supervisor: SupervisorAgent used for each audit
+            queue: Queue to consume
+            store: Where results are written
+            shard: Partition this worker consumes (its worker ID)
+            concurrency: Audits in flight (defaults to APP_AUDIT_WORKER_CONCURRENCY)
+            visibility_timeout: Seconds a received message stays hidden
+                (defaults to APP_AUDIT_QUEUE_VISIBILITY_TIMEOUT); extended
+                while the audit runs
+            max_receives: Deliveries before a failing job is recorded as failed
+                (defaults to APP_AUDIT_QUEUE_MAX_RECEIVES)
+            backoff_base: Base delay (seconds) before a failed job is redelivered
+            priority: Priority class the audits take on the shared AWS limiters
+            peers: Partitions whose expired leases this worker takes over when
+                its own is empty (defaults to every partition the queue can list)
+        """
+        settings = get_settings().app
+        self.supervisor = supervisor
+        self.queue = queue
+        self.store = store
+        self.shard = shard
+        self.concurrency = concurrency or settings.audit_worker_concurrency
+        self.visibility_timeout = visibility_timeout or settings.audit_queue_visibility_timeout
+        self.max_receives = max_receives or settings.audit_queue_max_receives
+        self.backoff_base = backoff_base
+        self.priority = Priority(priority)
+        self.peers = list(peers) if peers is not None else None
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        # receipt -> partition of every leased message; the heartbeat only
+        # extends receipts still in here, and holds the lock while it does
+        self._leases: Dict[str, str] = {}
+        self._lease_lock = threading.Lock()
+        self._running_jobs: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"audit-{shard}")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def retry_delay(self, receive_count: int) -> float:
+        """Seconds a failed job stays hidden before it is redelivered."""
+        return min(self.visibility_timeout, self.backoff_base * (2 ** max(0, receive_count - 1)))
+
+    def run_once(self, stop: Optional[threading.Event] = None) -> int:
+        """
+        Process messages until nothing is left to lease (or ``stop`` is set).
+
+        Each finished audit frees a slot that is leased again at once, so
+        ``concurrency`` audits stay in flight while work remains.
+
+        Returns:
+            Messages received
+        """
+        messages = self._lease(self.concurrency)
+        if not messages:
+            return 0
+        received = 0
+        pending: Dict[Future, QueueMessage] = {}
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(done,), daemon=True)
+        heartbeat.start()
+        try:
+            while True:
+                for message in messages:
+                    pending[self._executor.submit(self._handle, message)] = message
+                    received += 1
+                if not pending:
+                    break
+                finished = next(as_completed(pending))
+                del pending[finished]
+                finished.result()
+                messages = [] if stop and stop.is_set() else self._lease(self.concurrency - len(pending))
+        finally:
+            for future in as_completed(pending):
+                future.exception()
+            done.set()
+            heartbeat.join()
+        return received
+
+    def _lease(self, slots: int) -> List[QueueMessage]:
+        """Receive up to ``slots`` messages from this partition, then from peers' expired leases."""
+        if slots <= 0:
+            return []
+        messages = self.queue.receive(self.shard, slots, self.visibility_timeout)
+        peers = self.peers if self.peers is not None else self.queue.shards()
+        for peer in peers:
+            if len(messages) >= slots:
+                break
+            if peer == self.shard:
+                continue
+            taken = self.queue.receive_expired(peer, slots - len(messages), self.visibility_timeout)
+            if taken:
+                LEASES_TAKEN_OVER.inc(len(taken))
+                logger.info("Took over expired leases", shard=self.shard, partition=peer, jobs=len(taken))
+                messages += taken
+        with self._lease_lock:
+            for message in messages:
+                self._leases[message.receipt] = message.shard or self.shard
+        return messages
+
+    def _release(self, message: QueueMessage) -> str:
+        """Stop extending a message's lease; returns the partition it came from."""
+        with self._lease_lock:
+            self._leases.pop(message.receipt, None)
+        return message.shard or self.shard
+
+    def run(
+        self,
+        stop: Optional[threading.Event] = None,
+        idle_exit_seconds: Optional[float] = None,
+        poll_seconds: float = 1.0,
+    ) -> Dict[str, int]:
+        """
+        Process messages until ``stop`` is set, or the partition has been
+        empty for ``idle_exit_seconds``.
+
+        Returns:
+            Jobs handled per outcome
+        """
+        stop = stop or threading.Event()
+        idle_since = time.monotonic()
+        try:
+            while not stop.is_set():
+                if self.run_once(stop):
+                    idle_since = time.monotonic()
+                    continue
+                if idle_exit_seconds is not None and time.monotonic() - idle_since >= idle_exit_seconds:
+                    break
+                stop.wait(poll_seconds)
+        finally:
+            self.close()
+        logger.info("Audit worker stopped", shard=self.shard, **self.stats)
+        return dict(self.stats)
+
+    def _heartbeat(self, done: threading.Event) -> None:
+        """Keep leased messages hidden while their audits run."""
+        while not done.wait(self.visibility_timeout / 2):
+            # Held throughout, so a retry backoff set after _release is never overwritten
+            with self._lease_lock:
+                for receipt, shard in self._leases.items():
+                    if self.queue.change_visibility(shard, receipt, self.visibility_timeout):
+                        VISIBILITY_EXTENSIONS.inc()
+
+    def _handle(self, message: QueueMessage) -> None:
+        try:
+            outcome = self._process(message)
+        finally:
+            self._release(message)
+        with self._lock:
+            self.stats[outcome] += 1
+        QUEUE_JOBS.labels(outcome=outcome).inc()
+
+    def _process(self, message: QueueMessage) -> str:
+        job_id = message.body.get("job_id")
+        supplier = message.body.get("supplier") or {}
+        shard = message.shard or self.shard
+        if not job_id or not supplier.get("name"):
+            logger.warning("Dropping malformed audit job", shard=shard, message_id=message.message_id)
+            self.queue.delete(self._release(message), message.receipt)
+            return "invalid"
+        # A result means an earlier delivery finished but was not deleted in time
+        if self.store.has(job_id):
+            self.queue.delete(self._release(message), message.receipt)
+            return "duplicate"
+        # Another slot is auditing this job from a second delivery of the same dispatch
+        with self._lock:
+            running = job_id in self._running_jobs
+            self._running_jobs.add(job_id)
+        if running:
+            self.queue.delete(self._release(message), message.receipt)
+            return "duplicate"
+        try:
+            return self._audit(message, job_id, supplier)
+        finally:
+            with self._lock:
+                self._running_jobs.discard(job_id)
+
+    def _audit(self, message: QueueMessage, job_id: str, supplier: Dict[str, Any]) -> str:
+        key = job_key(supplier)
+        try:
+            with priority_scope(self.priority):
+                report = self.supervisor.audit_supplier(supplier["name"], supplier_record=supplier)
+        except Exception as e:
+            if message.receive_count < self.max_receives:
+                delay = self.retry_delay(message.receive_count)
+                self.queue.change_visibility(self._release(message), message.receipt, delay)
+                logger.warning(
+                    "Queued audit failed",
+                    supplier=supplier["name"],
+                    receives=message.receive_count,
+                    retry_in=delay,
+                    error=str(e),
+                )
+                return "retried"
+            self.store.put(job_id, key, error=str(e), worker=self.shard)
+            self.queue.delete(self._release(message), message.receipt)
+            logger.error("Queued audit gave up", supplier=supplier["name"], receives=message.receive_count, error=str(e))
+            return "failed"
+
+        if supplier.get("id"):
+            report["supplier_id"] = supplier["id"]
+        written = self.store.put(job_id, key, report=report, worker=self.shard)
+        self.queue.delete(self._release(message), message.receipt)
+        return "done" if written else "duplicate"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipeline.distributed",
+        description="Dispatch audits to a queue, or run a worker that consumes them.",
+    )
+    parser.add_argument("--queue", help="Queue URL (defaults to APP_AUDIT_QUEUE_URL)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dispatch = commands.add_parser("dispatch", help="Queue one audit per supplier")
+    dispatch.add_argument("input", help="Supplier file (JSON, CSV or NDJSON); '-' reads stdin")
+    dispatch.add_argument("--workers", required=True, help="Comma-separated worker IDs")
+    dispatch.add_argument("--run-id", help="Run identifier (defaults to today's UTC date)")
+
+    work = commands.add_parser("work", help="Consume one worker's partition")
+    work.add_argument("shard", help="Worker ID (the partition to consume)")
+    work.add_argument("--store", help="Report store (defaults to APP_AUDIT_REPORT_STORE)")
+    work.add_argument("--concurrency", type=int, help="Audits in flight")
+    work.add_argument("--idle-exit", type=float, help="Exit after the partition is empty this many seconds")
+    work.add_argument("--peers", help="Comma-separated partitions whose expired leases this worker takes over "
+                                      "(defaults to every partition in the queue)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(stream=sys.stderr)
+    # Imported here: src.main imports src.agents.supervisor, which imports src.pipeline
+    from src.main import init_supervisor, iter_suppliers
+
+    queue = open_queue(args.queue)
+    try:
+        if args.command == "dispatch":
+            workers = [worker.strip() for worker in args.workers.split(",") if worker.strip()]
+            stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+            try:
+                sent = AuditDispatcher(queue, workers).dispatch(iter_suppliers(stream, path=args.input), args.run_id)
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+            print(json.dumps(sent))
+            return 0
+
+        store = ReportStore(args.store or get_settings().app.audit_report_store)
+        try:
+            peers = [peer.strip() for peer in args.peers.split(",") if peer.strip()] if args.peers else None
+            worker = AuditWorker(init_supervisor(), queue, store, args.shard, concurrency=args.concurrency,
+                                 peers=peers)
+            stats = worker.run(idle_exit_seconds=args.idle_exit)
+        finally:
+            store.close()
+        print(json.dumps({"shard": args.shard, **stats}))
+        return 1 if stats.get("failed") else 0
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Entity-linking prefilter between investigation and auditing.
+
+Keyword news queries return articles that mention a supplier in passing
+or are about a different company with a similar name. Each of those would
+cost a policy check and a Knowledge Base retrieval, so the EntityLinker
+scores how strongly a finding is about the supplier and drops the rest
+before ranking.
+
+A finding's relevance combines:
+
+- mention strength: the full name (1.0), a multi-word alias unique in the
+  supplier directory (0.8), or a one-word or shared alias (0.4, which needs
+  supporting context to pass), discounted when the only mention comes late
+  in a long text
+- conflicts: an alias followed by a different legal designator
+  ("Acme Ltd" for "Acme Corporation") or overlapping another supplier's
+  full name does not count as a mention
+- context from the supplier record: its country (+) or only other
+  countries (-), and terms of its industry category (+)
+
+The SupplierDirectory is the alias index. It is built from suppliers.json
+records; aliases are the explicit ``aliases`` plus the name without legal
+suffixes.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from src.config import get_settings
+from src.logging_config import get_logger
+from src.sources.base import tokenize
+from src.utils.metrics import get_registry
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+FINDINGS_LINKED = _metrics.counter(
+    "sentinel_findings_linked_total",
+    "Findings screened by the entity-linking prefilter, by outcome",
+    ["outcome"],
+)
+
+# Trailing words that designate a legal entity rather than name it
+LEGAL_DESIGNATORS = frozenset({
+    "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "group", "holding", "holdings",
+    "inc", "incorporated", "industries", "limited", "llc", "ltd", "nv", "plc", "sa", "spa",
+})
+
+# Words that show up in coverage of each supplier category
+INDUSTRY_TERMS: Dict[str, List[str]] = {
+    "apparel": ["apparel", "garment", "garments", "clothing", "fashion", "textile", "textiles"],
+    "electronics": ["electronics", "electronic", "semiconductor", "components", "assembly"],
+    "food processing": ["food", "seafood", "processing", "fishing", "cannery"],
+    "forestry": ["forestry", "timber", "logging", "forest", "forests", "wood"],
+    "manufacturing": ["manufacturing", "factory", "factories", "plant", "production"],
+    "medical devices": ["medical", "device", "devices", "healthcare"],
+    "mining": ["mining", "mine", "mines", "miners", "ore", "copper", "gold"],
+    "renewable energy": ["solar", "wind", "renewable", "energy", "panel", "panels"],
+    "textiles": ["textile", "textiles", "garment", "garments", "fabric", "dyeing", "mill"],
+}
+
+# Mentions after this many tokens of a longer text count as "in passing"
+_LEAD_TOKENS = 25
+_PASSING_FACTOR = 0.7
+_CONTEXT_WEIGHT = 0.25
+
+
+def _terms(name: str) -> Tuple[str, ...]:
+    return tuple(tokenize(name))
+
+
+def _strip_designators(terms: Tuple[str, ...]) -> Tuple[str, ...]:
+    end = len(terms)
+    while end > 1 and terms[end - 1] in LEGAL_DESIGNATORS:
+        end -= 1
+    return terms[:end]
+
+
+def _find(tokens: List[str], phrase: Tuple[str, ...]) -> List[int]:
+    size = len(phrase)
+    first = phrase[0]
+    return [
+        i for i, token in enumerate(tokens)
+        if token == first and tuple(tokens[i:i + size]) == phrase
+    ]
+
+
+class SupplierDirectory:
+    """Alias index over supplier records (name, aliases, country, category)."""
+
+    def __init__(self, suppliers: Iterable[Dict[str, Any]] = ()):
+        self._records: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._aliases: Dict[Tuple[str, ...], Set[Tuple[str, ...]]] = {}
+        self._countries: Set[Tuple[str, ...]] = set()
+        self._lock = threading.Lock()
+        for supplier in suppliers:
+            self.add(supplier)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SupplierDirectory":
+        """Load a suppliers.json file (``{"suppliers": [...]}`` or a plain list)."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data.get("suppliers", []) if isinstance(data, dict) else data)
+
+    @classmethod
+    def from_settings(cls) -> "SupplierDirectory":
+        """Directory from APP_SUPPLIERS_FILE; empty if the file does not exist."""
+        path = get_settings().app.suppliers_file
+        if path and Path(path).is_file():
+            return cls.load(path)
+        return cls()
+
+    @staticmethod
+    def aliases_for(supplier: Dict[str, Any]) -> Set[Tuple[str, ...]]:
+        """The full name, its explicit aliases and the name without legal suffixes."""
+        full = _terms(supplier["name"])
+        aliases = {full, _strip_designators(full)}
+        for alias in supplier.get("aliases") or []:
+            terms = _terms(alias)
+            aliases.update({terms, _strip_designators(terms)})
+        return {alias for alias in aliases if alias}
+
+    def add(self, supplier: Dict[str, Any]) -> None:
+        """Add or replace a supplier record."""
+        key = _terms(supplier.get("name") or "")
+        if not key:
+            return
+        with self._lock:
+            self._records[key] = dict(supplier)
+            for alias in self.aliases_for(supplier):
+                self._aliases.setdefault(alias, set()).add(key)
+            if supplier.get("country"):
+                self._countries.add(_terms(supplier["country"]))
+
+    def get(self, supplier_name: str) -> Optional[Dict[str, Any]]:
+        """Record for a supplier, looked up by name or unique alias."""
+        terms = _terms(supplier_name)
+        record = self._records.get(terms)
+        if record is None:
+            owners = self._aliases.get(terms) or self._aliases.get(_strip_designators(terms)) or set()
+            if len(owners) == 1:
+                record = self._records[next(iter(owners))]
+        return record
+
+    def owners(self, alias: Tuple[str, ...]) -> Set[Tuple[str, ...]]:
+        """Full names of the suppliers an alias may refer to."""
+        return self._aliases.get(alias, set())
+
+    def full_names(self) -> List[Tuple[str, ...]]:
+        return list(self._records)
+
+    def alias_index(self) -> Dict[Tuple[str, ...], Set[Tuple[str, ...]]]:
+        """Snapshot of every alias and the full names of the suppliers it may refer to."""
+        with self._lock:
+            return {alias: set(owners) for alias, owners in self._aliases.items()}
+
+    def record(self, full_name: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Record stored under a supplier's tokenized full name."""
+        return self._records.get(full_name)
+
+    @property
+    def countries(self) -> Set[Tuple[str, ...]]:
+        return self._countries
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class EntityLinker:
+    """Drops findings that are not actually about the supplier."""
+
+    def __init__(self, directory: Optional[SupplierDirectory] = None, threshold: Optional[float] = None):
+        """
+        Args:
+            directory: Alias index and supplier metadata (defaults to APP_SUPPLIERS_FILE)
+            threshold: Minimum relevance kept (defaults to APP_ENTITY_LINK_THRESHOLD)
+        """
+        self.directory = directory if directory is not None else SupplierDirectory.from_settings()
+        self.threshold = threshold if threshold is not None else get_settings().app.entity_link_threshold
+
+    def _profile(self, supplier_name: str, record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        known = self.directory.get(supplier_name) or {}
+        profile = {**known, **{k: v for k, v in (record or {}).items() if v}}
+        profile["name"] = supplier_name
+        return profile
+
+    def mention_strength(self, tokens: List[str], profile: Dict[str, Any]) -> float:
+        """Strongest non-conflicting mention of the supplier in ``tokens``."""
+        full = _terms(profile["name"])
+        others = [name for name in self.directory.full_names() if name != full]
+        best = 0.0
+        for alias in SupplierDirectory.aliases_for(profile):
+            if alias == full:
+                weight = 1.0
+            else:
+                shared = self.directory.owners(alias) - {full}
+                weight = 0.8 if len(alias) > 1 and not shared else 0.4
+            if weight <= best:
+                continue
+            for position in _find(tokens, alias):
+                if alias != full and self._conflicts(tokens, position, alias, full, others):
+                    continue
+                long_text = len(tokens) > 2 * _LEAD_TOKENS
+                factor = _PASSING_FACTOR if long_text and position > _LEAD_TOKENS else 1.0
+                best = max(best, weight * factor)
+        return best
+
+    @staticmethod
+    def _conflicts(
+        tokens: List[str],
+        position: int,
+        alias: Tuple[str, ...],
+        full: Tuple[str, ...],
+        others: List[Tuple[str, ...]],
+    ) -> bool:
+        following = tokens[position + len(alias)] if position + len(alias) < len(tokens) else None
+        if following in LEGAL_DESIGNATORS and following not in full:
+            return True
+        # Alias is the start of another known supplier's full name
+        return any(
+            len(name) > len(alias) and tuple(tokens[position:position + len(name)]) == name
+            for name in others
+        )
+
+    def context_score(self, tokens: List[str], profile: Dict[str, Any]) -> float:
+        score = 0.0
+        country = _terms(profile.get("country") or "")
+        if country:
+            if _find(tokens, country):
+                score += _CONTEXT_WEIGHT
+            elif any(_find(tokens, other) for other in self.directory.countries if other != country):
+                score -= _CONTEXT_WEIGHT
+        category = " ".join(_terms(profile.get("category") or ""))
+        industry = INDUSTRY_TERMS.get(category) or list(_terms(category))
+        if industry and set(industry) & set(tokens):
+            score += _CONTEXT_WEIGHT
+        return score
+
+    def relevance(self, finding: Dict[str, Any], profile: Dict[str, Any]) -> float:
+        tokens = tokenize(" ".join(str(finding.get(field) or "") for field in ("title", "snippet")))
+        return self.mention_strength(tokens, profile) + self.context_score(tokens, profile)
+
+    def filter(
+        self,
+        supplier_name: str,
+        findings: List[Dict[str, Any]],
+        record: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split findings into those about the supplier and those discarded.
+
+        Args:
+            supplier_name: Audited supplier
+            findings: Investigator findings
+            record: Supplier record (country, category, aliases) overriding
+                the directory entry
+
+        Returns:
+            ``(kept, discarded)``, each in the original order
+        """
+        profile = self._profile(supplier_name, record)
+        kept, discarded = [], []
+        for finding in findings:
+            (kept if self.relevance(finding, profile) >= self.threshold else discarded).append(finding)
+        FINDINGS_LINKED.labels(outcome="kept").inc(len(kept))
+        FINDINGS_LINKED.labels(outcome="discarded").inc(len(discarded))
+        if discarded:
+            logger.info(
+                "Discarded findings not about supplier",
+                supplier=supplier_name,
+                discarded=len(discarded),
+                total=len(findings),
+            )
+        return kept, discarded
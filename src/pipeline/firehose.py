@@ -0,0 +1,322 @@
+"""
+News-firehose matching that triggers targeted re-audits.
+
+Instead of polling every supplier, a stream of incoming articles is matched
+against every supplier name and alias in the SupplierDirectory, and only
+suppliers that are actually mentioned get a delta audit.
+
+Per article:
+
+1. de-duplicate: syndicated copies (same URL, or same title when there is
+   no URL) are skipped using an exact set of the most recently seen
+   fingerprints, so a new article is never mistaken for a copy
+2. prefilter: articles sharing no token with the first word of any alias
+   skip the automaton (one C-level set intersection)
+3. match: a token-level Aho-Corasick automaton, built once over all aliases,
+   finds every alias in a single pass. Matching is on word boundaries, and
+   the longest alias at a position wins. A mention counts only when it is
+   the full name or a multi-word alias that belongs to one supplier, and is
+   not followed by another legal designator ("Acme Ltd" for "Acme Corp").
+   This is the same bar the EntityLinker sets without context.
+
+Hits are grouped per supplier for each batch of articles and handed to an
+``enqueue(supplier_record, articles)`` callback. ``monitor_enqueue`` moves
+the supplier to the front of a MonitoringScheduler, so delta audits still
+respect the audits-per-hour budget.
+
+Feeds are JSON Lines files of articles (NewsAPI shape: title, description,
+content, url, publishedAt), so a day's stream can be replayed:
+
+    python -m src.pipeline.firehose feed.jsonl --suppliers data/sample/suppliers.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from src.logging_config import configure_logging, get_logger
+from src.pipeline.batch import job_key
+from src.pipeline.entity_linking import LEGAL_DESIGNATORS, SupplierDirectory
+from src.sources.base import tokenize
+from src.utils.metrics import get_registry
+from src.utils.recent_set import RecentSet
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+FIREHOSE_ARTICLES = _metrics.counter(
+    "sentinel_firehose_articles_total",
+    "Firehose articles by outcome: duplicate, prefiltered, unmatched or matched",
+    ["outcome"],
+)
+FIREHOSE_DELTA_AUDITS = _metrics.counter(
+    "sentinel_firehose_delta_audits_total", "Supplier re-audits triggered by firehose hits"
+)
+
+ARTICLE_FIELDS = ("title", "description", "content")
+
+Enqueue = Callable[[Dict[str, Any], List[Dict[str, Any]]], None]
+
+
+class Hit(NamedTuple):
+    """A supplier mention found in an article."""
+    supplier: Tuple[str, ...]
+    alias: Tuple[str, ...]
+    position: int
+
+
+class AliasAutomaton:
+    """Aho-Corasick automaton over token sequences."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, ...]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, ...]]] = [[]]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+        self.first_tokens = frozenset(self._goto[0])
+
+    def _insert(self, pattern: Tuple[str, ...]) -> None:
+        state = 0
+        for token in pattern:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if pattern:
+            self._out[state].append(pattern)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; outputs inherit their failure state's outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def search(self, tokens: List[str]) -> Iterator[Tuple[int, Tuple[str, ...]]]:
+        """Yield ``(start, pattern)`` for every pattern occurrence in ``tokens``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pattern in out[state]:
+                yield end - len(pattern) + 1, pattern
+
+
+class FirehoseMatcher:
+    """Finds which suppliers an article is about, for every supplier at once."""
+
+    def __init__(self, directory: Optional[SupplierDirectory] = None):
+        """
+        Args:
+            directory: Supplier names and aliases (defaults to APP_SUPPLIERS_FILE)
+        """
+        self.directory = directory if directory is not None else SupplierDirectory.from_settings()
+        started = time.perf_counter()
+        aliases = self.directory.alias_index()
+        full_names = set(self.directory.full_names())
+        # Aliases strong enough to trigger on their own, mapped to their supplier
+        self._owner: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        for alias, owners in aliases.items():
+            if alias in full_names:
+                self._owner[alias] = alias
+            elif len(alias) > 1 and len(owners) == 1:
+                self._owner[alias] = next(iter(owners))
+        # All aliases go into the automaton so a longer name shadows a shorter alias
+        self.automaton = AliasAutomaton(aliases)
+        self.build_seconds = time.perf_counter() - started
+        logger.info("Built firehose automaton", aliases=len(aliases), states=len(self.automaton),
+                    seconds=round(self.build_seconds, 3))
+
+    @staticmethod
+    def article_tokens(article: Dict[str, Any]) -> List[str]:
+        return tokenize(" ".join(str(article.get(field) or "") for field in ARTICLE_FIELDS))
+
+    def prefilter(self, tokens: List[str]) -> bool:
+        """True if the article could mention a supplier at all."""
+        return not self.automaton.first_tokens.isdisjoint(tokens)
+
+    def hits(self, tokens: List[str]) -> List[Hit]:
+        """Supplier mentions in a tokenized article (longest alias per position)."""
+        longest: Dict[int, Tuple[str, ...]] = {}
+        for start, alias in self.automaton.search(tokens):
+            if len(alias) > len(longest.get(start, ())):
+                longest[start] = alias
+        found = []
+        covered_until = -1
+        for start in sorted(longest):
+            alias = longest[start]
+            end = start + len(alias)
+            # Skip aliases nested inside an earlier, longer match
+            if end <= covered_until:
+                continue
+            covered_until = max(covered_until, end)
+            supplier = self._owner.get(alias)
+            if supplier is None:
+                continue
+            following = tokens[end] if end < len(tokens) else None
+            if alias != supplier and following in LEGAL_DESIGNATORS and following not in supplier:
+                continue
+            found.append(Hit(supplier, alias, start))
+        return found
+
+    def match(self, article: Dict[str, Any]) -> Set[Tuple[str, ...]]:
+        """Tokenized full names of the suppliers an article mentions."""
+        tokens = self.article_tokens(article)
+        if not self.prefilter(tokens):
+            return set()
+        return {hit.supplier for hit in self.hits(tokens)}
+
+
+def _fingerprint(article: Dict[str, Any]) -> Optional[str]:
+    url = str(article.get("url") or "").strip()
+    if url:
+        return url
+    title = " ".join(tokenize(str(article.get("title") or "")))
+    return f"title:{title}" if title else None
+
+
+class FirehoseIngestor:
+    """Streams articles through the matcher and enqueues one delta audit per hit supplier per batch."""
+
+    def __init__(
+        self,
+        matcher: FirehoseMatcher,
+        enqueue: Enqueue,
+        batch_size: int = 1000,
+        dedup_capacity: int = 200_000,
+    ):
+        """
+        Args:
+            matcher: FirehoseMatcher over the supplier directory
+            enqueue: Called as ``enqueue(supplier_record, articles)`` for each
+                supplier mentioned in a batch
+            batch_size: Articles per batch; repeated mentions of a supplier
+                within one batch trigger a single audit
+            dedup_capacity: Most recent article fingerprints remembered for de-duplication
+        """
+        self.matcher = matcher
+        self.enqueue = enqueue
+        self.batch_size = max(1, batch_size)
+        self.seen = RecentSet(dedup_capacity)
+        self.stats = {"articles": 0, "duplicate": 0, "prefiltered": 0, "unmatched": 0, "matched": 0,
+                      "delta_audits": 0, "seconds": 0.0}
+
+    def _classify(self, article: Dict[str, Any]) -> Tuple[str, Set[Tuple[str, ...]]]:
+        fingerprint = _fingerprint(article)
+        if fingerprint is not None and self.seen.add(fingerprint):
+            return "duplicate", set()
+        tokens = self.matcher.article_tokens(article)
+        if not self.matcher.prefilter(tokens):
+            return "prefiltered", set()
+        suppliers = {hit.supplier for hit in self.matcher.hits(tokens)}
+        return ("matched" if suppliers else "unmatched"), suppliers
+
+    def ingest_batch(self, articles: List[Dict[str, Any]]) -> int:
+        """Match a batch and enqueue its delta audits; returns the number enqueued."""
+        started = time.perf_counter()
+        pending: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        outcomes: Dict[str, int] = {}
+        for article in articles:
+            outcome, suppliers = self._classify(article)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            for supplier in suppliers:
+                pending.setdefault(supplier, []).append(article)
+        for supplier, hits in pending.items():
+            record = self.matcher.directory.record(supplier) or {"name": " ".join(supplier)}
+            self.enqueue(record, hits)
+        FIREHOSE_DELTA_AUDITS.inc(len(pending))
+        for outcome, count in outcomes.items():
+            FIREHOSE_ARTICLES.labels(outcome=outcome).inc(count)
+            self.stats[outcome] += count
+        self.stats["articles"] += len(articles)
+        self.stats["delta_audits"] += len(pending)
+        self.stats["seconds"] += time.perf_counter() - started
+        return len(pending)
+
+    def ingest(self, articles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Consume a stream of articles in batches; returns running totals."""
+        batch: List[Dict[str, Any]] = []
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= self.batch_size:
+                self.ingest_batch(batch)
+                batch = []
+        if batch:
+            self.ingest_batch(batch)
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        seconds = self.stats["seconds"]
+        rate = self.stats["articles"] / seconds if seconds else 0.0
+        return {**self.stats, "seconds": round(seconds, 4), "articles_per_second": round(rate, 1)}
+
+
+def monitor_enqueue(monitor) -> Enqueue:
+    """Enqueue callback that expedites the hit supplier on a MonitoringScheduler."""
+    def enqueue(record: Dict[str, Any], articles: List[Dict[str, Any]]) -> None:
+        monitor.expedite(job_key(record))
+    return enqueue
+
+
+def iter_feed(path: str) -> Iterator[Dict[str, Any]]:
+    """Articles from a JSON Lines feed file ('-' for stdin, which is left open)."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipeline.firehose",
+        description="Replay a JSON Lines article feed and print the delta audits it triggers.",
+    )
+    parser.add_argument("feeds", nargs="+", help="JSON Lines article files ('-' for stdin)")
+    parser.add_argument("--suppliers", help="Supplier directory (defaults to APP_SUPPLIERS_FILE)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Articles per batch")
+    args = parser.parse_args(argv)
+    configure_logging(stream=sys.stderr)
+
+    directory = SupplierDirectory.load(args.suppliers) if args.suppliers else SupplierDirectory.from_settings()
+
+    def emit(record: Dict[str, Any], articles: List[Dict[str, Any]]) -> None:
+        print(json.dumps({
+            "supplier": record.get("name"),
+            "supplier_id": record.get("id"),
+            "articles": [article.get("url") or article.get("title") for article in articles],
+        }))
+
+    ingestor = FirehoseIngestor(FirehoseMatcher(directory), emit, batch_size=args.batch_size)
+    for path in args.feeds:
+        ingestor.ingest(iter_feed(path))
+    print(json.dumps(ingestor.summary()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Risk-weighted continuous re-auditing of the supplier portfolio.
+
+Instead of re-auditing every supplier on one fixed cadence, each supplier
+gets its own next-audit time:
+
+    interval = APP_MONITOR_RISK_INTERVAL_HOURS[last overall_risk]
+               x status factor   (flagged 0.25, under_review 0.5)
+               x recency factor  (newest finding < 7 days 0.5, < 30 days 0.75)
+
+so a RED, flagged supplier with fresh findings comes back within hours
+while a quiet GREEN one waits two weeks. Suppliers never audited are due
+immediately.
+
+Due times live in a min-heap timer (stale entries are skipped lazily when
+a supplier is rescheduled). Dispatch is paced by a token bucket refilled at
+APP_MONITOR_AUDITS_PER_HOUR, so audits are spread evenly across the day
+instead of arriving in waves. A re-audit that fails or is cancelled is
+retried after RETRY_HOURS, so no supplier drops out of monitoring. If the portfolio needs more audits per hour
+than the budget allows, every interval is stretched by the same factor,
+keeping RED suppliers proportionally more frequent rather than starving
+GREEN ones. A small per-supplier jitter keeps suppliers that share an
+interval from falling due together.
+
+Usage:
+    monitor = MonitoringScheduler(supervisor, suppliers, audit_scheduler=scheduler)
+    monitor.seed(journal.iter_reports())   # optional: start from earlier reports
+    monitor.run_forever(stop_event)
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config import get_settings
+from src.logging_config import get_logger
+from src.pipeline.batch import job_key
+from src.utils.metrics import get_registry
+from src.utils.priority import Priority, priority_scope
+from src.utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+MONITOR_AUDITS = _metrics.counter(
+    "sentinel_monitor_audits_total", "Continuous-monitoring re-audits by resulting risk", ["risk"]
+)
+MONITOR_OVERDUE = _metrics.gauge(
+    "sentinel_monitor_overdue", "Suppliers past their next-audit time waiting for budget"
+)
+MONITOR_RETRIES = _metrics.counter(
+    "sentinel_monitor_retries_total", "Re-audits that failed or were cancelled and were rescheduled", ["reason"]
+)
+MONITOR_DEMAND = _metrics.gauge(
+    "sentinel_monitor_demand_per_hour", "Audits per hour the unstretched schedule asks for"
+)
+
+# Multipliers on the risk interval from the supplier's status in suppliers.json
+STATUS_FACTORS = {"flagged": 0.25, "under_review": 0.5}
+# (max age in days of the newest finding, multiplier)
+RECENCY_FACTORS = [(7, 0.5), (30, 0.75)]
+JITTER = 0.1
+MIN_INTERVAL_HOURS = 1.0
+RETRY_HOURS = 1.0
+
+_HOUR = 3600.0
+
+
+def newest_finding_age_days(report: Dict[str, Any], now: float) -> Optional[float]:
+    """Age in days of the most recent dated finding in a report, if any."""
+    newest = None
+    for finding in report.get("findings", []):
+        try:
+            dated = datetime.strptime(str(finding.get("date", ""))[:10], "%Y-%m-%d")
+        except ValueError:
+            continue
+        newest = dated if newest is None or dated > newest else newest
+    if newest is None:
+        return None
+    return max(0.0, (now - newest.replace(tzinfo=timezone.utc).timestamp()) / 86400)
+
+
+class MonitoringScheduler:
+    """Keeps every supplier re-audited at a cadence matching its risk, within a budget."""
+
+    def __init__(
+        self,
+        supervisor,
+        suppliers: Iterable[Dict[str, Any]],
+        audits_per_hour: Optional[float] = None,
+        intervals: Optional[Dict[str, float]] = None,
+        audit_scheduler=None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            supervisor: SupervisorAgent used when no audit_scheduler is given
+            suppliers: Supplier records (suppliers.json entries)
+            audits_per_hour: Global re-audit budget (defaults to APP_MONITOR_AUDITS_PER_HOUR)
+            intervals: Base hours between audits per overall risk
+                (defaults to APP_MONITOR_RISK_INTERVAL_HOURS)
+            audit_scheduler: Optional AuditScheduler; re-audits are submitted
+                to it in the scheduled class instead of run inline
+            clock: Wall-clock time source (seconds since the epoch)
+        """
+        settings = get_settings().app
+        self.supervisor = supervisor
+        self.audit_scheduler = audit_scheduler
+        self.audits_per_hour = audits_per_hour or settings.monitor_audits_per_hour
+        self.intervals = intervals or settings.monitor_risk_interval_hours
+        self._clock = clock
+        self._budget = TokenBucket(self.audits_per_hour / _HOUR, capacity=1, clock=clock)
+        self._suppliers: Dict[str, Dict[str, Any]] = {}
+        self._base_hours: Dict[str, float] = {}
+        self._heap: List[List[Any]] = []
+        self._entries: Dict[str, List[Any]] = {}
+        self._expedited = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        now = clock()
+        for supplier in suppliers:
+            key = job_key(supplier)
+            self._suppliers[key] = supplier
+            self._base_hours[key] = self._interval_hours(supplier, None, now)
+            self._push(key, now)
+        MONITOR_DEMAND.set(self.demand_per_hour())
+
+    def _interval_hours(self, supplier: Dict[str, Any], report: Optional[Dict[str, Any]], now: float) -> float:
+        """Unstretched hours until the next audit after ``report`` (None: never audited)."""
+        risk = (report or {}).get("overall_risk", "UNKNOWN")
+        hours = float(self.intervals.get(risk, self.intervals.get("UNKNOWN", 24.0)))
+        hours *= STATUS_FACTORS.get(str(supplier.get("status", "")).lower(), 1.0)
+        age = newest_finding_age_days(report, now) if report else None
+        if age is not None:
+            for max_age, factor in RECENCY_FACTORS:
+                if age < max_age:
+                    hours *= factor
+                    break
+        return max(MIN_INTERVAL_HOURS, hours)
+
+    def demand_per_hour(self) -> float:
+        """Audits per hour the portfolio needs at its unstretched intervals."""
+        return sum(1.0 / hours for hours in self._base_hours.values())
+
+    def stretch(self) -> float:
+        """Factor applied to every interval so demand fits the budget (>= 1)."""
+        return max(1.0, self.demand_per_hour() / self.audits_per_hour)
+
+    def _push(self, key: str, due: float) -> None:
+        stale = self._entries.pop(key, None)
+        if stale is not None:
+            stale[-1] = None
+        entry = [due, next(self._counter), key]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _pop_due(self) -> str:
+        """Pop the earliest supplier (lock held; the caller checked it is due)."""
+        self._peek()
+        _, _, key = heapq.heappop(self._heap)
+        del self._entries[key]
+        return key
+
+    def record(self, supplier_key: str, report: Dict[str, Any], now: Optional[float] = None) -> float:
+        """
+        Schedule a supplier's next audit from its latest report.
+
+        Returns:
+            The next-audit time (seconds since the epoch)
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            supplier = self._suppliers[supplier_key]
+            self._base_hours[supplier_key] = self._interval_hours(supplier, report, now)
+            # Stable per-supplier offset in [-JITTER, +JITTER]
+            jitter = (zlib.crc32(supplier_key.encode("utf-8")) % 2001 / 1000.0 - 1.0) * JITTER
+            hours = self._base_hours[supplier_key] * self.stretch() * (1.0 + jitter)
+            due = now + hours * _HOUR
+            if supplier_key in self._expedited:
+                # News arrived while this audit was running
+                self._expedited.discard(supplier_key)
+                due = min(due, self._clock())
+            self._push(supplier_key, due)
+        MONITOR_DEMAND.set(self.demand_per_hour())
+        return due
+
+    def expedite(self, supplier_key: str) -> bool:
+        """
+        Move a supplier to the front of the schedule (e.g. after a news hit).
+
+        It still waits for budget like any other re-audit. A supplier whose
+        audit is in flight is re-audited once that audit completes.
+
+        Returns:
+            False if the supplier is not monitored
+        """
+        with self._lock:
+            if supplier_key not in self._suppliers:
+                return False
+            if supplier_key not in self._entries:
+                self._expedited.add(supplier_key)
+            else:
+                self._push(supplier_key, min(self._clock(), self._peek()))
+        return True
+
+    def seed(self, reports: Iterable[Dict[str, Any]]) -> int:
+        """
+        Schedule suppliers from earlier reports, timed from each report's timestamp.
+
+        Reports are matched by ``supplier_id`` or supplier name. Returns the
+        number of suppliers seeded.
+        """
+        names = {supplier.get("name"): key for key, supplier in self._suppliers.items()}
+        seeded = 0
+        for report in reports:
+            key = report.get("supplier_id") or names.get(report.get("supplier"))
+            if key not in self._suppliers:
+                continue
+            try:
+                audited_at = datetime.fromisoformat(str(report["timestamp"]).replace("Z", "+00:00")).timestamp()
+            except (KeyError, ValueError):
+                audited_at = self._clock()
+            self.record(key, report, now=audited_at)
+            seeded += 1
+        return seeded
+
+    def _peek(self) -> float:
+        """Earliest live due time (lock held); stale heap entries are dropped here."""
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else float("inf")
+
+    def next_due(self) -> Optional[float]:
+        """Earliest next-audit time, or None when nothing is scheduled."""
+        with self._lock:
+            due = self._peek()
+        return None if due == float("inf") else due
+
+    def overdue(self, now: Optional[float] = None) -> int:
+        """Suppliers past their next-audit time that have not started."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            return sum(1 for entry in self._entries.values() if entry[0] <= now)
+
+    def schedule(self) -> List[Tuple[str, float]]:
+        """(supplier key, next-audit time) for every scheduled supplier, soonest first."""
+        with self._lock:
+            return sorted(((key, entry[0]) for key, entry in self._entries.items()), key=lambda item: item[1])
+
+    def run_pending(self) -> List[Future]:
+        """
+        Start re-audits for suppliers that are due, as far as the budget allows.
+
+        Suppliers are taken in due-time order. With an audit_scheduler the
+        audits are submitted in the scheduled class and their futures
+        returned; otherwise they run inline and completed futures are returned.
+        """
+        started = []
+        while True:
+            now = self._clock()
+            with self._lock:
+                if self._peek() > now or self._budget.try_acquire() > 0:
+                    break
+                key = self._pop_due()
+            started.append(self._start(key))
+        MONITOR_OVERDUE.set(self.overdue())
+        return started
+
+    def _start(self, key: str) -> Future:
+        supplier = self._suppliers[key]
+        if self.audit_scheduler is not None:
+            future = self.audit_scheduler.submit(supplier["name"], Priority.SCHEDULED, supplier)
+        else:
+            future = Future()
+            try:
+                with priority_scope(Priority.SCHEDULED):
+                    future.set_result(self.supervisor.audit_supplier(supplier["name"], supplier_record=supplier))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _retry(self, key: str, reason: str) -> None:
+        """Reschedule a supplier whose re-audit produced no report, so it stays monitored."""
+        MONITOR_RETRIES.labels(reason=reason).inc()
+        with self._lock:
+            due = self._clock() + RETRY_HOURS * _HOUR
+            if key in self._expedited:
+                self._expedited.discard(key)
+                due = self._clock()
+            self._push(key, due)
+
+    def _finished(self, key: str, future: Future) -> None:
+        if future.cancelled():
+            # e.g. the audit scheduler shut down before the audit started
+            logger.warning("Monitoring re-audit cancelled", supplier=key)
+            self._retry(key, "cancelled")
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning("Monitoring re-audit failed", supplier=key, error=str(error))
+            self._retry(key, "failed")
+            return
+        report = future.result()
+        MONITOR_AUDITS.labels(risk=report.get("overall_risk", "UNKNOWN")).inc()
+        self.record(key, report)
+
+    def run_forever(self, stop: threading.Event, max_idle_seconds: float = 60.0) -> None:
+        """Re-audit suppliers as they fall due until ``stop`` is set."""
+        while not stop.is_set():
+            self.run_pending()
+            due = self.next_due()
+            now = self._clock()
+            if due is None:
+                wait = max_idle_seconds
+            elif due > now:
+                wait = due - now
+            else:
+                # Due suppliers are waiting for budget: sleep until the next token
+                wait = (1.0 - self._budget.tokens) / self._budget.rate
+            stop.wait(min(max_idle_seconds, max(0.0, wait)))
@@ -0,0 +1,155 @@
+"""
+Relevance ranking and top-K selection of findings before the Auditor.
+
+Sources can return any number of findings, and each one costs policy
+checks and Knowledge Base retrievals. The ranker scores every finding and
+keeps the best ``max_findings`` (APP_MAX_FINDINGS_PER_AUDIT), selected
+with a heap so the cost stays O(n log k) however noisy the sources are.
+
+Each finding's score is a weighted sum of four signals, each in [0, 1]:
+
+- recency: exponential decay on the finding's age (half-life in days)
+- credibility: how authoritative the source is (regulators > NGOs > press)
+- keyword density: CATEGORY_KEYWORDS hits relative to snippet length
+- name match: how much of the supplier name the snippet contains
+"""
+
+import heapq
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config import get_settings
+from src.sources.base import CATEGORY_KEYWORDS, normalize_date, tokenize
+from src.utils.metrics import get_registry
+
+_metrics = get_registry()
+FINDINGS_RANKED = _metrics.counter(
+    "sentinel_findings_ranked_total", "Findings scored by the ranking stage"
+)
+FINDINGS_TRUNCATED = _metrics.counter(
+    "sentinel_findings_truncated_total", "Findings dropped by top-K selection before the Auditor"
+)
+
+DEFAULT_WEIGHTS = {"recency": 0.3, "credibility": 0.25, "keyword_density": 0.2, "name_match": 0.25}
+
+# Words or phrases of source names and domains, matched on whole words
+# ("epa" matches "US EPA" and "epa.gov", not "Nepal"), and their
+# credibility; first match wins
+DEFAULT_CREDIBILITY: List[Tuple[str, float]] = [
+    ("sanctions", 1.0),
+    ("protection agency", 1.0),
+    ("epa", 1.0),
+    ("ministry", 1.0),
+    ("court", 1.0),
+    ("courts", 1.0),
+    ("regulator", 1.0),
+    ("regulatory", 1.0),
+    ("labor rights", 0.85),
+    ("watchdog", 0.85),
+    ("watch", 0.8),
+    ("amnesty", 0.85),
+    ("ngo", 0.8),
+    ("reuters", 0.75),
+    ("associated press", 0.75),
+    ("bloomberg", 0.75),
+    ("financial times", 0.75),
+    ("news", 0.6),
+    ("journal", 0.6),
+    ("monitor", 0.6),
+]
+DEFAULT_SOURCE_CREDIBILITY = 0.5
+
+_KEYWORDS = frozenset(keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords)
+
+
+class FindingRanker:
+    """Scores findings for relevance and keeps the top K."""
+
+    def __init__(
+        self,
+        max_findings: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        credibility: Optional[List[Tuple[str, float]]] = None,
+        half_life_days: float = 180.0,
+        today: Optional[Callable[[], date]] = None,
+    ):
+        """
+        Args:
+            max_findings: Findings kept per audit (defaults to APP_MAX_FINDINGS_PER_AUDIT)
+            weights: Overrides for DEFAULT_WEIGHTS
+            credibility: ``(source word or phrase, score)`` pairs checked in order
+            half_life_days: Age at which the recency signal halves
+            today: Clock for recency (for tests)
+        """
+        self.max_findings = max_findings if max_findings is not None else get_settings().app.max_findings_per_audit
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.credibility = credibility if credibility is not None else DEFAULT_CREDIBILITY
+        self._credibility_terms = [(tuple(tokenize(needle)), score) for needle, score in self.credibility]
+        self.half_life_days = half_life_days
+        self._today = today or date.today
+
+    def recency(self, finding: Dict[str, Any], today: Optional[date] = None) -> float:
+        try:
+            published = date.fromisoformat(normalize_date(finding.get("date"))[:10])
+        except ValueError:
+            return 0.0
+        age = max(0, ((today or self._today()) - published).days)
+        return 0.5 ** (age / self.half_life_days)
+
+    def source_credibility(self, finding: Dict[str, Any]) -> float:
+        tokens = tokenize(str(finding.get("source") or ""))
+        for terms, score in self._credibility_terms:
+            width = len(terms)
+            if width and any(tuple(tokens[i:i + width]) == terms for i in range(len(tokens) - width + 1)):
+                return score
+        return DEFAULT_SOURCE_CREDIBILITY
+
+    @staticmethod
+    def keyword_density(tokens: List[str]) -> float:
+        if not tokens:
+            return 0.0
+        hits = sum(1 for token in tokens if token in _KEYWORDS)
+        # Two hits in a typical 20-word snippet already saturate the signal
+        return min(1.0, hits * 10 / len(tokens))
+
+    @staticmethod
+    def name_match(tokens: List[str], name_terms: List[str]) -> float:
+        """1.0 for the full name as a phrase, else the share of name terms present."""
+        if not name_terms:
+            return 0.0
+        size = len(name_terms)
+        if any(tokens[i:i + size] == name_terms for i in range(len(tokens) - size + 1)):
+            return 1.0
+        present = set(tokens)
+        return 0.8 * sum(term in present for term in name_terms) / size
+
+    def score(self, finding: Dict[str, Any], supplier_name: str, today: Optional[date] = None) -> float:
+        """Weighted relevance of one finding to the supplier."""
+        return self._score(finding, tokenize(supplier_name), today or self._today())
+
+    def _score(self, finding: Dict[str, Any], name_terms: List[str], today: date) -> float:
+        tokens = tokenize(str(finding.get("snippet") or ""))
+        signals = {
+            "recency": self.recency(finding, today),
+            "credibility": self.source_credibility(finding),
+            "keyword_density": self.keyword_density(tokens),
+            "name_match": self.name_match(tokens, name_terms),
+        }
+        return sum(self.weights[name] * value for name, value in signals.items())
+
+    def select(self, supplier_name: str, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        The ``max_findings`` most relevant findings, best first.
+
+        Ties keep the sources' original order.
+        """
+        today = self._today()
+        name_terms = tokenize(supplier_name)
+        FINDINGS_RANKED.inc(len(findings))
+        top = heapq.nlargest(
+            self.max_findings,
+            ((self._score(finding, name_terms, today), -i, finding) for i, finding in enumerate(findings)),
+            key=lambda entry: entry[:2],
+        )
+        FINDINGS_TRUNCATED.inc(len(findings) - len(top))
+        return [finding for _, _, finding in top]
@@ -0,0 +1,225 @@
+"""
+Multi-core batch re-scoring of stored findings.
+
+Re-scoring runs stored Investigator output (one JSON object per supplier:
+``{"supplier", "findings", "sources", "supplier_id"?, "supplier_record"?}``)
+back through the local stages of an audit:
+
+    JSON parsing -> de-duplication -> entity linking and ranking
+    -> Auditor rule evaluation -> report serialisation
+
+None of these stages wait on the network, so with threads the GIL caps them
+at one core. ``ParallelRescorer`` runs them in a process pool instead:
+
+- Work is sharded by supplier. Each input line is one supplier, and
+  consecutive lines are packed into shards of about ``shard_bytes`` bytes,
+  so a supplier is never split between processes.
+- Shards cross the process boundary as raw NDJSON ``bytes`` and come back
+  as NDJSON report ``bytes``. Pickling a bytes object is a single copy,
+  while pickling millions of finding dicts costs as much as the scoring
+  itself. Parsing happens in the workers, where it parallelises.
+- Each worker builds one rules-only Supervisor (no Knowledge Base, no
+  Auditor agent) in its initializer and reuses it for every shard.
+- Output keeps input order.
+
+Usage:
+    python -m src.pipeline.rescoring findings.ndjson --processes 8 > reports.ndjson
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from src.config import get_settings
+from src.logging_config import configure_logging, get_logger
+from src.sources.registry import dedupe_findings
+
+logger = get_logger(__name__)
+
+_worker_supervisor = None
+
+
+def build_rescoring_supervisor():
+    """Supervisor that audits stored findings with the rule tier only."""
+    # Imported here: src.agents.supervisor itself imports src.pipeline
+    from src.agents.auditor import AuditorAgent
+    from src.agents.supervisor import SupervisorAgent
+
+    # No Knowledge Base client and no Auditor agent: nothing leaves the machine
+    return SupervisorAgent(investigator_agent=None, auditor_agent=AuditorAgent(), coalesce=False)
+
+
+def _init_worker() -> None:
+    global _worker_supervisor
+    _worker_supervisor = build_rescoring_supervisor()
+
+
+def rescore_record(supervisor, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Audit one supplier's stored findings; returns the report."""
+    findings = {**record, "findings": dedupe_findings(record.get("findings") or [])}
+    report = supervisor.audit_supplier(
+        record["supplier"], findings=findings, supplier_record=record.get("supplier_record")
+    )
+    if record.get("supplier_id"):
+        report["supplier_id"] = record["supplier_id"]
+    return report
+
+
+def rescore_shard(shard: bytes) -> bytes:
+    """
+    Re-score one shard of NDJSON supplier records.
+
+    Runs in a worker process (or inline when there is one process). A record
+    that fails, or a line that is not a JSON object, becomes an
+    ``{"supplier", "error"}`` line instead of failing the shard.
+    """
+    global _worker_supervisor
+    if _worker_supervisor is None:
+        _init_worker()
+    lines = []
+    for raw in shard.splitlines():
+        if not raw.strip():
+            continue
+        record = None
+        try:
+            record = json.loads(raw)
+            if not isinstance(record, dict):
+                raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+            report = rescore_record(_worker_supervisor, record)
+        except Exception as e:
+            supplier = record.get("supplier") if isinstance(record, dict) else None
+            report = {"supplier": supplier, "error": str(e)}
+        lines.append(json.dumps(report, separators=(",", ":")))
+    return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+def iter_shards(lines: Iterable[bytes], shard_bytes: int) -> Iterator[bytes]:
+    """Pack whole NDJSON lines into shards of roughly ``shard_bytes`` bytes."""
+    shard: List[bytes] = []
+    size = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        if not line.endswith(b"\n"):
+            line += b"\n"
+        shard.append(line)
+        size += len(line)
+        if size >= shard_bytes:
+            yield b"".join(shard)
+            shard, size = [], 0
+    if shard:
+        yield b"".join(shard)
+
+
+class ParallelRescorer:
+    """Re-scores NDJSON supplier records across worker processes."""
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        shard_bytes: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+    ):
+        """
+        Args:
+            processes: Worker processes (defaults to APP_RESCORE_PROCESSES;
+                0 means one per CPU, 1 runs inline without a pool)
+            shard_bytes: Target shard size (defaults to APP_RESCORE_SHARD_BYTES)
+            mp_context: multiprocessing context; "spawn" by default so workers
+                never inherit locks held by the parent's threads
+        """
+        settings = get_settings().app
+        processes = processes if processes is not None else settings.rescore_processes
+        self.processes = processes if processes > 0 else (os.cpu_count() or 1)
+        self.shard_bytes = shard_bytes or settings.rescore_shard_bytes
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelRescorer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=self.mp_context, initializer=_init_worker
+        )
+
+    def start(self) -> None:
+        """
+        Keep a pool alive across ``run`` calls.
+
+        Spawned workers pay the import and Supervisor set-up once, here,
+        instead of on every ``run`` call.
+        """
+        if self.processes > 1 and self._pool is None:
+            self._pool = self._new_pool()
+            for future in [self._pool.submit(rescore_shard, b"") for _ in range(self.processes)]:
+                future.result()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def run(self, lines: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Re-score NDJSON records, yielding NDJSON report shards in input order.
+
+        At most two shards per process are in flight, so memory stays
+        bounded however large the input is.
+        """
+        shards = iter_shards(lines, self.shard_bytes)
+        if self.processes == 1:
+            for shard in shards:
+                yield rescore_shard(shard)
+            return
+
+        pool = self._pool or self._new_pool()
+        try:
+            pending: Deque[Future] = deque()
+            for shard in shards:
+                pending.append(pool.submit(rescore_shard, shard))
+                if len(pending) >= self.processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            if pool is not self._pool:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def rescore(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convenience wrapper over ``run`` for in-memory records."""
+        lines = (json.dumps(record).encode("utf-8") for record in records)
+        return [json.loads(line) for shard in self.run(lines) for line in shard.splitlines() if line]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipeline.rescoring",
+        description="Re-score stored findings (NDJSON, one supplier per line) on all cores.",
+    )
+    parser.add_argument("input", help="NDJSON findings file ('-' for stdin)")
+    parser.add_argument("--processes", type=int, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--shard-bytes", type=int, help="Target shard size in bytes")
+    args = parser.parse_args(argv)
+    configure_logging(stream=sys.stderr)
+
+    rescorer = ParallelRescorer(args.processes, args.shard_bytes)
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    with source:
+        for shard in rescorer.run(source):
+            sys.stdout.buffer.write(shard)
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
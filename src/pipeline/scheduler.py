@@ -0,0 +1,320 @@
+"""
+Priority scheduling of audits in front of the SupervisorAgent.
+
+Audits are submitted in one of three classes (src.utils.priority):
+
+- interactive: an analyst is waiting on the dashboard (<30s SLA)
+- scheduled: periodic re-audits of the portfolio
+- backfill: bulk runs that only need to finish eventually
+
+Dispatch:
+
+1. Interactive audits always go first, and ``interactive_workers`` workers
+   are kept for them, so a click never waits behind a batch queue.
+2. Scheduled and backfill audits share the remaining workers by weight
+   (stride scheduling over APP_PRIORITY_WEIGHTS).
+3. Each audit runs under its priority, so the shared AWS rate limiters
+   split contended Bedrock, Knowledge Base and news capacity by the same
+   weights.
+4. When interactive audits are queued and every worker is busy, running
+   backfill audits are preempted at their next stage boundary. A backfill
+   audit paused after its investigation is re-queued at the front of its
+   class with the findings, so it resumes at the audit step.
+
+Queue depth and running audits per class are exported as gauges, and queue
+wait times as ``scheduler.wait.<class>`` latency histograms.
+
+Usage:
+    with AuditScheduler(supervisor) as scheduler:
+        report = scheduler.audit("Acme Corp")                          # interactive
+        futures = [scheduler.submit(name, Priority.BACKFILL) for name in names]
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional
+
+from src.config import get_settings
+from src.exceptions import AuditPreempted
+from src.logging_config import get_logger
+from src.utils.metrics import get_registry
+from src.utils.priority import Priority, check_weights, priority_scope, priority_weights
+from src.utils.tracing import get_span_recorder
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+SCHEDULER_QUEUE_DEPTH = _metrics.gauge(
+    "sentinel_scheduler_queue_depth", "Audits waiting for a scheduler worker", ["priority"]
+)
+SCHEDULER_RUNNING = _metrics.gauge(
+    "sentinel_scheduler_running", "Audits running on scheduler workers", ["priority"]
+)
+SCHEDULER_JOBS = _metrics.counter(
+    "sentinel_scheduler_jobs_total", "Scheduled audits by outcome", ["priority", "outcome"]
+)
+SCHEDULER_PREEMPTIONS = _metrics.counter(
+    "sentinel_scheduler_preemptions_total", "Backfill audits paused for interactive work"
+)
+
+
+class _Job:
+    """A queued audit and the future its caller waits on."""
+
+    __slots__ = ("supplier_name", "priority", "supplier_record", "future", "enqueued_at",
+                 "findings", "preempt")
+
+    def __init__(self, supplier_name: str, priority: Priority, supplier_record: Optional[Dict[str, Any]]):
+        self.supplier_name = supplier_name
+        self.priority = priority
+        self.supplier_record = supplier_record
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+        self.findings: Optional[Dict[str, Any]] = None
+        self.preempt = threading.Event()
+
+
+class AuditScheduler:
+    """Runs supplier audits from per-priority queues on a fixed set of workers."""
+
+    def __init__(
+        self,
+        supervisor,
+        workers: Optional[int] = None,
+        interactive_workers: Optional[int] = None,
+        weights: Optional[Dict[Priority, float]] = None,
+        preempt_backfill: Optional[bool] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            supervisor: SupervisorAgent used for each audit
+            workers: Concurrent audits (defaults to APP_SCHEDULER_WORKERS)
+            interactive_workers: Workers that only run interactive audits
+                (defaults to APP_SCHEDULER_INTERACTIVE_WORKERS)
+            weights: Share per class for scheduled and backfill dispatch
+                (defaults to APP_PRIORITY_WEIGHTS)
+            preempt_backfill: Pause running backfill audits when interactive
+                audits wait (defaults to APP_SCHEDULER_PREEMPT_BACKFILL)
+        """
+        settings = get_settings().app
+        self.supervisor = supervisor
+        self.workers = max(1, workers if workers is not None else settings.scheduler_workers)
+        reserved = interactive_workers if interactive_workers is not None else settings.scheduler_interactive_workers
+        # At least one worker must be able to run batch work
+        self.interactive_workers = max(0, min(reserved, self.workers - 1))
+        self.weights = check_weights(weights or priority_weights())
+        self.preempt_backfill = (
+            preempt_backfill if preempt_backfill is not None else settings.scheduler_preempt_backfill
+        )
+        self._queues: Dict[Priority, Deque[_Job]] = {priority: deque() for priority in Priority}
+        self._running: Dict[Priority, List[_Job]] = {priority: [] for priority in Priority}
+        self._pass: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self.preemptions = 0
+
+    def __enter__(self) -> "AuditScheduler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def submit(
+        self,
+        supplier_name: str,
+        priority: Priority = Priority.INTERACTIVE,
+        supplier_record: Optional[Dict[str, Any]] = None,
+    ) -> Future:
+        """
+        Queue an audit.
+
+        Returns:
+            Future resolving to the audit report (or the audit's exception)
+
+        Raises:
+            RuntimeError: If the scheduler has been shut down
+        """
+        job = _Job(supplier_name, Priority(priority), supplier_record)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AuditScheduler has been shut down")
+            self._start_workers()
+            queue = self._queues[job.priority]
+            if not queue:
+                # An idle class rejoins at the current virtual time instead of
+                # cashing in the turns it did not need
+                self._pass[job.priority] = max(self._pass[job.priority], self._virtual_time())
+            queue.append(job)
+            SCHEDULER_QUEUE_DEPTH.labels(priority=job.priority.value).inc()
+            if job.priority is Priority.INTERACTIVE:
+                self._preempt_for_interactive()
+            self._cond.notify_all()
+        return job.future
+
+    def audit(
+        self,
+        supplier_name: str,
+        priority: Priority = Priority.INTERACTIVE,
+        supplier_record: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Queue an audit and block until its report is ready."""
+        return self.submit(supplier_name, priority, supplier_record).result(timeout)
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Queued audits per class."""
+        with self._cond:
+            return {priority.value: len(queue) for priority, queue in self._queues.items()}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, running audits and wait-time percentiles per class."""
+        recorder = get_span_recorder()
+        with self._cond:
+            stats: Dict[str, Any] = {
+                "queued": {p.value: len(q) for p, q in self._queues.items()},
+                "running": {p.value: len(r) for p, r in self._running.items()},
+                "preemptions": self.preemptions,
+            }
+        stats["wait_p95_seconds"] = {
+            priority.value: round(recorder.histogram(f"scheduler.wait.{priority.value}").percentile(95), 4)
+            for priority in Priority
+        }
+        return stats
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop accepting audits; workers exit once the queues are empty.
+
+        Args:
+            wait: Block until the workers have exited
+            cancel_pending: Cancel queued audits instead of running them
+        """
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for priority, queue in self._queues.items():
+                    while queue:
+                        queue.popleft().future.cancel()
+                        SCHEDULER_QUEUE_DEPTH.labels(priority=priority.value).dec()
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _start_workers(self) -> None:
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work,
+                args=(index < self.interactive_workers,),
+                name=f"audit-scheduler-{index}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _virtual_time(self) -> float:
+        busy = [self._pass[p] for p in Priority if self._queues[p]]
+        return min(busy) if busy else max(self._pass.values())
+
+    def _next_job(self, interactive_only: bool) -> Optional[_Job]:
+        """Pop the next job for a worker: interactive first, then by stride."""
+        if self._queues[Priority.INTERACTIVE]:
+            return self._queues[Priority.INTERACTIVE].popleft()
+        if interactive_only:
+            return None
+        waiting = [p for p in (Priority.SCHEDULED, Priority.BACKFILL) if self._queues[p]]
+        if not waiting:
+            return None
+        priority = min(waiting, key=lambda p: self._pass[p])
+        self._pass[priority] += 1.0 / self.weights[priority]
+        return self._queues[priority].popleft()
+
+    def _preempt_for_interactive(self) -> None:
+        """Ask running backfill audits to pause when queued interactive work has no free worker."""
+        if not self.preempt_backfill:
+            return
+        busy = sum(len(running) for running in self._running.values())
+        shortfall = len(self._queues[Priority.INTERACTIVE]) - (self.workers - busy)
+        for job in self._running[Priority.BACKFILL]:
+            if shortfall <= 0:
+                break
+            if not job.preempt.is_set():
+                job.preempt.set()
+                shortfall -= 1
+
+    def _work(self, interactive_only: bool) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job(interactive_only)
+                while job is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    job = self._next_job(interactive_only)
+                self._running[job.priority].append(job)
+                SCHEDULER_QUEUE_DEPTH.labels(priority=job.priority.value).dec()
+                SCHEDULER_RUNNING.labels(priority=job.priority.value).inc()
+            try:
+                self._run(job)
+            finally:
+                with self._cond:
+                    self._running[job.priority].remove(job)
+                    SCHEDULER_RUNNING.labels(priority=job.priority.value).dec()
+                    self._cond.notify_all()
+
+    def _run(self, job: _Job) -> None:
+        if not job.future.running():
+            # First dispatch (a resumed, preempted job is already running)
+            if not job.future.set_running_or_notify_cancel():
+                return
+            get_span_recorder().record(
+                f"scheduler.wait.{job.priority.value}", time.monotonic() - job.enqueued_at
+            )
+        try:
+            with priority_scope(job.priority):
+                report = self._audit(job)
+        except AuditPreempted as e:
+            self._requeue(job, e.findings)
+            return
+        except BaseException as e:
+            SCHEDULER_JOBS.labels(priority=job.priority.value, outcome="failed").inc()
+            job.future.set_exception(e)
+            return
+        SCHEDULER_JOBS.labels(priority=job.priority.value, outcome="completed").inc()
+        job.future.set_result(report)
+
+    def _audit(self, job: _Job) -> Dict[str, Any]:
+        if job.priority is not Priority.BACKFILL or not self.preempt_backfill:
+            return self.supervisor.audit_supplier(job.supplier_name, supplier_record=job.supplier_record)
+
+        def on_stage(stage: str, findings: Optional[Dict[str, Any]]) -> None:
+            if job.preempt.is_set():
+                raise AuditPreempted(f"Backfill audit of {job.supplier_name} preempted", findings=findings)
+
+        return self.supervisor.audit_supplier(
+            job.supplier_name, findings=job.findings, on_stage=on_stage,
+            supplier_record=job.supplier_record,
+        )
+
+    def _requeue(self, job: _Job, findings: Optional[Dict[str, Any]]) -> None:
+        """Put a preempted job back at the front of its queue, keeping its findings."""
+        resumed = _Job(job.supplier_name, job.priority, job.supplier_record)
+        resumed.future = job.future
+        resumed.enqueued_at = job.enqueued_at
+        resumed.findings = findings if findings is not None else job.findings
+        SCHEDULER_PREEMPTIONS.inc()
+        logger.info("Backfill audit preempted", supplier=job.supplier_name,
+                    resumes_at="audit" if resumed.findings is not None else "investigation")
+        with self._cond:
+            self.preemptions += 1
+            self._queues[job.priority].appendleft(resumed)
+            SCHEDULER_QUEUE_DEPTH.labels(priority=job.priority.value).inc()
+            self._cond.notify_all()
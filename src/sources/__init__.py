@@ -0,0 +1,46 @@
+"""
+Intelligence source adapters for the Investigator.
+
+Sources:
+- NewsAPIAdapter: news search clients
+- LambdaNewsAdapter: the news search Lambda
+- NGOFeedAdapter: NGO report feeds (RSS/Atom)
+- SanctionsListAdapter: sanctions lists (JSON/CSV)
+- FileCorpusAdapter: local article archives (JSON Lines)
+- CorpusIndexAdapter: offline corpus in an on-disk inverted index
+"""
+
+from src.sources.adapters import (
+    CallableSourceAdapter,
+    FileCorpusAdapter,
+    LambdaNewsAdapter,
+    NewsAPIAdapter,
+    NGOFeedAdapter,
+    SanctionsListAdapter,
+)
+from src.sources.base import (
+    CATEGORY_KEYWORDS,
+    PartialResults,
+    SourceAdapter,
+    classify_category,
+    normalize_finding,
+)
+from src.sources.index import CorpusIndex, CorpusIndexAdapter
+from src.sources.registry import SourceRegistry
+
+__all__ = [
+    "CATEGORY_KEYWORDS",
+    "PartialResults",
+    "SourceAdapter",
+    "SourceRegistry",
+    "classify_category",
+    "normalize_finding",
+    "CallableSourceAdapter",
+    "NewsAPIAdapter",
+    "LambdaNewsAdapter",
+    "NGOFeedAdapter",
+    "SanctionsListAdapter",
+    "FileCorpusAdapter",
+    "CorpusIndex",
+    "CorpusIndexAdapter",
+]
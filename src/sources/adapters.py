@@ -0,0 +1,269 @@
+"""
+Built-in Investigator source adapters.
+
+- NewsAPIAdapter: any client exposing ``search_news(supplier_name)``
+- LambdaNewsAdapter: the news search Lambda (AWS_NEWS_SEARCH_LAMBDA_ARN)
+- CallableSourceAdapter: wraps a plain function (e.g. the mock search)
+- NGOFeedAdapter: RSS/Atom feed of NGO reports, refreshed periodically
+- SanctionsListAdapter: JSON or CSV sanctions list matched on names and aliases
+- FileCorpusAdapter: JSON Lines archive of articles scanned for mentions
+"""
+
+import csv
+import json
+import threading
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src.sources.base import PartialResults, SourceAdapter, mentions
+from src.utils.aws_clients import invoke_news_search
+from src.utils.deadline import remaining_time
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.lower().replace(",", " ").replace(".", " ").split())
+
+
+class NewsAPIAdapter(SourceAdapter):
+    """News search client exposing ``search_news(supplier_name)``."""
+
+    name = "news"
+    shared_limiter = "news"
+
+    def __init__(self, client: Any, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.client = client
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        return self.client.search_news(supplier_name)
+
+
+class LambdaNewsAdapter(SourceAdapter):
+    """
+    News search Lambda invoked directly (see ``invoke_news_search``).
+
+    The invocation already holds the shared "news" quota and goes through
+    the "news_lambda" breaker, so the adapter takes no quota of its own.
+    Results the Lambda marks ``partial`` (categories that failed or were cut
+    off by the budget) come back as ``PartialResults``.
+    """
+
+    name = "news"
+
+    def __init__(
+        self,
+        function_name: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        date_range: str = "2y",
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            function_name: Lambda name or ARN (defaults to AWS_NEWS_SEARCH_LAMBDA_ARN)
+            categories: Categories to search (defaults to the Lambda's own)
+            date_range: Look-back window, e.g. "2y" or "90d"
+        """
+        super().__init__(**kwargs)
+        self.function_name = function_name
+        self.categories = categories
+        self.date_range = date_range
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        result = invoke_news_search(
+            supplier_name,
+            categories=self.categories,
+            date_range=self.date_range,
+            function_name=self.function_name,
+        )
+        findings = result.get("findings") or []
+        if result.get("partial"):
+            return PartialResults(findings, result.get("errors") or ["incomplete search"])
+        return findings
+
+
+class CallableSourceAdapter(SourceAdapter):
+    """Adapter around a ``fn(supplier_name) -> findings`` function."""
+
+    def __init__(self, name: str, fn: Callable[[str], List[Dict[str, Any]]], **kwargs: Any):
+        super().__init__(name=name, **kwargs)
+        self.fn = fn
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        return self.fn(supplier_name)
+
+
+class _Reloading(ABC):
+    """Loads a resource once and reloads it when ``_stamp()`` changes."""
+
+    def __init__(self) -> None:
+        self._loaded: Optional[Tuple[Any, Any]] = None
+        self._load_lock = threading.Lock()
+
+    @abstractmethod
+    def _stamp(self) -> Any:
+        """Version of the resource, e.g. its mtime; a change triggers a reload."""
+
+    @abstractmethod
+    def _load(self) -> Any:
+        """Read the resource."""
+
+    def _current(self) -> Any:
+        stamp = self._stamp()
+        loaded = self._loaded
+        if loaded is None or loaded[0] != stamp:
+            with self._load_lock:
+                loaded = self._loaded
+                if loaded is None or loaded[0] != stamp:
+                    loaded = self._loaded = (stamp, self._load())
+        return loaded[1]
+
+
+class NGOFeedAdapter(_Reloading, SourceAdapter):
+    """
+    NGO report feed (RSS 2.0 or Atom) from a URL or local file.
+
+    The feed is fetched at most once per ``refresh_seconds`` and shared by
+    every audit; items mentioning the supplier become findings.
+    """
+
+    name = "ngo"
+
+    def __init__(
+        self,
+        feed: Union[str, Path],
+        source_label: str = "NGO Report",
+        refresh_seconds: float = 900.0,
+        **kwargs: Any,
+    ):
+        SourceAdapter.__init__(self, **kwargs)
+        _Reloading.__init__(self)
+        self.feed = str(feed)
+        self.source_label = source_label
+        self.refresh_seconds = refresh_seconds
+
+    def _stamp(self) -> Any:
+        return int(time.time() // self.refresh_seconds)
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if "://" in self.feed:
+            timeout = remaining_time() or self.timeout_seconds
+            with urllib.request.urlopen(self.feed, timeout=timeout) as response:
+                return self.parse(response.read())
+        return self.parse(Path(self.feed).read_bytes())
+
+    def parse(self, document: bytes) -> List[Dict[str, Any]]:
+        """Parse RSS ``<item>`` or Atom ``<entry>`` elements into raw findings."""
+        root = ET.fromstring(document)
+        items = []
+        for item in root.iter("item"):
+            items.append({
+                "date": item.findtext("pubDate"),
+                "source": item.findtext("author") or self.source_label,
+                "title": item.findtext("title") or "",
+                "description": item.findtext("description") or "",
+                "category": item.findtext("category"),
+                "url": item.findtext("link"),
+            })
+        for entry in root.iter(f"{_ATOM}entry"):
+            link = entry.find(f"{_ATOM}link")
+            items.append({
+                "date": entry.findtext(f"{_ATOM}updated") or entry.findtext(f"{_ATOM}published"),
+                "source": entry.findtext(f"{_ATOM}author/{_ATOM}name") or self.source_label,
+                "title": entry.findtext(f"{_ATOM}title") or "",
+                "description": entry.findtext(f"{_ATOM}summary") or "",
+                "category": None,
+                "url": link.get("href") if link is not None else None,
+            })
+        return items
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        results = []
+        for item in self._current():
+            text = f"{item['title']} {item['description']}"
+            if mentions(text, supplier_name):
+                results.append({**item, "snippet": item["title"] or item["description"]})
+        return results
+
+
+class SanctionsListAdapter(_Reloading, SourceAdapter):
+    """
+    Sanctions list matched on normalised supplier names and aliases.
+
+    Accepts a JSON list of ``{"name", "aliases", "program", "listed_on", "url"}``
+    entries or a CSV with the same columns (aliases separated by ``;``).
+    The file is re-read when it changes.
+    """
+
+    name = "sanctions"
+
+    def __init__(self, path: Union[str, Path], list_name: str = "Sanctions List", **kwargs: Any):
+        SourceAdapter.__init__(self, priority=kwargs.pop("priority", 10), **kwargs)
+        _Reloading.__init__(self)
+        self.path = Path(path)
+        self.list_name = list_name
+
+    def _stamp(self) -> Any:
+        return self.path.stat().st_mtime_ns
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.path.suffix.lower() == ".csv":
+            with self.path.open(newline="", encoding="utf-8") as f:
+                entries = list(csv.DictReader(f))
+            for entry in entries:
+                entry["aliases"] = [a for a in (entry.get("aliases") or "").split(";") if a.strip()]
+        else:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        index: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            for name in [entry["name"], *entry.get("aliases", [])]:
+                index[_normalize_name(name)] = entry
+        return index
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        entry = self._current().get(_normalize_name(supplier_name))
+        if entry is None:
+            return []
+        program = f" under the {entry['program']} program" if entry.get("program") else ""
+        return [{
+            "date": entry.get("listed_on"),
+            "source": self.list_name,
+            "snippet": f"{supplier_name} is listed on the {self.list_name}{program} as {entry['name']}.",
+            "category": "Governance",
+            "url": entry.get("url"),
+        }]
+
+
+class FileCorpusAdapter(_Reloading, SourceAdapter):
+    """
+    Local archive of articles in JSON Lines format.
+
+    Each line holds ``date``, ``source``, ``title`` or ``snippet``, optional
+    ``body``, ``category`` and ``url``. Documents mentioning the supplier
+    become findings. The archive is re-read when it changes.
+    """
+
+    name = "corpus"
+
+    def __init__(self, path: Union[str, Path], **kwargs: Any):
+        SourceAdapter.__init__(self, **kwargs)
+        _Reloading.__init__(self)
+        self.path = Path(path)
+
+    def _stamp(self) -> Any:
+        return self.path.stat().st_mtime_ns
+
+    def _load(self) -> List[Dict[str, Any]]:
+        with self.path.open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        return [
+            doc for doc in self._current()
+            if mentions(f"{doc.get('title', '')} {doc.get('snippet', '')} {doc.get('body', '')}", supplier_name)
+        ]
@@ -0,0 +1,204 @@
+"""
+Source adapter base class and finding normalisation.
+
+Every intelligence source (news API, NGO feed, sanctions list, local
+corpus) is wrapped in a SourceAdapter. The adapter declares its own
+timeout, merge priority and quota, and returns raw findings that
+``normalize_finding`` coerces into the ``Finding`` shape.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, ContextManager, Dict, Iterable, List, Optional
+
+from pydantic import ValidationError as PydanticValidationError
+
+from src.config import get_settings
+from src.models import Category, Finding
+from src.utils.rate_limit import ServiceLimiter, get_rate_limiter
+
+# Mirrors the per-category queries in infrastructure/lambda/news_search.py
+CATEGORY_KEYWORDS: Dict[Category, List[str]] = {
+    Category.LABOR: ["labor", "workers", "strike", "wages", "safety", "union"],
+    Category.ENVIRONMENT: ["pollution", "environmental", "emissions", "fine", "epa"],
+    Category.GOVERNANCE: ["corruption", "bribery", "fraud", "ethics", "scandal"],
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric terms, as matched by the keyword queries and the corpus index."""
+    return _WORD.findall(text.lower())
+
+
+def classify_category(text: str, default: Category = Category.GOVERNANCE) -> Category:
+    """Category whose keywords occur most often in ``text`` (ties go to the first listed)."""
+    words = tokenize(text)
+    best, best_hits = default, 0
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        hits = sum(words.count(keyword) for keyword in keywords)
+        if hits > best_hits:
+            best, best_hits = category, hits
+    return best
+
+
+def normalize_date(value: Any) -> str:
+    """ISO timestamps, RFC 822 feed dates and datetimes become ``YYYY-MM-DD``."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    text = str(value or "").strip()
+    if not text:
+        return ""
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(text).date().isoformat()
+    except (TypeError, ValueError):
+        return text
+
+
+def normalize_finding(raw: Dict[str, Any], default_source: str) -> Optional[Dict[str, Any]]:
+    """
+    Coerce an adapter's raw finding into the ``Finding`` shape.
+
+    Missing sources fall back to ``default_source``; missing or unknown
+    categories are inferred from the text with CATEGORY_KEYWORDS.
+
+    Returns:
+        Finding dict, or None if the finding has no usable text
+    """
+    snippet = " ".join(str(raw.get("snippet") or raw.get("title") or "").split())
+    if not snippet:
+        return None
+    category = raw.get("category")
+    try:
+        category = Category(category) if category else classify_category(snippet)
+    except ValueError:
+        category = classify_category(f"{category} {snippet}")
+    try:
+        finding = Finding(
+            date=normalize_date(raw.get("date")),
+            source=str(raw.get("source") or default_source),
+            snippet=snippet,
+            title=" ".join(str(raw.get("title") or "").split()) or None,
+            category=category,
+            url=raw.get("url") or None,
+        )
+    except PydanticValidationError:
+        return None
+    return finding.model_dump(mode="json")
+
+
+class PartialResults(list):
+    """
+    Findings from a source that only partly answered.
+
+    Adapters return it in place of a plain list when some of their queries
+    failed or ran out of time; the source is then reported ``partial`` and
+    the audit degraded, with ``errors`` saying what was missed.
+    """
+
+    def __init__(self, findings: Iterable[Dict[str, Any]] = (), errors: Iterable[str] = ()):
+        super().__init__(findings)
+        self.errors = list(errors)
+
+
+def mentions(text: str, supplier_name: str) -> bool:
+    """True if ``supplier_name`` appears in ``text`` as whole words (case-insensitive)."""
+    words = tokenize(supplier_name)
+    if not words:
+        return False
+    pattern = r"\b" + r"\W+".join(map(re.escape, words)) + r"\b"
+    return re.search(pattern, text.lower()) is not None
+
+
+class SourceAdapter(ABC):
+    """
+    Base class for Investigator intelligence sources.
+
+    Subclasses implement ``search``. Adapters run concurrently; each call is
+    bounded by ``timeout_seconds`` (and the audit deadline), guarded by a
+    circuit breaker named after the adapter and rate limited by its quota.
+
+    Attributes:
+        name: Source name used in report ``sources``, breakers and caches
+        priority: Merge order; lower values win when sources report the
+            same article
+        timeout_seconds: Per-call budget; slower calls are cut off
+        max_results: Findings kept per call
+        shared_limiter: Process-wide limiter (see src.utils.rate_limit)
+            used when no quota is given, e.g. "news"; None means unlimited
+        protected: Whether calls go through the breaker, hedging and the
+            findings cache; off for in-process sources such as the mock
+    """
+
+    name = "source"
+    shared_limiter: Optional[str] = None
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        priority: int = 100,
+        timeout_seconds: Optional[float] = None,
+        max_results: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        max_concurrency: int = 10,
+        protected: bool = True,
+    ):
+        """
+        Args:
+            name: Overrides the class default name
+            priority: Merge priority (lower first)
+            timeout_seconds: Defaults to APP_SOURCE_TIMEOUT_SECONDS
+            max_results: Defaults to APP_SOURCE_MAX_RESULTS
+            requests_per_second: Own call quota; when unset the adapter
+                uses ``shared_limiter``, if any
+            max_concurrency: Concurrent calls allowed under its own quota
+            protected: False to call ``search`` directly, with no breaker,
+                hedging or findings cache
+        """
+        app = get_settings().app
+        self.name = name or self.name
+        self.priority = priority
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else app.source_timeout_seconds
+        self.max_results = max_results if max_results is not None else app.source_max_results
+        self.protected = protected
+        self._limiter = (
+            ServiceLimiter(self.name, requests_per_second, max_concurrency)
+            if requests_per_second is not None else None
+        )
+
+    @property
+    def limiter(self) -> Optional[ServiceLimiter]:
+        if self._limiter is None and self.shared_limiter is not None:
+            return get_rate_limiter(self.shared_limiter)
+        return self._limiter
+
+    def limit(self, timeout: Optional[float] = None) -> ContextManager[None]:
+        """Hold the adapter's quota for one call (no-op when unlimited)."""
+        limiter = self.limiter
+        return limiter.limit(timeout=timeout) if limiter is not None else nullcontext()
+
+    @property
+    def operation(self) -> str:
+        """Span name of one call, e.g. "news.search"."""
+        return f"{self.name}.search"
+
+    @abstractmethod
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        """
+        Return raw findings about the supplier.
+
+        Raw findings are dicts with any of ``date``, ``source``,
+        ``snippet`` (or ``title``), ``category`` and ``url``. Return
+        ``PartialResults`` if only some of the source answered.
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, priority={self.priority})"
@@ -0,0 +1,539 @@
+"""
+On-disk inverted index over an offline news/NGO corpus.
+
+Lets the Investigator run against an archive of articles and NGO reports
+instead of live APIs (air-gapped deployments, cost control). Appends write
+immutable segments, so the index grows incrementally; ``compact`` merges
+them. Postings, dates and document offsets are memory-mapped, so opening a
+multi-million document index is cheap and queries touch only the pages
+they need.
+
+Queries mirror the Lambda's NewsAPI search (``"<supplier>" AND (<category
+keywords>)``): documents must contain every term of the supplier name and
+are scored by CATEGORY_KEYWORDS hits, which also pick the finding's
+category when the document has none.
+
+Layout:
+    <directory>/manifest.json       segment names and document counts
+    <directory>/seg-000001/
+        terms.json                  term -> [start, count] into docids/tfs
+        docids.bin                  uint32 segment-local doc ids, ascending per term
+        tfs.bin                     uint32 term frequencies, parallel to docids
+        dates.bin                   int32 date ordinal per document (0 = unknown)
+        offsets.bin                 uint64 byte offset of each document in docs.jsonl
+        docs.jsonl                  stored fields, one document per line
+
+Binary files use the host's byte order; an index is not portable between
+little- and big-endian machines. One writer per index at a time.
+
+Usage:
+    python -m src.sources.index add /data/corpus-index articles.jsonl
+    python -m src.sources.index search /data/corpus-index "Acme Corp" --from 2024-01-01
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import shutil
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.exceptions import ValidationError
+from src.logging_config import configure_logging, get_logger
+from src.models import Category
+from src.sources.base import (
+    CATEGORY_KEYWORDS,
+    SourceAdapter,
+    classify_category,
+    normalize_date,
+    tokenize,
+)
+
+logger = get_logger(__name__)
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+# Saturation constant for keyword term frequency (as in BM25's k1)
+_TF_SATURATION = 1.2
+# Extra score when the full supplier name appears verbatim in the headline
+_PHRASE_BOOST = 1.0
+
+
+def _date_ordinal(value: Any) -> int:
+    try:
+        return date.fromisoformat(normalize_date(value)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def _document_text(doc: Dict[str, Any]) -> str:
+    return " ".join(str(doc.get(field) or "") for field in ("title", "snippet", "body"))
+
+
+def _stored_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields kept in docs.jsonl; bodies are indexed but not stored."""
+    snippet = doc.get("snippet") or doc.get("title") or str(doc.get("body") or "")[:280]
+    return {
+        "date": normalize_date(doc.get("date")),
+        "source": doc.get("source"),
+        "snippet": " ".join(str(snippet).split()),
+        "category": doc.get("category"),
+        "url": doc.get("url"),
+    }
+
+
+class _Segment:
+    """Read-only view of one immutable segment; arrays are memory-mapped."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.terms: Dict[str, List[int]] = json.loads((path / "terms.json").read_text(encoding="utf-8"))
+        self._files: List[Any] = []
+        self._maps: List[mmap.mmap] = []
+        self.docids = self._map("docids.bin", "I")
+        self.tfs = self._map("tfs.bin", "I")
+        self.dates = self._map("dates.bin", "i")
+        self.offsets = self._map("offsets.bin", "Q")
+        self._docs = self._map("docs.jsonl", "B")
+        self.size = len(self.dates)
+
+    def _map(self, name: str, typecode: str) -> Sequence[int]:
+        f = open(self.path / name, "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return array(typecode)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+    def postings(self, term: str) -> Optional[Tuple[Sequence[int], Sequence[int]]]:
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        start, count = entry
+        return self.docids[start:start + count], self.tfs[start:start + count]
+
+    def document(self, doc_id: int) -> Dict[str, Any]:
+        return json.loads(bytes(self._docs[self.offsets[doc_id]:self.offsets[doc_id + 1]]))
+
+    def raw_documents(self) -> bytes:
+        return bytes(self._docs)
+
+    def close(self) -> None:
+        for view in (self.docids, self.tfs, self.dates, self.offsets, self._docs):
+            if isinstance(view, memoryview):
+                view.release()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A caller still holds a postings slice; the map closes when it is collected
+                pass
+        for f in self._files:
+            f.close()
+
+
+def _write_segment(
+    path: Path,
+    postings: Dict[str, Tuple[array, array]],
+    dates: array,
+    docs: bytes,
+    offsets: array,
+) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    terms: Dict[str, List[int]] = {}
+    docids, tfs = array("I"), array("I")
+    for term in sorted(postings):
+        ids, freqs = postings[term]
+        terms[term] = [len(docids), len(ids)]
+        docids.extend(ids)
+        tfs.extend(freqs)
+    (tmp / "terms.json").write_text(json.dumps(terms, separators=(",", ":")), encoding="utf-8")
+    for name, values in (("docids.bin", docids), ("tfs.bin", tfs), ("dates.bin", dates), ("offsets.bin", offsets)):
+        with open(tmp / name, "wb") as f:
+            values.tofile(f)
+    (tmp / "docs.jsonl").write_bytes(docs)
+    os.replace(tmp, path)
+
+
+class CorpusIndex:
+    """
+    Segmented inverted index with memory-mapped postings.
+
+    Readers pick up segments appended by another process on their next
+    query (the manifest is re-read when it changes).
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Open or create an index.
+
+        Args:
+            directory: Index directory (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._segments: Dict[str, _Segment] = {}
+        self._manifest: Dict[str, Any] = {"version": FORMAT_VERSION, "segments": []}
+        self._manifest_stamp: Optional[Tuple[int, int]] = None
+        self._refresh()
+
+    def _refresh(self) -> List[_Segment]:
+        path = self.directory / MANIFEST
+        try:
+            stat = path.stat()
+            # The manifest is replaced, never rewritten, so the inode changes on every commit
+            stamp: Optional[Tuple[int, int]] = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            if stamp != self._manifest_stamp:
+                if stamp is not None:
+                    manifest = json.loads(path.read_text(encoding="utf-8"))
+                    if manifest.get("version") != FORMAT_VERSION:
+                        raise ValidationError(
+                            f"Unsupported corpus index version {manifest.get('version')} in {self.directory}"
+                        )
+                    self._manifest = manifest
+                names = {segment["name"] for segment in self._manifest["segments"]}
+                for name in list(self._segments):
+                    if name not in names:
+                        self._segments.pop(name).close()
+                for name in names - set(self._segments):
+                    self._segments[name] = _Segment(self.directory / name)
+                self._manifest_stamp = stamp
+            return [self._segments[segment["name"]] for segment in self._manifest["segments"]]
+
+    def _write_manifest(self, segments: List[Dict[str, Any]]) -> None:
+        manifest = {"version": FORMAT_VERSION, "segments": segments}
+        tmp = self.directory / f".{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, self.directory / MANIFEST)
+
+    def _next_segment_name(self) -> str:
+        numbers = [int(s["name"].split("-")[1]) for s in self._manifest["segments"]]
+        existing = [int(p.name.split("-")[1]) for p in self.directory.glob("seg-*")]
+        return f"seg-{max(numbers + existing, default=0) + 1:06d}"
+
+    @property
+    def document_count(self) -> int:
+        self._refresh()
+        return sum(segment["documents"] for segment in self._manifest["segments"])
+
+    def __len__(self) -> int:
+        return self.document_count
+
+    def append(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index documents as a new segment.
+
+        Each document may carry ``date``, ``source``, ``title``, ``snippet``,
+        ``body``, ``category`` and ``url``; title, snippet and body are
+        indexed.
+
+        Returns:
+            Number of documents added
+        """
+        postings: Dict[str, Tuple[array, array]] = defaultdict(lambda: (array("I"), array("I")))
+        dates, offsets = array("i"), array("Q", [0])
+        lines: List[bytes] = []
+        for doc_id, doc in enumerate(documents):
+            for term, count in Counter(tokenize(_document_text(doc))).items():
+                ids, freqs = postings[term]
+                ids.append(doc_id)
+                freqs.append(count)
+            dates.append(_date_ordinal(doc.get("date")))
+            line = json.dumps(_stored_fields(doc), separators=(",", ":")).encode("utf-8") + b"\n"
+            lines.append(line)
+            offsets.append(offsets[-1] + len(line))
+        if not lines:
+            return 0
+
+        with self._lock:
+            self._refresh()
+            name = self._next_segment_name()
+            _write_segment(self.directory / name, postings, dates, b"".join(lines), offsets)
+            self._write_manifest(self._manifest["segments"] + [{"name": name, "documents": len(lines)}])
+            self._refresh()
+        logger.info("Corpus segment written", index=str(self.directory), segment=name, documents=len(lines))
+        return len(lines)
+
+    def compact(self) -> None:
+        """Merge all segments into one (queries touch one set of postings)."""
+        with self._lock:
+            segments = self._refresh()
+            if len(segments) < 2:
+                return
+            postings: Dict[str, Tuple[array, array]] = defaultdict(lambda: (array("I"), array("I")))
+            dates, offsets = array("i"), array("Q", [0])
+            docs: List[bytes] = []
+            base = 0
+            for segment in segments:
+                for term, (start, count) in segment.terms.items():
+                    ids, freqs = postings[term]
+                    ids.extend(doc_id + base for doc_id in segment.docids[start:start + count])
+                    freqs.extend(segment.tfs[start:start + count])
+                dates.extend(segment.dates)
+                raw = segment.raw_documents()
+                docs.append(raw)
+                shift = offsets[-1]
+                offsets.extend(shift + offset for offset in segment.offsets[1:])
+                base += segment.size
+
+            name = self._next_segment_name()
+            _write_segment(self.directory / name, postings, dates, b"".join(docs), offsets)
+            old = [segment["name"] for segment in self._manifest["segments"]]
+            self._write_manifest([{"name": name, "documents": base}])
+            self._refresh()
+            for stale in old:
+                shutil.rmtree(self.directory / stale, ignore_errors=True)
+        logger.info("Corpus index compacted", index=str(self.directory), segments=len(old), documents=base)
+
+    def search(
+        self,
+        supplier_name: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 50,
+        categories: Optional[Iterable[Union[Category, str]]] = None,
+        require_keywords: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find documents about a supplier.
+
+        Args:
+            supplier_name: Every term of the name must occur in the document
+            date_from: Earliest publication date (inclusive)
+            date_to: Latest publication date (inclusive)
+            limit: Maximum findings returned
+            categories: Categories whose keywords boost the score (default: all)
+            require_keywords: Keep only documents with at least one category
+                keyword, exactly like the Lambda's per-category queries
+
+        Returns:
+            Findings (``date``, ``source``, ``snippet``, ``category``, ``url``)
+            ordered by score, then most recent first
+        """
+        name_terms = list(dict.fromkeys(tokenize(supplier_name)))
+        if not name_terms or limit <= 0:
+            return []
+        wanted = [Category(c) for c in categories] if categories is not None else list(CATEGORY_KEYWORDS)
+        lo = date_from.toordinal() if date_from else None
+        hi = date_to.toordinal() if date_to else None
+        phrase = " ".join(name_terms)
+
+        segments = self._refresh()
+        total = sum(segment.size for segment in segments) or 1
+        df: Counter = Counter()
+        for segment in segments:
+            for keywords in CATEGORY_KEYWORDS.values():
+                for keyword in keywords:
+                    entry = segment.terms.get(keyword)
+                    if entry:
+                        df[keyword] += entry[1]
+        idf = {term: math.log(1 + total / count) for term, count in df.items()}
+
+        scored: List[Tuple[float, int, int, int, Optional[Category]]] = []
+        for seg_index, segment in enumerate(segments):
+            candidates = self._candidates(segment, name_terms, lo, hi)
+            if not candidates:
+                continue
+            boosts = {
+                category: self._keyword_scores(segment, candidates, CATEGORY_KEYWORDS[category], idf)
+                for category in wanted
+            }
+            for doc_id in candidates:
+                per_category = {category: scores.get(doc_id, 0.0) for category, scores in boosts.items()}
+                score = sum(per_category.values())
+                if require_keywords and score == 0:
+                    continue
+                best = max(per_category, key=per_category.get) if score > 0 else None
+                scored.append((score, segment.dates[doc_id], seg_index, doc_id, best))
+
+        results = []
+        for score, _, seg_index, doc_id, best in heapq.nlargest(limit * 2, scored, key=lambda r: (r[0], r[1])):
+            doc = segments[seg_index].document(doc_id)
+            if phrase in " ".join(tokenize(doc["snippet"])):
+                score += _PHRASE_BOOST
+            results.append((score, doc, best))
+        results.sort(key=lambda r: (r[0], r[1]["date"]), reverse=True)
+
+        findings = []
+        for _, doc, best in results[:limit]:
+            category = doc.get("category") or (best.value if best else classify_category(doc["snippet"]).value)
+            findings.append({**doc, "category": category})
+        return findings
+
+    @staticmethod
+    def _candidates(segment: _Segment, terms: List[str], lo: Optional[int], hi: Optional[int]) -> List[int]:
+        """Ascending doc ids containing every term, within the date range."""
+        lists = []
+        for term in terms:
+            entry = segment.postings(term)
+            if entry is None:
+                return []
+            lists.append(entry[0])
+        lists.sort(key=len)
+        matches: Iterable[int] = lists[0]
+        for ids in lists[1:]:
+            matches = CorpusIndex._intersect(matches, ids)
+        dates = segment.dates
+        return [
+            doc_id for doc_id in matches
+            if (lo is None or lo <= dates[doc_id]) and (hi is None or 0 < dates[doc_id] <= hi)
+        ]
+
+    @staticmethod
+    def _intersect(small: Iterable[int], ids: Sequence[int]) -> List[int]:
+        """Ascending ids present in both; ``small`` must ascend."""
+        small = small if isinstance(small, list) else list(small)
+        if len(small) * max(1, len(ids)).bit_length() < len(ids):
+            # Few candidates: gallop through the long list from the last hit
+            matches, position = [], 0
+            for doc_id in small:
+                position = bisect_left(ids, doc_id, position)
+                if position == len(ids):
+                    break
+                if ids[position] == doc_id:
+                    matches.append(doc_id)
+            return matches
+        # Comparable sizes: a set intersection runs the loop in C
+        return sorted(set(small).intersection(ids))
+
+    @staticmethod
+    def _keyword_scores(
+        segment: _Segment, candidates: List[int], keywords: List[str], idf: Dict[str, float]
+    ) -> Dict[int, float]:
+        scores: Dict[int, float] = defaultdict(float)
+        candidate_set = None
+        for keyword in keywords:
+            entry = segment.postings(keyword)
+            if entry is None:
+                continue
+            ids, tfs = entry
+            weight = idf.get(keyword, 0.0)
+            if len(ids) <= len(candidates):
+                candidate_set = candidate_set or set(candidates)
+                hits = ((doc_id, tfs[i]) for i, doc_id in enumerate(ids) if doc_id in candidate_set)
+            else:
+                hits = CorpusIndex._lookup(candidates, ids, tfs)
+            for doc_id, tf in hits:
+                scores[doc_id] += weight * tf / (tf + _TF_SATURATION)
+        return scores
+
+    @staticmethod
+    def _lookup(candidates: List[int], ids: Sequence[int], tfs: Sequence[int]) -> Iterator[Tuple[int, int]]:
+        position = 0
+        for doc_id in candidates:
+            position = bisect_left(ids, doc_id, position)
+            if position == len(ids):
+                return
+            if ids[position] == doc_id:
+                yield doc_id, tfs[position]
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments.clear()
+            self._manifest_stamp = None
+
+
+class CorpusIndexAdapter(SourceAdapter):
+    """Investigator source backed by a CorpusIndex."""
+
+    name = "corpus_index"
+
+    def __init__(
+        self,
+        index: Union[CorpusIndex, str, Path],
+        days_back: Optional[int] = None,
+        require_keywords: bool = False,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            index: Open index or its directory
+            days_back: Only documents from the last ``days_back`` days
+            require_keywords: Drop documents without any category keyword
+        """
+        super().__init__(**kwargs)
+        self.index = index if isinstance(index, CorpusIndex) else CorpusIndex(index)
+        self.days_back = days_back
+        self.require_keywords = require_keywords
+
+    def search(self, supplier_name: str) -> List[Dict[str, Any]]:
+        date_from = date.today() - timedelta(days=self.days_back) if self.days_back is not None else None
+        return self.index.search(
+            supplier_name,
+            date_from=date_from,
+            limit=self.max_results,
+            require_keywords=self.require_keywords,
+        )
+
+
+def _read_jsonl(path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        batch = []
+        for line in f:
+            if line.strip():
+                batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.sources.index",
+        description="Build and query the offline corpus index.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Append JSON Lines documents ('-' for stdin)")
+    add.add_argument("index")
+    add.add_argument("files", nargs="+")
+    add.add_argument("--batch-size", type=int, default=100_000, help="Documents per segment")
+    search = commands.add_parser("search", help="Query the index for a supplier")
+    search.add_argument("index")
+    search.add_argument("supplier")
+    search.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    search.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    search.add_argument("--limit", type=int, default=20)
+    compact = commands.add_parser("compact", help="Merge all segments into one")
+    compact.add_argument("index")
+    args = parser.parse_args(argv)
+    configure_logging(stream=sys.stderr)
+
+    index = CorpusIndex(args.index)
+    if args.command == "add":
+        added = sum(index.append(batch) for path in args.files for batch in _read_jsonl(path, args.batch_size))
+        print(f"Indexed {added} documents ({index.document_count} total)", file=sys.stderr)
+    elif args.command == "search":
+        for finding in index.search(args.supplier, args.date_from, args.date_to, args.limit):
+            print(json.dumps(finding))
+    else:
+        index.compact()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
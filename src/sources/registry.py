@@ -0,0 +1,256 @@
+"""
+Concurrent fan-out over the Investigator's source adapters.
+
+``SourceRegistry.search`` calls every registered adapter at once, each
+under its own timeout, circuit breaker and quota, then merges the results
+in priority order. An audit therefore waits for the slowest adapter at
+most, and an adapter still running at its timeout is cut off. Failed or
+cut-off sources fall back to their last good findings (marked stale) or
+are reported missing; sources that only partly answered are reported
+partial.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import get_settings
+from src.exceptions import ConfigurationError, TimeoutError
+from src.logging_config import get_logger
+from src.sources.base import PartialResults, SourceAdapter, normalize_finding
+from src.utils.circuit_breaker import protected_call
+from src.utils.deadline import deadline_scope, mark_degraded, remaining_time
+from src.utils.findings_cache import FindingsCache, get_findings_cache
+from src.utils.metrics import get_registry
+from src.utils.tracing import span
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+SOURCE_CALLS = _metrics.counter(
+    "sentinel_source_calls_total", "Investigator source calls by outcome", ["source", "status"]
+)
+SOURCE_FINDINGS = _metrics.counter(
+    "sentinel_source_findings_total", "Normalised findings returned per source", ["source"]
+)
+
+SourceStatus = Dict[str, Any]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().app.source_max_workers,
+                    thread_name_prefix="sentinel-source",
+                )
+    return _executor
+
+
+def _dedup_key(finding: Dict[str, Any]) -> str:
+    return finding.get("url") or " ".join(finding["snippet"].lower().split())
+
+
+def dedupe_findings(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop repeated findings, keeping the first of each.
+
+    A finding repeats an earlier one if it has the same URL or the same
+    normalised snippet (syndicated copies of one story under different URLs).
+    """
+    seen = set()
+    kept = []
+    for finding in findings:
+        keys = {_dedup_key(finding), " ".join(str(finding.get("snippet", "")).lower().split())}
+        keys.discard("")
+        if keys & seen:
+            continue
+        seen.update(keys)
+        kept.append(finding)
+    return kept
+
+
+class SourceRegistry:
+    """Ordered set of source adapters searched concurrently."""
+
+    def __init__(
+        self,
+        adapters: Optional[List[SourceAdapter]] = None,
+        findings_cache: Optional[FindingsCache] = None,
+    ):
+        """
+        Args:
+            adapters: Initial adapters (names must be unique)
+            findings_cache: Last good findings per source, served when a
+                source fails (defaults to the process-wide cache)
+        """
+        self.findings_cache = findings_cache if findings_cache is not None else get_findings_cache()
+        self._adapters: Dict[str, SourceAdapter] = {}
+        self._lock = threading.Lock()
+        for adapter in adapters or []:
+            self.register(adapter)
+
+    def register(self, adapter: SourceAdapter) -> None:
+        """
+        Add an adapter.
+
+        Raises:
+            ConfigurationError: If an adapter with the same name is registered
+        """
+        with self._lock:
+            if adapter.name in self._adapters:
+                raise ConfigurationError(f"Source '{adapter.name}' is already registered")
+            self._adapters[adapter.name] = adapter
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._adapters.pop(name, None)
+
+    def adapters(self) -> List[SourceAdapter]:
+        """Registered adapters in merge order (priority, then registration)."""
+        with self._lock:
+            adapters = list(self._adapters.values())
+        return sorted(adapters, key=lambda adapter: adapter.priority)
+
+    def __len__(self) -> int:
+        return len(self._adapters)
+
+    def search(self, supplier_name: str) -> Tuple[List[Dict[str, Any]], List[SourceStatus]]:
+        """
+        Search every source concurrently and merge the findings.
+
+        Returns:
+            ``(findings, sources)``: normalised, de-duplicated findings with
+            higher-priority sources first, and one status per source
+            (``ok``, ``partial``, ``stale`` or ``missing``)
+        """
+        adapters = self.adapters()
+        if not adapters:
+            return [], []
+
+        if len(adapters) == 1:
+            outcomes = {adapters[0].name: self._call(adapters[0], supplier_name)}
+        else:
+            outcomes = self._fan_out(adapters, supplier_name)
+
+        findings: List[Dict[str, Any]] = []
+        seen = set()
+        statuses = []
+        for adapter in adapters:
+            results, status = self._resolve(adapter, supplier_name, *outcomes[adapter.name])
+            statuses.append(status)
+            for finding in results:
+                key = _dedup_key(finding)
+                if key not in seen:
+                    seen.add(key)
+                    findings.append(finding)
+        return findings, statuses
+
+    def _fan_out(
+        self, adapters: List[SourceAdapter], supplier_name: str
+    ) -> Dict[str, Tuple[Optional[List[Dict[str, Any]]], Optional[BaseException]]]:
+        executor = _get_executor()
+        futures = {
+            adapter.name: executor.submit(
+                contextvars.copy_context().run, self._call, adapter, supplier_name
+            )
+            for adapter in adapters
+        }
+        budget = max(adapter.timeout_seconds for adapter in adapters)
+        remaining = remaining_time()
+        if remaining is not None:
+            budget = min(budget, remaining)
+        wait(futures.values(), timeout=budget)
+
+        outcomes = {}
+        for adapter in adapters:
+            future = futures[adapter.name]
+            if future.done():
+                outcomes[adapter.name] = future.result()
+            else:
+                # Adapters bound themselves by their own timeout; this only
+                # catches one that is still wrapping up at the cut-off
+                outcomes[adapter.name] = (None, TimeoutError(f"{adapter.name} cut off after {budget:.1f}s"))
+        return outcomes
+
+    def _call(
+        self, adapter: SourceAdapter, supplier_name: str
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[BaseException]]:
+        """Run one adapter under its own timeout; never raises."""
+        def request() -> List[Dict[str, Any]]:
+            with adapter.limit(timeout=remaining_time()), span(adapter.operation):
+                return adapter.search(supplier_name)
+
+        started = time.perf_counter()
+        try:
+            if adapter.protected:
+                with deadline_scope(adapter.timeout_seconds):
+                    raw = protected_call(adapter.name, request, adapter.operation)
+            else:
+                raw = request()
+        except Exception as e:
+            logger.warning(
+                "Source search failed",
+                source=adapter.name,
+                supplier=supplier_name,
+                error=str(e),
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+            return None, e
+
+        findings = []
+        for item in raw or []:
+            finding = normalize_finding(item, default_source=adapter.name)
+            if finding is not None:
+                findings.append(finding)
+            if len(findings) >= adapter.max_results:
+                break
+        if isinstance(raw, PartialResults):
+            findings = PartialResults(findings, raw.errors)
+        return findings, None
+
+    def _resolve(
+        self,
+        adapter: SourceAdapter,
+        supplier_name: str,
+        findings: Optional[List[Dict[str, Any]]],
+        error: Optional[BaseException],
+    ) -> Tuple[List[Dict[str, Any]], SourceStatus]:
+        """Cache a success, or fall back to cached findings after a failure."""
+        stage = f"investigate.{adapter.name}"
+        if isinstance(findings, PartialResults):
+            # Not last-known-good: a later failure should fall back to a full answer
+            reason = "; ".join(findings.errors)
+            SOURCE_CALLS.labels(source=adapter.name, status="partial").inc()
+            SOURCE_FINDINGS.labels(source=adapter.name).inc(len(findings))
+            mark_degraded(stage, f"partial results: {reason}")
+            return list(findings), {"name": adapter.name, "status": "partial", "error": reason}
+
+        if error is None:
+            if adapter.protected:
+                self.findings_cache.put(supplier_name, findings, source=adapter.name)
+            SOURCE_CALLS.labels(source=adapter.name, status="ok").inc()
+            SOURCE_FINDINGS.labels(source=adapter.name).inc(len(findings))
+            return findings, {"name": adapter.name, "status": "ok"}
+
+        cached = self.findings_cache.get(supplier_name, source=adapter.name) if adapter.protected else None
+        if cached is None:
+            SOURCE_CALLS.labels(source=adapter.name, status="missing").inc()
+            mark_degraded(stage, f"no findings available: {error}")
+            return [], {"name": adapter.name, "status": "missing", "error": str(error)}
+
+        SOURCE_CALLS.labels(source=adapter.name, status="stale").inc()
+        mark_degraded(stage, f"served cached findings from {cached.fetched_at}: {error}")
+        return list(cached.findings), {
+            "name": adapter.name,
+            "status": "stale",
+            "fetched_at": cached.fetched_at,
+            "error": str(error),
+        }
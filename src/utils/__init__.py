@@ -6,14 +6,40 @@ from src.utils.aws_clients import (
     get_boto3_session,
     get_lambda_client,
     invoke_bedrock_agent,
+    invoke_news_search,
     query_knowledge_base,
 )
+from src.utils.circuit_breaker import (
+    circuit_breaker_metrics,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from src.utils.client_manager import (
+    ClientManager,
+    get_client_manager,
+    reset_client_manager,
+)
+from src.utils.rate_limit import (
+    get_rate_limiter,
+    rate_limiter_metrics,
+    reset_rate_limiters,
+)
 
 __all__ = [
     "get_boto3_session",
     "get_bedrock_agent_runtime_client",
     "get_bedrock_agent_client",
     "get_lambda_client",
+    "ClientManager",
+    "get_client_manager",
+    "reset_client_manager",
     "invoke_bedrock_agent",
+    "invoke_news_search",
     "query_knowledge_base",
+    "get_rate_limiter",
+    "rate_limiter_metrics",
+    "reset_rate_limiters",
+    "get_circuit_breaker",
+    "circuit_breaker_metrics",
+    "reset_circuit_breakers",
 ]
@@ -0,0 +1,336 @@
+"""
+Columnar export of audit history for analytics.
+
+Writes audit reports, findings and violations into Hive-partitioned
+Parquet datasets so risk trends, violation frequency by source and
+severity distributions can be analysed in bulk.
+
+Layout:
+    <root>/reports/audit_date=2024-11-26/supplier_category=Textiles/part-<id>-<n>.parquet
+    <root>/findings/audit_date=.../supplier_category=.../part-<id>.parquet
+    <root>/violations/audit_date=.../supplier_category=.../part-<id>.parquet
+
+Requires the optional ``pyarrow`` dependency (``pip install ethos-chain[analytics]``).
+"""
+
+import hashlib
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from src.exceptions import ConfigurationError
+from src.logging_config import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    ds = None
+    pq = None
+
+logger = get_logger(__name__)
+
+TABLES = ("reports", "findings", "violations")
+UNKNOWN_CATEGORY = "Unknown"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ConfigurationError(
+            "pyarrow is required for audit history export; "
+            "install it with `pip install ethos-chain[analytics]`"
+        )
+
+
+def _enum_type() -> Any:
+    """Dictionary-encoded string type used for low-cardinality enum columns."""
+    return pa.dictionary(pa.int16(), pa.string())
+
+
+def _schemas() -> Dict[str, Any]:
+    """Arrow schemas for the exported tables (partition columns excluded)."""
+    enum = _enum_type()
+    return {
+        "reports": pa.schema([
+            ("audit_id", pa.string()),
+            ("supplier", pa.string()),
+            ("timestamp", pa.string()),
+            ("overall_risk", enum),
+            ("labor_score", pa.int16()),
+            ("environment_score", pa.int16()),
+            ("governance_score", pa.int16()),
+            ("finding_count", pa.int32()),
+            ("violation_count", pa.int32()),
+            ("degraded", pa.bool_()),
+        ]),
+        "findings": pa.schema([
+            ("audit_id", pa.string()),
+            ("supplier", pa.string()),
+            ("finding_index", pa.int32()),
+            ("date", pa.string()),
+            ("source", enum),
+            ("category", enum),
+            ("snippet", pa.string()),
+            ("url", pa.string()),
+        ]),
+        "violations": pa.schema([
+            ("audit_id", pa.string()),
+            ("supplier", pa.string()),
+            ("date", pa.string()),
+            ("source", enum),
+            ("category", enum),
+            ("severity", enum),
+            ("evidence_type", enum),
+            ("policy_reference", enum),
+        ]),
+    }
+
+
+def make_audit_id(report: Dict[str, Any]) -> str:
+    """Derive a stable audit ID from the supplier name and report timestamp."""
+    if report.get("audit_id"):
+        return str(report["audit_id"])
+    key = f"{report.get('supplier', '')}|{report.get('timestamp', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _as_dict(report: Any) -> Dict[str, Any]:
+    """Accept either a report dict or an ``AuditReport`` model."""
+    if hasattr(report, "model_dump"):
+        return report.model_dump(by_alias=True, mode="json")
+    return report
+
+
+class AuditHistoryExporter:
+    """
+    Streaming Parquet writer for audit history.
+
+    Rows are buffered per table and partition and flushed as row groups
+    once ``batch_size`` rows accumulate, so memory stays bounded by
+    ``batch_size`` x open partitions regardless of history size. At most
+    ``max_open_files`` Parquet files are open at once: the least recently
+    written one is closed to make room, and later rows for its partition
+    go to a new part file. Each exporter session writes new
+    ``part-*.parquet`` files, which makes repeated exports incremental
+    appends to the same dataset root.
+
+    Usage:
+        with AuditHistoryExporter("exports/") as exporter:
+            for report in reports:
+                exporter.write_report(report, supplier_category="Textiles")
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        batch_size: int = 10_000,
+        supplier_categories: Optional[Dict[str, str]] = None,
+        compression: str = "zstd",
+        max_open_files: int = 64,
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            root: Dataset root directory
+            batch_size: Rows buffered per partition before a row group is written
+            supplier_categories: Optional supplier name -> category lookup,
+                e.g. built from data/sample/suppliers.json
+            compression: Parquet compression codec
+            max_open_files: Parquet writers kept open across partitions
+        """
+        _require_pyarrow()
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.supplier_categories = supplier_categories or {}
+        self.compression = compression
+        self.max_open_files = max(1, max_open_files)
+        self._schemas = _schemas()
+        self._session_id = uuid.uuid4().hex[:12]
+        self._buffers: Dict[Tuple[str, str, str], Dict[str, List[Any]]] = {}
+        self._writers: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        # Part files started per partition, so a reopened partition never overwrites one
+        self._parts: Dict[Tuple[str, str, str], int] = {}
+        self.rows_written = {table: 0 for table in TABLES}
+
+    def __enter__(self) -> "AuditHistoryExporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_report(self, report: Any, supplier_category: Optional[str] = None) -> str:
+        """
+        Append one audit report (and its findings and violations).
+
+        Args:
+            report: Report dict from SupervisorAgent or an AuditReport model
+            supplier_category: Supplier industry category used for partitioning
+
+        Returns:
+            The audit ID linking the report, finding and violation rows
+        """
+        report = _as_dict(report)
+        supplier = report.get("supplier", "")
+        category = (
+            supplier_category
+            or self.supplier_categories.get(supplier)
+            or UNKNOWN_CATEGORY
+        )
+        partition = (str(report.get("timestamp", ""))[:10] or "unknown", category)
+        audit_id = make_audit_id(report)
+        findings = report.get("findings", [])
+        violations = report.get("violations", [])
+        scores = report.get("risk_scores", {})
+
+        self._append("reports", partition, {
+            "audit_id": audit_id,
+            "supplier": supplier,
+            "timestamp": report.get("timestamp"),
+            "overall_risk": report.get("overall_risk"),
+            "labor_score": scores.get("Labor", 0),
+            "environment_score": scores.get("Environment", 0),
+            "governance_score": scores.get("Governance", 0),
+            "finding_count": len(findings),
+            "violation_count": len(violations),
+            "degraded": bool(report.get("degraded", False)),
+        })
+
+        for index, finding in enumerate(findings):
+            self._append("findings", partition, {
+                "audit_id": audit_id,
+                "supplier": supplier,
+                "finding_index": index,
+                "date": finding.get("date"),
+                "source": finding.get("source"),
+                "category": finding.get("category"),
+                "snippet": finding.get("snippet"),
+                "url": finding.get("url"),
+            })
+
+        for violation in violations:
+            finding = violation.get("finding", {})
+            self._append("violations", partition, {
+                "audit_id": audit_id,
+                "supplier": supplier,
+                "date": finding.get("date"),
+                "source": finding.get("source"),
+                "category": finding.get("category"),
+                "severity": violation.get("severity"),
+                "evidence_type": violation.get("evidence_type"),
+                "policy_reference": violation.get("policy_reference"),
+            })
+
+        return audit_id
+
+    def write_reports(self, reports: Any, supplier_category: Optional[str] = None) -> int:
+        """Append reports from any iterable (e.g. a generator). Returns the count."""
+        count = 0
+        for report in reports:
+            self.write_report(report, supplier_category=supplier_category)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """Write all buffered rows as row groups."""
+        for key in list(self._buffers):
+            self._flush_partition(key)
+
+    def close(self) -> None:
+        """Flush pending rows and finalize all open Parquet files."""
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        logger.info("Closed audit history exporter", root=str(self.root), **self.rows_written)
+
+    def _append(self, table: str, partition: Tuple[str, str], row: Dict[str, Any]) -> None:
+        key = (table, partition[0], partition[1])
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = {name: [] for name in self._schemas[table].names}
+            self._buffers[key] = buffer
+        for name, column in buffer.items():
+            column.append(row.get(name))
+        if len(buffer["audit_id"]) >= self.batch_size:
+            self._flush_partition(key)
+
+    def _flush_partition(self, key: Tuple[str, str, str]) -> None:
+        buffer = self._buffers.pop(key, None)
+        if not buffer or not buffer["audit_id"]:
+            return
+        table, date, category = key
+        schema = self._schemas[table]
+        writer = self._writers.get(key)
+        if writer is None:
+            while len(self._writers) >= self.max_open_files:
+                _key, oldest = self._writers.popitem(last=False)
+                oldest.close()
+            directory = (
+                self.root / table
+                / f"audit_date={quote(date, safe='')}"
+                / f"supplier_category={quote(category, safe='')}"
+            )
+            directory.mkdir(parents=True, exist_ok=True)
+            part = self._parts.get(key, 0)
+            self._parts[key] = part + 1
+            writer = pq.ParquetWriter(
+                str(directory / f"part-{self._session_id}-{part}.parquet"),
+                schema,
+                compression=self.compression,
+            )
+            self._writers[key] = writer
+        else:
+            self._writers.move_to_end(key)
+        writer.write_table(pa.Table.from_pydict(buffer, schema=schema))
+        self.rows_written[table] += len(buffer["audit_id"])
+
+
+def _dataset(root: Union[str, Path], table: str) -> Any:
+    _require_pyarrow()
+    if table not in TABLES:
+        raise ValueError(f"Unknown table '{table}', expected one of {TABLES}")
+    return ds.dataset(str(Path(root) / table), format="parquet", partitioning="hive")
+
+
+def read_history(
+    root: Union[str, Path],
+    table: str = "findings",
+    columns: Optional[List[str]] = None,
+    where: Any = None,
+) -> Any:
+    """
+    Read an exported table with memory-mapped I/O.
+
+    Args:
+        root: Dataset root used by AuditHistoryExporter
+        table: One of "reports", "findings", "violations"
+        columns: Optional column projection
+        where: Optional pyarrow.dataset filter expression, e.g.
+            ``pyarrow.dataset.field("audit_date") >= "2024-01-01"``
+
+    Returns:
+        pyarrow.Table including the ``audit_date`` and ``supplier_category`` partition columns
+    """
+    _dataset(root, table)
+    return pq.read_table(
+        str(Path(root) / table),
+        columns=columns,
+        filters=where,
+        memory_map=True,
+        partitioning="hive",
+    )
+
+
+def iter_history_batches(
+    root: Union[str, Path],
+    table: str = "findings",
+    columns: Optional[List[str]] = None,
+    where: Any = None,
+) -> Iterator[Any]:
+    """Stream an exported table as record batches without materializing it."""
+    yield from _dataset(root, table).to_batches(columns=columns, filter=where)
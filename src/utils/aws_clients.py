@@ -5,24 +5,54 @@ Provides factory functions for creating AWS service clients with
 proper configuration and error handling.
 """
 
-from functools import lru_cache
-from typing import Any, Optional
+import json
+from typing import Any, List, Optional
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 from src.config import get_settings
-from src.exceptions import AWSServiceError, BedrockAgentError, KnowledgeBaseError
+from src.exceptions import (
+    AWSServiceError,
+    BedrockAgentError,
+    ConfigurationError,
+    KnowledgeBaseError,
+    TimeoutError,
+)
 from src.logging_config import get_logger
+from src.utils.circuit_breaker import get_circuit_breaker
+from src.utils.client_manager import get_client_manager
+from src.utils.deadline import remaining_time
+from src.utils.metrics import get_registry
+from src.utils.rate_limit import get_rate_limiter
+from src.utils.tracing import span
 
 logger = get_logger(__name__)
 
+_metrics = get_registry()
+AWS_CALLS = _metrics.counter(
+    "sentinel_aws_calls_total", "Outbound AWS calls by operation", ["operation"]
+)
+AWS_ERRORS = _metrics.counter(
+    "sentinel_aws_errors_total",
+    "Failed AWS operations by Sentinel exception class",
+    ["operation", "exception"]
+)
+
+
+def _count_error(operation: str, error: Exception) -> Exception:
+    """Record a failed AWS operation and return the error for raising."""
+    AWS_ERRORS.labels(operation=operation, exception=type(error).__name__).inc()
+    return error
+
 
-@lru_cache(maxsize=10)
 def get_boto3_session(profile_name: Optional[str] = None) -> boto3.Session:
     """
-    Get or create a boto3 session.
+    Get the calling thread's (or event loop's) boto3 session.
+    
+    boto3 sessions are not thread-safe, so each thread gets its own from the
+    shared ClientManager.
     
     Args:
         profile_name: Optional AWS profile name
@@ -30,32 +60,26 @@ def get_boto3_session(profile_name: Optional[str] = None) -> boto3.Session:
     Returns:
         Configured boto3 Session
     """
-    settings = get_settings()
-    profile = profile_name or settings.aws.profile
-    
     try:
-        if profile:
-            session = boto3.Session(
-                profile_name=profile,
-                region_name=settings.aws.region
-            )
-            logger.info("Created boto3 session", profile=profile, region=settings.aws.region)
-        else:
-            session = boto3.Session(region_name=settings.aws.region)
-            logger.info("Created boto3 session", region=settings.aws.region)
-        
-        return session
+        return get_client_manager().session(profile_name)
     except Exception as e:
         logger.error("Failed to create boto3 session", error=str(e))
-        raise AWSServiceError(f"Failed to create AWS session: {e}")
+        raise _count_error("create_session", AWSServiceError(f"Failed to create AWS session: {e}"))
 
 
-def get_boto_config() -> Config:
+def get_boto_config(max_pool_connections: Optional[int] = None) -> Config:
     """
     Get boto3 client configuration.
     
+    Client-side rate adaptation is handled process-wide by
+    src.utils.rate_limit, so botocore uses standard (non-adaptive) retries.
+    
+    Args:
+        max_pool_connections: HTTP connections per client
+            (defaults to AWS_MAX_POOL_CONNECTIONS)
+    
     Returns:
-        Botocore Config object with retry and timeout settings
+        Botocore Config object with retry, timeout and pool settings
     """
     settings = get_settings()
     
@@ -63,86 +87,90 @@ def get_boto_config() -> Config:
         region_name=settings.aws.region,
         retries={
             'max_attempts': 3,
-            'mode': 'adaptive'
+            'mode': 'standard'
         },
         connect_timeout=5,
         read_timeout=settings.app.audit_timeout_seconds,
+        max_pool_connections=max_pool_connections or settings.aws.max_pool_connections,
     )
 
 
-@lru_cache(maxsize=5)
+def _session_client(session: boto3.Session, service_name: str, **kwargs: Any) -> Any:
+    """Client from a caller-owned session; the caller manages its lifetime."""
+    return session.client(service_name, config=get_boto_config(), **kwargs)
+
+
 def get_bedrock_agent_runtime_client(session: Optional[boto3.Session] = None) -> Any:
     """
     Get Bedrock Agent Runtime client.
     
+    Without ``session`` the client is the calling thread's (or event loop's)
+    shared client from the ClientManager.
+    
     Args:
-        session: Optional boto3 session
+        session: Optional boto3 session; a new client is built from it
         
     Returns:
         Bedrock Agent Runtime client
     """
     settings = get_settings()
-    
-    if session is None:
-        session = get_boto3_session()
+    kwargs = {}
+    if settings.aws.bedrock_runtime_endpoint:
+        kwargs["endpoint_url"] = settings.aws.bedrock_runtime_endpoint
     
     try:
-        client = session.client(
-            'bedrock-agent-runtime',
-            config=get_boto_config(),
-            endpoint_url=settings.aws.bedrock_runtime_endpoint
-        )
-        logger.info("Created Bedrock Agent Runtime client")
-        return client
+        if session is not None:
+            return _session_client(session, 'bedrock-agent-runtime', **kwargs)
+        return get_client_manager().client('bedrock-agent-runtime', **kwargs)
     except (BotoCoreError, ClientError) as e:
         logger.error("Failed to create Bedrock Agent Runtime client", error=str(e))
-        raise BedrockAgentError(f"Failed to create Bedrock Agent Runtime client: {e}")
+        raise _count_error(
+            "create_client",
+            BedrockAgentError(f"Failed to create Bedrock Agent Runtime client: {e}")
+        )
 
 
-@lru_cache(maxsize=5)
 def get_bedrock_agent_client(session: Optional[boto3.Session] = None) -> Any:
     """
     Get Bedrock Agent client for management operations.
     
     Args:
-        session: Optional boto3 session
+        session: Optional boto3 session; a new client is built from it
         
     Returns:
         Bedrock Agent client
     """
-    if session is None:
-        session = get_boto3_session()
-    
     try:
-        client = session.client('bedrock-agent', config=get_boto_config())
-        logger.info("Created Bedrock Agent client")
-        return client
+        if session is not None:
+            return _session_client(session, 'bedrock-agent')
+        return get_client_manager().client('bedrock-agent')
     except (BotoCoreError, ClientError) as e:
         logger.error("Failed to create Bedrock Agent client", error=str(e))
-        raise BedrockAgentError(f"Failed to create Bedrock Agent client: {e}")
+        raise _count_error(
+            "create_client",
+            BedrockAgentError(f"Failed to create Bedrock Agent client: {e}")
+        )
 
 
-@lru_cache(maxsize=5)
 def get_lambda_client(session: Optional[boto3.Session] = None) -> Any:
     """
     Get Lambda client.
     
     Args:
-        session: Optional boto3 session
+        session: Optional boto3 session; a new client is built from it
         
     Returns:
         Lambda client
     """
-    if session is None:
-        session = get_boto3_session()
-    
     try:
-        client = session.client('lambda', config=get_boto_config())
-        logger.info("Created Lambda client")
-        return client
+        if session is not None:
+            return _session_client(session, 'lambda')
+        return get_client_manager().client('lambda')
     except (BotoCoreError, ClientError) as e:
         logger.error("Failed to create Lambda client", error=str(e))
-        raise AWSServiceError(f"Failed to create Lambda client: {e}")
+        raise _count_error(
+            "create_client", AWSServiceError(f"Failed to create Lambda client: {e}")
+        )
 
 
 def invoke_bedrock_agent(
@@ -150,7 +178,8 @@ def invoke_bedrock_agent(
     agent_alias_id: str,
     session_id: str,
     input_text: str,
-    session: Optional[boto3.Session] = None
+    session: Optional[boto3.Session] = None,
+    client: Optional[Any] = None
 ) -> dict:
     """
     Invoke a Bedrock Agent.
@@ -161,6 +190,7 @@ def invoke_bedrock_agent(
         session_id: Session ID for the conversation
         input_text: Input text to send to the agent
         session: Optional boto3 session
+        client: Optional Bedrock Agent Runtime client (e.g. one owned by an agent)
         
     Returns:
         Agent response dict
@@ -168,7 +198,7 @@ def invoke_bedrock_agent(
     Raises:
         BedrockAgentError: If invocation fails
     """
-    client = get_bedrock_agent_runtime_client(session)
+    client = client or get_bedrock_agent_runtime_client(session)
     
     try:
         logger.info(
@@ -177,12 +207,18 @@ def invoke_bedrock_agent(
             session_id=session_id
         )
         
-        response = client.invoke_agent(
-            agentId=agent_id,
-            agentAliasId=agent_alias_id,
-            sessionId=session_id,
-            inputText=input_text
-        )
+        AWS_CALLS.labels(operation="invoke_agent").inc()
+        breaker = get_circuit_breaker("bedrock")
+        limiter = get_rate_limiter("bedrock")
+        # Waiting on our own rate limiter says nothing about the service's health
+        with breaker.guard(ignore=(TimeoutError,)), limiter.limit(timeout=remaining_time()):
+            with span("aws.bedrock.invoke_agent"):
+                response = client.invoke_agent(
+                    agentId=agent_id,
+                    agentAliasId=agent_alias_id,
+                    sessionId=session_id,
+                    inputText=input_text
+                )
         
         logger.info("Bedrock agent invoked successfully", agent_id=agent_id)
         return response
@@ -193,14 +229,17 @@ def invoke_bedrock_agent(
             agent_id=agent_id,
             error=str(e)
         )
-        raise BedrockAgentError(f"Failed to invoke agent {agent_id}: {e}")
+        raise _count_error(
+            "invoke_agent", BedrockAgentError(f"Failed to invoke agent {agent_id}: {e}")
+        )
 
 
 def query_knowledge_base(
     knowledge_base_id: str,
     query_text: str,
     max_results: int = 5,
-    session: Optional[boto3.Session] = None
+    session: Optional[boto3.Session] = None,
+    client: Optional[Any] = None
 ) -> dict:
     """
     Query a Bedrock Knowledge Base.
@@ -210,6 +249,7 @@ def query_knowledge_base(
         query_text: Query text
         max_results: Maximum number of results to return
         session: Optional boto3 session
+        client: Optional Bedrock Agent Runtime client (e.g. one owned by an agent)
         
     Returns:
         Query results dict
@@ -217,7 +257,7 @@ def query_knowledge_base(
     Raises:
         KnowledgeBaseError: If query fails
     """
-    client = get_bedrock_agent_runtime_client(session)
+    client = client or get_bedrock_agent_runtime_client(session)
     
     try:
         logger.info(
@@ -226,15 +266,20 @@ def query_knowledge_base(
             query=query_text
         )
         
-        response = client.retrieve(
-            knowledgeBaseId=knowledge_base_id,
-            retrievalQuery={'text': query_text},
-            retrievalConfiguration={
-                'vectorSearchConfiguration': {
-                    'numberOfResults': max_results
-                }
-            }
-        )
+        AWS_CALLS.labels(operation="retrieve").inc()
+        breaker = get_circuit_breaker("knowledge_base")
+        limiter = get_rate_limiter("knowledge_base")
+        with breaker.guard(ignore=(TimeoutError,)), limiter.limit(timeout=remaining_time()):
+            with span("aws.knowledge_base.retrieve"):
+                response = client.retrieve(
+                    knowledgeBaseId=knowledge_base_id,
+                    retrievalQuery={'text': query_text},
+                    retrievalConfiguration={
+                        'vectorSearchConfiguration': {
+                            'numberOfResults': max_results
+                        }
+                    }
+                )
         
         logger.info(
             "Knowledge Base queried successfully",
@@ -249,4 +294,106 @@ def query_knowledge_base(
             kb_id=knowledge_base_id,
             error=str(e)
         )
-        raise KnowledgeBaseError(f"Failed to query Knowledge Base {knowledge_base_id}: {e}")
+        raise _count_error(
+            "retrieve",
+            KnowledgeBaseError(f"Failed to query Knowledge Base {knowledge_base_id}: {e}")
+        )
+
+
+def invoke_news_search(
+    supplier_name: str,
+    categories: Optional[List[str]] = None,
+    date_range: str = "2y",
+    function_name: Optional[str] = None,
+    session: Optional[boto3.Session] = None
+) -> dict:
+    """
+    Invoke the news search Lambda directly.
+    
+    Inside an audit deadline the remaining budget is sent as
+    ``timeout_seconds`` so the Lambda can stop searching in time.
+    
+    Args:
+        supplier_name: Supplier to search for
+        categories: Categories to search (defaults to labor/environment/governance)
+        date_range: Look-back window, e.g. "2y" or "90d"
+        function_name: Lambda name or ARN (defaults to AWS_NEWS_SEARCH_LAMBDA_ARN)
+        session: Optional boto3 session
+        
+    Returns:
+        Search results dict with "supplier" and "findings"
+        
+    Raises:
+        ConfigurationError: If no Lambda is configured
+        AWSServiceError: If the invocation or the search fails
+    """
+    settings = get_settings()
+    function_name = function_name or settings.aws.news_search_lambda_arn
+    if not function_name:
+        raise ConfigurationError("AWS_NEWS_SEARCH_LAMBDA_ARN is not configured")
+    
+    client = get_lambda_client(session)
+    payload = {
+        "supplier_name": supplier_name,
+        "categories": categories or ["labor", "environment", "governance"],
+        "date_range": date_range,
+    }
+    budget = remaining_time()
+    if budget is not None:
+        payload["timeout_seconds"] = round(budget, 3)
+    
+    try:
+        logger.info("Invoking news search Lambda", supplier=supplier_name)
+        
+        AWS_CALLS.labels(operation="news_search").inc()
+        breaker = get_circuit_breaker("news_lambda")
+        limiter = get_rate_limiter("news")
+        # A crashed Lambda, a malformed answer or a 5xx is an unhealthy
+        # dependency, so those are raised inside the guard to count as failures
+        with breaker.guard(ignore=(TimeoutError,)), limiter.limit(timeout=remaining_time()):
+            with span("aws.lambda.news_search"):
+                response = client.invoke(
+                    FunctionName=function_name,
+                    InvocationType="RequestResponse",
+                    Payload=json.dumps(payload).encode("utf-8")
+                )
+            try:
+                body = json.loads(response["Payload"].read())
+            except ValueError as e:
+                raise AWSServiceError(f"News search Lambda returned invalid JSON: {e}") from e
+            if response.get("FunctionError"):
+                raise AWSServiceError(f"News search Lambda failed: {body}")
+            
+            # The Lambda answers in Bedrock action group format
+            try:
+                api_response = body.get("response", {})
+                status = api_response.get("httpStatusCode", 200)
+                result = json.loads(api_response["responseBody"]["application/json"]["body"])
+                if not isinstance(result, dict):
+                    raise TypeError(f"expected a JSON object, got {type(result).__name__}")
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise AWSServiceError(f"Malformed news search Lambda response: {e!r}") from e
+            if status >= 500:
+                raise AWSServiceError(f"News search failed: {result.get('error', 'unknown error')}")
+    except ClientError as e:
+        logger.error("Failed to invoke news search Lambda", supplier=supplier_name, error=str(e))
+        raise _count_error(
+            "news_search", AWSServiceError(f"Failed to invoke news search Lambda: {e}")
+        )
+    except AWSServiceError as e:
+        logger.error("News search Lambda failed", supplier=supplier_name, error=str(e))
+        raise _count_error("news_search", e)
+    
+    if status != 200:
+        # A 4xx is a bad request, not an unhealthy Lambda
+        raise _count_error(
+            "news_search",
+            AWSServiceError(f"News search failed: {result.get('error', 'unknown error')}")
+        )
+    
+    logger.info(
+        "News search Lambda returned",
+        supplier=supplier_name,
+        finding_count=len(result.get("findings", []))
+    )
+    return result
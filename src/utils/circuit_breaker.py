@@ -0,0 +1,231 @@
+"""
+Per-dependency circuit breakers for outbound calls.
+
+Each external dependency (Bedrock, the Knowledge Base, the news Lambda,
+news APIs) gets a breaker shared by every audit in the process:
+
+- CLOSED: calls pass through; consecutive failures are counted.
+- OPEN: after ``failure_threshold`` consecutive failures, calls fail fast
+  with CircuitOpenError for ``recovery_timeout`` seconds instead of
+  waiting out their timeouts.
+- HALF_OPEN: after the cool-down, a limited number of probe calls go
+  through. A success closes the circuit; a failure re-opens it.
+
+Throttling errors do not count as failures; the rate limiters in
+src.utils.rate_limit already back off on those.
+
+Usage:
+    with get_circuit_breaker("knowledge_base").guard():
+        client.retrieve(...)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Tuple, Type, TypeVar
+
+from src.config import get_settings
+from src.exceptions import CircuitOpenError, ConfigurationError, TimeoutError, ValidationError
+from src.logging_config import get_logger
+from src.utils.deadline import current_deadline, hedged_call
+from src.utils.rate_limit import is_throttling_error
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Caller mistakes say nothing about the dependency's health
+_NON_FAILURES = (ConfigurationError, ValidationError, CircuitOpenError)
+
+
+def counts_as_failure(error: BaseException) -> bool:
+    """Return True if an error should count against the dependency's health."""
+    if isinstance(error, _NON_FAILURES):
+        return False
+    return isinstance(error, Exception) and not is_throttling_error(error)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+# Numeric encoding for the state gauge
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open breaker for one dependency."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.opened_total = 0
+        self.rejected_total = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+            logger.info("Circuit half-open", dependency=self.name)
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self.opened_total += 1
+        logger.warning("Circuit opened", dependency=self.name, failures=self._failures)
+
+    def _acquire(self) -> bool:
+        """Admit a call; returns True if it is a half-open probe."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state is CircuitState.CLOSED:
+                return False
+            if self._state is CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected_total += 1
+            retry_in = max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+        raise CircuitOpenError(f"{self.name} circuit is open; retry in {retry_in:.1f}s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state is not CircuitState.CLOSED:
+                logger.info("Circuit closed", dependency=self.name)
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN or (
+                self._state is CircuitState.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._open()
+
+    @contextmanager
+    def guard(self, ignore: Tuple[Type[BaseException], ...] = ()) -> Iterator[None]:
+        """
+        Run a block as one call through the breaker.
+
+        Args:
+            ignore: Extra exception types that should not count as failures
+
+        Raises:
+            CircuitOpenError: If the circuit is open (the block does not run)
+        """
+        probe = self._acquire()
+        try:
+            yield
+        except BaseException as e:
+            if counts_as_failure(e) and not isinstance(e, ignore):
+                self.record_failure()
+            raise
+        else:
+            self.record_success()
+        finally:
+            if probe:
+                with self._lock:
+                    self._probes -= 1
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``fn`` through the breaker."""
+        with self.guard():
+            return fn(*args, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state.value,
+                "state_value": STATE_VALUES[state],
+                "consecutive_failures": self._failures,
+                "opened_total": self.opened_total,
+                "rejected_total": self.rejected_total,
+            }
+
+
+def protected_call(dependency: str, fn: Callable[[], T], operation: str) -> T:
+    """
+    Deadline-bounded, hedged call to ``fn`` through the dependency's breaker.
+
+    Use for clients without their own timeouts (e.g. news APIs): with
+    hedging on, the deadline bounds how long the audit waits. Running out of budget says
+    nothing about the dependency, so a deadline timeout does not count as a
+    failure; errors the dependency raises do.
+
+    Raises:
+        CircuitOpenError: If the circuit is open
+        TimeoutError: If the deadline passes first
+    """
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check(operation)
+    with get_circuit_breaker(dependency).guard(ignore=(TimeoutError,)):
+        return hedged_call(fn, operation)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(dependency: str) -> CircuitBreaker:
+    """
+    Get the shared breaker for a dependency, e.g. "bedrock", "knowledge_base" or "news".
+
+    Returns:
+        CircuitBreaker: Process-wide breaker, created on first use from settings
+    """
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(dependency)
+            if breaker is None:
+                app = get_settings().app
+                breaker = _breakers[dependency] = CircuitBreaker(
+                    dependency,
+                    failure_threshold=app.circuit_failure_threshold,
+                    recovery_timeout=app.circuit_recovery_seconds,
+                )
+    return breaker
+
+
+def set_circuit_breaker(dependency: str, breaker: CircuitBreaker) -> None:
+    """Install a breaker for a dependency (e.g. with custom thresholds or a fake clock)."""
+    with _breakers_lock:
+        _breakers[dependency] = breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Drop all breakers so they are rebuilt closed (useful for testing)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def circuit_breaker_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every breaker created so far, keyed by dependency."""
+    return {name: breaker.metrics() for name, breaker in list(_breakers.items())}
@@ -0,0 +1,285 @@
+"""
+Per-thread and per-event-loop AWS client management.
+
+boto3 sessions are not thread-safe, and a small process-wide LRU of clients
+either shares them across worker threads or keeps re-creating them. The
+ClientManager gives every thread (or running asyncio event loop) its own
+session and one client per service configuration, created on first use and
+reused for the life of that thread or loop. Lookups on the hot path take no
+lock. Clients are closed when their thread exits, their loop is garbage
+collected, or ``close()`` is called, and registered hooks see each client
+being created and closed.
+
+Usage:
+    client = get_client_manager().client("bedrock-agent-runtime")
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from src.config import get_settings
+from src.logging_config import get_logger
+from src.utils.metrics import get_registry
+
+logger = get_logger(__name__)
+
+_metrics = get_registry()
+CLIENTS_CREATED = _metrics.counter(
+    "sentinel_aws_clients_created_total", "AWS clients created by service", ["service"]
+)
+CLIENTS_CLOSED = _metrics.counter(
+    "sentinel_aws_clients_closed_total", "AWS clients closed by service", ["service"]
+)
+CACHE_MISSES = _metrics.counter("sentinel_cache_misses_total", "Cache misses", ["cache"])
+
+ClientKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+ClientHook = Callable[[str, Any], None]
+
+
+def _default_session_factory(profile_name: Optional[str]) -> boto3.Session:
+    settings = get_settings()
+    profile = profile_name or settings.aws.profile
+    if profile:
+        return boto3.Session(profile_name=profile, region_name=settings.aws.region)
+    return boto3.Session(region_name=settings.aws.region)
+
+
+class _Hits:
+    """Cached-client lookups served by one scope; only the owning thread writes it."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+class _Scope:
+    """Sessions and clients owned by one thread or event loop."""
+
+    __slots__ = ("name", "pid", "sessions", "clients", "hits", "__weakref__")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pid = os.getpid()
+        self.sessions: Dict[Optional[str], boto3.Session] = {}
+        self.clients: Dict[ClientKey, Any] = {}
+        self.hits = _Hits()
+
+
+class ClientManager:
+    """
+    Hands out thread-local or loop-local boto3 sessions and clients.
+
+    Code running inside an asyncio event loop shares that loop's clients;
+    any other thread gets its own. Work dispatched to executor threads with
+    ``run_in_executor``/``to_thread`` therefore uses the executor thread's
+    clients, which stay warm across tasks.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[Optional[str]], Any] = _default_session_factory,
+        config_factory: Optional[Callable[[], Config]] = None,
+    ):
+        """
+        Args:
+            session_factory: Builds a session for a profile name (None = default)
+            config_factory: Builds the botocore Config for new clients
+                (defaults to src.utils.aws_clients.get_boto_config)
+        """
+        self._session_factory = session_factory
+        self._config_factory = config_factory
+        self._local = threading.local()
+        self._loop_scopes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Scope]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Strong refs to every scope's client dict so close() can reach them;
+        # the scope objects themselves stay owned by their thread or loop
+        self._live: Dict[int, Tuple[str, Dict[ClientKey, Any], _Hits]] = {}
+        # Hits from scopes that have been released
+        self._retired_hits = 0
+        self._lock = threading.Lock()
+        self._on_create: List[ClientHook] = []
+        self._on_close: List[ClientHook] = []
+
+    # Lifecycle hooks -------------------------------------------------------
+
+    def on_create(self, hook: ClientHook) -> None:
+        """Call ``hook(service_name, client)`` after each client is created."""
+        self._on_create.append(hook)
+
+    def on_close(self, hook: ClientHook) -> None:
+        """Call ``hook(service_name, client)`` before each client is closed."""
+        self._on_close.append(hook)
+
+    # Scope resolution ------------------------------------------------------
+
+    def _new_scope(self, name: str) -> _Scope:
+        scope = _Scope(name)
+        with self._lock:
+            self._live[id(scope)] = (name, scope.clients, scope.hits)
+        weakref.finalize(scope, self._release, id(scope))
+        return scope
+
+    def _scope(self) -> _Scope:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            scope = self._loop_scopes.get(loop)
+            if scope is None:
+                # Only the loop's own thread gets here, but loops on other
+                # threads may be registering at the same time
+                scope = self._new_scope(f"loop-{id(loop):x}")
+                with self._lock:
+                    self._loop_scopes[loop] = scope
+        else:
+            scope = getattr(self._local, "scope", None)
+            if scope is None:
+                scope = self._local.scope = self._new_scope(threading.current_thread().name)
+
+        if scope.pid != os.getpid():
+            # Forked child: the parent's connections are not ours to use or close
+            scope.sessions.clear()
+            scope.clients.clear()
+            scope.pid = os.getpid()
+        return scope
+
+    # Public API ------------------------------------------------------------
+
+    def session(self, profile_name: Optional[str] = None) -> Any:
+        """The calling thread's (or loop's) session for ``profile_name``."""
+        scope = self._scope()
+        session = scope.sessions.get(profile_name)
+        if session is None:
+            session = scope.sessions[profile_name] = self._session_factory(profile_name)
+            logger.info("Created boto3 session", scope=scope.name, profile=profile_name)
+        return session
+
+    def client(self, service_name: str, profile_name: Optional[str] = None, **client_kwargs: Any) -> Any:
+        """
+        The calling thread's (or loop's) client for a service.
+
+        Args:
+            service_name: boto3 service name, e.g. "bedrock-agent-runtime"
+            profile_name: Optional AWS profile
+            **client_kwargs: Extra ``session.client`` arguments (e.g. endpoint_url);
+                each distinct combination gets its own client
+
+        Returns:
+            A boto3 client reused for every call from the same thread or loop
+        """
+        scope = self._scope()
+        key = (service_name, tuple(sorted(client_kwargs.items())) + (("profile", profile_name),))
+        client = scope.clients.get(key)
+        if client is not None:
+            scope.hits.value += 1
+            return client
+
+        CACHE_MISSES.labels(cache="aws_clients").inc()
+        config = self._config_factory() if self._config_factory else _boto_config()
+        client = self.session(profile_name).client(service_name, config=config, **client_kwargs)
+        scope.clients[key] = client
+        CLIENTS_CREATED.labels(service=service_name).inc()
+        logger.info("Created AWS client", service=service_name, scope=scope.name)
+        for hook in self._on_create:
+            hook(service_name, client)
+        return client
+
+    def stats(self) -> Dict[str, Any]:
+        """Live scopes and clients, for diagnostics and tests."""
+        with self._lock:
+            live = list(self._live.values())
+            retired = self._retired_hits
+        return {
+            "scopes": len(live),
+            "clients": sum(len(clients) for _name, clients, _hits in live),
+            "hits": retired + sum(hits.value for _name, _clients, hits in live),
+        }
+
+    def close_current(self) -> None:
+        """Close the calling thread's (or loop's) clients, e.g. when a worker stops."""
+        scope = self._scope()
+        self._close_clients(scope.clients)
+        scope.sessions.clear()
+
+    def close(self) -> None:
+        """Close every client this manager has handed out."""
+        with self._lock:
+            live = list(self._live.values())
+        for _name, clients, _hits in live:
+            self._close_clients(clients)
+
+    # Internals -------------------------------------------------------------
+
+    def _release(self, scope_id: int) -> None:
+        """Finalizer: the owning thread exited or the loop was collected."""
+        with self._lock:
+            entry = self._live.pop(scope_id, None)
+            if entry is not None:
+                self._retired_hits += entry[2].value
+        if entry is not None:
+            self._close_clients(entry[1])
+
+    def _close_clients(self, clients: Dict[ClientKey, Any]) -> None:
+        while clients:
+            try:
+                (service_name, _options), client = clients.popitem()
+            except KeyError:
+                break
+            for hook in self._on_close:
+                hook(service_name, client)
+            close = getattr(client, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning("Failed to close AWS client", service=service_name, error=str(e))
+            CLIENTS_CLOSED.labels(service=service_name).inc()
+
+
+def _boto_config() -> Config:
+    from src.utils.aws_clients import get_boto_config
+
+    return get_boto_config()
+
+
+_manager: Optional[ClientManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_client_manager() -> ClientManager:
+    """
+    Get the global client manager (singleton pattern).
+
+    Returns:
+        ClientManager: Process-wide manager
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ClientManager()
+    return _manager
+
+
+def client_cache_hits() -> int:
+    """Cached-client lookups served by the global manager, for the metrics collector."""
+    return _manager.stats()["hits"] if _manager is not None else 0
+
+
+def reset_client_manager() -> None:
+    """Close all clients and drop the global manager (useful for testing)."""
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        manager.close()
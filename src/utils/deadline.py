@@ -0,0 +1,345 @@
+"""
+Deadline propagation and hedged requests.
+
+An audit runs under a Deadline held in a contextvar. The rate limiters, KB
+retrieval and news search read the remaining budget from it rather than
+each applying its own fixed timeout. When a stage runs out of budget it
+records a degradation on the deadline, and the Supervisor returns the
+partial report flagged as degraded instead of blowing the SLA.
+
+``hedged_call`` cuts tail latency on idempotent reads. If the first request
+has not answered by the operation's observed p95 latency, an identical
+request is sent and whichever answers first wins. A process-wide budget
+keeps hedges to a small fraction of requests.
+
+Usage:
+    with deadline_scope(30) as deadline:
+        context = hedged_call(lambda: query_knowledge_base(kb_id, q), "aws.knowledge_base.retrieve")
+    deadline.degradations  # ["auditor.policy_context: ..."] when the budget ran out
+"""
+
+import contextvars
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+from src.config import get_settings
+from src.exceptions import TimeoutError
+from src.logging_config import get_logger
+from src.utils.metrics import get_registry
+from src.utils.tracing import get_span_recorder
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Observed samples needed before the p95 replaces the configured hedge delay
+HEDGE_MIN_SAMPLES = 20
+
+_metrics = get_registry()
+DEADLINE_EXCEEDED = _metrics.counter(
+    "sentinel_deadline_exceeded_total", "Stages that ran out of audit budget", ["stage"]
+)
+HEDGES_SENT = _metrics.counter(
+    "sentinel_hedged_requests_total", "Duplicate requests sent after the hedge delay", ["operation"]
+)
+HEDGES_WON = _metrics.counter(
+    "sentinel_hedge_wins_total", "Hedged requests that answered before the original", ["operation"]
+)
+HEDGES_OVER_BUDGET = _metrics.counter(
+    "sentinel_hedges_over_budget_total", "Hedges not sent because the hedge budget was spent", ["operation"]
+)
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar("sentinel_deadline", default=None)
+
+
+class Deadline:
+    """Remaining time budget for one audit, plus the stages it had to cut short."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.budget = seconds
+        self._clock = clock
+        self.expires_at = clock() + seconds
+        self._degradations: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def check(self, stage: str) -> None:
+        """
+        Raise if the budget is spent.
+
+        Raises:
+            TimeoutError: If the deadline has passed
+        """
+        if self.expired:
+            DEADLINE_EXCEEDED.labels(stage=stage).inc()
+            raise TimeoutError(f"Audit deadline of {self.budget}s exceeded before {stage}")
+
+    def degrade(self, stage: str, reason: str) -> None:
+        """Record that ``stage`` returned partial results (first reason per stage wins)."""
+        with self._lock:
+            if stage not in self._degradations:
+                self._degradations[stage] = reason
+                logger.warning("Audit degraded", stage=stage, reason=reason)
+
+    @property
+    def degradations(self) -> List[str]:
+        """``"<stage>: <reason>"`` for every degraded stage, in order."""
+        with self._lock:
+            return [f"{stage}: {reason}" for stage, reason in self._degradations.items()]
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[Deadline]:
+    """
+    Run a block under a deadline of ``seconds``.
+
+    A nested scope never extends the enclosing budget: if the outer deadline
+    is sooner, it is reused (degradations included). Otherwise the inner
+    deadline's degradations are copied to the outer one on exit, so the
+    audit's report still lists them.
+    """
+    parent = _current.get()
+    if parent is not None and parent.remaining() <= seconds:
+        yield parent
+        return
+    deadline = Deadline(seconds)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+        if parent is not None:
+            with deadline._lock:
+                degradations = list(deadline._degradations.items())
+            for stage, reason in degradations:
+                parent.degrade(stage, reason)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline bound to the current context, if any."""
+    return _current.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left on the current deadline, or None when unbounded."""
+    deadline = _current.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def mark_degraded(stage: str, reason: str) -> None:
+    """Record a degradation on the current deadline (no-op outside a deadline)."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.degrade(stage, reason)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_primary_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().app.hedge_max_workers,
+                    thread_name_prefix="sentinel-hedge",
+                )
+    return _executor
+
+
+def _get_primary_executor() -> ThreadPoolExecutor:
+    global _primary_executor
+    if _primary_executor is None:
+        with _executor_lock:
+            if _primary_executor is None:
+                # Unbounded: every original request has a caller blocked on it,
+                # so the pool never outgrows the callers, and idle threads are
+                # reused before new ones start
+                _primary_executor = ThreadPoolExecutor(
+                    max_workers=sys.maxsize,
+                    thread_name_prefix="sentinel-request",
+                )
+    return _primary_executor
+
+
+def hedge_delay(operation: str) -> float:
+    """
+    Seconds to wait before hedging ``operation``.
+
+    Uses the p95 of the span of the same name once enough samples exist,
+    otherwise APP_HEDGE_DEFAULT_DELAY_SECONDS.
+    """
+    histogram = get_span_recorder().histogram(operation)
+    if histogram.count >= HEDGE_MIN_SAMPLES:
+        return histogram.percentile(95)
+    return get_settings().app.hedge_default_delay_seconds
+
+
+class HedgeBudget:
+    """
+    Caps hedges at a fraction of requests, process-wide.
+
+    Every request earns ``ratio`` of a token, up to ``burst``, and every
+    hedge spends one. When a dependency slows down across the board, most
+    requests pass their p95 at once; without a cap, hedging would double
+    the load on the dependency just as it struggles.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget; False if it is spent."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+_hedge_budget: Optional[HedgeBudget] = None
+
+
+def get_hedge_budget() -> HedgeBudget:
+    global _hedge_budget
+    if _hedge_budget is None:
+        with _executor_lock:
+            if _hedge_budget is None:
+                _hedge_budget = HedgeBudget(get_settings().app.hedge_budget_ratio)
+    return _hedge_budget
+
+
+def reset_hedge_budget() -> None:
+    """Drop the hedge budget so the next call starts a full one from settings."""
+    global _hedge_budget
+    with _executor_lock:
+        _hedge_budget = None
+
+
+def hedged_call(
+    fn: Callable[[], T],
+    operation: str,
+    hedge_after: Optional[float] = None,
+    max_requests: int = 2,
+) -> T:
+    """
+    Call ``fn`` within the current deadline, hedging slow calls.
+
+    With hedging off, ``fn`` runs on the calling thread. Otherwise the
+    original request runs on its own thread, so it never waits behind
+    hedges, and only the hedges go to the bounded hedge pool
+    (APP_HEDGE_MAX_WORKERS). The hedge delay is counted from when the
+    original starts running. Hedges are capped by APP_HEDGE_BUDGET_RATIO;
+    one that waits for a busy hedge pool until the original answers never
+    runs.
+
+    ``fn`` must be idempotent: a duplicate may run. Once one request
+    answers, the others are cancelled; one already running cannot be
+    interrupted, so it finishes in the background and its result is
+    discarded. The original is not hedged if it fails; the error is
+    raised once every in-flight request has failed.
+
+    Args:
+        fn: Zero-argument callable performing the request
+        operation: Span name of the request (the source of its p95), e.g. "news.search"
+        hedge_after: Hedge delay in seconds (defaults to ``hedge_delay(operation)``)
+        max_requests: Total requests allowed, original included
+
+    Returns:
+        The first successful result
+
+    Raises:
+        TimeoutError: If the deadline passes before any request answers
+    """
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(operation)
+    if not (get_settings().app.hedging_enabled and max_requests > 1):
+        return fn()
+
+    budget = get_hedge_budget()
+    budget.record_request()
+    delay = hedge_after if hedge_after is not None else hedge_delay(operation)
+    settled = threading.Event()
+    running = threading.Event()
+
+    def submit(executor: ThreadPoolExecutor) -> Future:
+        def run() -> T:
+            if settled.is_set():
+                raise CancelledError()
+            running.set()
+            result = fn()
+            # Set before the pool thread can pick up a queued duplicate
+            settled.set()
+            return result
+        # Each request runs in a copy of our context so it sees the deadline and trace
+        return executor.submit(contextvars.copy_context().run, run)
+
+    futures = [submit(_get_primary_executor())]
+    pending = set(futures)
+    first_error: Optional[BaseException] = None
+    try:
+        # The hedge delay counts from when the original starts, not while it waits for a thread
+        if not running.wait(timeout=deadline.remaining() if deadline is not None else None):
+            DEADLINE_EXCEEDED.labels(stage=operation).inc()
+            raise TimeoutError(f"Audit deadline of {deadline.budget}s exceeded waiting to start {operation}")
+        hedge_at = time.monotonic() + delay
+        while pending:
+            remaining = deadline.remaining() if deadline is not None else None
+            can_hedge = len(futures) < max_requests and first_error is None
+            timeouts = [t for t in (max(0.0, hedge_at - time.monotonic()) if can_hedge else None, remaining)
+                        if t is not None]
+            timeout = min(timeouts) if timeouts else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is not futures[0]:
+                        HEDGES_WON.labels(operation=operation).inc()
+                    return future.result()
+                first_error = first_error or error
+
+            if not done:
+                if deadline is not None and deadline.expired:
+                    DEADLINE_EXCEEDED.labels(stage=operation).inc()
+                    raise TimeoutError(f"Audit deadline of {deadline.budget}s exceeded during {operation}")
+                if can_hedge and time.monotonic() >= hedge_at:
+                    if not budget.try_spend():
+                        HEDGES_OVER_BUDGET.labels(operation=operation).inc()
+                        max_requests = len(futures)
+                        continue
+                    HEDGES_SENT.labels(operation=operation).inc()
+                    logger.debug("Hedging slow request", operation=operation, delay_ms=round(delay * 1000, 1))
+                    hedge = submit(_get_executor())
+                    futures.append(hedge)
+                    pending.add(hedge)
+    finally:
+        # Losers still queued never start; one already running finishes and is ignored
+        settled.set()
+        for future in futures:
+            future.cancel()
+
+    raise first_error
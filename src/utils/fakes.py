@@ -0,0 +1,184 @@
+"""
+Local fakes for Bedrock, Knowledge Base and news search.
+
+Offline stand-ins with injectable latency and throttling, used to test
+rate limiting and to exercise the agents without AWS credentials. They
+mirror the boto3 ``bedrock-agent-runtime`` response shapes closely enough
+for the helpers in src.utils.aws_clients.
+"""
+
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+POLICY_PATH = Path(__file__).resolve().parents[2] / "data" / "policies" / "code_of_conduct.md"
+
+
+def throttling_error(operation: str) -> ClientError:
+    """Build the ClientError boto3 raises when a service throttles a call."""
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+        operation,
+    )
+
+
+def load_policy_sections(path: Path = POLICY_PATH) -> List[Dict[str, str]]:
+    """Split the Code of Conduct markdown into ``{"title", "text"}`` sections."""
+    sections: List[Dict[str, str]] = []
+    title, lines = None, []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("### "):
+            if title:
+                sections.append({"title": title, "text": "\n".join(lines).strip()})
+            title, lines = line[4:].strip(), []
+        elif title and not line.startswith("#"):
+            lines.append(line)
+    if title:
+        sections.append({"title": title, "text": "\n".join(lines).strip()})
+    return sections
+
+
+class FakeService:
+    """
+    Base for fakes: injects latency and throttling.
+
+    Throttles a call when more than ``capacity`` calls are in flight, or at
+    random with probability ``throttle_rate``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        capacity: Optional[int] = None,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.capacity = capacity
+        self.calls = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def _enter(self, operation: str) -> None:
+        with self._lock:
+            self.calls += 1
+            over_capacity = self.capacity is not None and self.in_flight >= self.capacity
+            if over_capacity or self._random.random() < self.throttle_rate:
+                self.throttled += 1
+                raise throttling_error(operation)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            self._sleep(delay)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class FakeBedrockAgentRuntime(FakeService):
+    """
+    Fake ``bedrock-agent-runtime`` client supporting ``retrieve`` and ``invoke_agent``.
+
+    ``retrieve`` ranks Code of Conduct sections by keyword overlap with the
+    query. ``invoke_agent`` answers with ``responder(input_text)``.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        policy_sections: Optional[List[Dict[str, str]]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.responder = responder or (lambda text: "[]")
+        self.policy_sections = policy_sections if policy_sections is not None else load_policy_sections()
+
+    def retrieve(
+        self,
+        knowledgeBaseId: str,
+        retrievalQuery: Dict[str, str],
+        retrievalConfiguration: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        self._enter("Retrieve")
+        try:
+            limit = (
+                (retrievalConfiguration or {})
+                .get("vectorSearchConfiguration", {})
+                .get("numberOfResults", 5)
+            )
+            terms = set(re.findall(r"[a-z]+", retrievalQuery.get("text", "").lower()))
+            scored = []
+            for section in self.policy_sections:
+                words = set(re.findall(r"[a-z]+", (section["title"] + " " + section["text"]).lower()))
+                overlap = len(terms & words)
+                scored.append((overlap / (len(terms) or 1), section))
+            scored.sort(key=lambda item: item[0], reverse=True)
+            return {
+                "retrievalResults": [
+                    {
+                        "content": {"text": f"{section['title']}: {section['text']}"},
+                        "location": {"type": "S3", "s3Location": {"uri": f"s3://policies/{section['title']}"}},
+                        "score": round(score, 4),
+                    }
+                    for score, section in scored[:limit]
+                ]
+            }
+        finally:
+            self._exit()
+
+    def invoke_agent(
+        self,
+        agentId: str,
+        agentAliasId: str,
+        sessionId: str,
+        inputText: str,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        self._enter("InvokeAgent")
+        try:
+            text = self.responder(inputText)
+            return {
+                "sessionId": sessionId,
+                "completion": [{"chunk": {"bytes": text.encode("utf-8")}}],
+            }
+        finally:
+            self._exit()
+
+
+class FakeNewsAPI(FakeService):
+    """
+    Fake news search client exposing ``search_news(supplier_name)``.
+
+    Returns the Investigator's mock findings unless ``findings_for`` is given.
+    """
+
+    def __init__(self, findings_for: Optional[Callable[[str], List[Dict[str, Any]]]] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        if findings_for is None:
+            from src.agents.investigator import InvestigatorAgent
+
+            findings_for = InvestigatorAgent()._mock_search
+        self.findings_for = findings_for
+
+    def search_news(self, supplier_name: str) -> List[Dict[str, Any]]:
+        self._enter("SearchNews")
+        try:
+            return self.findings_for(supplier_name)
+        finally:
+            self._exit()
@@ -0,0 +1,84 @@
+"""
+Last-known-good findings per supplier.
+
+When a news source is down or its circuit is open, the Investigator serves
+the most recent successful findings for the supplier from here. The report
+marks the source as stale and records when those findings were fetched.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from src.config import get_settings
+from src.utils.metrics import get_registry
+
+_metrics = get_registry()
+CACHE_HITS = _metrics.counter("sentinel_cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = _metrics.counter("sentinel_cache_misses_total", "Cache misses", ["cache"])
+
+
+class CachedFindings(NamedTuple):
+    findings: List[Dict[str, Any]]
+    fetched_at: str
+
+
+def _normalize(supplier_name: str) -> str:
+    return " ".join(supplier_name.lower().split())
+
+
+class FindingsCache:
+    """Thread-safe LRU of the last successful findings per supplier and source."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, CachedFindings]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, supplier_name: str, findings: List[Dict[str, Any]], source: str = "news") -> None:
+        entry = CachedFindings(
+            list(findings),
+            datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        )
+        key = (source, _normalize(supplier_name))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, supplier_name: str, source: str = "news") -> Optional[CachedFindings]:
+        key = (source, _normalize(supplier_name))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        (CACHE_HITS if entry is not None else CACHE_MISSES).labels(cache="findings").inc()
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[FindingsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_findings_cache() -> FindingsCache:
+    """
+    Get the global findings cache (singleton pattern).
+
+    Returns:
+        FindingsCache: Sized by APP_FINDINGS_CACHE_SIZE
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FindingsCache(get_settings().app.findings_cache_size)
+    return _cache
@@ -0,0 +1,66 @@
+"""
+Consistent hashing of keys onto a changing set of nodes.
+
+Distributed audit workers use it to own a stable slice of the supplier
+universe, so each worker's findings cache, entity-linking directory and
+policy cache stay warm for the same suppliers night after night. Adding or
+removing a worker moves only about 1/N of the suppliers; the rest keep
+their owner.
+
+Usage:
+    ring = HashRing(["worker-0", "worker-1", "worker-2"])
+    ring.node_for("SUP-001")  # -> "worker-1"
+"""
+
+import bisect
+import hashlib
+from typing import Iterable, List, Tuple
+
+DEFAULT_REPLICAS = 128
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS):
+        """
+        Args:
+            nodes: Initial node names
+            replicas: Virtual nodes per node; more gives a more even split
+        """
+        if replicas < 1:
+            raise ValueError("replicas must be >= 1")
+        self.replicas = replicas
+        self._points: List[Tuple[int, str]] = []
+        self._hashes: List[int] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted({node for _point, node in self._points})
+
+    def __len__(self) -> int:
+        return len(self._points) // self.replicas
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        for i in range(self.replicas):
+            bisect.insort(self._points, (_hash(f"{node}#{i}"), node))
+        self._hashes = [point for point, _node in self._points]
+
+    def remove(self, node: str) -> None:
+        self._points = [(point, owner) for point, owner in self._points if owner != node]
+        self._hashes = [point for point, _node in self._points]
+
+    def node_for(self, key: str) -> str:
+        """Node owning ``key``: the first virtual node clockwise from its hash."""
+        if not self._points:
+            raise ValueError("hash ring has no nodes")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._points)
+        return self._points[index][1]
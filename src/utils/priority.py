@@ -0,0 +1,61 @@
+"""
+Priority classes for audits sharing the same AWS capacity.
+
+Work runs under a priority held in a contextvar. The shared rate limiters
+read it to split their concurrency and request rate between classes by weight
+(APP_PRIORITY_WEIGHTS), so a nightly backfill cannot take every Bedrock
+slot while an analyst waits on an interactive audit. Code that never sets
+a priority runs as INTERACTIVE, which is what direct dashboard and CLI
+calls have always been.
+
+Usage:
+    with priority_scope(Priority.BACKFILL):
+        supervisor.audit_supplier(name)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Dict, Iterator
+
+from src.config import get_settings
+
+
+class Priority(str, Enum):
+    """Audit priority class, highest first."""
+    INTERACTIVE = "interactive"
+    SCHEDULED = "scheduled"
+    BACKFILL = "backfill"
+
+
+_current: ContextVar[Priority] = ContextVar("sentinel_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[Priority]:
+    """Run a block (and the threads it fans out to with a copied context) at ``priority``."""
+    token = _current.set(Priority(priority))
+    try:
+        yield Priority(priority)
+    finally:
+        _current.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority of the current context (INTERACTIVE when none was set)."""
+    return _current.get()
+
+
+def priority_weights() -> Dict[Priority, float]:
+    """Configured share weight per class; missing classes weigh 1."""
+    configured = get_settings().app.priority_weights
+    return {priority: float(configured.get(priority.value, 1.0)) for priority in Priority}
+
+
+def check_weights(weights: Dict[Priority, float]) -> Dict[Priority, float]:
+    """Return ``weights`` if every class has a weight > 0, else raise ValueError."""
+    for priority in Priority:
+        weight = weights.get(priority)
+        if weight is None or not weight > 0:
+            raise ValueError(f"Priority weight for {priority.value} must be > 0, got {weight}")
+    return weights
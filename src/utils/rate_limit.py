@@ -0,0 +1,367 @@
+"""
+Process-wide rate limiting for outbound AWS and news API calls.
+
+Every outbound call acquires a slot from a per-service ``ServiceLimiter``
+that combines:
+
+- a token bucket capping sustained requests per second, and
+- an AIMD (additive-increase / multiplicative-decrease) concurrency limit
+  that halves on throttling errors and creeps back up on success.
+
+When callers of several priority classes (src.utils.priority) wait for the
+same service, each freed slot goes to the waiting class holding the fewest
+slots per unit of weight, and each refilled token to the waiting class that
+has taken the fewest tokens per unit of weight. Contended concurrency and
+request rate both split by APP_PRIORITY_WEIGHTS. An uncontended class may
+use every slot and every token.
+
+Limiters are shared across the Supervisor, Investigator, Auditor and
+Knowledge Base calls so concurrent audits see one view of each service's
+throughput budget instead of throttling each other independently.
+
+Usage:
+    with get_rate_limiter("bedrock").limit():
+        client.invoke_agent(...)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.config import get_settings
+from src.exceptions import TimeoutError
+from src.utils.priority import Priority, check_weights, current_priority, priority_weights
+
+THROTTLING_ERROR_CODES = frozenset({
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+    "RequestLimitExceeded",
+    "ProvisionedThroughputExceededException",
+    "SlowDown",
+})
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Return True if an exception signals the remote service is throttling us."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        if code in THROTTLING_ERROR_CODES:
+            return True
+    status = getattr(response, "status_code", None)
+    if status == 429:
+        return True
+    cause = error.__cause__
+    return cause is not None and cause is not error and is_throttling_error(cause)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``rate`` tokens per second.
+
+    While callers of several priority classes wait, tokens go to the waiting
+    class with the lowest tokens taken per unit of weight (stride
+    scheduling), so a backlog of backfill calls cannot hold the rate against
+    interactive ones. A class that starts waiting is not credited for the
+    time it was idle.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        weights: Optional[Dict[Priority, float]] = None,
+    ):
+        if not rate > 0:
+            raise ValueError(f"Token bucket rate must be > 0, got {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.weights = check_weights(weights if weights is not None else priority_weights())
+        self.queued_by_priority = {priority: 0 for priority in Priority}
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._pass = {priority: 0.0 for priority in Priority}
+        self._virtual_time = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if available.
+
+        Returns:
+            0.0 on success, otherwise the seconds to wait before retrying
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def _take(self, tokens: float, priority: Priority) -> float:
+        """``try_acquire`` that charges ``priority``'s pass; the lock must be held."""
+        self._refill()
+        if self._tokens < tokens:
+            return (tokens - self._tokens) / self.rate
+        self._tokens -= tokens
+        self._virtual_time = self._pass[priority]
+        self._pass[priority] += tokens / self.weights[priority]
+        return 0.0
+
+    def _next_in_line(self, priority: Priority) -> bool:
+        """True if ``priority`` is the waiting class with the lowest pass; the lock must be held."""
+        waiting = [p for p in Priority if self.queued_by_priority[p]]
+        return min(waiting, key=lambda p: self._pass[p]) == priority
+
+    def acquire(
+        self, tokens: float = 1.0, timeout: Optional[float] = None, priority: Optional[Priority] = None
+    ) -> None:
+        """Block until tokens are available for ``priority`` (default: the current one) or raise TimeoutError."""
+        priority = priority or current_priority()
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._lock:
+            if not any(self.queued_by_priority.values()) and self._take(tokens, priority) == 0.0:
+                return
+            if not self.queued_by_priority[priority]:
+                self._pass[priority] = max(self._pass[priority], self._virtual_time)
+            self.queued_by_priority[priority] += 1
+        try:
+            while True:
+                with self._lock:
+                    if self._next_in_line(priority):
+                        wait = self._take(tokens, priority)
+                        if wait == 0.0:
+                            return
+                    else:
+                        # Another class goes first; look again after its next token
+                        wait = tokens / self.rate
+                if deadline is not None and self._clock() + wait > deadline:
+                    raise TimeoutError(f"Rate limit wait exceeded {timeout}s")
+                self._sleep(wait)
+        finally:
+            with self._lock:
+                self.queued_by_priority[priority] -= 1
+
+
+class AIMDConcurrencyLimiter:
+    """
+    Concurrency limit that adapts to throttling.
+
+    Each success raises the limit by ``1 / limit`` (about +1 per window of
+    calls); a throttling error multiplies it by ``backoff_factor``. Decreases
+    are applied at most once per ``cooldown`` seconds so a burst of
+    concurrent throttles counts as one congestion signal.
+
+    Slots are shared between priority classes by weighted fairness: while
+    classes are waiting, a free slot goes to the one with the lowest
+    ``in_flight / weight`` (ties to the higher priority).
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[float] = None,
+        backoff_factor: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        weights: Optional[Dict[Priority, float]] = None,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(initial_limit if initial_limit is not None else self.max_limit)
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.queued = 0
+        self.weights = check_weights(weights if weights is not None else priority_weights())
+        self.in_flight_by_priority = {priority: 0 for priority in Priority}
+        self.queued_by_priority = {priority: 0 for priority in Priority}
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def _next_in_line(self, priority: Priority) -> bool:
+        """True if a slot is free and ``priority`` is the most underserved waiting class."""
+        if self.in_flight >= int(self.limit):
+            return False
+        waiting = [p for p in Priority if self.queued_by_priority[p]]
+        chosen = min(waiting, key=lambda p: self.in_flight_by_priority[p] / self.weights[p])
+        return chosen == priority
+
+    def acquire(self, timeout: Optional[float] = None, priority: Optional[Priority] = None) -> None:
+        """Block until a concurrency slot is free for ``priority`` (default: the current one)."""
+        priority = priority or current_priority()
+        with self._cond:
+            if self.in_flight < int(self.limit) and not self.queued:
+                self.in_flight += 1
+                self.in_flight_by_priority[priority] += 1
+                return
+            self.queued += 1
+            self.queued_by_priority[priority] += 1
+            try:
+                acquired = self._cond.wait_for(lambda: self._next_in_line(priority), timeout)
+                if not acquired:
+                    raise TimeoutError(f"Concurrency slot wait exceeded {timeout}s")
+                self.in_flight += 1
+                self.in_flight_by_priority[priority] += 1
+            finally:
+                self.queued -= 1
+                self.queued_by_priority[priority] -= 1
+                # Whoever is next in line may have changed
+                self._cond.notify_all()
+
+    def release(self, throttled: bool = False, priority: Optional[Priority] = None) -> None:
+        """Return a slot, adjusting the limit from the call outcome."""
+        priority = priority or current_priority()
+        with self._cond:
+            self.in_flight -= 1
+            self.in_flight_by_priority[priority] -= 1
+            if throttled:
+                now = self._clock()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class ServiceLimiter:
+    """Token bucket plus AIMD concurrency limit for a single downstream service."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_second: float,
+        max_concurrency: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(requests_per_second, clock=clock, sleep=sleep)
+        self.concurrency = AIMDConcurrencyLimiter(max_concurrency, clock=clock)
+        self.calls_total = 0
+        self.throttled_total = 0
+        self._stats_lock = threading.Lock()
+
+    @contextmanager
+    def limit(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a concurrency slot and a rate token for the duration of a call.
+
+        Throttling errors raised inside the block shrink the concurrency
+        limit; other outcomes count as success. The slot and the token are
+        taken at the current priority (see src.utils.priority).
+        """
+        priority = current_priority()
+        self.concurrency.acquire(timeout, priority=priority)
+        try:
+            self.bucket.acquire(timeout=timeout, priority=priority)
+        except BaseException:
+            self.concurrency.release(priority=priority)
+            raise
+
+        throttled = False
+        try:
+            yield
+        except BaseException as e:
+            throttled = is_throttling_error(e)
+            raise
+        finally:
+            self.concurrency.release(throttled=throttled, priority=priority)
+            with self._stats_lock:
+                self.calls_total += 1
+                if throttled:
+                    self.throttled_total += 1
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn`` under this limiter."""
+        with self.limit():
+            return fn(*args, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current in-flight, queued and limit values."""
+        return {
+            "in_flight": self.concurrency.in_flight,
+            "queued": self.concurrency.queued,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "max_concurrency": self.concurrency.max_limit,
+            "requests_per_second": self.bucket.rate,
+            "tokens_available": round(self.bucket.tokens, 2),
+            "calls_total": self.calls_total,
+            "throttled_total": self.throttled_total,
+            "in_flight_by_priority": {p.value: n for p, n in self.concurrency.in_flight_by_priority.items()},
+            "queued_by_priority": {p.value: n for p, n in self.concurrency.queued_by_priority.items()},
+        }
+
+
+def _service_limits(service: str) -> Dict[str, Any]:
+    """Per-service limits from AppSettings; unknown services use the Bedrock limits."""
+    app = get_settings().app
+    limits = {
+        "bedrock": (app.bedrock_requests_per_second, app.bedrock_max_concurrency),
+        "knowledge_base": (
+            app.knowledge_base_requests_per_second,
+            app.knowledge_base_max_concurrency,
+        ),
+        "news": (app.news_requests_per_second, app.news_max_concurrency),
+    }
+    rate, concurrency = limits.get(service, limits["bedrock"])
+    return {"requests_per_second": rate, "max_concurrency": concurrency}
+
+
+_limiters: Dict[str, ServiceLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(service: str) -> ServiceLimiter:
+    """
+    Get the shared limiter for a service ("bedrock", "knowledge_base", "news").
+
+    Returns:
+        ServiceLimiter: Process-wide limiter, created on first use
+    """
+    limiter = _limiters.get(service)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(service)
+            if limiter is None:
+                limiter = ServiceLimiter(service, **_service_limits(service))
+                _limiters[service] = limiter
+    return limiter
+
+
+def set_rate_limiter(service: str, limiter: ServiceLimiter) -> None:
+    """Install a limiter for a service (e.g. with custom limits or a fake clock)."""
+    with _limiters_lock:
+        _limiters[service] = limiter
+
+
+def reset_rate_limiters() -> None:
+    """Drop all shared limiters so they are rebuilt from settings (useful for testing)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every limiter created so far, keyed by service."""
+    return {name: limiter.metrics() for name, limiter in list(_limiters.items())}
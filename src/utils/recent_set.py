@@ -0,0 +1,57 @@
+"""
+Exact, bounded set of the most recently seen strings.
+
+Used by the news firehose to skip syndicated copies of articles it has
+already matched. Membership is exact, so a new article is never mistaken
+for a copy. Memory stays bounded because only the ``capacity`` most
+recently seen items are kept. An item evicted for being old is treated as
+new again, which at worst re-matches an article seen long ago. Items are
+stored as 16-byte BLAKE2b digests, so long URLs cost no more than short ones.
+
+Usage:
+    seen = RecentSet(capacity=200_000)
+    if not seen.add(url):
+        handle(url)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class RecentSet:
+    """Thread-safe LRU set of string digests."""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Items remembered before the least recently seen is evicted
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        self.capacity = capacity
+        self._items: "OrderedDict[bytes, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(item: str) -> bytes:
+        return hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+
+    def add(self, item: str) -> bool:
+        """Add ``item``; returns True if it was already present (and marks it recently seen)."""
+        digest = self._digest(item)
+        with self._lock:
+            if digest in self._items:
+                self._items.move_to_end(digest)
+                return True
+            self._items[digest] = None
+            if len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+            return False
+
+    def __contains__(self, item: str) -> bool:
+        with self._lock:
+            return self._digest(item) in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
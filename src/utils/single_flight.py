@@ -0,0 +1,143 @@
+"""
+Single-flight request coalescing.
+
+When several callers ask for the same work at once (a dozen analysts
+auditing the supplier that just made the news), only the first caller runs
+it. The rest wait for that in-flight call and receive a copy of its
+result, or its exception. Nothing is cached: once the call finishes, the
+next request for the key starts a fresh one.
+
+The in-flight call is a ``concurrent.futures.Future``, so threads and
+asyncio coroutines can join each other's calls:
+
+    flight = get_single_flight("audits")
+    report = flight.do(key, lambda: run_audit(name))                  # threads
+    report = await flight.do_async(key, lambda: run_audit(name))      # event loop
+"""
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from src.logging_config import get_logger
+from src.utils.metrics import get_registry
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_metrics = get_registry()
+SINGLE_FLIGHT_CALLS = _metrics.counter(
+    "sentinel_single_flight_calls_total",
+    "Calls through a single-flight group: executed (leader) or coalesced onto one in flight",
+    ["group", "outcome"],
+)
+SINGLE_FLIGHT_IN_FLIGHT = _metrics.gauge(
+    "sentinel_single_flight_in_flight", "Distinct keys currently executing", ["group"]
+)
+# A join onto an in-flight call is a hit; starting a new call is a miss
+CACHE_HITS = _metrics.counter("sentinel_cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = _metrics.counter("sentinel_cache_misses_total", "Cache misses", ["cache"])
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution."""
+
+    def __init__(self, name: str, share: Callable[[Any], Any] = copy.deepcopy):
+        """
+        Args:
+            name: Group name used in metrics, e.g. "audits"
+            share: How followers receive the leader's result; results are
+                deep-copied by default so callers can annotate their own
+        """
+        self.name = name
+        self.share = share
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                SINGLE_FLIGHT_CALLS.labels(group=self.name, outcome="coalesced").inc()
+                CACHE_HITS.labels(cache=f"single_flight_{self.name}").inc()
+                return future, False
+            future = self._calls[key] = Future()
+            self.executed += 1
+        SINGLE_FLIGHT_CALLS.labels(group=self.name, outcome="leader").inc()
+        CACHE_MISSES.labels(cache=f"single_flight_{self.name}").inc()
+        SINGLE_FLIGHT_IN_FLIGHT.labels(group=self.name).inc()
+        return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], T]) -> None:
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            SINGLE_FLIGHT_IN_FLIGHT.labels(group=self.name).dec()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight, then share its outcome.
+
+        Raises:
+            Whatever the in-flight call raised
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn)
+            return future.result()
+        logger.debug("Joined in-flight call", group=self.name, key=str(key))
+        return self.share(future.result())
+
+    async def do_async(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Like ``do`` for coroutines: a leader runs blocking ``fn`` in the loop's
+        default executor, and followers await the shared call without blocking.
+        """
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._run, key, future, fn)
+            return future.result()
+        logger.debug("Joined in-flight call", group=self.name, key=str(key))
+        return self.share(await asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def metrics(self) -> Dict[str, int]:
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": self.in_flight()}
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Process-wide single-flight group, created on first use."""
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.setdefault(name, SingleFlight(name))
+    return group
+
+
+def reset_single_flights(name: Optional[str] = None) -> None:
+    """Drop one group (or all); calls already in flight still complete."""
+    with _groups_lock:
+        if name is None:
+            _groups.clear()
+        else:
+            _groups.pop(name, None)
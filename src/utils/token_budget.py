@@ -0,0 +1,230 @@
+"""
+Token accounting and input compaction for LLM calls.
+
+An audit runs under a TokenLedger held in a contextvar, like its Deadline.
+Every agent call records its estimated prompt and completion tokens on
+the ledger, and the Supervisor puts the totals in the report. Before
+findings are sent to the model, ``compact_text`` shrinks each snippet to
+its share of the remaining budget:
+
+1. boilerplate is removed (URLs, "Read more", wire datelines, NewsAPI's
+   "[+1234 chars]" marker)
+2. repeated sentences and repeated full supplier names are collapsed
+3. if still too long, only the sentences with the most policy keywords
+   are kept, in their original order
+
+Token counts are estimates (about four characters per token), which is
+close enough for budgeting and cost tracking without a tokenizer.
+
+Usage:
+    with token_scope(20_000) as ledger:
+        snippet = compact_text(snippet, "Acme Corp", max_tokens=ledger.remaining() // 10)
+        record_tokens(estimate_tokens(prompt), estimate_tokens(answer))
+    ledger.summary()  # {"budget": 20000, "prompt": 812, "completion": 95, ...}
+"""
+
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config import get_settings
+from src.sources.base import CATEGORY_KEYWORDS, tokenize
+from src.utils.metrics import get_registry
+
+_metrics = get_registry()
+LLM_TOKENS = _metrics.counter(
+    "sentinel_llm_tokens_total", "Estimated tokens exchanged with Bedrock agents", ["kind"]
+)
+TOKENS_COMPACTED = _metrics.counter(
+    "sentinel_llm_tokens_compacted_total", "Estimated prompt tokens removed by snippet compaction"
+)
+
+# Terms that make a sentence worth keeping when a snippet has to be cut
+POLICY_TERMS = frozenset(
+    [keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords]
+    + [
+        "abuse", "abuses", "accused", "allegations", "child", "contamination", "critical",
+        "death", "deaths", "discharge", "fined", "forced", "hazardous", "injuries", "injured",
+        "investigation", "lawsuit", "overtime", "penalty", "sanctions", "spill", "toxic",
+        "trafficking", "unpaid", "violation", "violations", "waste",
+    ]
+)
+
+_BOILERPLATE = [
+    re.compile(r"\[\+\d+ chars\]"),
+    re.compile(r"https?://\S+"),
+    re.compile(
+        r"\b(?:click here|read more|continue reading|subscribe (?:now|today)|sign up for|"
+        r"all rights reserved|advertisement)\b[^.!?]*[.!?]?",
+        re.IGNORECASE,
+    ),
+    # Wire datelines: "LONDON (Reuters) - "
+    re.compile(r"^[A-Z][A-Za-z ,.]*\((?:Reuters|AP|AFP|Bloomberg)\)\s*[-–—]\s*"),
+]
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+_current: ContextVar[Optional["TokenLedger"]] = ContextVar("sentinel_token_ledger", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English prose)."""
+    return len(text) // 4 + 1
+
+
+def finding_tokens(finding: Dict[str, Any]) -> int:
+    """Estimated tokens a finding adds to a prompt."""
+    return sum(estimate_tokens(str(finding.get(key) or "")) for key in ("date", "source", "category", "snippet"))
+
+
+def _strip_boilerplate(text: str) -> str:
+    for pattern in _BOILERPLATE:
+        text = pattern.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _dedupe(sentences: List[str], supplier_name: Optional[str]) -> List[str]:
+    """Drop repeated sentences; keep the first full supplier name, shorten the rest."""
+    named = False
+
+    def mention(match: "re.Match[str]") -> str:
+        nonlocal named
+        if named:
+            return "the company"
+        named = True
+        return match.group(0)
+
+    shorten = supplier_name and len(supplier_name) > len("the company")
+    name = re.compile(re.escape(supplier_name), re.IGNORECASE) if shorten else None
+    seen = set()
+    result = []
+    for sentence in sentences:
+        key = " ".join(tokenize(sentence))
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        result.append(name.sub(mention, sentence) if name is not None else sentence)
+    return result
+
+
+def _policy_score(sentence: str) -> int:
+    return sum(1 for term in tokenize(sentence) if term in POLICY_TERMS)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    limit = max(1, max_tokens * 4 - 1)
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] or text[:limit]
+    return cut.rstrip(" ,;:") + "…"
+
+
+def compact_text(text: str, supplier_name: Optional[str] = None, max_tokens: Optional[int] = None) -> str:
+    """
+    Shrink a finding snippet for an LLM prompt.
+
+    Args:
+        text: Snippet or article description
+        supplier_name: Supplier whose repeated full-name mentions are collapsed
+        max_tokens: Estimated token limit (defaults to APP_FINDING_MAX_TOKENS)
+
+    Returns:
+        The compacted text; never longer than the input
+    """
+    max_tokens = max_tokens if max_tokens is not None else get_settings().app.finding_max_tokens
+    sentences = [s for s in _SENTENCE_END.split(_strip_boilerplate(text)) if s]
+    sentences = _dedupe(sentences, supplier_name)
+    if sum(estimate_tokens(s) for s in sentences) > max_tokens and len(sentences) > 1:
+        ranked = sorted(range(len(sentences)), key=lambda i: (-_policy_score(sentences[i]), i))
+        keep, used = set(), 0
+        for i in ranked:
+            cost = estimate_tokens(sentences[i])
+            if keep and used + cost > max_tokens:
+                continue
+            keep.add(i)
+            used += cost
+        sentences = [sentences[i] for i in sorted(keep)]
+    compacted = _truncate(" ".join(sentences), max_tokens)
+    if len(compacted) >= len(text):
+        return text
+    saved = estimate_tokens(text) - estimate_tokens(compacted)
+    TOKENS_COMPACTED.inc(saved)
+    ledger = _current.get()
+    if ledger is not None:
+        ledger.record_compaction(saved)
+    return compacted
+
+
+class TokenLedger:
+    """Estimated tokens one audit sent to and received from the model."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.compacted = 0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> int:
+        """Prompt tokens left in the budget (never negative)."""
+        return max(0, self.budget - self.prompt_tokens)
+
+    def record(self, prompt_tokens: int, completion_tokens: int = 0) -> None:
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.calls += 1
+
+    def record_compaction(self, tokens_saved: int) -> None:
+        with self._lock:
+            self.compacted += 1
+            self.tokens_saved += tokens_saved
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "prompt": self.prompt_tokens,
+                "completion": self.completion_tokens,
+                "total": self.prompt_tokens + self.completion_tokens,
+                "calls": self.calls,
+                "compacted_findings": self.compacted,
+                "tokens_saved": self.tokens_saved,
+            }
+
+
+@contextmanager
+def token_scope(budget: Optional[int] = None) -> Iterator[TokenLedger]:
+    """
+    Account a block's LLM tokens against ``budget`` (defaults to APP_AUDIT_TOKEN_BUDGET).
+
+    A nested scope shares the enclosing audit's ledger.
+    """
+    parent = _current.get()
+    if parent is not None:
+        yield parent
+        return
+    ledger = TokenLedger(budget if budget is not None else get_settings().app.audit_token_budget)
+    token = _current.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current.reset(token)
+
+
+def current_ledger() -> Optional[TokenLedger]:
+    """The token ledger bound to the current context, if any."""
+    return _current.get()
+
+
+def record_tokens(prompt_tokens: int, completion_tokens: int = 0) -> None:
+    """Count one model call's tokens on the current ledger and in metrics."""
+    LLM_TOKENS.labels(kind="prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(kind="completion").inc(completion_tokens)
+    ledger = _current.get()
+    if ledger is not None:
+        ledger.record(prompt_tokens, completion_tokens)
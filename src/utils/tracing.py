@@ -0,0 +1,255 @@
+"""
+Span instrumentation and latency histograms for the audit pipeline.
+
+Each audit runs under a trace ID bound into structlog's contextvars, so
+every log line emitted during the audit carries it. Stages, agent calls
+and AWS requests are timed with ``span()``; durations feed per-span
+log-bucketed histograms that report p50/p95/p99 with bounded memory.
+
+Usage:
+    with start_trace(supplier="Acme"):
+        with span("supervisor.investigate"):
+            ...
+    get_span_recorder().summary()
+    # {"supervisor.investigate": {"count": 1, "p50_ms": ..., "p95_ms": ..., ...}}
+"""
+
+import functools
+import itertools
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from src.config import get_settings
+from src.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_span_ids = itertools.count(1)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("sentinel_current_span", default=None)
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of durations in seconds.
+
+    Bucket ``i`` covers ``(min_value * growth**(i-1), min_value * growth**i]``,
+    so percentiles are accurate to within ``growth - 1`` relative error while
+    memory depends only on the dynamic range, not the sample count.
+    """
+
+    def __init__(self, min_value: float = 1e-6, growth: float = 1.05):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.ceil(math.log(value / self.min_value) / self._log_growth))
+
+    def upper_bound(self, index: int) -> float:
+        """Upper edge (seconds) of bucket ``index``."""
+        return self.min_value * self.growth ** index
+
+    def add(self, value: float) -> None:
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Fold another histogram with the same bucket layout into this one."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Estimated value (seconds) at percentile ``pct`` (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """``(upper_bound_seconds, cumulative_count)`` pairs for exporters."""
+        cumulative = 0
+        result = []
+        for index in sorted(self.buckets):
+            cumulative += self.buckets[index]
+            result.append((self.upper_bound(index), cumulative))
+        return result
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and p50/p95/p99/max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class SpanRecorder:
+    """Thread-safe collection of per-span latency histograms."""
+
+    def __init__(self, log_spans: bool = False):
+        self.log_spans = log_spans
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """A copy of the histogram for ``name`` (empty if never recorded)."""
+        copy = LatencyHistogram()
+        with self._lock:
+            if name in self._histograms:
+                copy.merge(self._histograms[name])
+        return copy
+
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        """Copies of every histogram, keyed by span name."""
+        with self._lock:
+            names = list(self._histograms)
+        return {name: self.histogram(name) for name in names}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 summary per span name."""
+        return {name: h.summary() for name, h in sorted(self.histograms().items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+_recorder: Optional[SpanRecorder] = None
+
+
+def get_span_recorder() -> SpanRecorder:
+    """
+    Get the global span recorder (singleton pattern).
+
+    Span logging is enabled when LOG_LEVEL is DEBUG.
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = SpanRecorder(log_spans=get_settings().logging.level.upper() == "DEBUG")
+    return _recorder
+
+
+class Span:
+    """
+    A single timed operation within a trace.
+
+    ``span_id`` is a process-local counter: cheap, and unique within a trace.
+    """
+
+    __slots__ = ("name", "attributes", "span_id", "parent", "started", "duration")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block and record its duration under ``name``.
+
+    Args:
+        name: Span name, e.g. "supervisor.investigate" or "aws.knowledge_base.retrieve"
+        **attributes: Extra fields included in the span log line
+    """
+    parent = _current_span.get()
+    current = Span(name, attributes, parent)
+    token = _current_span.set(current)
+    error: Optional[str] = None
+    try:
+        yield current
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.started
+        _current_span.reset(token)
+        recorder = get_span_recorder()
+        recorder.record(name, current.duration)
+        if recorder.log_spans:
+            logger.debug(
+                "Span finished",
+                span=name,
+                span_id=current.span_id,
+                parent_span_id=parent.span_id if parent else None,
+                duration_ms=round(current.duration * 1000, 3),
+                error=error,
+                **attributes,
+            )
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator form of ``span()``; defaults to the function's qualified name."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_trace_id() -> Optional[str]:
+    """The trace ID bound to the current context, if any."""
+    return structlog.contextvars.get_contextvars().get("trace_id")
+
+
+@contextmanager
+def start_trace(trace_id: Optional[str] = None, **context: Any) -> Iterator[str]:
+    """
+    Bind an audit-level trace ID (and extra context) into structlog contextvars.
+
+    Nested calls reuse the enclosing trace so an audit started inside a batch
+    job or CLI run keeps the caller's trace ID.
+
+    Yields:
+        The active trace ID
+    """
+    existing = get_trace_id()
+    if existing and trace_id is None:
+        yield existing
+        return
+    trace_id = trace_id or uuid.uuid4().hex
+    with structlog.contextvars.bound_contextvars(trace_id=trace_id, **context):
+        yield trace_id
@@ -0,0 +1,129 @@
+"""
+Unit tests for the columnar audit history exporter.
+
+Tests partitioned Parquet output, dictionary encoding and incremental appends.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.models import AuditReport
+from src.utils.audit_export import (
+    AuditHistoryExporter,
+    iter_history_batches,
+    make_audit_id,
+    read_history,
+)
+
+
+class TestAuditHistoryExporter:
+    """Test cases for AuditHistoryExporter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.supervisor = SupervisorAgent(InvestigatorAgent(), AuditorAgent())
+
+    def test_writes_partitioned_tables(self, tmp_path):
+        """Test reports, findings and violations land in date/category partitions."""
+        report = self.supervisor.audit_supplier("Andean Mining Corp")
+
+        with AuditHistoryExporter(tmp_path, supplier_categories={"Andean Mining Corp": "Mining"}) as exporter:
+            audit_id = exporter.write_report(report)
+
+        reports = read_history(tmp_path, "reports")
+        findings = read_history(tmp_path, "findings")
+        violations = read_history(tmp_path, "violations")
+
+        assert reports.num_rows == 1
+        assert findings.num_rows == len(report["findings"])
+        assert violations.num_rows == len(report["violations"])
+        assert reports.column("audit_id")[0].as_py() == audit_id
+        assert reports.column("supplier_category")[0].as_py() == "Mining"
+        assert reports.column("audit_date")[0].as_py() == report["timestamp"][:10]
+
+    def test_enum_columns_are_dictionary_encoded(self, tmp_path):
+        """Test severity and risk columns are stored dictionary-encoded."""
+        report = self.supervisor.audit_supplier("QuickProd Manufacturing")
+
+        with AuditHistoryExporter(tmp_path) as exporter:
+            exporter.write_report(report)
+
+        violations = read_history(tmp_path, "violations")
+        assert pa.types.is_dictionary(violations.schema.field("severity").type)
+        assert pa.types.is_dictionary(violations.schema.field("source").type)
+
+    def test_incremental_append_across_sessions(self, tmp_path):
+        """Test a second exporter session appends instead of overwriting."""
+        for supplier in ["Acme Corporation", "Global Textiles"]:
+            with AuditHistoryExporter(tmp_path) as exporter:
+                exporter.write_report(self.supervisor.audit_supplier(supplier))
+
+        reports = read_history(tmp_path, "reports", columns=["supplier"])
+        assert sorted(reports.column("supplier").to_pylist()) == [
+            "Acme Corporation",
+            "Global Textiles",
+        ]
+
+    def test_small_batches_stream_row_groups(self, tmp_path):
+        """Test buffered rows are flushed once batch_size is reached."""
+        exporter = AuditHistoryExporter(tmp_path, batch_size=2)
+        for i in range(5):
+            exporter.write_report(self.supervisor.audit_supplier(f"Supplier {i}"))
+        assert exporter.rows_written["reports"] == 4
+        exporter.close()
+        assert exporter.rows_written["reports"] == 5
+
+        batches = list(iter_history_batches(tmp_path, "findings", columns=["audit_id"]))
+        assert sum(batch.num_rows for batch in batches) == 10
+
+    def test_filter_by_partition(self, tmp_path):
+        """Test partition filters prune by supplier category."""
+        with AuditHistoryExporter(tmp_path) as exporter:
+            exporter.write_report(self.supervisor.audit_supplier("Acme"), supplier_category="Food Processing")
+            exporter.write_report(self.supervisor.audit_supplier("Beta"), supplier_category="Textiles")
+
+        table = read_history(tmp_path, "reports", where=ds.field("supplier_category") == "Food Processing")
+        assert table.column("supplier").to_pylist() == ["Acme"]
+
+    def test_open_files_are_capped(self, tmp_path):
+        """Test the least recently written partition is closed and later rows roll to a new part file."""
+        exporter = AuditHistoryExporter(tmp_path, batch_size=1, max_open_files=2)
+        for category in ["Mining", "Textiles", "Mining", "Food Processing", "Textiles"]:
+            exporter.write_report(self.supervisor.audit_supplier("Acme"), supplier_category=category)
+            assert len(exporter._writers) <= 2
+        exporter.close()
+
+        textiles = list((tmp_path / "reports").glob("audit_date=*/supplier_category=Textiles/*.parquet"))
+        reports = read_history(tmp_path, "reports")
+        assert len(textiles) == 2
+        assert reports.num_rows == 5
+        assert sorted(reports.column("supplier_category").to_pylist()) == [
+            "Food Processing", "Mining", "Mining", "Textiles", "Textiles"
+        ]
+
+    def test_accepts_audit_report_model(self, tmp_path):
+        """Test pydantic AuditReport instances are exported like dicts."""
+        report = AuditReport(
+            supplier="Model Corp",
+            timestamp="2024-11-26T00:00:00Z",
+            overall_risk="GREEN",
+            risk_scores={"Labor": 0, "Environment": 10, "Governance": 0},
+        )
+
+        with AuditHistoryExporter(tmp_path) as exporter:
+            exporter.write_report(report)
+
+        reports = read_history(tmp_path, "reports")
+        assert reports.column("environment_score")[0].as_py() == 10
+        assert reports.column("overall_risk")[0].as_py() == "GREEN"
+
+    def test_audit_id_is_stable(self):
+        """Test the derived audit ID is deterministic."""
+        report = {"supplier": "Acme", "timestamp": "2024-11-26T00:00:00Z"}
+        assert make_audit_id(report) == make_audit_id(dict(report))
+        assert make_audit_id({"audit_id": "abc"}) == "abc"
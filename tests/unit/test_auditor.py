@@ -4,6 +4,9 @@ Unit tests for AuditorAgent.
 Tests the policy evaluation and risk scoring logic.
 """
 
+import json
+import re
+
 import pytest
 from src.agents.auditor import AuditorAgent
 
@@ -211,3 +214,216 @@ class TestAuditorAgent:
         
         for score in result["risk_scores"].values():
             assert score <= 100
+
+
+class TestAuditorPolicyContext:
+    """Test cases for Knowledge Base policy retrieval."""
+
+    def test_violations_carry_policy_context(self):
+        """Test flagged findings are annotated with retrieved Code of Conduct sections."""
+        from src.utils.fakes import FakeBedrockAgentRuntime
+
+        kb = FakeBedrockAgentRuntime()
+        auditor = AuditorAgent(knowledge_base_client=kb, knowledge_base_id="kb-1")
+
+        result = auditor.evaluate_findings({
+            "supplier": "Test Corp",
+            "findings": [
+                {"snippet": "Test Corp fined for water contamination.", "category": "Environment"},
+                {"snippet": "Test Corp receives sustainability award.", "category": "Governance"},
+            ],
+        })
+
+        assert kb.calls == 1
+        context = result["violations"][0]["policy_context"]
+        assert len(context) == 3
+        assert context[0]["text"]
+
+
+def finding_ids(prompt):
+    return [int(match) for match in re.findall(r'^\{"id": (\d+)', prompt, re.MULTILINE)]
+
+
+def answer_all(verdict):
+    return lambda prompt: json.dumps([{"id": i, **verdict} for i in finding_ids(prompt)])
+
+
+class TestTieredEvaluation:
+    """Test rule verdicts short-circuit and only uncertain findings reach the LLM."""
+
+    FINDINGS = [
+        {"snippet": "Test Corp receives sustainability award.", "category": "Governance"},
+        {"snippet": "Test Corp fined $3M for hazardous waste.", "category": "Environment"},
+        {"snippet": "Allegations of unpaid overtime at Test Corp.", "category": "Labor"},
+        {"snippet": "Test Corp workers stage strike.", "category": "Labor"},
+    ]
+
+    def make_auditor(self, responder, **kwargs):
+        from src.agents.policy_evaluator import PolicyEvaluator
+        from src.utils.fakes import FakeBedrockAgentRuntime
+
+        self.prompts = []
+        def record(text):
+            self.prompts.append(text)
+            return responder(text)
+        client = FakeBedrockAgentRuntime(responder=record)
+        evaluator = PolicyEvaluator(client=client, agent_id="AUDITOR")
+        return AuditorAgent(knowledge_base_client=client, knowledge_base_id="kb-1",
+                            policy_evaluator=evaluator, **kwargs)
+
+    def test_only_uncertain_findings_escalated(self):
+        """Test confident rule verdicts skip the agent and the rest use its verdict."""
+        auditor = self.make_auditor(answer_all({
+            "violation": True, "severity": "MAJOR",
+            "policy_reference": "Section 3.1: Working Hours", "evidence_type": "ALLEGATION",
+        }))
+
+        result = auditor.evaluate_findings({"findings": self.FINDINGS})
+
+        assert len(self.prompts) == 1
+        assert finding_ids(self.prompts[0]) == [0, 1]
+        assert "Code of Conduct excerpts" in self.prompts[0]
+        assert [v["severity"] for v in result["violations"]] == ["CRITICAL", "MAJOR", "MAJOR"]
+        assert result["violations"][1]["policy_reference"] == "Section 3.1: Working Hours"
+        assert result["evaluation"]["findings"] == 4
+        assert result["evaluation"]["escalated"] == 2
+        assert result["evaluation"]["escalation_rate"] == 0.5
+        assert result["evaluation"]["llm_calls"] == 1
+        assert result["evaluation"]["llm_calls_saved"] == 3
+
+    def test_threshold_zero_disables_escalation(self):
+        """Test a zero threshold trusts every rule verdict."""
+        auditor = self.make_auditor(lambda text: "{}", escalation_threshold=0.0)
+
+        result = auditor.evaluate_findings({"findings": self.FINDINGS})
+
+        assert self.prompts == []
+        assert result["evaluation"]["escalated"] == 0
+
+    def test_malformed_answer_falls_back_to_rules(self):
+        """Test an unparseable agent answer keeps the rule verdict and degrades."""
+        from src.utils.deadline import deadline_scope
+
+        auditor = self.make_auditor(lambda text: "I cannot decide.")
+
+        with deadline_scope(30) as deadline:
+            result = auditor.evaluate_findings({"findings": self.FINDINGS[2:3]})
+
+        assert [v["severity"] for v in result["violations"]] == ["MINOR"]
+        assert any(reason.startswith("auditor.llm_evaluate") for reason in deadline.degradations)
+
+    def test_no_agent_configured(self):
+        """Test without an Auditor agent every finding is decided by rules."""
+        result = AuditorAgent().evaluate_findings({"findings": self.FINDINGS})
+
+        assert result["evaluation"]["escalated"] == 0
+        assert result["evaluation"]["llm_calls_saved"] == 0
+        assert result["evaluation"]["estimated_seconds_saved"] == 0
+        assert len(result["violations"]) == 2
+
+
+class TestBatchedPolicyEvaluation:
+    """Test escalated findings are packed into few agent calls."""
+
+    def make_evaluator(self, responder, **kwargs):
+        from src.agents.policy_evaluator import PolicyEvaluator
+        from src.utils.fakes import FakeBedrockAgentRuntime
+
+        self.prompts = []
+        def record(text):
+            self.prompts.append(text)
+            return responder(text)
+        return PolicyEvaluator(client=FakeBedrockAgentRuntime(responder=record), agent_id="AUDITOR", **kwargs)
+
+    def items(self, count):
+        context = [{"text": "Section 3.1: Working hours must not exceed 60 per week."}]
+        return [({"snippet": f"Allegation {i} of excessive overtime", "category": "Labor"}, context)
+                for i in range(count)]
+
+    def test_one_call_for_many_findings_with_shared_context(self):
+        """Test findings share one prompt and the policy excerpt is sent once."""
+        evaluator = self.make_evaluator(answer_all({"violation": False}))
+
+        result = evaluator.evaluate_batch(self.items(12))
+
+        assert result.calls == 1
+        assert result.verdicts == {i: None for i in range(12)}
+        assert self.prompts[0].count("Working hours must not exceed") == 1
+
+    def test_batches_respect_finding_and_token_limits(self):
+        """Test batch size adapts to the configured limits."""
+        by_count = self.make_evaluator(answer_all({"violation": False}), max_batch_findings=5)
+        assert by_count.evaluate_batch(self.items(12)).calls == 3
+
+        from src.agents.policy_evaluator import estimate_tokens
+
+        items = self.items(12)
+        by_tokens = self.make_evaluator(answer_all({"violation": False}), max_prompt_tokens=300)
+        batches = list(by_tokens.batches(items))
+        assert len(batches) > 1
+        assert sorted(i for batch in batches for i in batch) == list(range(12))
+        assert all(estimate_tokens(by_tokens.build_prompt([items[i] for i in batch])) <= 300
+                   for batch in batches)
+
+    def test_missing_and_malformed_items_are_resplit(self):
+        """Test items left out or malformed are retried on their own."""
+        def responder(prompt):
+            ids = finding_ids(prompt)
+            if len(ids) > 1:
+                # Drops the last finding and garbles the second
+                return json.dumps([{"id": i, "violation": "maybe" if i == 1 else False} for i in ids[:-1]])
+            return json.dumps([{"id": ids[0], "violation": True, "severity": "MINOR",
+                                "evidence_type": "ALLEGATION"}])
+        evaluator = self.make_evaluator(responder)
+
+        result = evaluator.evaluate_batch(self.items(4))
+
+        assert result.failures == {}
+        assert [result.verdicts[i] for i in (0, 1, 2)] == [None, None, None]
+        assert result.verdicts[3]["severity"] == "MINOR"
+        # Full batch, then items 1 and 3 together, then item 3 alone
+        assert result.calls == 3
+
+    def test_only_rejected_prompts_are_resplit(self):
+        """Test a too-long prompt is halved, but throttling is raised without retrying smaller batches."""
+        from botocore.exceptions import ClientError
+        from src.exceptions import BedrockAgentError
+        from src.utils.fakes import throttling_error
+
+        def reject(prompt):
+            if len(finding_ids(prompt)) > 2:
+                raise ClientError({"Error": {"Code": "ValidationException", "Message": "Input is too long"}},
+                                  "InvokeAgent")
+            return answer_all({"violation": False})(prompt)
+        result = self.make_evaluator(reject).evaluate_batch(self.items(4))
+        assert result.failures == {} and result.calls == 3
+
+        def throttle(prompt):
+            raise throttling_error("InvokeAgent")
+        evaluator = self.make_evaluator(throttle)
+        with pytest.raises(BedrockAgentError):
+            evaluator.evaluate_batch(self.items(4))
+        assert len(self.prompts) == 1
+
+    def test_verdicts_parsed_despite_brackets_in_trailing_prose(self):
+        """Test only the first JSON array is decoded when the answer goes on to cite [sections]."""
+        from src.agents.policy_evaluator import parse_verdicts
+
+        answer = (
+            'Verdicts: [{"id": 0, "violation": false}, {"id": 1, "violation": true}]\n'
+            "Both were checked against [Section 3.1] of the policy."
+        )
+
+        assert parse_verdicts(answer) == {0: {"id": 0, "violation": False}, 1: {"id": 1, "violation": True}}
+
+    def test_unparseable_single_item_fails(self):
+        """Test a finding that never gets a valid verdict is reported as failed."""
+        from src.exceptions import AuditError
+
+        evaluator = self.make_evaluator(lambda prompt: "not json")
+
+        result = evaluator.evaluate_batch(self.items(2))
+
+        assert set(result.failures) == {0, 1}
+        assert isinstance(result.failures[0], AuditError)
+        assert result.calls == 3
@@ -0,0 +1,149 @@
+"""
+Unit tests for checkpointed batch audits.
+
+Tests the journal state machine, crash recovery and failure retries.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.exceptions import AuditPreempted
+from src.pipeline.batch import AuditJournal, BatchAuditRunner, JobState
+
+
+class TestBatchAuditRunner:
+    """Test cases for BatchAuditRunner and AuditJournal."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.investigator = InvestigatorAgent()
+        self.auditor = AuditorAgent()
+        self.supervisor = SupervisorAgent(self.investigator, self.auditor)
+
+    def test_runs_all_jobs_to_done(self, tmp_path):
+        """Test every enqueued supplier ends up done with a stored report."""
+        journal = AuditJournal(tmp_path / "run.db")
+        suppliers = [{"id": f"SUP-{i}", "name": f"Supplier {i}"} for i in range(20)]
+        assert journal.enqueue(suppliers) == 20
+
+        counts = BatchAuditRunner(self.supervisor, journal, workers=4).run()
+
+        assert counts["done"] == 20
+        reports = list(journal.iter_reports())
+        assert {r["supplier_id"] for r in reports} == {s["id"] for s in suppliers}
+
+    def test_enqueue_is_idempotent(self, tmp_path):
+        """Test re-enqueueing known suppliers does not reset their state."""
+        journal = AuditJournal(tmp_path / "run.db")
+        journal.enqueue([{"name": "Acme"}])
+        BatchAuditRunner(self.supervisor, journal).run()
+
+        assert journal.enqueue([{"name": "Acme"}, {"name": "Beta"}]) == 1
+        assert journal.counts()["done"] == 1
+
+    def test_completed_reports_are_not_refetched(self, tmp_path):
+        """Test resuming a finished run performs no new investigations."""
+        path = tmp_path / "run.db"
+        journal = AuditJournal(path)
+        journal.enqueue([{"name": "Acme"}, {"name": "Beta"}])
+        BatchAuditRunner(self.supervisor, journal).run()
+        journal.close()
+
+        investigator = Mock(wraps=self.investigator)
+        supervisor = SupervisorAgent(investigator, self.auditor)
+        counts = BatchAuditRunner(supervisor, AuditJournal(path)).run()
+
+        assert counts["done"] == 2
+        investigator.search_supplier_news.assert_not_called()
+
+    def test_resume_from_auditing_skips_investigation(self, tmp_path):
+        """Test a crash during the audit step resumes with journaled findings."""
+        journal = AuditJournal(tmp_path / "run.db")
+        journal.enqueue([{"name": "Acme"}, {"name": "Beta"}])
+        findings = self.investigator.search_supplier_news("Acme")
+        journal.transition("Acme", JobState.AUDITING, findings=findings)
+        journal.transition("Beta", JobState.INVESTIGATING)
+
+        investigator = Mock(wraps=self.investigator)
+        supervisor = SupervisorAgent(investigator, self.auditor)
+        counts = BatchAuditRunner(supervisor, journal).run()
+
+        assert counts["done"] == 2
+        investigator.search_supplier_news.assert_called_once_with("Beta")
+
+    def test_failed_items_retry_with_backoff(self, tmp_path):
+        """Test transient failures are retried until they succeed."""
+        journal = AuditJournal(tmp_path / "run.db")
+        journal.enqueue([{"name": "Acme"}, {"name": "Beta"}])
+        auditor = Mock(wraps=self.auditor)
+        auditor.evaluate_findings.side_effect = [
+            RuntimeError("ThrottlingException"),
+            self.auditor.evaluate_findings({"findings": []}),
+            self.auditor.evaluate_findings({"findings": []}),
+        ]
+        investigator = Mock(wraps=self.investigator)
+        supervisor = SupervisorAgent(investigator, auditor)
+
+        counts = BatchAuditRunner(supervisor, journal, workers=1, backoff_base=0.01).run()
+
+        assert counts["done"] == 2
+        assert counts["failed"] == 0
+        # The failed audit step reused its journaled findings
+        assert investigator.search_supplier_news.call_count == 2
+
+    def test_exhausted_items_stay_failed_until_reset(self, tmp_path):
+        """Test items past max_attempts stay failed and can be re-armed."""
+        journal = AuditJournal(tmp_path / "run.db")
+        journal.enqueue([{"name": "Acme"}])
+        supervisor = Mock()
+        supervisor.audit_supplier.side_effect = RuntimeError("boom")
+
+        runner = BatchAuditRunner(supervisor, journal, max_attempts=2, backoff_base=0.01)
+        counts = runner.run()
+
+        assert counts["failed"] == 1
+        assert supervisor.audit_supplier.call_count == 2
+        assert journal.reset_failed() == 1
+
+    def test_preempted_audit_resumes_without_using_an_attempt(self, tmp_path):
+        """Test a preempted job goes back to auditing with its findings and keeps its attempts."""
+        journal = AuditJournal(tmp_path / "run.db")
+        supplier = {"id": "SUP-1", "name": "Acme", "country": "Vietnam"}
+        journal.enqueue([supplier])
+        findings = {"supplier": "Acme", "findings": [], "sources": []}
+        supervisor = Mock()
+        supervisor.audit_supplier.side_effect = [
+            AuditPreempted("paused for interactive work", findings=findings),
+            {"supplier": "Acme"},
+        ]
+
+        counts = BatchAuditRunner(supervisor, journal, max_attempts=1).run()
+
+        assert counts["done"] == 1
+        first, resumed = supervisor.audit_supplier.call_args_list
+        assert first.kwargs["supplier_record"] == supplier
+        assert resumed.kwargs["findings"] == findings
+        attempts = journal._conn.execute("SELECT attempts FROM jobs").fetchone()[0]
+        assert attempts == 0
+
+    def test_callback_errors_are_counted_not_swallowed(self, tmp_path):
+        """Test a raising on_complete leaves the job done and shows up in the run summary."""
+        journal = AuditJournal(tmp_path / "run.db")
+        journal.enqueue([{"name": "Acme"}, {"name": "Beta"}])
+        def on_complete(report):
+            if report["supplier"] == "Acme":
+                raise RuntimeError("sink unavailable")
+
+        counts = BatchAuditRunner(self.supervisor, journal).run(on_complete=on_complete)
+
+        assert counts["done"] == 2
+        assert counts["callback_errors"] == 1
+
+    def test_journal_uses_wal(self, tmp_path):
+        """Test the journal is opened in WAL mode."""
+        journal = AuditJournal(tmp_path / "run.db")
+        mode = journal._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
@@ -0,0 +1,80 @@
+"""
+Unit tests for the benchmark workload generator and runner.
+"""
+
+from src.benchmark import (
+    BenchmarkConfig,
+    FindingsCorpus,
+    build_portfolio,
+    compare_results,
+    run_benchmark,
+    save_results,
+)
+from src.benchmark.runner import load_results
+from src.benchmark.workload import classify_supplier
+
+
+class TestWorkload:
+    """Test cases for synthetic portfolios and findings."""
+
+    def test_portfolio_is_deterministic_and_keeps_risk_profile(self):
+        """Test the same seed yields the same portfolio and names keep their profile."""
+        first = build_portfolio(50, seed=7)
+        assert first == build_portfolio(50, seed=7)
+        assert len({s["name"] for s in first}) == 50
+        for supplier in first:
+            assert classify_supplier(supplier["name"]) == supplier["risk_profile"]
+
+    def test_risk_mix(self):
+        """Test a single-profile mix only produces that profile."""
+        portfolio = build_portfolio(20, risk_mix={"RED": 1.0})
+        assert {s["risk_profile"] for s in portfolio} == {"RED"}
+
+    def test_corpus_pads_to_requested_size(self):
+        """Test padded findings are unique and green suppliers stay clean."""
+        corpus = FindingsCorpus(findings_per_supplier=12, seed=1)
+
+        red = corpus.findings_for("QuickProd Factories 000001")
+        green = corpus.findings_for("GreenTech Manufacturing 000002")
+
+        assert len(red) == 12
+        assert len({f["url"] for f in red}) == 12
+        assert red == corpus.findings_for("QuickProd Factories 000001")
+        assert all("fined" not in f["snippet"] for f in green)
+
+
+class TestRunner:
+    """Test cases for the benchmark runner."""
+
+    def test_run_and_save(self, tmp_path):
+        """Test a small run reports throughput, stages and memory and round-trips as JSON."""
+        config = BenchmarkConfig(suppliers=12, workers=4, kb_latency_ms=1, news_latency_ms=1)
+
+        results = run_benchmark(config)
+        path = save_results(results, tmp_path)
+
+        assert results["summary"]["audited"] == 12
+        assert results["summary"]["throughput_per_second"] > 0
+        assert results["stages"]["supervisor.audit_supplier"]["count"] == 12
+        assert results["stages"]["news.search"]["count"] == 12
+        assert "aws.knowledge_base.retrieve" in results["stages"]
+        assert results["memory"]["peak_traced_mb"] > 0
+        assert load_results(path) == results
+
+    def test_compare_flags_regressions(self):
+        """Test throughput drops and p95 increases beyond tolerance are reported."""
+        baseline = {
+            "summary": {"throughput_per_second": 100.0},
+            "stages": {"supervisor.evaluate": {"p95_ms": 10.0}},
+            "memory": {"peak_traced_mb": 5.0},
+        }
+        current = {
+            "summary": {"throughput_per_second": 80.0},
+            "stages": {"supervisor.evaluate": {"p95_ms": 20.0}},
+            "memory": {"peak_traced_mb": 5.1},
+        }
+
+        regressions = compare_results(current, baseline)
+
+        assert len(regressions) == 2
+        assert compare_results(baseline, baseline) == []
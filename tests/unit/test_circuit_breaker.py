@@ -0,0 +1,246 @@
+"""
+Unit tests for circuit breakers and cached-findings fallback.
+"""
+
+import io
+import json
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.exceptions import AWSServiceError, CircuitOpenError, TimeoutError
+from src.utils import aws_clients
+from src.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    get_circuit_breaker,
+    protected_call,
+    reset_circuit_breakers,
+)
+from src.utils.deadline import deadline_scope
+from src.utils.fakes import FakeBedrockAgentRuntime, FakeNewsAPI, throttling_error
+from src.utils.findings_cache import FindingsCache
+from src.utils.metrics import get_registry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise RuntimeError("connection reset")
+
+
+class TestCircuitBreaker:
+    """Test cases for the breaker state machine."""
+
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("unit", failure_threshold=3, recovery_timeout=10, clock=self.clock)
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        """Test the circuit opens at the threshold and then rejects without calling."""
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                self.breaker.call(fail)
+
+        assert self.breaker.state is CircuitState.OPEN
+        called = []
+        with pytest.raises(CircuitOpenError):
+            self.breaker.call(lambda: called.append(1))
+        assert called == []
+        assert self.breaker.rejected_total == 1
+
+    def test_success_resets_failure_count(self):
+        """Test only consecutive failures count."""
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                self.breaker.call(fail)
+        self.breaker.call(lambda: None)
+        with pytest.raises(RuntimeError):
+            self.breaker.call(fail)
+
+        assert self.breaker.state is CircuitState.CLOSED
+
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test a probe after the cool-down closes on success and re-opens on failure."""
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                self.breaker.call(fail)
+
+        self.clock.now = 10
+        assert self.breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(RuntimeError):
+            self.breaker.call(fail)
+        assert self.breaker.state is CircuitState.OPEN
+
+        self.clock.now = 20
+        assert self.breaker.call(lambda: "ok") == "ok"
+        assert self.breaker.state is CircuitState.CLOSED
+
+    def test_throttling_does_not_trip(self):
+        """Test throttling errors are left to the rate limiter."""
+        def throttled():
+            raise throttling_error("Retrieve")
+
+        for _ in range(5):
+            with pytest.raises(Exception):
+                self.breaker.call(throttled)
+
+        assert self.breaker.state is CircuitState.CLOSED
+
+
+class FlakyNewsAPI(FakeNewsAPI):
+    """News API that fails while ``down`` is set."""
+
+    down = False
+
+    def search_news(self, supplier_name):
+        if self.down:
+            self.calls += 1
+            raise ConnectionError("news API unavailable")
+        return super().search_news(supplier_name)
+
+
+class TestFallback:
+    """Test cached-findings fallback and report source marking."""
+
+    def setup_method(self):
+        reset_circuit_breakers()
+        self.news = FlakyNewsAPI()
+        self.supervisor = SupervisorAgent(
+            InvestigatorAgent(news_api_client=self.news, findings_cache=FindingsCache()),
+            AuditorAgent(),
+        )
+
+    def teardown_method(self):
+        reset_circuit_breakers()
+
+    def test_stale_findings_served_when_source_fails(self):
+        """Test a failed search serves the last good findings, marked stale."""
+        fresh = self.supervisor.audit_supplier("QuickProd Factories")
+        self.news.down = True
+
+        report = self.supervisor.audit_supplier("QuickProd Factories")
+
+        assert report["findings"] == fresh["findings"]
+        assert report["overall_risk"] == "RED"
+        assert report["sources"][0]["status"] == "stale"
+        assert report["sources"][0]["fetched_at"]
+        assert report["degraded"] is True
+
+    def test_missing_source_yields_unknown(self):
+        """Test a failed search with nothing cached reports the source missing."""
+        self.news.down = True
+
+        report = self.supervisor.audit_supplier("Never Seen Ltd")
+
+        assert report["overall_risk"] == "UNKNOWN"
+        assert report["sources"] == [
+            {"name": "news", "status": "missing", "error": "news API unavailable"}
+        ]
+
+    def test_open_circuit_stops_calling_the_source(self):
+        """Test repeated failures open the news circuit so later audits fail fast."""
+        self.news.down = True
+        for i in range(10):
+            self.supervisor.audit_supplier(f"Supplier {i}")
+
+        assert get_circuit_breaker("news").state is CircuitState.OPEN
+        assert self.news.calls == 5
+        text = get_registry().render_text()
+        assert 'sentinel_circuit_state{dependency="news"} 2' in text
+
+    def test_knowledge_base_outage_degrades_instead_of_failing(self):
+        """Test KB errors drop policy context but the audit still completes."""
+        def unavailable(**kwargs):
+            raise ClientError(
+                {"Error": {"Code": "ServiceUnavailableException", "Message": "down"}}, "Retrieve"
+            )
+
+        kb = FakeBedrockAgentRuntime()
+        kb.retrieve = unavailable
+        supervisor = SupervisorAgent(
+            InvestigatorAgent(), AuditorAgent(knowledge_base_client=kb, knowledge_base_id="kb-1")
+        )
+
+        report = supervisor.audit_supplier("QuickProd Factories")
+
+        assert report["overall_risk"] == "RED"
+        assert report["degraded"] is True
+        assert get_circuit_breaker("knowledge_base").metrics()["consecutive_failures"] > 0
+
+
+class FakeLambda:
+    """Lambda client returning a canned invocation response."""
+
+    def __init__(self, body, function_error=None):
+        self.body = body
+        self.function_error = function_error
+        self.calls = 0
+
+    def invoke(self, **kwargs):
+        self.calls += 1
+        response = {"StatusCode": 200, "Payload": io.BytesIO(json.dumps(self.body).encode("utf-8"))}
+        if self.function_error:
+            response["FunctionError"] = self.function_error
+        return response
+
+
+def action_group_body(status, result):
+    return {"response": {"httpStatusCode": status, "responseBody": {"application/json": {"body": json.dumps(result)}}}}
+
+
+class TestNewsLambdaBreaker:
+    """Test news Lambda errors reach the news_lambda breaker."""
+
+    def setup_method(self):
+        reset_circuit_breakers()
+
+    def teardown_method(self):
+        reset_circuit_breakers()
+
+    def search(self, monkeypatch, client):
+        monkeypatch.setattr(aws_clients, "get_lambda_client", lambda session=None: client)
+        with pytest.raises(AWSServiceError):
+            aws_clients.invoke_news_search("Acme", function_name="news-search")
+
+    @pytest.mark.parametrize("client", [
+        FakeLambda({"errorMessage": "boom"}, function_error="Unhandled"),
+        FakeLambda(action_group_body(503, {"error": "upstream down"})),
+        FakeLambda({"response": {"httpStatusCode": 200}}),
+    ], ids=["function_error", "server_error", "malformed"])
+    def test_lambda_failures_open_the_circuit(self, monkeypatch, client):
+        """Test crashes, 5xx answers and malformed bodies count as consecutive failures."""
+        threshold = get_circuit_breaker("news_lambda").failure_threshold
+        for _ in range(threshold):
+            self.search(monkeypatch, client)
+
+        assert get_circuit_breaker("news_lambda").state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            aws_clients.invoke_news_search("Acme", function_name="news-search")
+        assert client.calls == threshold
+
+    def test_bad_request_does_not_trip(self, monkeypatch):
+        """Test a 4xx answer raises without counting against the Lambda."""
+        client = FakeLambda(action_group_body(400, {"error": "unknown category"}))
+        for _ in range(10):
+            self.search(monkeypatch, client)
+
+        assert get_circuit_breaker("news_lambda").metrics()["consecutive_failures"] == 0
+
+    def test_deadline_timeout_does_not_trip(self):
+        """Test a call cut off by the audit deadline is not held against the dependency."""
+        for _ in range(get_circuit_breaker("news").failure_threshold + 1):
+            with deadline_scope(0.02), pytest.raises(TimeoutError):
+                protected_call("news", lambda: time.sleep(0.1), "news_search")
+
+        assert get_circuit_breaker("news").metrics()["consecutive_failures"] == 0
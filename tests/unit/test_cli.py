@@ -0,0 +1,145 @@
+"""
+Unit tests for the ethos-chain command-line interface.
+
+Tests supplier input parsing, NDJSON streaming and checkpoint resume.
+"""
+
+import io
+import json
+
+import pytest
+import structlog
+from unittest.mock import Mock
+
+from src.main import Checkpoint, iter_suppliers, main, run_audits
+
+
+class TestIterSuppliers:
+    """Test cases for supplier input parsing."""
+
+    def test_suppliers_json_shape(self):
+        """Test the data/sample/suppliers.json shape is accepted."""
+        stream = io.StringIO(json.dumps({"suppliers": [{"id": "SUP-001", "name": "Acme"}]}))
+        suppliers = list(iter_suppliers(stream))
+        assert suppliers == [{"id": "SUP-001", "name": "Acme"}]
+
+    def test_plain_json_list_of_names(self):
+        """Test a JSON list of bare names is accepted."""
+        suppliers = list(iter_suppliers(io.StringIO('["Acme", "Beta"]')))
+        assert [s["name"] for s in suppliers] == ["Acme", "Beta"]
+
+    def test_csv_input(self):
+        """Test CSV input with a name column."""
+        stream = io.StringIO("id,name,country\nSUP-1,Acme,Norway\nSUP-2,Beta,Sweden\n")
+        suppliers = list(iter_suppliers(stream, path="suppliers.csv"))
+        assert [s["id"] for s in suppliers] == ["SUP-1", "SUP-2"]
+
+    def test_ndjson_autodetected(self):
+        """Test NDJSON on stdin is detected from its content."""
+        stream = io.StringIO('{"name": "Acme"}\n{"name": "Beta"}\n')
+        assert [s["name"] for s in iter_suppliers(stream)] == ["Acme", "Beta"]
+
+    def test_format_detected_from_first_non_blank_line(self):
+        """Test a long first NDJSON record, blank leading lines and pretty-printed JSON are told apart."""
+        long_record = json.dumps({"name": "Acme", "notes": "x" * 10_000})
+        ndjson = io.StringIO(f"\n\n{long_record}\n{json.dumps({'name': 'Beta'})}\n")
+        assert [s["name"] for s in iter_suppliers(ndjson)] == ["Acme", "Beta"]
+
+        pretty = io.StringIO(json.dumps({"suppliers": [{"name": "Acme"}, {"name": "Beta"}]}, indent=2))
+        assert [s["name"] for s in iter_suppliers(pretty)] == ["Acme", "Beta"]
+
+    def test_json_array_is_streamed(self):
+        """Test the first supplier is yielded long before a large JSON document has been read."""
+        document = json.dumps({"run": {"note": "nightly"},
+                               "suppliers": [{"id": f"SUP-{i}", "name": f"Supplier {i}"} for i in range(20_000)]})
+        stream = io.StringIO(document)
+
+        suppliers = iter_suppliers(stream)
+        assert next(suppliers) == {"id": "SUP-0", "name": "Supplier 0"}
+        assert stream.tell() < len(document) / 4
+        assert sum(1 for _ in suppliers) == 19_999
+
+    def test_json_with_trailing_data_is_rejected(self):
+        """Test extra content after the JSON document raises instead of being ignored."""
+        with pytest.raises(ValueError):
+            list(iter_suppliers(io.StringIO('["Acme"] ["Beta"]'), fmt="json"))
+
+
+class TestRunAudits:
+    """Test cases for the concurrent NDJSON audit runner."""
+
+    def test_writes_one_report_per_line(self):
+        """Test each supplier produces one NDJSON report line."""
+        output = io.StringIO()
+        suppliers = [{"id": f"SUP-{i}", "name": f"Supplier {i}"} for i in range(10)]
+
+        summary = run_audits(suppliers, output, workers=3)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(lines) == 10
+        assert {line["supplier_id"] for line in lines} == {f"SUP-{i}" for i in range(10)}
+        assert summary["audited"] == 10
+        assert summary["latency_p95_ms"] >= summary["latency_p50_ms"]
+
+    def test_checkpoint_resume_skips_completed(self, tmp_path):
+        """Test a resumed run skips suppliers recorded in the checkpoint."""
+        path = str(tmp_path / "run.ckpt")
+        suppliers = [{"name": "Acme"}, {"name": "Beta"}]
+
+        checkpoint = Checkpoint(path)
+        run_audits(suppliers[:1], io.StringIO(), checkpoint=checkpoint)
+        checkpoint.close()
+
+        output = io.StringIO()
+        checkpoint = Checkpoint(path)
+        summary = run_audits(suppliers, output, checkpoint=checkpoint)
+        checkpoint.close()
+
+        assert summary["skipped"] == 1
+        assert [json.loads(line)["supplier"] for line in output.getvalue().splitlines()] == ["Beta"]
+
+    def test_malformed_ndjson_line_is_reported_and_the_run_continues(self, tmp_path):
+        """Test a bad line mid-stream becomes an error line while the audits around it complete."""
+        stream = io.StringIO('{"name": "Acme"}\n{"name": "Beta"}\n{bad\n"Gamma"\n\n{"name": "Delta"}\n')
+        checkpoint = Checkpoint(str(tmp_path / "run.ckpt"))
+        output = io.StringIO()
+
+        summary = run_audits(iter_suppliers(stream, fmt="ndjson"), output, checkpoint=checkpoint)
+        checkpoint.close()
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        errors = [line for line in lines if "line" in line]
+        assert [error["line"] for error in errors] == [3, 4]
+        assert all(error["error"] for error in errors)
+        assert sorted(line["supplier"] for line in lines if "line" not in line) == ["Acme", "Beta", "Delta"]
+        assert (summary["audited"], summary["invalid"]) == (3, 2)
+        assert checkpoint.completed == {"Acme", "Beta", "Delta"}
+
+    def test_failed_audit_is_reported_and_not_checkpointed(self, tmp_path):
+        """Test failures emit an error line and are retried on resume."""
+        supervisor = Mock()
+        supervisor.audit_supplier.side_effect = RuntimeError("throttled")
+        checkpoint = Checkpoint(str(tmp_path / "run.ckpt"))
+        output = io.StringIO()
+
+        summary = run_audits([{"name": "Acme"}], output, supervisor=supervisor, checkpoint=checkpoint)
+
+        assert summary["failed"] == 1
+        assert json.loads(output.getvalue())["error"] == "throttled"
+        assert "Acme" not in checkpoint
+
+    def test_main_reads_file(self, tmp_path, capsys):
+        """Test the entry point audits a suppliers file end to end."""
+        path = tmp_path / "suppliers.json"
+        path.write_text(json.dumps({"suppliers": [{"name": "Acme"}, {"name": "Beta"}]}))
+
+        try:
+            exit_code = main([str(path), "--workers", "2"])
+        finally:
+            # main() points structlog at the captured stderr; undo for later tests
+            structlog.reset_defaults()
+
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert len(captured.out.splitlines()) == 2
+        assert "Audited 2 suppliers" in captured.err
@@ -0,0 +1,209 @@
+"""
+Unit tests for per-thread and per-event-loop AWS client management.
+"""
+
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import get_settings
+from src.utils.aws_clients import get_bedrock_agent_runtime_client
+from src.utils.client_manager import ClientManager, get_client_manager, reset_client_manager
+
+
+class FakeClient:
+    """Stand-in boto3 client that records close()."""
+
+    def __init__(self, service_name):
+        self.service_name = service_name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Stand-in boto3 session; creating a client is deliberately slow."""
+
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self, profile_name=None):
+        self.profile_name = profile_name
+
+    def client(self, service_name, config=None, **kwargs):
+        time.sleep(0.001)
+        with FakeSession.lock:
+            FakeSession.created += 1
+        return FakeClient(service_name)
+
+
+class TestClientManager:
+    """Test cases for ClientManager scoping and lifecycle."""
+
+    def setup_method(self):
+        FakeSession.created = 0
+        self.manager = ClientManager(session_factory=FakeSession, config_factory=lambda: None)
+
+    def test_stress_no_recreation_churn(self):
+        """Test many concurrent lookups create exactly one client per worker thread."""
+        seen = {}
+        seen_lock = threading.Lock()
+        workers = 32
+
+        def lookup(_):
+            client = self.manager.client("bedrock-agent-runtime")
+            assert self.manager.client("lambda") is self.manager.client("lambda")
+            with seen_lock:
+                seen.setdefault(threading.current_thread().name, set()).add(id(client))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lookup, range(20_000)))
+
+        assert all(len(ids) == 1 for ids in seen.values())
+        assert len({next(iter(ids)) for ids in seen.values()}) == len(seen)
+        # One runtime and one lambda client per thread, never rebuilt
+        assert FakeSession.created == 2 * len(seen)
+        assert len(seen) <= workers
+
+    def test_hot_path_lookup_takes_no_lock_under_contention(self):
+        """Test cached lookups from 8 threads return each thread's own client without locking."""
+        class CountingLock:
+            def __init__(self, lock):
+                self.lock = lock
+                self.acquired = 0
+
+            def __enter__(self):
+                self.acquired += 1
+                return self.lock.__enter__()
+
+            def __exit__(self, *exc_info):
+                return self.lock.__exit__(*exc_info)
+
+        iterations = 2_000
+        counted = threading.Event()
+        results, acquired = {}, []
+        warmed = threading.Barrier(9)
+        # Counted before any thread exits: a thread's exit releases its scope under the lock
+        finished = threading.Barrier(8, action=lambda: acquired.append(self.manager._lock.acquired))
+
+        def hammer():
+            first = self.manager.client("bedrock-agent-runtime")
+            warmed.wait()
+            counted.wait()
+            same = all(self.manager.client("bedrock-agent-runtime") is first for _ in range(iterations))
+            results[threading.current_thread().name] = (id(first), same)
+            finished.wait()
+
+        threads = [threading.Thread(target=hammer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        warmed.wait()
+        self.manager._lock = CountingLock(self.manager._lock)
+        counted.set()
+        for thread in threads:
+            thread.join()
+
+        assert acquired == [0]
+        assert all(same for _, same in results.values())
+        assert len({client for client, _ in results.values()}) == 8
+        assert FakeSession.created == 8
+
+    def test_thread_exit_closes_its_clients(self):
+        """Test a finished thread's clients are closed and close hooks fire."""
+        closed = []
+        self.manager.on_close(lambda service, client: closed.append(service))
+        holder = {}
+
+        thread = threading.Thread(target=lambda: holder.update(client=self.manager.client("lambda")))
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+
+        assert holder["client"].closed
+        assert closed == ["lambda"]
+        assert self.manager.stats()["scopes"] == 0
+
+    def test_cached_lookups_counted_across_thread_exit(self):
+        """Test hits from a finished thread still count once its scope is released."""
+
+        def lookups():
+            for _ in range(3):
+                self.manager.client("lambda")
+
+        thread = threading.Thread(target=lookups)
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+        self.manager.client("lambda")
+        self.manager.client("lambda")
+
+        # Two misses created clients; the remaining lookups were hits
+        assert FakeSession.created == 2
+        assert self.manager.stats()["hits"] == 3
+
+    def test_event_loop_scope(self):
+        """Test coroutines on one loop share clients and executor threads get their own."""
+        async def run():
+            async def lookup():
+                await asyncio.sleep(0)
+                return self.manager.client("bedrock-agent-runtime")
+
+            on_loop = await asyncio.gather(*(lookup() for _ in range(50)))
+            in_thread = await asyncio.to_thread(self.manager.client, "bedrock-agent-runtime")
+            return on_loop, in_thread
+
+        on_loop, in_thread = asyncio.run(run())
+
+        assert len({id(c) for c in on_loop}) == 1
+        assert in_thread is not on_loop[0]
+        gc.collect()
+        assert on_loop[0].closed
+
+    def test_close_closes_everything(self):
+        """Test close() closes clients held by live threads too."""
+        created = []
+        self.manager.on_create(lambda service, client: created.append(client))
+        ready, release = threading.Event(), threading.Event()
+
+        def worker():
+            self.manager.client("lambda")
+            ready.set()
+            release.wait()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        ready.wait()
+        self.manager.client("lambda")
+
+        self.manager.close()
+        release.set()
+        thread.join()
+
+        assert len(created) == 2
+        assert all(client.closed for client in created)
+
+
+class TestAWSHelpers:
+    """Test the aws_clients helpers use the global manager."""
+
+    def setup_method(self):
+        reset_client_manager()
+
+    def teardown_method(self):
+        reset_client_manager()
+
+    def test_helpers_reuse_thread_client_with_pool_size(self):
+        """Test helpers return the same real boto3 client per thread, sized from settings."""
+        first = get_bedrock_agent_runtime_client()
+        assert get_bedrock_agent_runtime_client() is first
+        assert first.meta.config.max_pool_connections == get_settings().aws.max_pool_connections
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other = executor.submit(get_bedrock_agent_runtime_client).result()
+        assert other is not first
+        assert get_client_manager().stats()["clients"] >= 1
@@ -0,0 +1,128 @@
+"""
+Unit tests for the offline corpus index.
+"""
+
+import json
+import random
+import time
+from datetime import date
+
+from src.sources import CorpusIndex, CorpusIndexAdapter, SourceRegistry
+from src.sources.index import main
+from src.utils.circuit_breaker import reset_circuit_breakers
+from src.utils.findings_cache import FindingsCache
+
+DOCS = [
+    {"date": "2024-11-01", "source": "EPA", "title": "QuickProd Factories fined for emissions",
+     "body": "The EPA fine follows pollution complaints.", "url": "https://e.com/1"},
+    {"date": "2024-09-20", "source": "Labor Watch", "title": "Strike at QuickProd Factories",
+     "body": "Workers demand safety upgrades and unpaid wages.", "url": "https://e.com/2"},
+    {"date": "2023-01-15", "source": "Trade Weekly", "title": "QuickProd Factories opens new plant",
+     "url": "https://e.com/3"},
+    {"date": "2024-10-10", "source": "Wire", "title": "Factories across region report strong quarter",
+     "url": "https://e.com/4"},
+]
+
+
+class TestCorpusIndex:
+    """Test cases for building and querying the index."""
+
+    def test_requires_every_name_term_and_boosts_categories(self, tmp_path):
+        """Test only documents naming the supplier match, categorised by keyword hits."""
+        index = CorpusIndex(tmp_path)
+        index.append(DOCS)
+
+        results = index.search("QuickProd Factories")
+
+        assert [r["url"] for r in results][:2] == ["https://e.com/1", "https://e.com/2"]
+        assert {r["url"] for r in results} == {"https://e.com/1", "https://e.com/2", "https://e.com/3"}
+        assert results[0]["category"] == "Environment"
+        assert results[1]["category"] == "Labor"
+
+    def test_date_range_and_required_keywords(self, tmp_path):
+        """Test date filters and the Lambda's keyword-required semantics."""
+        index = CorpusIndex(tmp_path)
+        index.append(DOCS)
+
+        recent = index.search("QuickProd Factories", date_from=date(2024, 1, 1), date_to=date(2024, 10, 1))
+        assert [r["url"] for r in recent] == ["https://e.com/2"]
+        keyword_hits = index.search("QuickProd Factories", require_keywords=True)
+        assert "https://e.com/3" not in {r["url"] for r in keyword_hits}
+
+    def test_incremental_append_visible_to_other_readers(self, tmp_path):
+        """Test appends add segments that an already-open reader picks up."""
+        writer, reader = CorpusIndex(tmp_path), CorpusIndex(tmp_path)
+        writer.append(DOCS[:2])
+        assert len(reader.search("QuickProd")) == 2
+
+        writer.append(DOCS[2:])
+
+        assert len(reader) == 4
+        assert len(reader.search("QuickProd")) == 3
+
+    def test_compact_preserves_results(self, tmp_path):
+        """Test merging segments returns the same findings."""
+        index = CorpusIndex(tmp_path)
+        for doc in DOCS:
+            index.append([doc])
+        before = index.search("QuickProd Factories")
+
+        index.compact()
+
+        assert len(list(tmp_path.glob("seg-*"))) == 1
+        assert index.search("QuickProd Factories") == before
+
+    def test_cli_add_and_search(self, tmp_path, capsys, monkeypatch):
+        """Test the command line builds and queries an index."""
+        # Keep module loggers off the captured stderr, which closes after this test
+        monkeypatch.setattr("src.sources.index.configure_logging", lambda stream=None: None)
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text("\n".join(json.dumps(doc) for doc in DOCS))
+
+        assert main(["add", str(tmp_path / "idx"), str(corpus)]) == 0
+        capsys.readouterr()
+        assert main(["search", str(tmp_path / "idx"), "QuickProd", "--limit", "1"]) == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert json.loads(lines[-1])["url"] == "https://e.com/1"
+
+    def test_large_corpus_queries_in_milliseconds(self, tmp_path):
+        """Test a selective query against 50k documents stays in the low milliseconds."""
+        rng = random.Random(0)
+        words = [f"w{i}" for i in range(2000)]
+        keywords = ["strike", "pollution", "fraud", "wages", "emissions"]
+        index = CorpusIndex(tmp_path)
+        for batch in range(5):
+            index.append(
+                {
+                    "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    "title": " ".join(rng.sample(words, 12) + [rng.choice(keywords)]
+                                      + (["Acme", "Corp"] if i % 500 == 0 else [])),
+                    "url": f"https://e.com/{batch}/{i}",
+                }
+                for i in range(10_000)
+            )
+
+        started = time.perf_counter()
+        results = index.search("Acme Corp", limit=50)
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 50
+        assert elapsed < 0.05
+
+
+class TestCorpusIndexAdapter:
+    """Test the index as an Investigator source."""
+
+    def test_registry_search(self, tmp_path):
+        """Test indexed findings are normalised through the registry."""
+        reset_circuit_breakers()
+        index = CorpusIndex(tmp_path)
+        index.append(DOCS)
+        registry = SourceRegistry([CorpusIndexAdapter(index, max_results=2)], findings_cache=FindingsCache())
+
+        findings, sources = registry.search("QuickProd Factories")
+
+        assert sources == [{"name": "corpus_index", "status": "ok"}]
+        assert [f["category"] for f in findings] == ["Environment", "Labor"]
+        assert findings[0]["date"] == "2024-11-01"
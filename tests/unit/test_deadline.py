@@ -0,0 +1,228 @@
+"""
+Unit tests for deadline propagation and hedged requests.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.exceptions import TimeoutError
+from src.utils import deadline as deadline_module
+from src.utils.deadline import (
+    Deadline,
+    HedgeBudget,
+    current_deadline,
+    deadline_scope,
+    hedge_delay,
+    hedged_call,
+    remaining_time,
+    reset_hedge_budget,
+)
+from src.utils.fakes import FakeBedrockAgentRuntime, FakeNewsAPI
+from src.utils.findings_cache import FindingsCache
+from src.utils.metrics import get_registry
+from src.utils.tracing import get_span_recorder
+
+
+class TestDeadline:
+    """Test cases for Deadline and deadline_scope."""
+
+    def test_remaining_and_check(self):
+        """Test the budget counts down and check() raises once spent."""
+        now = [100.0]
+        deadline = Deadline(5, clock=lambda: now[0])
+
+        assert deadline.remaining() == 5
+        now[0] = 106.0
+        assert deadline.remaining() == 0
+        with pytest.raises(TimeoutError):
+            deadline.check("investigate")
+
+    def test_nested_scope_never_extends_budget(self):
+        """Test an inner scope reuses a sooner outer deadline and shortens a later one."""
+        assert remaining_time() is None
+        with deadline_scope(1) as outer:
+            with deadline_scope(10) as inner:
+                assert inner is outer
+            with deadline_scope(0.5) as shorter:
+                assert shorter is not outer
+                assert current_deadline() is shorter
+        assert current_deadline() is None
+
+    def test_degradations_deduplicated_per_stage(self):
+        """Test only the first reason per stage is kept."""
+        deadline = Deadline(1)
+        deadline.degrade("auditor.policy_context", "first")
+        deadline.degrade("auditor.policy_context", "second")
+        assert deadline.degradations == ["auditor.policy_context: first"]
+
+
+class TestHedgedCall:
+    """Test cases for hedged_call."""
+
+    def setup_method(self):
+        reset_hedge_budget()
+
+    def teardown_method(self):
+        reset_hedge_budget()
+
+    def single_thread_pool(self, monkeypatch):
+        pool = ThreadPoolExecutor(1)
+        monkeypatch.setattr(deadline_module, "_executor", pool)
+        return pool
+
+    def test_hedge_wins_when_original_is_slow(self):
+        """Test a duplicate is sent after the hedge delay and the faster answer is used."""
+        won = get_registry().counter("sentinel_hedge_wins_total", "", ["operation"])
+        before = won.value(operation="unit.hedge")
+        calls = []
+        lock = threading.Lock()
+
+        def request():
+            with lock:
+                calls.append(1)
+                attempt = len(calls)
+            time.sleep(0.5 if attempt == 1 else 0.01)
+            return attempt
+
+        started = time.perf_counter()
+        result = hedged_call(request, "unit.hedge", hedge_after=0.02)
+
+        assert result == 2
+        assert time.perf_counter() - started < 0.3
+        assert won.value(operation="unit.hedge") == before + 1
+
+    def test_deadline_bounds_the_wait(self):
+        """Test a call that outlives the deadline raises TimeoutError on time."""
+        started = time.perf_counter()
+        with deadline_scope(0.05):
+            with pytest.raises(TimeoutError):
+                hedged_call(lambda: time.sleep(0.5), "unit.slow", hedge_after=1)
+        assert time.perf_counter() - started < 0.3
+
+    def test_errors_propagate(self):
+        """Test a failing request raises its own error."""
+        def request():
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            hedged_call(request, "unit.error", hedge_after=0.01)
+
+    def test_request_sees_deadline(self):
+        """Test the request thread inherits the caller's deadline."""
+        with deadline_scope(5) as deadline:
+            assert hedged_call(current_deadline, "unit.context") is deadline
+
+    def test_runs_inline_when_hedging_is_off(self, monkeypatch):
+        """Test the request runs on the caller's thread, deadline or not."""
+        from src.config import get_settings
+
+        monkeypatch.setattr(get_settings().app, "hedging_enabled", False)
+        caller = threading.current_thread().name
+
+        assert hedged_call(lambda: threading.current_thread().name, "unit.inline") == caller
+        with deadline_scope(5):
+            assert hedged_call(lambda: threading.current_thread().name, "unit.inline") == caller
+
+    def test_saturated_hedge_pool_does_not_hold_up_the_original(self, monkeypatch):
+        """Test the original request starts at once, and answers in budget, while the hedge pool is full."""
+        pool = self.single_thread_pool(monkeypatch)
+        release = threading.Event()
+        pool.submit(release.wait)
+        caller = threading.current_thread().name
+        try:
+            with deadline_scope(0.5) as deadline:
+                # The hedge queues behind the blocked pool; the original answers regardless
+                thread = hedged_call(
+                    lambda: time.sleep(0.05) or threading.current_thread().name, "unit.saturated", hedge_after=0.01
+                )
+        finally:
+            release.set()
+
+        assert thread != caller and not thread.startswith("sentinel-hedge")
+        assert deadline.degradations == []
+
+    def test_losing_request_is_cancelled(self, monkeypatch):
+        """Test a hedge still queued when the original answers never runs."""
+        pool = self.single_thread_pool(monkeypatch)
+        pool.submit(time.sleep, 0.2)
+        calls = []
+
+        assert hedged_call(lambda: calls.append(1) or time.sleep(0.1) or "ok", "unit.cancel", hedge_after=0.02) == "ok"
+        time.sleep(0.05)
+        assert calls == [1]
+
+    def test_hedges_are_capped_by_the_budget(self):
+        """Test the budget allows a burst, then one hedge per 1/ratio requests."""
+        budget = HedgeBudget(ratio=0.5, burst=2)
+
+        assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+        budget.record_request()
+        assert not budget.try_spend()
+        budget.record_request()
+        assert budget.try_spend()
+
+    def test_spent_budget_stops_hedging(self, monkeypatch):
+        """Test a slow request is not hedged once the budget is spent."""
+        monkeypatch.setattr(deadline_module, "_hedge_budget", HedgeBudget(ratio=0, burst=0))
+        calls = []
+
+        assert hedged_call(lambda: calls.append(1) or time.sleep(0.05) or "ok", "unit.budget", hedge_after=0.01) == "ok"
+        assert calls == [1]
+
+    def test_hedge_delay_tracks_p95(self):
+        """Test the hedge delay switches to the observed p95 once samples exist."""
+        recorder = get_span_recorder()
+        recorder.reset()
+        for _ in range(50):
+            recorder.record("unit.p95", 0.2)
+        assert hedge_delay("unit.p95") == pytest.approx(0.2, rel=0.05)
+
+
+class TestDegradedAudits:
+    """Test the Supervisor returns flagged partial reports when out of budget."""
+
+    def test_slow_news_search_returns_unknown_degraded_report(self):
+        """Test a news search slower than the budget yields a degraded UNKNOWN report."""
+        news = FakeNewsAPI(latency=1.0)
+        supervisor = SupervisorAgent(
+            InvestigatorAgent(news_api_client=news, findings_cache=FindingsCache()),
+            AuditorAgent(),
+            timeout_seconds=0.1,
+        )
+
+        started = time.perf_counter()
+        report = supervisor.audit_supplier("QuickProd Factories")
+
+        assert time.perf_counter() - started < 0.5
+        assert report["degraded"] is True
+        assert report["overall_risk"] == "UNKNOWN"
+        assert report["degraded_reasons"][0].startswith("investigate")
+        assert report["sources"][0]["status"] == "missing"
+
+    def test_slow_knowledge_base_keeps_rule_verdicts(self):
+        """Test KB timeouts drop policy excerpts but keep the violations."""
+        kb = FakeBedrockAgentRuntime(latency=1.0)
+        supervisor = SupervisorAgent(
+            InvestigatorAgent(),
+            AuditorAgent(knowledge_base_client=kb, knowledge_base_id="kb-1"),
+            timeout_seconds=0.1,
+        )
+
+        report = supervisor.audit_supplier("QuickProd Factories")
+
+        assert report["overall_risk"] == "RED"
+        assert report["degraded"] is True
+        assert any(r.startswith("auditor.policy_context:") for r in report["degraded_reasons"])
+        assert all("policy_context" not in v for v in report["violations"])
+
+    def test_fast_audit_not_degraded(self):
+        """Test audits inside the budget are not flagged."""
+        report = SupervisorAgent(InvestigatorAgent(), AuditorAgent()).audit_supplier("Acme")
+        assert report["degraded"] is False
+        assert report["degraded_reasons"] == []
@@ -0,0 +1,308 @@
+"""
+Unit tests for queue-backed distributed audit workers.
+"""
+
+import multiprocessing
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.benchmark.workload import build_portfolio
+from src.pipeline.distributed import (
+    AuditDispatcher,
+    AuditWorker,
+    InMemoryQueue,
+    ReportStore,
+    SQLiteQueue,
+    SQSQueue,
+    main,
+)
+from src.utils.hash_ring import HashRing
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSupervisor:
+    """Returns a minimal report; fails the first ``failures`` audits of each supplier."""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = []
+
+    def audit_supplier(self, supplier_name, supplier_record=None):
+        self.calls.append(supplier_name)
+        time.sleep(self.delay)
+        if self.calls.count(supplier_name) <= self.failures:
+            raise RuntimeError("news API down")
+        return {"supplier": supplier_name, "overall_risk": "GREEN"}
+
+
+SUPPLIERS = [{"id": f"SUP-{i:03d}", "name": f"Supplier {i}"} for i in range(20)]
+
+
+class TestHashRing:
+    """Test consistent-hash routing of suppliers to workers."""
+
+    def test_adding_a_node_moves_only_its_share(self):
+        """Test about 1/N keys move to a new node and none move between old nodes."""
+        keys = [f"SUP-{i:05d}" for i in range(5000)]
+        ring = HashRing(["w0", "w1", "w2"])
+        before = {key: ring.node_for(key) for key in keys}
+
+        ring.add("w3")
+        after = {key: ring.node_for(key) for key in keys}
+
+        moved = [key for key in keys if before[key] != after[key]]
+        assert all(after[key] == "w3" for key in moved)
+        assert 0.15 < len(moved) / len(keys) < 0.35
+        shares = [list(after.values()).count(node) / len(keys) for node in ring.nodes]
+        assert min(shares) > 0.15
+
+
+class TestQueues:
+    """Test visibility timeouts and receipts on each local backend."""
+
+    def check_visibility(self, queue, clock):
+        queue.send("w0", [{"job_id": "a"}, {"job_id": "b"}])
+
+        first = queue.receive("w0", 10, visibility_timeout=30)
+        assert [m.body["job_id"] for m in first] == ["a", "b"]
+        assert queue.receive("w0", 10, visibility_timeout=30) == []
+
+        clock.now += 31
+        again = queue.receive("w0", 1, visibility_timeout=30)
+        assert again[0].body["job_id"] == "a" and again[0].receive_count == 2
+        assert queue.delete("w0", first[0].receipt) is False
+        assert queue.delete("w0", again[0].receipt) is True
+        assert queue.depth("w0") == 1
+        assert queue.receive("w1", 10, visibility_timeout=30) == []
+
+    def test_in_memory_queue(self):
+        """Test unacknowledged messages come back after the timeout with a new receipt."""
+        clock = FakeClock()
+        self.check_visibility(InMemoryQueue(clock=clock), clock)
+
+    def test_sqlite_queue_shared_between_connections(self, tmp_path):
+        """Test the SQLite queue has the same semantics and connections never share a message."""
+        clock = FakeClock()
+        self.check_visibility(SQLiteQueue(tmp_path / "q.db", clock=clock), clock)
+
+        one, two = SQLiteQueue(tmp_path / "q2.db"), SQLiteQueue(tmp_path / "q2.db")
+        one.send("w0", [{"job_id": str(i)} for i in range(10)])
+        taken = one.receive("w0", 6, 60) + two.receive("w0", 6, 60)
+        assert sorted(m.body["job_id"] for m in taken) == sorted(str(i) for i in range(10))
+
+    def test_sqs_queue_batches_and_parses(self):
+        """Test sends are batched by ten and receive counts come from the message attributes."""
+        client = MagicMock()
+        client.send_message_batch.return_value = {"Successful": []}
+        client.receive_message.return_value = {"Messages": [{
+            "MessageId": "m1", "ReceiptHandle": "r1", "Body": '{"job_id": "a"}',
+            "Attributes": {"ApproximateReceiveCount": "3"},
+        }]}
+        queue = SQSQueue("https://sqs.local/1/audits-{shard}", client=client)
+
+        queue.send("w0", [{"job_id": str(i)} for i in range(23)])
+        (message,) = queue.receive("w0", 50, 900)
+
+        assert [len(c.kwargs["Entries"]) for c in client.send_message_batch.call_args_list] == [10, 10, 3]
+        assert client.send_message_batch.call_args.kwargs["QueueUrl"] == "https://sqs.local/1/audits-w0"
+        assert client.receive_message.call_args.kwargs["MaxNumberOfMessages"] == 10
+        assert message.body == {"job_id": "a"} and message.receive_count == 3
+
+
+class TestAuditWorker:
+    """Test idempotent results, retries and visibility extension."""
+
+    def test_duplicate_dispatch_yields_one_report(self, tmp_path):
+        """Test dispatching the same run twice audits each supplier once."""
+        queue, store = InMemoryQueue(), ReportStore(tmp_path / "reports.db")
+        dispatcher = AuditDispatcher(queue, ["w0"])
+        dispatcher.dispatch(SUPPLIERS[:5], run_id="2024-05-10")
+        dispatcher.dispatch(SUPPLIERS[:5], run_id="2024-05-10")
+        supervisor = FakeSupervisor()
+
+        stats = AuditWorker(supervisor, queue, store, "w0", concurrency=4).run(idle_exit_seconds=0)
+
+        assert stats == {"done": 5, "duplicate": 5}
+        assert len(supervisor.calls) == 5
+        assert store.counts() == {"done": 5, "failed": 0}
+        assert {r["supplier_id"] for r in store.iter_reports()} == {s["id"] for s in SUPPLIERS[:5]}
+        assert queue.depth("w0") == 0
+
+    def test_failures_retry_then_give_up(self, tmp_path):
+        """Test a failing job is redelivered after backoff, then recorded failed after max receives."""
+        clock = FakeClock()
+        queue, store = InMemoryQueue(clock=clock), ReportStore(tmp_path / "reports.db")
+        AuditDispatcher(queue, ["w0"]).dispatch(SUPPLIERS[:2], run_id="r")
+        worker = AuditWorker(FakeSupervisor(failures=5), queue, store, "w0", max_receives=3, backoff_base=1)
+
+        for _ in range(3):
+            worker.run_once()
+            assert worker.run_once() == 0
+            clock.now += 10
+        worker.close()
+
+        assert worker.stats == {"retried": 4, "failed": 2}
+        assert store.counts() == {"done": 0, "failed": 2}
+        assert queue.depth("w0") == 0
+
+    def test_long_audit_keeps_its_message_hidden(self, tmp_path):
+        """Test the heartbeat extends visibility so a slow audit is not redelivered."""
+        queue, store = InMemoryQueue(), ReportStore(tmp_path / "reports.db")
+        AuditDispatcher(queue, ["w0"]).dispatch(SUPPLIERS[:1], run_id="r")
+        worker = AuditWorker(FakeSupervisor(delay=1.0), queue, store, "w0", visibility_timeout=0.4)
+        thread = threading.Thread(target=worker.run_once)
+        thread.start()
+
+        stolen = []
+        deadline = time.monotonic() + 0.8
+        while time.monotonic() < deadline:
+            stolen += queue.receive("w0", 1, 0.4)
+            time.sleep(0.05)
+        thread.join()
+        worker.close()
+
+        assert stolen == []
+        assert worker.stats == {"done": 1}
+
+    def test_freed_slot_leases_the_next_job(self, tmp_path):
+        """Test a slow audit holds one slot while the other slot works through the rest of the partition."""
+        class SlowFirstSupervisor(FakeSupervisor):
+            def __init__(self):
+                super().__init__()
+                self.finished = []
+
+            def audit_supplier(self, supplier_name, supplier_record=None):
+                time.sleep(0.5 if supplier_name == "Supplier 0" else 0.01)
+                self.finished.append(supplier_name)
+                return super().audit_supplier(supplier_name, supplier_record)
+
+        queue, store = InMemoryQueue(), ReportStore(tmp_path / "reports.db")
+        AuditDispatcher(queue, ["w0"]).dispatch(SUPPLIERS[:6], run_id="r")
+        supervisor = SlowFirstSupervisor()
+        worker = AuditWorker(supervisor, queue, store, "w0", concurrency=2)
+
+        assert worker.run_once() == 6
+        worker.close()
+
+        assert supervisor.finished[-1] == "Supplier 0"
+        assert worker.stats == {"done": 6}
+
+    def test_dead_workers_expired_leases_are_taken_over(self, tmp_path):
+        """Test an idle worker audits another partition's expired leases but leaves its fresh jobs alone."""
+        clock = FakeClock()
+        queue, store = InMemoryQueue(clock=clock), ReportStore(tmp_path / "reports.db")
+        queue.send("w1", [{"job_id": f"r/{s['id']}", "supplier": s} for s in SUPPLIERS[:3]])
+        # w1 leases two jobs and dies
+        queue.receive("w1", 2, visibility_timeout=30)
+        clock.now += 31
+
+        worker = AuditWorker(FakeSupervisor(), queue, store, "w0", visibility_timeout=30)
+        assert worker.run_once() == 2
+        worker.close()
+
+        assert {r["supplier_key"] for r in store.results()} == {"SUP-000", "SUP-001"}
+        assert all(r["worker"] == "w0" for r in store.results())
+        assert queue.depth("w1") == 1
+
+    def test_heartbeat_does_not_undo_retry_backoff(self, tmp_path):
+        """Test a failed job's backoff is set after its lease is released, so no extension follows it."""
+        class RecordingQueue(InMemoryQueue):
+            def __init__(self):
+                super().__init__()
+                self.changes = []
+
+            def change_visibility(self, shard, receipt, timeout):
+                self.changes.append((receipt, timeout, receipt in worker._leases))
+                return super().change_visibility(shard, receipt, timeout)
+
+        class FailFirstSupervisor(FakeSupervisor):
+            def audit_supplier(self, supplier_name, supplier_record=None):
+                if supplier_name == "Supplier 0":
+                    raise RuntimeError("news API down")
+                time.sleep(0.5)
+                return {"supplier": supplier_name, "overall_risk": "GREEN"}
+
+        queue, store = RecordingQueue(), ReportStore(tmp_path / "reports.db")
+        AuditDispatcher(queue, ["w0"]).dispatch(SUPPLIERS[:2], run_id="r")
+        worker = AuditWorker(FailFirstSupervisor(), queue, store, "w0", visibility_timeout=0.2, backoff_base=0.05)
+
+        worker.run_once()
+        worker.close()
+
+        assert worker.stats["done"] == 1 and worker.stats["retried"] >= 1
+        backoffs = [change for change in queue.changes if change[1] == 0.05]
+        assert backoffs and all(leased is False for _, _, leased in backoffs)
+        # Nothing touches a failed delivery's visibility after its backoff
+        for receipt, _, _ in backoffs:
+            assert [change[0] for change in queue.changes].count(receipt) == 1
+        assert any(change[1] == 0.2 for change in queue.changes)
+
+
+class TestHorizontalScaling:
+    """Test adding workers shortens the run, and worker processes share one queue safely."""
+
+    def test_more_workers_drain_the_portfolio_faster(self, tmp_path):
+        """Test three workers finish the same portfolio in well under half the time of one."""
+        def drain(workers):
+            queue, store = InMemoryQueue(), ReportStore(tmp_path / f"reports-{len(workers)}.db")
+            AuditDispatcher(queue, workers).dispatch(SUPPLIERS, run_id="r")
+            started = time.monotonic()
+            threads = [
+                threading.Thread(
+                    target=AuditWorker(FakeSupervisor(delay=0.05), queue, store, shard, concurrency=2).run,
+                    kwargs={"idle_exit_seconds": 0},
+                )
+                for shard in workers
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert store.counts() == {"done": len(SUPPLIERS), "failed": 0}
+            return time.monotonic() - started
+
+        one = drain(["w0"])
+        three = drain(["w0", "w1", "w2"])
+
+        assert three < one / 2
+
+    def test_worker_processes_deliver_each_job_exactly_once(self, tmp_path):
+        """Test worker processes sharing a SQLite queue audit every supplier once, each by its owner."""
+        queue_url = f"sqlite:{tmp_path / 'queue.db'}"
+        store_path = str(tmp_path / "reports.db")
+        workers = ["worker-0", "worker-1", "worker-2"]
+        suppliers = build_portfolio(30)
+        queue = SQLiteQueue(tmp_path / "queue.db")
+        dispatcher = AuditDispatcher(queue, workers)
+        sent = dispatcher.dispatch(suppliers, run_id="nightly")
+        ReportStore(store_path).close()
+
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=main,
+                args=(["--queue", queue_url, "work", shard, "--store", store_path, "--idle-exit", "0.5"],),
+            )
+            for shard in workers
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=120)
+
+        assert [process.exitcode for process in processes] == [0, 0, 0]
+        assert len(sent) == 3 and sum(sent.values()) == 30
+        results = ReportStore(store_path).results()
+        assert sorted(r["supplier_key"] for r in results) == sorted(s["id"] for s in suppliers)
+        owners = {s["id"]: dispatcher.shard_for(s) for s in suppliers}
+        assert all(r["worker"] == owners[r["supplier_key"]] and r["status"] == "done" for r in results)
+        assert sum(queue.depth(shard) for shard in workers) == 0
@@ -0,0 +1,165 @@
+"""
+Unit tests for the entity-linking prefilter.
+"""
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.pipeline import EntityLinker, FindingRanker, SupplierDirectory
+from src.sources import CallableSourceAdapter, SourceRegistry
+from src.utils.circuit_breaker import reset_circuit_breakers
+from src.utils.findings_cache import FindingsCache
+
+SUPPLIERS = [
+    {"id": "SUP-001", "name": "Acme Corporation", "country": "United States", "category": "Manufacturing"},
+    {"id": "SUP-003", "name": "EcoTextiles Ltd", "country": "Bangladesh", "category": "Textiles",
+     "aliases": ["Eco Textiles"]},
+    {"id": "SUP-009", "name": "Andean Mining Corp", "country": "Peru", "category": "Mining"},
+    {"id": "SUP-010", "name": "Andean Mining SA", "country": "Chile", "category": "Mining"},
+]
+
+
+def finding(snippet, url=None):
+    return {"date": "2024-05-01", "source": "Wire", "snippet": snippet, "category": "Labor", "url": url}
+
+
+class TestSupplierDirectory:
+    """Test cases for the alias index."""
+
+    def test_aliases_drop_legal_designators(self):
+        """Test names are indexed with and without legal suffixes."""
+        directory = SupplierDirectory(SUPPLIERS)
+
+        assert directory.get("Acme")["id"] == "SUP-001"
+        assert directory.get("eco textiles")["id"] == "SUP-003"
+        assert directory.owners(("andean", "mining")) == {
+            ("andean", "mining", "corp"), ("andean", "mining", "sa")
+        }
+        assert directory.get("Andean Mining") is None
+
+    def test_load_suppliers_file(self, tmp_path):
+        """Test the directory loads the sample suppliers.json layout."""
+        path = tmp_path / "suppliers.json"
+        path.write_text('{"suppliers": [{"name": "Nordic Timber Co", "country": "Sweden"}]}')
+
+        directory = SupplierDirectory.load(path)
+
+        assert len(directory) == 1
+        assert directory.get("Nordic Timber")["country"] == "Sweden"
+
+
+class TestEntityLinker:
+    """Test cases for mention strength and context scoring."""
+
+    def setup_method(self):
+        self.linker = EntityLinker(SupplierDirectory(SUPPLIERS), threshold=0.5)
+
+    def test_full_name_and_unique_alias_kept(self):
+        """Test the full name or an unambiguous alias links the finding."""
+        kept, discarded = self.linker.filter("Acme Corporation", [
+            finding("Acme Corporation fined for emissions"),
+            finding("Acme factory workers strike over wages"),
+        ])
+
+        assert len(kept) == 2
+        assert discarded == []
+
+    def test_other_entities_discarded(self):
+        """Test different legal entities and unrelated articles are dropped."""
+        kept, discarded = self.linker.filter("Acme Corporation", [
+            finding("Acme Ltd, a UK retailer, settles fraud case"),
+            finding("Regional factories report strong quarter"),
+            finding("Acme Corporation opens plant in Ohio"),
+        ])
+
+        assert [f["snippet"] for f in kept] == ["Acme Corporation opens plant in Ohio"]
+        assert len(discarded) == 2
+
+    def test_ambiguous_alias_needs_context(self):
+        """Test a shared alias only links with matching country or industry context."""
+        kept, _ = self.linker.filter("Andean Mining Corp", [
+            finding("Andean Mining workers in Peru protest conditions at copper mine", url="a"),
+            finding("Andean Mining in Chile accused of water pollution", url="b"),
+            finding("Andean Mining SA wins new contract", url="c"),
+        ])
+
+        assert [f["url"] for f in kept] == ["a"]
+
+    def test_record_overrides_directory(self):
+        """Test supplier metadata passed in is used for suppliers outside the directory."""
+        linker = EntityLinker(SupplierDirectory(), threshold=0.5)
+        record = {"name": "Sunrise Garments Ltd", "country": "Vietnam", "category": "Apparel",
+                  "aliases": ["Sunrise"]}
+
+        kept, discarded = linker.filter("Sunrise Garments Ltd", [
+            finding("Sunrise garment workers in Vietnam report unpaid overtime", url="a"),
+            finding("Sunrise over the harbour draws tourists", url="b"),
+        ], record)
+
+        assert [f["url"] for f in kept] == ["a"]
+        assert [f["url"] for f in discarded] == ["b"]
+
+
+class TestSupervisorScreening:
+    """Test irrelevant findings never reach the Auditor."""
+
+    def test_discard_rate_reported(self):
+        """Test the report's screening counts include discarded findings."""
+        reset_circuit_breakers()
+        findings = [finding(f"Acme Corporation report {i}", url=f"https://e.com/{i}") for i in range(6)]
+        findings += [finding(f"Acme Ltd press release {i}", url=f"https://e.com/x{i}") for i in range(2)]
+        registry = SourceRegistry([CallableSourceAdapter("wire", lambda name: findings)],
+                                  findings_cache=FindingsCache())
+        seen = []
+        auditor = AuditorAgent()
+        evaluate = auditor.evaluate_findings
+        auditor.evaluate_findings = lambda data: seen.append(len(data["findings"])) or evaluate(data)
+        supervisor = SupervisorAgent(
+            InvestigatorAgent(sources=registry, findings_cache=FindingsCache()),
+            auditor,
+            ranker=FindingRanker(max_findings=4),
+            linker=EntityLinker(SupplierDirectory(SUPPLIERS), threshold=0.5),
+        )
+
+        report = supervisor.audit_supplier("Acme Corporation")
+
+        assert seen == [4]
+        assert report["screening"] == {"found": 8, "irrelevant": 2, "discard_rate": 0.25, "kept": 4}
+
+    def make_supervisor(self, findings, **kwargs):
+        reset_circuit_breakers()
+        registry = SourceRegistry([CallableSourceAdapter("wire", lambda name: findings)],
+                                  findings_cache=FindingsCache())
+        return SupervisorAgent(InvestigatorAgent(sources=registry, findings_cache=FindingsCache()),
+                               AuditorAgent(), **kwargs)
+
+    def test_linking_is_opt_in(self):
+        """Test findings that never repeat the name reach the Auditor unless linking is enabled."""
+        findings = [finding("Factory fined $2M for river pollution", url="a")]
+
+        report = self.make_supervisor(findings).audit_supplier("Acme Corporation")
+
+        assert report["screening"]["irrelevant"] == 0
+        assert report["overall_risk"] != "GREEN"
+
+    def test_headline_mention_keeps_finding(self):
+        """Test the article title counts as a mention when the snippet omits the name."""
+        findings = [{**finding("Factory fined $2M for river pollution", url="a"), "title": "Acme Corporation fined"}]
+        supervisor = self.make_supervisor(findings, linker=EntityLinker(SupplierDirectory(SUPPLIERS), threshold=0.5))
+
+        report = supervisor.audit_supplier("Acme Corporation")
+
+        assert report["screening"]["kept"] == 1
+        assert report["overall_risk"] != "GREEN"
+
+    def test_everything_discarded_is_unknown_not_green(self):
+        """Test an audit whose findings were all screened out is UNKNOWN and degraded."""
+        findings = [finding("Factory fined $2M for river pollution", url="a")]
+        supervisor = self.make_supervisor(findings, linker=EntityLinker(SupplierDirectory(SUPPLIERS), threshold=0.5))
+
+        report = supervisor.audit_supplier("Acme Corporation")
+
+        assert report["screening"]["kept"] == 0
+        assert report["overall_risk"] == "UNKNOWN"
+        assert report["degraded"] is True
+        assert report["degraded_reasons"][0].startswith("link: all 1 findings discarded")
@@ -0,0 +1,176 @@
+"""
+Unit tests for the news-firehose matcher and delta-audit triggering.
+"""
+
+import io
+import json
+import sys
+from datetime import datetime, timezone
+
+import structlog
+
+from src.logging_config import configure_logging
+from src.pipeline.entity_linking import SupplierDirectory
+from src.pipeline.firehose import (
+    AliasAutomaton,
+    FirehoseIngestor,
+    FirehoseMatcher,
+    iter_feed,
+    main,
+    monitor_enqueue,
+)
+from src.pipeline.monitoring import MonitoringScheduler
+from src.utils.recent_set import RecentSet
+
+SUPPLIERS = [
+    {"id": "SUP-006", "name": "Andean Mining Corp", "country": "Peru", "category": "Mining"},
+    {"id": "SUP-008", "name": "FastFashion Garments", "country": "Vietnam", "category": "Apparel",
+     "aliases": ["FFG Apparel"]},
+    {"id": "SUP-011", "name": "Sunrise Foods", "country": "Kenya", "category": "Food Processing"},
+    {"id": "SUP-012", "name": "Global Sunrise Holdings", "country": "Chile", "category": "Mining"},
+]
+
+
+def matcher():
+    return FirehoseMatcher(SupplierDirectory(SUPPLIERS))
+
+
+def names(suppliers):
+    return {" ".join(supplier) for supplier in suppliers}
+
+
+class TestAliasAutomaton:
+    """Test the token-level Aho-Corasick automaton."""
+
+    def test_finds_overlapping_patterns_in_one_pass(self):
+        """Test every occurrence is reported, including patterns sharing suffixes."""
+        automaton = AliasAutomaton([("he",), ("she",), ("his",), ("he", "rs"), ("she", "he", "rs")])
+
+        found = sorted(automaton.search(["ushe", "she", "he", "rs", "his"]))
+
+        assert found == [(1, ("she",)), (1, ("she", "he", "rs")), (2, ("he",)), (2, ("he", "rs")), (4, ("his",))]
+        assert automaton.first_tokens == {"he", "she", "his"}
+
+
+class TestFirehoseMatcher:
+    """Test which mentions trigger a supplier."""
+
+    def test_full_name_and_unique_alias(self):
+        """Test full names and unique multi-word aliases match on word boundaries."""
+        m = matcher()
+
+        assert names(m.match({"title": "Strike at Andean Mining Corp copper pit"})) == {"andean mining corp"}
+        assert names(m.match({"description": "FFG Apparel accused of wage theft"})) == {"fastfashion garments"}
+        assert m.match({"title": "Andean Miningcorp shares"}) == set()
+
+    def test_weak_and_conflicting_mentions_do_not_trigger(self):
+        """Test one-word aliases, other legal entities and nested names are ignored."""
+        m = matcher()
+
+        assert m.match({"title": "Sunrise over the Andes"}) == set()
+        assert m.match({"title": "Andean Mining SA fined for spill"}) == set()
+        assert names(m.match({"title": "Global Sunrise Holdings opens mine"})) == {"global sunrise holdings"}
+
+    def test_prefilter_skips_articles_without_candidate_tokens(self):
+        """Test articles sharing no first alias token never reach the automaton."""
+        m = matcher()
+
+        assert not m.prefilter(m.article_tokens({"title": "Central bank holds rates"}))
+        assert m.prefilter(m.article_tokens({"title": "Andean weather report"}))
+
+
+class TestFirehoseIngestor:
+    """Test batching, de-duplication and enqueueing of delta audits."""
+
+    def test_one_delta_audit_per_supplier_per_batch(self):
+        """Test repeated and syndicated mentions collapse into one enqueue."""
+        enqueued = []
+        ingestor = FirehoseIngestor(matcher(), lambda record, articles: enqueued.append((record["id"], len(articles))))
+        articles = [
+            {"url": "https://a/1", "title": "Andean Mining Corp spill"},
+            {"url": "https://a/1", "title": "Andean Mining Corp spill"},
+            {"url": "https://b/2", "title": "Andean Mining Corp responds to spill"},
+            {"url": "https://c/3", "title": "FastFashion Garments audit"},
+            {"url": "https://d/4", "title": "Markets close higher"},
+            {"url": "https://e/5", "title": "Andean Mining SA lawsuit"},
+        ]
+
+        stats = ingestor.ingest(articles)
+
+        assert sorted(enqueued) == [("SUP-006", 2), ("SUP-008", 1)]
+        assert stats["duplicate"] == 1
+        assert stats["prefiltered"] == 1
+        assert stats["matched"] == 3
+        assert stats["unmatched"] == 1
+        assert stats["delta_audits"] == 2
+
+    def test_hits_expedite_monitored_suppliers(self):
+        """Test a hit moves the supplier to the front of the monitoring schedule."""
+        now = datetime(2024, 5, 10, tzinfo=timezone.utc).timestamp()
+        monitor = MonitoringScheduler(None, SUPPLIERS, audits_per_hour=60, clock=lambda: now)
+        for supplier in SUPPLIERS:
+            monitor.record(supplier["id"], {"overall_risk": "GREEN", "findings": []}, now=now)
+
+        FirehoseIngestor(matcher(), monitor_enqueue(monitor)).ingest(
+            [{"url": "https://a/1", "title": "Sunrise Foods recalls products"}]
+        )
+
+        assert monitor.schedule()[0] == ("SUP-011", now)
+
+    def test_replay_from_feed_file(self, tmp_path, capsys, monkeypatch):
+        """Test the CLI replays a JSON Lines feed, printing only the triggered audits on stdout."""
+        # Log to the real stderr: the captured one closes after this test, and
+        # module loggers keep the stream they were first used with
+        saved = structlog.get_config()
+        monkeypatch.setattr("src.pipeline.firehose.configure_logging",
+                            lambda stream=None: configure_logging(stream=sys.__stderr__))
+        suppliers = tmp_path / "suppliers.json"
+        suppliers.write_text(json.dumps({"suppliers": SUPPLIERS}))
+        feed = tmp_path / "feed.jsonl"
+        feed.write_text("\n".join(json.dumps(article) for article in [
+            {"url": "https://a/1", "title": "Global Sunrise Holdings tailings dam"},
+            {"url": "https://a/2", "title": "Weather"},
+        ]))
+
+        try:
+            assert main([str(feed), "--suppliers", str(suppliers)]) == 0
+        finally:
+            structlog.configure(**saved)
+
+        captured = capsys.readouterr()
+        lines = [json.loads(line) for line in captured.out.splitlines()]
+        assert lines == [{"supplier": "Global Sunrise Holdings", "supplier_id": "SUP-012",
+                          "articles": ["https://a/1"]}]
+        assert json.loads(captured.err)["delta_audits"] == 1
+
+    def test_stdin_feed_is_left_open(self, monkeypatch):
+        """Test reading the '-' feed does not close stdin, so later feeds or readers can use it."""
+        stdin = io.StringIO('{"title": "Sunrise Foods recall"}\n\n')
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert list(iter_feed("-")) == [{"title": "Sunrise Foods recall"}]
+        assert not stdin.closed
+
+
+class TestRecentSet:
+    """Test the bounded de-duplication set."""
+
+    def test_membership_is_exact(self):
+        """Test added items are always found and unseen items never are."""
+        seen = RecentSet(capacity=10_000)
+        assert not any(seen.add(f"https://news.example/{i}") for i in range(10_000))
+
+        assert all(f"https://news.example/{i}" in seen for i in range(10_000))
+        assert not any(f"https://other.example/{i}" in seen for i in range(10_000))
+        assert seen.add("https://news.example/1") is True
+
+    def test_least_recently_seen_is_evicted(self):
+        """Test memory stays bounded and a re-seen item is kept over an older one."""
+        seen = RecentSet(capacity=2)
+        seen.add("a")
+        seen.add("b")
+        seen.add("a")
+        seen.add("c")
+
+        assert len(seen) == 2
+        assert "a" in seen and "c" in seen and "b" not in seen
@@ -0,0 +1,171 @@
+"""
+Unit tests for the in-process metrics registry.
+"""
+
+import json
+import time
+import urllib.request
+
+import pytest
+from unittest.mock import patch
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.exceptions import KnowledgeBaseError
+from src.utils.aws_clients import get_bedrock_agent_runtime_client, query_knowledge_base
+from src.utils.fakes import FakeBedrockAgentRuntime
+from src.utils.findings_cache import FindingsCache
+from src.utils.metrics import MetricsRegistry, get_registry, start_metrics_server
+from src.utils.single_flight import get_single_flight
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def setup_method(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self):
+        """Test counters and gauges record values per label set."""
+        counter = self.registry.counter("jobs_total", "Jobs", ["kind"])
+        gauge = self.registry.gauge("queue_depth", "Depth")
+
+        counter.labels(kind="a").inc()
+        counter.labels("a").inc(2)
+        counter.labels(kind="b").inc()
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        assert counter.value(kind="a") == 3
+        assert counter.value(kind="b") == 1
+        assert self.registry.snapshot()["queue_depth"] == 1
+
+    def test_text_exposition(self):
+        """Test Prometheus text output includes HELP, TYPE and labelled samples."""
+        self.registry.counter("jobs_total", "Jobs processed", ["kind"]).labels(kind='x"y').inc()
+
+        text = self.registry.render_text()
+
+        assert "# HELP jobs_total Jobs processed" in text
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="x\\"y"} 1' in text
+
+    def test_collectors_merge_into_one_family(self):
+        """Test collector samples with the same name render under one header."""
+        for cache in ("a", "b"):
+            self.registry.register_collector(
+                lambda cache=cache: [("hits_total", "counter", "Hits", [({"cache": cache}, 1)])]
+            )
+
+        text = self.registry.render_text()
+        assert text.count("# TYPE hits_total counter") == 1
+        assert 'hits_total{cache="b"} 1' in text
+
+    def test_type_conflict_rejected(self):
+        """Test re-registering a name as a different type fails."""
+        self.registry.counter("thing", "Thing")
+        with pytest.raises(ValueError):
+            self.registry.gauge("thing", "Thing")
+
+    def test_labelled_metric_needs_labels(self):
+        """Test inc/set on a labelled metric without labels() is a clear ValueError."""
+        counter = self.registry.counter("jobs_total", "Jobs", ["kind"])
+        gauge = self.registry.gauge("depth", "Depth", ["queue"])
+
+        with pytest.raises(ValueError, match="labels"):
+            counter.inc()
+        with pytest.raises(ValueError, match="labels"):
+            gauge.set(3)
+
+    def test_increment_overhead(self):
+        """Test hot-path increments stay around a microsecond."""
+        counter = self.registry.counter("hot_total", "Hot path")
+        iterations = 200_000
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            counter.inc()
+        per_call = (time.perf_counter() - started) / iterations
+
+        assert counter.value() == iterations
+        assert per_call < 2e-6
+
+
+class TestWiredMetrics:
+    """Test agents and AWS helpers publish to the global registry."""
+
+    def test_audit_metrics(self):
+        """Test audits, risk levels and violation severities are counted."""
+        registry = get_registry()
+        audits = registry.counter("sentinel_audits_total", "")
+        red = registry.counter("sentinel_audit_risk_level_total", "", ["risk"])
+        critical = registry.counter("sentinel_violations_total", "", ["severity"])
+        before = (audits.value(), red.value(risk="RED"), critical.value(severity="CRITICAL"))
+
+        SupervisorAgent(InvestigatorAgent(), AuditorAgent()).audit_supplier("QuickProd Factories")
+
+        assert audits.value() == before[0] + 1
+        assert red.value(risk="RED") == before[1] + 1
+        assert critical.value(severity="CRITICAL") > before[2]
+        assert registry.snapshot()["sentinel_audits_in_flight"] == 0
+
+    def test_aws_errors_counted_by_exception_class(self):
+        """Test failed KB queries are counted under KnowledgeBaseError."""
+        errors = get_registry().counter("sentinel_aws_errors_total", "", ["operation", "exception"])
+        before = errors.value(operation="retrieve", exception="KnowledgeBaseError")
+
+        fake = FakeBedrockAgentRuntime(throttle_rate=1.0)
+        with patch("src.utils.aws_clients.get_bedrock_agent_runtime_client", return_value=fake):
+            with pytest.raises(KnowledgeBaseError):
+                query_knowledge_base("kb-1", "bribery")
+
+        assert errors.value(operation="retrieve", exception="KnowledgeBaseError") == before + 1
+
+    def test_default_collectors_expose_clients_and_spans(self):
+        """Test AWS client creation counts and span quantiles appear in the exposition."""
+        get_bedrock_agent_runtime_client()
+        SupervisorAgent(InvestigatorAgent(), AuditorAgent()).audit_supplier("Acme")
+
+        text = get_registry().render_text()
+
+        assert 'sentinel_aws_clients_created_total{service="bedrock-agent-runtime"}' in text
+        assert 'sentinel_span_duration_seconds{span="supervisor.audit_supplier",quantile="0.95"}' in text
+
+    def test_cache_hits_and_misses(self):
+        """Test findings cache, single-flight and AWS client lookups report hits and misses."""
+        registry = get_registry()
+        hits = registry.counter("sentinel_cache_hits_total", "", ["cache"])
+        misses = registry.counter("sentinel_cache_misses_total", "", ["cache"])
+        before = (hits.value(cache="findings"), misses.value(cache="findings"))
+
+        cache = FindingsCache()
+        cache.put("Acme", [])
+        cache.get("Acme")
+        cache.get("Beta")
+        get_single_flight("unit").do("key", lambda: None)
+        get_bedrock_agent_runtime_client()
+        get_bedrock_agent_runtime_client()
+
+        assert hits.value(cache="findings") == before[0] + 1
+        assert misses.value(cache="findings") == before[1] + 1
+        assert misses.value(cache="single_flight_unit") >= 1
+        text = registry.render_text()
+        assert 'sentinel_cache_hits_total{cache="aws_clients"}' in text
+        assert 'sentinel_cache_misses_total{cache="aws_clients"}' in text
+
+    def test_http_endpoint(self):
+        """Test the HTTP server serves text and JSON snapshots."""
+        registry = MetricsRegistry()
+        registry.counter("served_total", "Served").inc()
+        server = start_metrics_server(port=0, addr="127.0.0.1", registry=registry)
+        try:
+            port = server.server_address[1]
+            text = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+            snapshot = json.loads(urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json").read())
+        finally:
+            server.shutdown()
+
+        assert "served_total 1" in text
+        assert snapshot == {"served_total": 1.0}
@@ -0,0 +1,171 @@
+"""
+Unit tests for risk-weighted continuous re-auditing.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.pipeline.monitoring import MonitoringScheduler
+
+NOW = datetime(2024, 5, 10, tzinfo=timezone.utc).timestamp()
+HOUR = 3600.0
+SUPPLIERS_FILE = Path(__file__).resolve().parents[2] / "data" / "sample" / "suppliers.json"
+INTERVALS = {"RED": 24.0, "YELLOW": 72.0, "GREEN": 336.0, "UNKNOWN": 12.0}
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubSupervisor:
+    """Supervisor stub returning a fixed risk for every audit."""
+
+    def __init__(self, risk="GREEN"):
+        self.risk = risk
+        self.audited = []
+
+    def audit_supplier(self, supplier_name, supplier_record=None):
+        self.audited.append(supplier_name)
+        return {"supplier": supplier_name, "overall_risk": self.risk, "findings": []}
+
+
+def load_suppliers():
+    return json.loads(SUPPLIERS_FILE.read_text(encoding="utf-8"))["suppliers"]
+
+
+def report(risk, finding_date=None):
+    findings = [{"date": finding_date, "snippet": "..."}] if finding_date else []
+    return {"overall_risk": risk, "findings": findings}
+
+
+class TestNextAuditTime:
+    """Test next-audit times follow risk, status and finding recency."""
+
+    def test_flagged_red_supplier_with_fresh_findings_comes_back_first(self):
+        """Test RED + flagged + a two-day-old finding beats a quiet GREEN supplier by far."""
+        suppliers = [
+            {"id": "A", "name": "FastFashion Garments", "status": "flagged"},
+            {"id": "B", "name": "Nordic Timber Co", "status": "active"},
+        ]
+        monitor = MonitoringScheduler(StubSupervisor(), suppliers, audits_per_hour=100,
+                                      intervals=INTERVALS, clock=FakeClock())
+
+        red = monitor.record("A", report("RED", "2024-05-08"), now=NOW)
+        green = monitor.record("B", report("GREEN"), now=NOW)
+
+        # 24h x 0.25 (flagged) x 0.5 (fresh finding), within the jitter
+        assert (red - NOW) / HOUR == pytest.approx(3.0, rel=0.11)
+        assert (green - NOW) / HOUR == pytest.approx(336.0, rel=0.11)
+        assert [key for key, _ in monitor.schedule()] == ["A", "B"]
+
+    def test_status_from_supplier_master(self):
+        """Test sample suppliers under review or flagged are re-audited sooner on the same risk."""
+        by_name = {s["name"]: s for s in load_suppliers()}
+        monitor = MonitoringScheduler(StubSupervisor(), by_name.values(), audits_per_hour=100,
+                                      intervals=INTERVALS, clock=FakeClock())
+        due = {
+            name: monitor.record(by_name[name]["id"], report("YELLOW"), now=NOW) - NOW
+            for name in ("Nordic Timber Co", "EcoTextiles Ltd", "FastFashion Garments")
+        }
+
+        assert due["FastFashion Garments"] < due["EcoTextiles Ltd"] < due["Nordic Timber Co"]
+
+    def test_demand_over_budget_stretches_intervals(self):
+        """Test intervals stretch evenly when the portfolio needs more audits than the budget."""
+        suppliers = [{"id": str(i), "name": f"Supplier {i}"} for i in range(48)]
+        monitor = MonitoringScheduler(StubSupervisor(), suppliers, audits_per_hour=1,
+                                      intervals=INTERVALS, clock=FakeClock())
+        due = [monitor.record(supplier["id"], report("RED"), now=NOW) for supplier in suppliers]
+
+        assert monitor.demand_per_hour() == pytest.approx(2.0)
+        assert monitor.stretch() == pytest.approx(2.0)
+        # Earlier records were stretched against the unaudited suppliers' UNKNOWN interval
+        assert all(d - NOW >= 0.9 * 48 * HOUR for d in due)
+        assert (due[-1] - NOW) / HOUR == pytest.approx(48.0, rel=0.11)
+
+    def test_seed_from_earlier_reports(self):
+        """Test seeding times the next audit from the report timestamp."""
+        monitor = MonitoringScheduler(StubSupervisor(), [{"id": "SUP-1", "name": "Acme Corp"}],
+                                      audits_per_hour=100, intervals=INTERVALS, clock=FakeClock())
+        seeded = monitor.seed([
+            {"supplier_id": "SUP-1", "supplier": "Acme Corp", "overall_risk": "GREEN",
+             "timestamp": "2024-05-09T00:00:00Z", "findings": []},
+            {"supplier": "Unknown Supplier", "overall_risk": "RED", "timestamp": "2024-05-09T00:00:00Z"},
+        ])
+
+        assert seeded == 1
+        assert monitor.overdue() == 0
+        assert (monitor.next_due() - NOW) / HOUR == pytest.approx(336.0 - 24.0, rel=0.11)
+
+
+class TestBudgetPacing:
+    """Test due audits are spread across the hour under the budget."""
+
+    def test_due_suppliers_are_paced_and_rescheduled(self):
+        """Test a portfolio that is all due at once starts one audit per budget slot."""
+        clock = FakeClock()
+        supervisor = StubSupervisor(risk="GREEN")
+        suppliers = load_suppliers()
+        monitor = MonitoringScheduler(supervisor, suppliers, audits_per_hour=6,
+                                      intervals=INTERVALS, clock=clock)
+
+        assert len(monitor.run_pending()) == 1
+        assert monitor.run_pending() == []
+        clock.now += 10 * 60
+        futures = monitor.run_pending()
+        assert len(futures) == 1 and futures[0].result()["overall_risk"] == "GREEN"
+
+        clock.now += 5 * 60
+        assert monitor.run_pending() == []
+        assert len(supervisor.audited) == 2
+        assert monitor.overdue() == len(suppliers) - 2
+        # Audited GREEN suppliers go to the back of the schedule
+        assert monitor.schedule()[-1][1] - clock.now > 24 * HOUR
+
+    def test_failed_audit_is_retried_later(self):
+        """Test a failing re-audit is rescheduled an hour out instead of dropped."""
+        class FailingSupervisor:
+            def audit_supplier(self, supplier_name, supplier_record=None):
+                raise RuntimeError("bedrock unavailable")
+
+        clock = FakeClock()
+        monitor = MonitoringScheduler(FailingSupervisor(), [{"id": "1", "name": "Acme Corp"}],
+                                      audits_per_hour=60, intervals=INTERVALS, clock=clock)
+
+        [future] = monitor.run_pending()
+
+        assert isinstance(future.exception(), RuntimeError)
+        assert monitor.next_due() == pytest.approx(NOW + HOUR)
+
+    def test_cancelled_audit_is_retried_later(self):
+        """Test a re-audit cancelled in the audit scheduler's queue keeps the supplier monitored."""
+        from concurrent.futures import Future
+
+        class QueueingScheduler:
+            def __init__(self):
+                self.futures = []
+
+            def submit(self, supplier_name, priority, supplier_record=None):
+                self.futures.append(Future())
+                return self.futures[-1]
+
+        clock = FakeClock()
+        audit_scheduler = QueueingScheduler()
+        monitor = MonitoringScheduler(StubSupervisor(), [{"id": "1", "name": "Acme Corp"}],
+                                      audits_per_hour=60, intervals=INTERVALS,
+                                      audit_scheduler=audit_scheduler, clock=clock)
+
+        [future] = monitor.run_pending()
+        assert monitor.next_due() is None
+        future.cancel()
+
+        assert monitor.next_due() == pytest.approx(NOW + HOUR)
@@ -0,0 +1,162 @@
+"""
+Unit tests for agentic orchestration and the hybrid path's concurrent fan-out.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from src.agents.bedrock_supervisor import BedrockSupervisorAgent
+from src.agents.policy_evaluator import PolicyEvaluator, fan_out
+from src.benchmark.orchestration import clear_verdicts, run_orchestration_benchmark
+from src.exceptions import AuditError, ConfigurationError
+from src.utils.deadline import current_deadline, deadline_scope
+from src.utils.fakes import FakeBedrockAgentRuntime
+
+
+class TestBedrockSupervisorAgent:
+    """Test the agentic client sends the audit and parses the agent's report."""
+
+    def test_report_is_parsed_and_normalised(self):
+        """Test the JSON report is found in prose and missing fields are filled."""
+        prompts = []
+        def responder(prompt):
+            prompts.append(prompt)
+            return 'Here is the report: {"overall_risk": "RED", "violations": [{"category": "Labor"}]} Done.'
+        agent = BedrockSupervisorAgent(client=FakeBedrockAgentRuntime(responder=responder), agent_id="SUPERVISOR")
+
+        report = agent.audit_supplier(
+            "Acme Textiles", supplier_record={"country": "Bangladesh", "category": "Apparel"}
+        )
+
+        assert prompts == ['Audit Acme Textiles ({"country": "Bangladesh", "category": "Apparel"})']
+        assert report["supplier"] == "Acme Textiles"
+        assert report["overall_risk"] == "RED"
+        assert report["violations"] == [{"category": "Labor"}]
+        assert report["findings"] == [] and report["degraded"] is False
+        assert report["tokens"]["calls"] == 1
+
+    def test_runner_arguments_are_accepted(self):
+        """Test batch and scheduler calls work: on_stage runs before the agent, stored findings are refused."""
+        agent = BedrockSupervisorAgent(
+            client=FakeBedrockAgentRuntime(responder=lambda prompt: '{"overall_risk": "GREEN"}'),
+            agent_id="SUPERVISOR",
+        )
+        stages = []
+
+        report = agent.audit_supplier("Acme Textiles", findings=None, on_stage=lambda *args: stages.append(args))
+
+        assert stages == [("investigating", None)]
+        assert report["overall_risk"] == "GREEN"
+        with pytest.raises(ConfigurationError):
+            agent.audit_supplier("Acme Textiles", findings={"findings": []})
+
+    def test_answer_without_report_raises(self):
+        """Test an answer holding no JSON object is an AuditError."""
+        agent = BedrockSupervisorAgent(
+            client=FakeBedrockAgentRuntime(responder=lambda prompt: "I could not finish the audit."),
+            agent_id="SUPERVISOR",
+        )
+
+        with pytest.raises(AuditError):
+            agent.audit_supplier("Acme Textiles")
+
+    def test_missing_agent_id_raises(self, monkeypatch):
+        """Test agentic mode refuses to start without a Supervisor agent."""
+        from src.config import get_settings
+
+        monkeypatch.setattr(get_settings().aws, "supervisor_agent_id", None)
+
+        with pytest.raises(ConfigurationError):
+            BedrockSupervisorAgent(client=FakeBedrockAgentRuntime())
+
+
+class TestAuditorFanOut:
+    """Test KB retrievals and agent batches run concurrently within one audit."""
+
+    def test_fan_out_keeps_order_and_context(self):
+        """Test results come back in input order and each call sees the caller's deadline."""
+        threads = set()
+        def work(i):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.02)
+            return i, current_deadline()
+
+        with deadline_scope(30) as deadline:
+            results = fan_out(work, list(range(6)))
+
+        assert [i for i, _ in results] == list(range(6))
+        assert all(seen is deadline for _, seen in results)
+        assert len(threads) > 1
+
+    def test_fan_out_bounds_calls_in_flight(self):
+        """Test an explicit max_workers caps the calls running at once."""
+        lock, running, peak = threading.Lock(), [0], [0]
+        def work(i):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return i
+
+        assert fan_out(work, list(range(8)), max_workers=2) == list(range(8))
+        assert peak[0] == 2
+
+    def test_fan_out_runs_inline_with_one_worker(self, monkeypatch):
+        """Test APP_AUDITOR_MAX_WORKERS=1 keeps everything on the calling thread."""
+        from src.config import get_settings
+
+        monkeypatch.setattr(get_settings().app, "auditor_max_workers", 1)
+        caller = threading.current_thread().name
+
+        assert fan_out(lambda i: threading.current_thread().name, [1, 2, 3]) == [caller] * 3
+
+    def test_batches_are_sent_concurrently(self):
+        """Test a batch split across several agent calls overlaps them and merges the verdicts."""
+        client = FakeBedrockAgentRuntime(responder=clear_verdicts, latency=0.05)
+        evaluator = PolicyEvaluator(client=client, agent_id="AUDITOR", max_batch_findings=3)
+        items = [({"snippet": f"Allegation {i}", "category": "Labor"}, []) for i in range(12)]
+
+        result = evaluator.evaluate_batch(items)
+
+        assert result.calls == 4
+        assert result.verdicts == {i: None for i in range(12)}
+        assert client.max_in_flight > 1
+
+
+class TestOrchestrationBenchmark:
+    """Test the hybrid path beats the agentic path on the same workload."""
+
+    def test_hybrid_is_faster_with_the_same_outcome(self):
+        """Test hybrid makes fewer model calls, runs faster and rates suppliers alike."""
+        results = run_orchestration_benchmark(
+            suppliers=3, findings_per_supplier=6, llm_latency_ms=40, news_latency_ms=5, kb_latency_ms=5
+        )
+
+        modes = results["modes"]
+        assert set(modes) == {"agentic", "hybrid_sequential", "hybrid_no_prefetch", "hybrid"}
+        assert modes["agentic"]["model_calls_per_audit"] == 7
+        assert modes["hybrid"]["model_calls_per_audit"] < 7
+        assert modes["hybrid"]["speedup_vs_agentic"] > 1
+        assert modes["hybrid"]["risk_levels"] == modes["agentic"]["risk_levels"]
+        assert modes["hybrid"]["kb_calls_per_audit"] < modes["hybrid_no_prefetch"]["kb_calls_per_audit"]
+        assert 0 < modes["hybrid"]["prefetch_hit_rate"] <= 1
+        json.dumps(results)
+
+    def test_benchmark_leaves_settings_alone(self):
+        """Test the pool size is passed to the Auditor rather than patched into the settings."""
+        from src.config import get_settings
+
+        before = get_settings().app.auditor_max_workers
+        results = run_orchestration_benchmark(
+            suppliers=1, findings_per_supplier=4, llm_latency_ms=1, news_latency_ms=1, kb_latency_ms=1,
+            modes=["hybrid_sequential"], max_workers=3,
+        )
+
+        assert get_settings().app.auditor_max_workers == before
+        assert results["config"]["max_workers"] == 3
+        assert results["modes"]["hybrid_sequential"]["kb_max_in_flight"] == 1
@@ -0,0 +1,151 @@
+"""
+Unit tests for speculative policy-section prefetch.
+"""
+
+from concurrent.futures import Future
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.policy_prefetch import PolicyPrefetch, current_prefetch, prefetch_query, prefetch_scope
+from src.agents.supervisor import SupervisorAgent
+from src.utils.fakes import FakeBedrockAgentRuntime, FakeNewsAPI
+from src.utils.tracing import get_span_recorder
+
+SECTIONS = {
+    "Labor": [{"text": "Working Conditions: Overtime must be voluntary. Workers may form unions.", "score": 0.4}],
+    "Environment": [
+        {"text": "Pollution Control: Prevent water pollution and report emissions.", "score": 0.5},
+        {"text": "Violations: Environmental fines must be reported within 30 days.", "score": 0.3},
+    ],
+}
+
+
+def completed(value=None, error=None):
+    future = Future()
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+    return future
+
+
+def make_prefetch(submit=None, **kwargs):
+    queries = []
+    def retrieve(query):
+        queries.append(query)
+        return SECTIONS.get(query.split(" ", 1)[0], [])
+    prefetch = PolicyPrefetch(retrieve, {"category": "Apparel", "country": "Vietnam"}, **kwargs)
+    prefetch.start(submit or (lambda fn: completed(fn())))
+    return prefetch, queries
+
+
+class TestPolicyPrefetch:
+    """Test hits, misses and the prefetch summary."""
+
+    def test_queries_use_industry_and_country(self):
+        """Test one query per audit category, narrowed by the supplier record."""
+        _, queries = make_prefetch()
+
+        assert len(queries) == 3
+        assert queries[0].startswith("Labor policy for Apparel suppliers in Vietnam: ")
+        assert "bribery" in queries[2]
+        assert prefetch_query("Environment") == "Environment policy for all suppliers: " \
+            "pollution environmental emissions fine epa"
+
+    def test_matching_sections_hit_and_others_miss(self):
+        """Test sections sharing a word with the snippet are used, best match first."""
+        prefetch, _ = make_prefetch()
+
+        hit = prefetch.lookup({"category": "Environment", "snippet": "Plant fined after water contamination"})
+        unrelated = prefetch.lookup({"category": "Labor", "snippet": "Child labour found at a subcontractor"})
+        empty = prefetch.lookup({"category": "Governance", "snippet": "Bribery probe opened"})
+
+        assert hit[0]["text"].startswith("Pollution Control")
+        assert unrelated is None and empty is None
+        summary = prefetch.summary()
+        assert summary["queries"] == 3
+        assert (summary["lookups"], summary["hits"], summary["misses"]) == (3, 1, 2)
+        assert summary["hit_rate"] == 0.333
+
+    def test_query_keywords_do_not_count_as_overlap(self):
+        """Test a snippet sharing only the prefetch query's keywords with a section is a miss."""
+        prefetch, _ = make_prefetch()
+
+        assert prefetch.lookup({"category": "Environment", "snippet": "Pollution and emissions probe"}) is None
+        assert prefetch.lookup({"category": "Environment", "snippet": "Emissions reported late"}) is not None
+
+    def test_scope_exit_cancels_queued_retrievals(self):
+        """Test retrievals still queued when the audit ends are cancelled, even on an error."""
+        queued = []
+        def submit(fn):
+            queued.append(Future())
+            return queued[-1]
+        prefetch, _ = make_prefetch(submit=submit)
+
+        try:
+            with prefetch_scope(prefetch):
+                assert current_prefetch() is prefetch
+                raise RuntimeError("Investigator failed")
+        except RuntimeError:
+            pass
+
+        assert current_prefetch() is None
+        assert len(queued) == 3 and all(future.cancelled() for future in queued)
+
+    def test_failed_or_unstarted_retrievals_miss(self):
+        """Test a failed retrieval is a miss, and one never started is cancelled rather than awaited."""
+        pending = []
+        def submit(fn):
+            if not pending:
+                pending.append(Future())
+                return pending[0]
+            return completed(error=RuntimeError("KB down"))
+        prefetch, _ = make_prefetch(submit=submit)
+
+        assert prefetch.lookup({"category": "Labor", "snippet": "Overtime complaints"}) is None
+        assert pending[0].cancelled()
+        assert prefetch.lookup({"category": "Environment", "snippet": "Water pollution"}) is None
+        assert prefetch.summary()["misses"] == 2
+
+
+class TestSupervisorPrefetch:
+    """Test the Supervisor prefetches while the Investigator runs."""
+
+    def make_supervisor(self, **kwargs):
+        self.kb = FakeBedrockAgentRuntime(latency=0.02)
+        self.news = FakeNewsAPI(latency=0.15)
+        return SupervisorAgent(
+            InvestigatorAgent(news_api_client=self.news),
+            AuditorAgent(knowledge_base_client=self.kb, knowledge_base_id="kb-1"),
+            coalesce=False,
+            **kwargs,
+        )
+
+    def test_prefetch_overlaps_investigation_and_saves_retrievals(self):
+        """Test hits skip on-demand retrieval and the prefetch was ready before the Auditor."""
+        # Fast fake KB samples from earlier tests would otherwise trigger hedged duplicates
+        get_span_recorder().reset()
+        supervisor = self.make_supervisor()
+
+        report = supervisor.audit_supplier(
+            "QuickProd Factories", supplier_record={"country": "China", "category": "Manufacturing"}
+        )
+
+        prefetch = report["prefetch"]
+        assert prefetch["queries"] == 3 and prefetch["hits"] >= 1
+        assert prefetch["lookups"] == prefetch["hits"] + prefetch["misses"]
+        assert self.kb.calls == 3 + prefetch["misses"]
+        assert prefetch["wait_seconds"] < 0.05
+        assert prefetch["retrieval_seconds_saved"] > 0
+        assert all(violation["policy_context"] for violation in report["violations"])
+
+    def test_disabled_or_given_findings_skip_prefetch(self):
+        """Test no prefetch runs when turned off or when there is no investigation to overlap."""
+        report = self.make_supervisor(prefetch_policy=False).audit_supplier("QuickProd Factories")
+        assert report["prefetch"] == {}
+
+        supervisor = self.make_supervisor()
+        findings = InvestigatorAgent().search_supplier_news("QuickProd Factories")
+        report = supervisor.audit_supplier("QuickProd Factories", findings=findings)
+        assert report["prefetch"] == {}
+        assert report["violations"]
@@ -0,0 +1,95 @@
+"""
+Unit tests for relevance ranking and top-K selection.
+"""
+
+from datetime import date
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.pipeline.ranking import FindingRanker
+from src.utils.fakes import FakeNewsAPI
+from src.utils.findings_cache import FindingsCache
+
+TODAY = date(2024, 12, 1)
+
+
+def finding(snippet, day="2024-11-01", source="Industry News"):
+    return {"date": day, "source": source, "snippet": snippet, "category": "Environment", "url": None}
+
+
+class TestFindingRanker:
+    """Test cases for FindingRanker scoring and selection."""
+
+    def setup_method(self):
+        self.ranker = FindingRanker(max_findings=3, today=lambda: TODAY)
+
+    def test_recency_decays_with_half_life(self):
+        """Test a finding one half-life old scores half as recent."""
+        assert self.ranker.recency(finding("x", "2024-12-01")) == 1.0
+        assert abs(self.ranker.recency(finding("x", "2024-06-04")) - 0.5) < 0.01
+        assert self.ranker.recency(finding("x", "last spring")) == 0.0
+
+    def test_credibility_matches_whole_words_and_domains(self):
+        """Test "epa" and "court" match a regulator or its domain, not a country or a person."""
+        def credibility(source):
+            return self.ranker.source_credibility(finding("x", source=source))
+
+        assert credibility("US EPA") == credibility("epa.gov") == 1.0
+        assert credibility("Supreme Court") == credibility("Financial Regulatory Authority") == 1.0
+        assert credibility("Human Rights Watch") == 0.8
+        assert credibility("Nepal Times") == credibility("Courtney's Blog") == 0.5
+        assert credibility("Newsweek") == 0.5
+
+    def test_signals_order_findings(self):
+        """Test credible, recent, on-topic findings naming the supplier rank first."""
+        findings = [
+            finding("Unrelated market update", "2020-01-01", "Blog"),
+            finding("Acme Corp fined by EPA for pollution and emissions", source="Environmental Protection Agency"),
+            finding("Acme mentioned in passing", "2023-01-01"),
+            finding("Acme Corp workers strike over wages", source="Labor Watch"),
+        ]
+
+        ranked = self.ranker.select("Acme Corp", findings)
+
+        assert [f["snippet"] for f in ranked] == [
+            findings[1]["snippet"], findings[3]["snippet"], findings[2]["snippet"]
+        ]
+
+    def test_name_match_strength(self):
+        """Test full phrase beats partial mentions."""
+        assert FindingRanker.name_match(["acme", "corp", "fined"], ["acme", "corp"]) == 1.0
+        assert FindingRanker.name_match(["acme", "fined"], ["acme", "corp"]) == 0.4
+        assert FindingRanker.name_match(["other"], ["acme", "corp"]) == 0.0
+
+    def test_keeps_at_most_k_and_is_stable(self):
+        """Test truncation to K keeps the original order among equal scores."""
+        findings = [finding(f"Acme Corp item {i}") for i in range(10)]
+
+        ranked = self.ranker.select("Acme Corp", findings)
+
+        assert ranked == findings[:3]
+
+
+class TestSupervisorRanking:
+    """Test the Supervisor bounds the findings the Auditor sees."""
+
+    def test_auditor_sees_top_k_only(self):
+        """Test a noisy source is cut down to max_findings before auditing."""
+        noisy = [finding(f"QuickProd Factories report {i}", source="Wire") for i in range(200)]
+        seen = []
+        auditor = AuditorAgent()
+        evaluate = auditor.evaluate_findings
+        auditor.evaluate_findings = lambda data: seen.append(len(data["findings"])) or evaluate(data)
+        supervisor = SupervisorAgent(
+            InvestigatorAgent(news_api_client=FakeNewsAPI(findings_for=lambda name: noisy),
+                              findings_cache=FindingsCache()),
+            auditor,
+            ranker=FindingRanker(max_findings=25),
+        )
+
+        report = supervisor.audit_supplier("QuickProd Factories")
+
+        assert seen == [25]
+        assert report["screening"] == {"found": 200, "irrelevant": 0, "discard_rate": 0.0, "kept": 25}
+        assert len(report["findings"]) == 25
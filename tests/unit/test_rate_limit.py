@@ -0,0 +1,207 @@
+"""
+Unit tests for the shared rate limiter and AIMD concurrency controller.
+
+Uses the local fakes in src.utils.fakes to inject throttling.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+from src.agents.investigator import InvestigatorAgent
+from src.exceptions import BedrockAgentError, TimeoutError
+from src.utils.aws_clients import invoke_bedrock_agent, query_knowledge_base
+from src.utils.fakes import FakeBedrockAgentRuntime, FakeNewsAPI, throttling_error
+from src.utils.rate_limit import (
+    AIMDConcurrencyLimiter,
+    ServiceLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    is_throttling_error,
+    rate_limiter_metrics,
+    reset_rate_limiters,
+    set_rate_limiter,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        """Test the bucket allows a burst of capacity then paces at rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+        bucket.acquire()
+        bucket.acquire()
+        assert clock.now == 0.0
+
+        bucket.acquire()
+        assert clock.now == pytest.approx(0.5)
+
+    def test_timeout(self):
+        """Test acquire raises when the wait would exceed the timeout."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+
+        with pytest.raises(TimeoutError):
+            bucket.acquire(timeout=0.1)
+
+    def test_rate_must_be_positive(self):
+        """Test a zero or negative rate is rejected up front rather than dividing by zero later."""
+        from pydantic import ValidationError
+        from src.config import AppSettings
+
+        for rate in (0, -1.0):
+            with pytest.raises(ValueError):
+                TokenBucket(rate=rate)
+        with pytest.raises(ValidationError):
+            AppSettings(news_requests_per_second=0)
+
+
+class TestAIMDConcurrencyLimiter:
+    """Test cases for AIMDConcurrencyLimiter."""
+
+    def test_multiplicative_decrease_and_additive_increase(self):
+        """Test throttling halves the limit and successes grow it back."""
+        clock = FakeClock()
+        limiter = AIMDConcurrencyLimiter(max_limit=8, clock=clock)
+
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == 4
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release()
+        assert limiter.limit == pytest.approx(5, abs=0.1)
+
+    def test_burst_of_throttles_counts_once_per_cooldown(self):
+        """Test concurrent throttles within the cooldown only decrease once."""
+        clock = FakeClock()
+        limiter = AIMDConcurrencyLimiter(max_limit=8, cooldown=1.0, clock=clock)
+
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release(throttled=True)
+        assert limiter.limit == 4
+
+        clock.now = 2.0
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == 2
+
+    def test_queued_callers_wait_for_slot(self):
+        """Test callers beyond the limit queue and are counted."""
+        limiter = AIMDConcurrencyLimiter(max_limit=1)
+        limiter.acquire()
+
+        waiter = threading.Thread(target=limiter.acquire)
+        waiter.start()
+        while limiter.queued == 0:
+            pass
+        assert limiter.in_flight == 1
+
+        limiter.release()
+        waiter.join(timeout=1)
+        assert limiter.queued == 0
+        assert limiter.in_flight == 1
+
+
+class TestServiceLimiter:
+    """Test cases for ServiceLimiter against throttling fakes."""
+
+    def teardown_method(self):
+        reset_rate_limiters()
+
+    def test_concurrency_cap_prevents_throttling(self):
+        """Test calls through the limiter never exceed the fake's capacity."""
+        fake = FakeBedrockAgentRuntime(latency=0.005, capacity=4)
+        limiter = ServiceLimiter("kb", requests_per_second=10_000, max_concurrency=4)
+
+        def call(_):
+            return limiter.call(fake.retrieve, knowledgeBaseId="kb", retrievalQuery={"text": "pollution"})
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(call, range(64)))
+
+        assert fake.throttled == 0
+        assert fake.max_in_flight <= 4
+        assert limiter.metrics()["calls_total"] == 64
+
+    def test_limit_adapts_down_under_throttling(self):
+        """Test the AIMD limit shrinks toward the fake's real capacity."""
+        fake = FakeBedrockAgentRuntime(latency=0.002, capacity=3)
+        limiter = ServiceLimiter("bedrock", requests_per_second=10_000, max_concurrency=16)
+        limiter.concurrency.cooldown = 0.0
+
+        def call(i):
+            try:
+                limiter.call(fake.invoke_agent, agentId="a", agentAliasId="b", sessionId=str(i), inputText="x")
+            except Exception as e:
+                assert is_throttling_error(e)
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(call, range(200)))
+
+        assert limiter.throttled_total > 0
+        assert limiter.concurrency.limit < 16
+
+    def test_throttle_detection(self):
+        """Test throttling error classification."""
+        assert is_throttling_error(throttling_error("Retrieve"))
+        assert not is_throttling_error(ValueError("boom"))
+
+
+class TestOutboundCallsAreLimited:
+    """Test the AWS helpers and news path go through the shared limiters."""
+
+    def teardown_method(self):
+        reset_rate_limiters()
+
+    def test_invoke_bedrock_agent_records_throttle(self):
+        """Test a throttled agent invocation is surfaced and counted."""
+        fake = FakeBedrockAgentRuntime(throttle_rate=1.0)
+        with patch("src.utils.aws_clients.get_bedrock_agent_runtime_client", return_value=fake):
+            with pytest.raises(BedrockAgentError):
+                invoke_bedrock_agent("agent", "alias", "session", "hello")
+
+        assert get_rate_limiter("bedrock").throttled_total == 1
+
+    def test_query_knowledge_base_uses_kb_limiter(self):
+        """Test KB retrievals are counted on the knowledge_base limiter."""
+        fake = FakeBedrockAgentRuntime()
+        with patch("src.utils.aws_clients.get_bedrock_agent_runtime_client", return_value=fake):
+            response = query_knowledge_base("kb-1", "river pollution fine", max_results=2)
+
+        assert len(response["retrievalResults"]) == 2
+        assert rate_limiter_metrics()["knowledge_base"]["calls_total"] == 1
+
+    def test_investigator_news_calls_use_news_limiter(self):
+        """Test the Investigator's news client is called under the news limiter."""
+        limiter = ServiceLimiter("news", requests_per_second=1000, max_concurrency=2)
+        set_rate_limiter("news", limiter)
+        investigator = InvestigatorAgent(news_api_client=FakeNewsAPI())
+
+        result = investigator.search_supplier_news("QuickProd Factories")
+
+        assert len(result["findings"]) == 4
+        assert limiter.calls_total == 1
+        assert limiter.metrics()["in_flight"] == 0
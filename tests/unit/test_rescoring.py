@@ -0,0 +1,86 @@
+"""
+Unit tests for multi-process re-scoring.
+"""
+
+import json
+
+from src.benchmark.rescore import build_findings_file, run_rescore_benchmark
+from src.pipeline.rescoring import ParallelRescorer, iter_shards, rescore_shard
+from src.sources.registry import dedupe_findings
+from src.utils.tracing import get_span_recorder
+
+VOLATILE = ("timestamp", "latency_ms", "audit_id")
+
+
+def stable(reports):
+    return [{k: v for k, v in report.items() if k not in VOLATILE} for report in reports]
+
+
+class TestSharding:
+    """Test how input lines are packed into shards."""
+
+    def test_shards_keep_lines_whole_and_in_order(self):
+        """Test every line lands in exactly one shard, unsplit and in order."""
+        lines = [json.dumps({"supplier": f"S{i}", "pad": "x" * i}).encode() for i in range(40)]
+
+        shards = list(iter_shards(lines + [b"  \n"], shard_bytes=200))
+
+        assert len(shards) > 1
+        assert b"".join(shards).splitlines() == lines
+
+    def test_dedupe_by_url_and_snippet(self):
+        """Test repeated URLs and syndicated snippets are dropped, first copy kept."""
+        findings = [
+            {"url": "https://a/1", "snippet": "Workers unpaid"},
+            {"url": "https://a/1", "snippet": "Workers unpaid (updated)"},
+            {"url": "https://b/2", "snippet": "  workers   UNPAID "},
+            {"url": "https://c/3", "snippet": "Spill at mine"},
+        ]
+
+        assert [f["url"] for f in dedupe_findings(findings)] == ["https://a/1", "https://c/3"]
+
+
+class TestParallelRescorer:
+    """Test re-scoring inline and across processes."""
+
+    def test_process_pool_matches_inline(self):
+        """Test two spawned workers produce the same reports, in order, as inline."""
+        # Fresh workers have no agent latency history to estimate time saved from
+        get_span_recorder().reset()
+        lines, _ = build_findings_file(12, findings_per_supplier=6)
+        records = [json.loads(line) for line in lines]
+
+        inline = ParallelRescorer(processes=1, shard_bytes=2_000).rescore(records)
+        with ParallelRescorer(processes=2, shard_bytes=2_000) as rescorer:
+            pooled = rescorer.rescore(records)
+
+        assert [r["supplier_id"] for r in pooled] == [r["supplier_id"] for r in records]
+        assert stable(pooled) == stable(inline)
+        assert {r["overall_risk"] for r in inline} >= {"RED", "GREEN"}
+
+    def test_failed_record_becomes_error_line(self):
+        """Test a bad record is reported without failing the rest of its shard."""
+        shard = b'{"findings": []}\n{"supplier": "Sunrise Foods", "findings": []}\n'
+
+        first, second = [json.loads(line) for line in rescore_shard(shard).splitlines()]
+
+        assert "error" in first
+        assert second["supplier"] == "Sunrise Foods" and "error" not in second
+
+    def test_malformed_line_becomes_error_line(self):
+        """Test a truncated or non-object line is reported and the shard carries on."""
+        shard = b'{"supplier": "Acme", "findings": [\n[1, 2]\n{"supplier": "Sunrise Foods", "findings": []}\n'
+
+        lines = [json.loads(line) for line in rescore_shard(shard).splitlines()]
+
+        assert [line["supplier"] for line in lines] == [None, None, "Sunrise Foods"]
+        assert "error" in lines[0] and "error" in lines[1] and "error" not in lines[2]
+
+    def test_benchmark_reports_speedup(self):
+        """Test the scaling benchmark reports every run against the one-process baseline."""
+        results = run_rescore_benchmark(suppliers=20, findings_per_supplier=4, processes=[1])
+
+        (run,) = results["runs"]
+        assert run["reports"] == 20
+        assert run["speedup"] == 1.0 and run["efficiency"] == 1.0
+        assert results["findings"] == 80
@@ -0,0 +1,218 @@
+"""
+Unit tests for priority scheduling of audits.
+"""
+
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from src.agents.auditor import AuditorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.pipeline.ranking import FindingRanker
+from src.pipeline.scheduler import AuditScheduler
+from src.utils.priority import Priority, current_priority, priority_scope
+from src.utils.rate_limit import AIMDConcurrencyLimiter, TokenBucket
+
+WEIGHTS = {Priority.INTERACTIVE: 8.0, Priority.SCHEDULED: 3.0, Priority.BACKFILL: 1.0}
+
+
+class GatedSupervisor:
+    """Supervisor stub recording audit order; the first audit waits for a gate."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.order = []
+        self.priorities = []
+
+    def audit_supplier(self, supplier_name, findings=None, on_stage=None, supplier_record=None):
+        self.order.append(supplier_name)
+        self.priorities.append(current_priority())
+        self.started.set()
+        self.gate.wait(5)
+        return {"supplier": supplier_name}
+
+
+class BlockingInvestigator:
+    """Investigator stub whose first search blocks until released."""
+
+    def __init__(self, findings=1):
+        self.release = threading.Event()
+        self.searching = threading.Event()
+        self.calls = Counter()
+        self.findings = findings
+
+    def search_supplier_news(self, supplier_name):
+        self.calls[supplier_name] += 1
+        if supplier_name == "Backfill Supplier Ltd":
+            self.searching.set()
+            self.release.wait(5)
+        return {
+            "supplier": supplier_name,
+            "findings": [{"date": "2024-05-01", "source": "EPA", "category": "Environment",
+                          "snippet": f"{supplier_name} fined for river contamination, case {i}."}
+                         for i in range(self.findings)],
+            "sources": [{"name": "news", "status": "ok"}],
+        }
+
+
+class TestWeightedLimiter:
+    """Test contended limiter slots go to the most underserved class."""
+
+    def test_freed_slot_goes_to_interactive_waiter(self):
+        """Test an interactive caller overtakes backfill callers queued before it."""
+        limiter = AIMDConcurrencyLimiter(max_limit=2, weights=WEIGHTS)
+        for _ in range(2):
+            limiter.acquire(priority=Priority.BACKFILL)
+
+        backfill = threading.Thread(target=limiter.acquire, kwargs={"priority": Priority.BACKFILL})
+        backfill.start()
+        while limiter.queued < 1:
+            time.sleep(0.001)
+        interactive = threading.Thread(target=limiter.acquire, kwargs={"priority": Priority.INTERACTIVE})
+        interactive.start()
+        while limiter.queued < 2:
+            time.sleep(0.001)
+
+        limiter.release(priority=Priority.BACKFILL)
+        interactive.join(timeout=1)
+        assert limiter.in_flight_by_priority[Priority.INTERACTIVE] == 1
+        assert limiter.queued_by_priority[Priority.BACKFILL] == 1
+
+        limiter.release(priority=Priority.BACKFILL)
+        backfill.join(timeout=1)
+        assert limiter.queued == 0
+
+    def test_uncontended_class_uses_every_slot(self):
+        """Test a lone low-priority class is not capped at its share."""
+        limiter = AIMDConcurrencyLimiter(max_limit=4, weights=WEIGHTS)
+        with priority_scope(Priority.BACKFILL):
+            for _ in range(4):
+                limiter.acquire(timeout=0.1)
+        assert limiter.in_flight_by_priority[Priority.BACKFILL] == 4
+
+    def test_weights_must_be_positive(self):
+        """Test a zero weight is refused rather than dividing by zero when slots are contended."""
+        from pydantic import ValidationError
+        from src.config import AppSettings
+
+        for weight in (0, -1.0):
+            weights = {**WEIGHTS, Priority.BACKFILL: weight}
+            with pytest.raises(ValueError):
+                AIMDConcurrencyLimiter(max_limit=2, weights=weights)
+            with pytest.raises(ValueError):
+                TokenBucket(rate=1.0, weights=weights)
+            with pytest.raises(ValueError):
+                AuditScheduler(GatedSupervisor(), weights=weights)
+            with pytest.raises(ValidationError):
+                AppSettings(priority_weights={"backfill": weight})
+
+    def test_contended_tokens_split_by_weight(self):
+        """Test waiting classes share the request rate 8:1 while a lone class takes every token."""
+        bucket = TokenBucket(rate=400.0, capacity=1, weights=WEIGHTS)
+        with priority_scope(Priority.BACKFILL):
+            for _ in range(5):
+                bucket.acquire(timeout=1)
+        granted = Counter()
+        lock = threading.Lock()
+        def caller(priority):
+            while True:
+                bucket.acquire(timeout=5, priority=priority)
+                with lock:
+                    if sum(granted.values()) >= 90:
+                        return
+                    granted[priority] += 1
+
+        threads = [threading.Thread(target=caller, args=(priority,))
+                   for priority in (Priority.BACKFILL, Priority.INTERACTIVE) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        # Earlier uncontended backfill tokens give interactive callers no head start
+        assert granted[Priority.INTERACTIVE] >= 4 * granted[Priority.BACKFILL] > 0
+
+
+class TestAuditScheduler:
+    """Test dispatch order, fairness and preemption."""
+
+    def test_interactive_jumps_the_batch_queue(self):
+        """Test an interactive audit runs before batch audits queued earlier."""
+        supervisor = GatedSupervisor()
+        scheduler = AuditScheduler(supervisor, workers=1, interactive_workers=0, weights=WEIGHTS,
+                                   preempt_backfill=False)
+        futures = [scheduler.submit("running", Priority.BACKFILL)]
+        supervisor.started.wait(1)
+        futures += [scheduler.submit(name, Priority.BACKFILL) for name in ("b1", "b2")]
+        futures.append(scheduler.submit("click", Priority.INTERACTIVE))
+        assert scheduler.queue_depth() == {"interactive": 1, "scheduled": 0, "backfill": 2}
+
+        supervisor.gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        assert supervisor.order == ["running", "click", "b1", "b2"]
+        assert supervisor.priorities[1] is Priority.INTERACTIVE
+        assert scheduler.metrics()["queued"]["backfill"] == 0
+
+    def test_batch_classes_share_by_weight(self):
+        """Test scheduled and backfill audits are dispatched 3:1."""
+        supervisor = GatedSupervisor()
+        scheduler = AuditScheduler(supervisor, workers=1, interactive_workers=0, weights=WEIGHTS)
+        blocker = scheduler.submit("blocker", Priority.SCHEDULED)
+        supervisor.started.wait(1)
+        futures = [scheduler.submit(f"s{i}", Priority.SCHEDULED) for i in range(6)]
+        futures += [scheduler.submit(f"b{i}", Priority.BACKFILL) for i in range(6)]
+
+        supervisor.gate.set()
+        for future in [blocker] + futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        first_eight = supervisor.order[1:9]
+        assert sum(name.startswith("s") for name in first_eight) == 6
+        assert sum(name.startswith("b") for name in first_eight) == 2
+
+    def test_backfill_is_preempted_and_resumes_without_reinvestigating(self):
+        """Test interactive work pauses a running backfill audit, which keeps its findings."""
+        investigator = BlockingInvestigator()
+        supervisor = SupervisorAgent(investigator, AuditorAgent(), coalesce=False)
+        scheduler = AuditScheduler(supervisor, workers=1, interactive_workers=0, weights=WEIGHTS)
+
+        backfill = scheduler.submit("Backfill Supplier Ltd", Priority.BACKFILL)
+        assert investigator.searching.wait(1)
+        interactive = scheduler.submit("Acme Corp", Priority.INTERACTIVE)
+        investigator.release.set()
+
+        click_report = interactive.result(timeout=5)
+        batch_report = backfill.result(timeout=5)
+        scheduler.shutdown()
+
+        assert click_report["overall_risk"] == "RED"
+        assert batch_report["overall_risk"] == "RED"
+        assert investigator.calls["Backfill Supplier Ltd"] == 1
+        assert scheduler.preemptions == 1
+
+    def test_resumed_backfill_screens_raw_findings_once(self):
+        """Test a resumed audit reports the screening counts of the original investigation."""
+        investigator = BlockingInvestigator(findings=3)
+        supervisor = SupervisorAgent(investigator, AuditorAgent(), ranker=FindingRanker(max_findings=1),
+                                     coalesce=False)
+        scheduler = AuditScheduler(supervisor, workers=1, interactive_workers=0, weights=WEIGHTS)
+
+        backfill = scheduler.submit("Backfill Supplier Ltd", Priority.BACKFILL)
+        assert investigator.searching.wait(1)
+        interactive = scheduler.submit("Acme Corp", Priority.INTERACTIVE)
+        investigator.release.set()
+
+        uninterrupted = interactive.result(timeout=5)
+        resumed = backfill.result(timeout=5)
+        scheduler.shutdown()
+
+        assert scheduler.preemptions == 1
+        assert resumed["screening"]["found"] == uninterrupted["screening"]["found"] == 3
+        assert resumed["screening"]["kept"] == 1
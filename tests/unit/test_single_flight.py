@@ -0,0 +1,139 @@
+"""
+Unit tests for single-flight coalescing of concurrent audits.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agents.auditor import AuditorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.utils.single_flight import SingleFlight, get_single_flight, reset_single_flights
+
+
+class SlowInvestigator:
+    """Investigator stub that counts searches and takes a while to answer."""
+
+    def __init__(self, seconds=0.2):
+        self.seconds = seconds
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search_supplier_news(self, supplier_name):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.seconds)
+        return {
+            "supplier": supplier_name,
+            "findings": [{"date": "2024-05-01", "source": "EPA", "category": "Environment",
+                          "snippet": f"{supplier_name} fined for river contamination."}],
+            "sources": [{"name": "news", "status": "ok"}],
+        }
+
+
+class TestSingleFlight:
+    """Test cases for the coalescing primitive."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test callers with the same key get copies of one result."""
+        flight = SingleFlight("test")
+        runs = []
+        def work():
+            runs.append(1)
+            time.sleep(0.1)
+            return {"value": 42}
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: flight.do("k", work), range(8)))
+
+        assert len(runs) == 1
+        assert all(result == {"value": 42} for result in results)
+        assert len({id(result) for result in results}) == 8
+        assert flight.metrics() == {"executed": 1, "coalesced": 7, "in_flight": 0}
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test followers see the leader's exception and the next call runs again."""
+        flight = SingleFlight("test")
+        started = threading.Event()
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(2) as pool:
+            leader = pool.submit(flight.do, "k", fail)
+            started.wait()
+            follower = pool.submit(flight.do, "k", lambda: "unused")
+            with pytest.raises(ValueError):
+                leader.result()
+            with pytest.raises(ValueError):
+                follower.result()
+
+        assert flight.do("k", lambda: "fresh") == "fresh"
+
+
+class TestCoalescedAudits:
+    """Test the Supervisor coalesces identical audits on both paths."""
+
+    def setup_method(self):
+        reset_single_flights()
+
+    def teardown_method(self):
+        reset_single_flights()
+
+    def test_threaded_audits_of_same_supplier(self):
+        """Test a burst of audits, differing only in case and spacing, runs once."""
+        investigator = SlowInvestigator()
+        supervisor = SupervisorAgent(investigator, AuditorAgent())
+        names = ["QuickProd Factories", "quickprod factories", "QuickProd  Factories"] * 4
+
+        with ThreadPoolExecutor(len(names)) as pool:
+            reports = list(pool.map(supervisor.audit_supplier, names))
+
+        assert investigator.calls == 1
+        assert {report["overall_risk"] for report in reports} == {"RED"}
+        assert get_single_flight("audits").metrics()["coalesced"] == len(names) - 1
+
+    def test_async_and_threaded_callers_share(self):
+        """Test coroutines and a thread join the same in-flight audit."""
+        investigator = SlowInvestigator()
+        supervisor = SupervisorAgent(investigator, AuditorAgent())
+
+        async def burst():
+            thread = asyncio.get_running_loop().run_in_executor(
+                None, supervisor.audit_supplier, "Acme Corp"
+            )
+            reports = await asyncio.gather(*(supervisor.audit_supplier_async("Acme Corp") for _ in range(5)))
+            return list(reports) + [await thread]
+
+        reports = asyncio.run(burst())
+
+        assert investigator.calls == 1
+        assert len(reports) == 6
+
+    def test_different_records_and_disabled_coalescing_run_separately(self):
+        """Test options are part of the key and coalescing can be turned off."""
+        investigator = SlowInvestigator(seconds=0.1)
+        supervisor = SupervisorAgent(investigator, AuditorAgent())
+        with ThreadPoolExecutor(2) as pool:
+            list(pool.map(lambda country: supervisor.audit_supplier(
+                "Acme Corp", supplier_record={"country": country}), ["Peru", "Chile"]))
+        assert investigator.calls == 2
+
+        uncoalesced = SupervisorAgent(investigator, AuditorAgent(), coalesce=False)
+        with ThreadPoolExecutor(3) as pool:
+            list(pool.map(uncoalesced.audit_supplier, ["Acme Corp"] * 3))
+        assert investigator.calls == 5
+
+    def test_supervisors_do_not_share_audits(self):
+        """Test concurrent audits of one supplier through two supervisors each run."""
+        first, second = SlowInvestigator(seconds=0.1), SlowInvestigator(seconds=0.1)
+        supervisors = [SupervisorAgent(first, AuditorAgent()), SupervisorAgent(second, AuditorAgent())]
+
+        with ThreadPoolExecutor(2) as pool:
+            list(pool.map(lambda supervisor: supervisor.audit_supplier("Acme Corp"), supervisors))
+
+        assert first.calls == 1 and second.calls == 1
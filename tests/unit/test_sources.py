@@ -0,0 +1,313 @@
+"""
+Unit tests for Investigator source adapters and the concurrent registry.
+"""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from src.agents.investigator import InvestigatorAgent
+from src.config import get_settings
+from src.exceptions import ConfigurationError
+from src.sources import (
+    CallableSourceAdapter,
+    FileCorpusAdapter,
+    LambdaNewsAdapter,
+    NGOFeedAdapter,
+    SanctionsListAdapter,
+    SourceAdapter,
+    SourceRegistry,
+    classify_category,
+    normalize_finding,
+)
+from src.utils import aws_clients, circuit_breaker
+from src.utils.circuit_breaker import reset_circuit_breakers
+from src.utils.deadline import deadline_scope, mark_degraded
+from src.utils.findings_cache import FindingsCache
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <item>
+    <title>Workers at QuickProd Factories strike over unpaid wages</title>
+    <description>Union says safety complaints were ignored.</description>
+    <link>https://ngo.example.org/reports/1</link>
+    <pubDate>Tue, 05 Nov 2024 10:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>Unrelated report on another company</title>
+    <link>https://ngo.example.org/reports/2</link>
+  </item>
+</channel></rss>
+"""
+
+
+def slow(findings, seconds):
+    def search(supplier_name):
+        time.sleep(seconds)
+        return findings
+    return search
+
+
+def finding(url, snippet="Fined for pollution.", source="Wire"):
+    return {"date": "2024-01-01", "source": source, "snippet": snippet, "category": "Environment", "url": url}
+
+
+class FakeNewsLambda:
+    """Lambda client answering news searches in action group format."""
+
+    def __init__(self, result):
+        self.result = result
+        self.payloads = []
+
+    def invoke(self, **kwargs):
+        self.payloads.append(json.loads(kwargs["Payload"]))
+        body = {"response": {"httpStatusCode": 200,
+                             "responseBody": {"application/json": {"body": json.dumps(self.result)}}}}
+        return {"StatusCode": 200, "Payload": io.BytesIO(json.dumps(body).encode("utf-8"))}
+
+
+class TestNormalization:
+    """Test cases for coercing raw findings into the Finding shape."""
+
+    def test_fills_defaults_and_infers_category(self):
+        """Test titles, timestamps and missing categories are normalised."""
+        result = normalize_finding(
+            {"title": "Workers strike over  wages", "date": "2024-03-10T08:15:00Z"},
+            default_source="ngo",
+        )
+        assert result == {
+            "date": "2024-03-10",
+            "source": "ngo",
+            "snippet": "Workers strike over wages",
+            "title": "Workers strike over wages",
+            "category": "Labor",
+            "url": None,
+        }
+
+    def test_title_kept_next_to_snippet(self):
+        """Test a headline is carried through so screening can see the company name."""
+        result = normalize_finding(
+            {"title": "Acme Corporation fined", "snippet": "The regulator imposed a penalty.", "category": "Environment"},
+            default_source="news",
+        )
+        assert result["snippet"] == "The regulator imposed a penalty."
+        assert result["title"] == "Acme Corporation fined"
+
+    def test_drops_findings_without_text(self):
+        """Test items with no snippet or title are dropped."""
+        assert normalize_finding({"url": "https://example.com"}, default_source="x") is None
+
+    def test_classify_category(self):
+        """Test keyword classification mirrors the news Lambda queries."""
+        assert classify_category("EPA emissions fine") == "Environment"
+        assert classify_category("bribery scandal") == "Governance"
+
+
+class TestSourceRegistry:
+    """Test cases for concurrent fan-out and merging."""
+
+    def setup_method(self):
+        reset_circuit_breakers()
+
+    def teardown_method(self):
+        reset_circuit_breakers()
+
+    def test_latency_bounded_by_slowest_adapter(self):
+        """Test adapters run concurrently rather than one after another."""
+        registry = SourceRegistry(
+            [CallableSourceAdapter(f"s{i}", slow([finding(f"https://e.com/{i}")], 0.2)) for i in range(4)],
+            findings_cache=FindingsCache(),
+        )
+
+        started = time.perf_counter()
+        findings, sources = registry.search("Acme")
+
+        assert time.perf_counter() - started < 0.5
+        assert len(findings) == 4
+        assert [s["status"] for s in sources] == ["ok"] * 4
+
+    def test_slow_adapter_is_cut_off(self):
+        """Test an adapter past its timeout is reported missing and the rest are kept."""
+        registry = SourceRegistry(
+            [
+                CallableSourceAdapter("fast", lambda name: [finding("https://e.com/fast")]),
+                CallableSourceAdapter("slow", slow([finding("https://e.com/slow")], 2.0), timeout_seconds=0.1),
+            ],
+            findings_cache=FindingsCache(),
+        )
+
+        started = time.perf_counter()
+        findings, sources = registry.search("Acme")
+
+        assert time.perf_counter() - started < 0.5
+        assert [f["url"] for f in findings] == ["https://e.com/fast"]
+        assert sources[0] == {"name": "fast", "status": "ok"}
+        assert sources[1]["status"] == "missing"
+
+    def test_merge_prefers_higher_priority_and_dedups(self):
+        """Test duplicates keep the higher-priority source's version."""
+        registry = SourceRegistry(
+            [
+                CallableSourceAdapter("low", lambda n: [finding("https://e.com/1", source="Low")], priority=50),
+                CallableSourceAdapter("high", lambda n: [finding("https://e.com/1", source="High")], priority=1),
+            ],
+            findings_cache=FindingsCache(),
+        )
+
+        findings, sources = registry.search("Acme")
+
+        assert [f["source"] for f in findings] == ["High"]
+        assert [s["name"] for s in sources] == ["high", "low"]
+
+    def test_max_results_quota(self):
+        """Test each adapter's findings are capped by its quota."""
+        many = [finding(f"https://e.com/{i}") for i in range(20)]
+        registry = SourceRegistry(
+            [CallableSourceAdapter("bulk", lambda n: many, max_results=5)], findings_cache=FindingsCache()
+        )
+        assert len(registry.search("Acme")[0]) == 5
+
+    def test_duplicate_names_rejected(self):
+        """Test registering two sources with the same name fails."""
+        registry = SourceRegistry([CallableSourceAdapter("a", lambda n: [])])
+        with pytest.raises(ConfigurationError):
+            registry.register(CallableSourceAdapter("a", lambda n: []))
+
+    def test_investigator_reports_every_source(self):
+        """Test the Investigator merges a custom registry's sources."""
+        registry = SourceRegistry(
+            [
+                CallableSourceAdapter("news", lambda n: [finding("https://e.com/news")]),
+                CallableSourceAdapter("broken", lambda n: 1 / 0),
+            ],
+            findings_cache=FindingsCache(),
+        )
+
+        result = InvestigatorAgent(sources=registry).search_supplier_news("Acme")
+
+        assert len(result["findings"]) == 1
+        assert [s["status"] for s in result["sources"]] == ["ok", "missing"]
+
+    def test_adapter_degradations_reach_the_audit(self):
+        """Test a degradation recorded under an adapter's own timeout shows up on the audit deadline."""
+        def partial(name):
+            mark_degraded("investigate.wire", "2 of 3 feeds answered")
+            return [finding("https://e.com/1")]
+        registry = SourceRegistry([CallableSourceAdapter("wire", partial, timeout_seconds=5)],
+                                  findings_cache=FindingsCache())
+
+        with deadline_scope(30) as audit:
+            registry.search("Acme")
+
+        assert audit.degradations == ["investigate.wire: 2 of 3 feeds answered"]
+
+    def test_unprotected_adapter_is_called_directly(self):
+        """Test the mock source skips the breaker, the hedge pool and the findings cache."""
+        cache = FindingsCache()
+        threads = []
+        adapter = CallableSourceAdapter(
+            "mock", lambda name: threads.append(threading.current_thread().name) or [finding("https://e.com/1")],
+            protected=False,
+        )
+
+        findings, sources = SourceRegistry([adapter], findings_cache=cache).search("Acme")
+
+        assert len(findings) == 1 and sources == [{"name": "mock", "status": "ok"}]
+        assert threads == [threading.current_thread().name]
+        assert cache.get("Acme", source="mock") is None
+        assert "mock" not in circuit_breaker._breakers
+        assert InvestigatorAgent().sources.adapters()[0].protected is False
+
+
+class TestAdapters:
+    """Test cases for the built-in adapters."""
+
+    def test_adapters_must_implement_search(self):
+        """Test an adapter without search() cannot be instantiated."""
+        class Incomplete(SourceAdapter):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_ngo_feed(self, tmp_path):
+        """Test RSS items mentioning the supplier become Labor findings."""
+        path = tmp_path / "feed.xml"
+        path.write_bytes(RSS)
+
+        results = NGOFeedAdapter(path).search("QuickProd Factories")
+
+        assert len(results) == 1
+        normalized = normalize_finding(results[0], "ngo")
+        assert normalized["date"] == "2024-11-05"
+        assert normalized["category"] == "Labor"
+        assert normalized["source"] == "NGO Report"
+
+    def test_sanctions_list_matches_aliases(self, tmp_path):
+        """Test sanctions entries match on normalised names and aliases."""
+        path = tmp_path / "sanctions.json"
+        path.write_text(json.dumps([
+            {"name": "Andean Mining Corp", "aliases": ["Andean Mining Co."], "program": "RUSSIA-EO14024",
+             "listed_on": "2024-02-01"}
+        ]))
+        adapter = SanctionsListAdapter(path)
+
+        results = adapter.search("andean mining co")
+
+        assert results[0]["category"] == "Governance"
+        assert "RUSSIA-EO14024" in results[0]["snippet"]
+        assert adapter.search("Nordic Timber") == []
+
+    def test_file_corpus(self, tmp_path):
+        """Test corpus documents are matched on whole-word supplier mentions."""
+        path = tmp_path / "corpus.jsonl"
+        path.write_text("\n".join(json.dumps(doc) for doc in [
+            {"date": "2024-05-01", "source": "Archive", "title": "Acme Corp fined for emissions"},
+            {"date": "2024-05-02", "source": "Archive", "title": "Acmeco expands"},
+        ]))
+
+        results = FileCorpusAdapter(path).search("Acme Corp")
+
+        assert [r["title"] for r in results] == ["Acme Corp fined for emissions"]
+
+    def test_lambda_news(self, monkeypatch):
+        """Test the news Lambda is invoked under the adapter's budget and its findings returned."""
+        client = FakeNewsLambda({"supplier": "Acme", "findings": [finding("https://e.com/1")]})
+        monkeypatch.setattr(aws_clients, "get_lambda_client", lambda session=None: client)
+        monkeypatch.setattr(get_settings().aws, "news_search_lambda_arn", "news-search")
+        reset_circuit_breakers()
+
+        investigator = InvestigatorAgent(findings_cache=FindingsCache())
+        result = investigator.search_supplier_news("Acme")
+
+        assert isinstance(investigator.sources.adapters()[0], LambdaNewsAdapter)
+        assert result["sources"] == [{"name": "news", "status": "ok"}]
+        assert [f["url"] for f in result["findings"]] == ["https://e.com/1"]
+        assert client.payloads[0]["supplier_name"] == "Acme"
+        assert 0 < client.payloads[0]["timeout_seconds"] <= get_settings().app.source_timeout_seconds
+        assert "news_lambda" in circuit_breaker._breakers
+
+    def test_partial_lambda_results_degrade_the_source(self, monkeypatch):
+        """Test a partial Lambda answer is reported as a partial source and degrades the audit."""
+        client = FakeNewsLambda({
+            "supplier": "Acme",
+            "findings": [finding("https://e.com/1")],
+            "partial": True,
+            "errors": ["governance: search budget exhausted"],
+        })
+        monkeypatch.setattr(aws_clients, "get_lambda_client", lambda session=None: client)
+        reset_circuit_breakers()
+        cache = FindingsCache()
+        registry = SourceRegistry([LambdaNewsAdapter(function_name="news-search")], findings_cache=cache)
+
+        with deadline_scope(30) as audit:
+            findings, sources = registry.search("Acme")
+
+        assert len(findings) == 1
+        assert sources == [{"name": "news", "status": "partial",
+                            "error": "governance: search budget exhausted"}]
+        assert audit.degradations == ["investigate.news: partial results: governance: search budget exhausted"]
+        assert cache.get("Acme", source="news") is None
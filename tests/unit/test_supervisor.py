@@ -182,3 +182,24 @@ class TestSupervisorAgent:
         # Note: Current implementation uses hardcoded timestamp
         # This test documents expected behavior for future implementation
         assert "timestamp" in report
+    
+    def test_audit_supplier_with_journaled_findings(self):
+        """Test supplied findings skip the investigation step."""
+        findings = {"supplier": "Acme Corp", "findings": []}
+        stages = []
+        self.mock_auditor.evaluate_findings.return_value = {
+            "overall_risk": "GREEN",
+            "risk_scores": {},
+            "violations": [],
+            "recommendations": []
+        }
+        
+        self.supervisor.audit_supplier(
+            "Acme Corp",
+            findings=findings,
+            on_stage=lambda stage, data: stages.append(stage)
+        )
+        
+        self.mock_investigator.search_supplier_news.assert_not_called()
+        self.mock_auditor.evaluate_findings.assert_called_once_with(findings)
+        assert stages == ["auditing"]
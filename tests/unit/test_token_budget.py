@@ -0,0 +1,133 @@
+"""
+Unit tests for LLM token accounting and snippet compaction.
+"""
+
+import json
+import re
+
+import pytest
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.policy_evaluator import PolicyEvaluator
+from src.agents.supervisor import SupervisorAgent
+from src.exceptions import BedrockAgentError
+from src.utils.deadline import deadline_scope
+from src.utils.fakes import FakeBedrockAgentRuntime
+from src.utils.findings_cache import FindingsCache
+from src.utils.token_budget import compact_text, estimate_tokens, record_tokens, token_scope
+
+ARTICLE = (
+    "LONDON (Reuters) - QuickProd Factories Limited reported record sales this quarter. "
+    "Analysts praised QuickProd Factories Limited management. "
+    "Workers at QuickProd Factories Limited went on strike over unpaid wages. "
+    "The plant was also fined for toxic waste discharge. "
+    "Read more at https://news.example.com/a [+2345 chars]"
+)
+
+
+def answer_all(prompt):
+    ids = re.findall(r'^\{"id": (\d+)', prompt, re.MULTILINE)
+    return json.dumps([{"id": int(i), "violation": False} for i in ids])
+
+
+class TestCompaction:
+    """Test cases for shrinking snippets before prompts."""
+
+    def test_strips_boilerplate_and_repeated_names(self):
+        """Test datelines, links and repeated supplier names are removed."""
+        text = compact_text(ARTICLE, "QuickProd Factories Limited", max_tokens=500)
+
+        assert text.startswith("QuickProd Factories Limited reported")
+        assert text.count("QuickProd Factories Limited") == 1
+        assert "Reuters" not in text and "http" not in text and "chars]" not in text
+
+    def test_keeps_policy_sentences_when_truncating(self):
+        """Test a tight limit keeps the sentences with the most policy keywords."""
+        text = compact_text(ARTICLE, "QuickProd Factories Limited", max_tokens=30)
+
+        assert "strike over unpaid wages" in text
+        assert "fined for toxic waste" in text
+        assert "record sales" not in text
+        assert estimate_tokens(text) <= 30
+
+    def test_short_text_unchanged(self):
+        """Test snippets already within the limit are returned as-is."""
+        assert compact_text("Fined for pollution.", "Acme", max_tokens=50) == "Fined for pollution."
+
+
+class TestTokenLedger:
+    """Test cases for per-audit token accounting."""
+
+    def test_nested_scopes_share_the_ledger(self):
+        """Test calls inside a nested scope count against the audit's budget."""
+        with token_scope(1000) as ledger:
+            record_tokens(300, 20)
+            with token_scope(50) as inner:
+                record_tokens(100, 10)
+
+        assert inner is ledger
+        assert ledger.remaining() == 600
+        assert ledger.summary()["total"] == 430
+        assert ledger.summary()["calls"] == 2
+
+    def test_auditor_stays_within_budget(self):
+        """Test a tight budget escalates only what it can pay for and degrades the rest."""
+        client = FakeBedrockAgentRuntime(responder=answer_all)
+        auditor = AuditorAgent(policy_evaluator=PolicyEvaluator(client=client, agent_id="AUDITOR"))
+        findings = [{"snippet": f"Allegations {i} of unsafe conditions. " * 20, "category": "Labor"}
+                    for i in range(10)]
+
+        with deadline_scope(30) as deadline, token_scope(400) as ledger:
+            result = auditor.evaluate_findings({"supplier": "Acme", "findings": findings})
+
+        assert 0 < result["evaluation"]["escalated"] < 10
+        assert ledger.prompt_tokens <= 400
+        assert ledger.compacted > 0
+        assert any(reason.startswith("auditor.token_budget") for reason in deadline.degradations)
+
+
+    def test_resplits_and_failed_calls_are_charged(self):
+        """Test every attempt is charged and re-splits stop once the budget is spent."""
+        from src.utils.fakes import throttling_error
+
+        evaluator = PolicyEvaluator(
+            client=FakeBedrockAgentRuntime(responder=lambda prompt: "not json"), agent_id="AUDITOR"
+        )
+        items = [({"snippet": f"Allegation {i} of unpaid overtime", "category": "Labor"}, None)
+                 for i in range(8)]
+        first = estimate_tokens(evaluator.build_prompt(items))
+
+        with token_scope(first + 10) as ledger:
+            result = evaluator.evaluate_batch(items)
+
+        assert result.calls == 1
+        assert set(result.failures) == set(range(8))
+        assert "Token budget exhausted" in str(result.failures[0])
+        assert ledger.calls == 1 and ledger.prompt_tokens == first
+
+        def throttle(prompt):
+            raise throttling_error("InvokeAgent")
+        failing = PolicyEvaluator(client=FakeBedrockAgentRuntime(responder=throttle), agent_id="AUDITOR")
+        with token_scope(10_000) as ledger:
+            with pytest.raises(BedrockAgentError):
+                failing.evaluate_batch(items[:1])
+        assert ledger.calls == 1 and ledger.prompt_tokens > 0
+
+
+class TestReportTokens:
+    """Test audit reports carry their token usage."""
+
+    def test_report_includes_tokens(self):
+        """Test the Supervisor records escalation tokens in the report."""
+        client = FakeBedrockAgentRuntime(responder=answer_all)
+        supervisor = SupervisorAgent(
+            InvestigatorAgent(findings_cache=FindingsCache()),
+            AuditorAgent(policy_evaluator=PolicyEvaluator(client=client, agent_id="AUDITOR")),
+        )
+
+        report = supervisor.audit_supplier("Global Textiles Inc")
+
+        assert report["tokens"]["calls"] == report["evaluation"]["llm_calls"] == 1
+        assert report["tokens"]["prompt"] > 0
+        assert report["tokens"]["budget"] == 20_000
@@ -0,0 +1,119 @@
+"""
+Unit tests for span instrumentation and latency histograms.
+"""
+
+import pytest
+import structlog
+from unittest.mock import patch
+
+from src.agents.auditor import AuditorAgent
+from src.agents.investigator import InvestigatorAgent
+from src.agents.supervisor import SupervisorAgent
+from src.utils.aws_clients import query_knowledge_base
+from src.utils.fakes import FakeBedrockAgentRuntime
+from src.utils.tracing import (
+    LatencyHistogram,
+    get_span_recorder,
+    get_trace_id,
+    span,
+    start_trace,
+    traced,
+)
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram."""
+
+    def test_percentiles_within_bucket_error(self):
+        """Test percentile estimates stay within the bucket growth factor."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.add(ms / 1000)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.05)
+        assert histogram.percentile(95) == pytest.approx(0.95, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.05)
+        assert histogram.percentile(100) == pytest.approx(1.0)
+
+    def test_memory_bounded_by_range_not_count(self):
+        """Test bucket count depends on value range, not sample count."""
+        histogram = LatencyHistogram()
+        for i in range(100_000):
+            histogram.add(0.010 + (i % 10) / 1000)
+
+        assert len(histogram.buckets) < 20
+
+    def test_merge_and_export(self):
+        """Test histograms merge and export cumulative buckets."""
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.add(0.001)
+        b.add(0.1)
+        a.merge(b)
+
+        buckets = a.cumulative_buckets()
+        assert buckets[-1][1] == 2
+        assert a.summary()["max_ms"] == pytest.approx(100)
+
+
+class TestSpans:
+    """Test cases for span recording and trace binding."""
+
+    def setup_method(self):
+        get_span_recorder().reset()
+
+    def test_span_records_duration(self):
+        """Test spans land in the named histogram, including on error."""
+        with span("unit.ok"):
+            pass
+        with pytest.raises(ValueError):
+            with span("unit.error"):
+                raise ValueError("boom")
+
+        summary = get_span_recorder().summary()
+        assert summary["unit.ok"]["count"] == 1
+        assert summary["unit.error"]["count"] == 1
+
+    def test_traced_decorator(self):
+        """Test the decorator records under the given name."""
+        @traced("unit.decorated")
+        def work():
+            return 42
+
+        assert work() == 42
+        assert get_span_recorder().summary()["unit.decorated"]["count"] == 1
+
+    def test_trace_id_bound_in_structlog_context(self):
+        """Test start_trace binds a trace ID and nested traces reuse it."""
+        assert get_trace_id() is None
+        with start_trace() as trace_id:
+            assert structlog.contextvars.get_contextvars()["trace_id"] == trace_id
+            with start_trace() as nested:
+                assert nested == trace_id
+        assert get_trace_id() is None
+
+    def test_audit_records_every_stage(self):
+        """Test a full audit records supervisor, agent and policy-check spans."""
+        supervisor = SupervisorAgent(InvestigatorAgent(), AuditorAgent())
+        supervisor.audit_supplier("QuickProd Factories")
+
+        summary = get_span_recorder().summary()
+        for name in [
+            "supervisor.audit_supplier",
+            "supervisor.investigate",
+            "supervisor.evaluate",
+            "supervisor.format_report",
+            "investigator.search_supplier_news",
+            "auditor.evaluate_findings",
+        ]:
+            assert summary[name]["count"] == 1, name
+        assert summary["auditor.check_policy"]["count"] == 4
+
+    def test_knowledge_base_queries_are_spanned(self):
+        """Test each KB query gets its own span."""
+        fake = FakeBedrockAgentRuntime()
+        with patch("src.utils.aws_clients.get_bedrock_agent_runtime_client", return_value=fake):
+            query_knowledge_base("kb-1", "child labor")
+            query_knowledge_base("kb-1", "bribery")
+
+        assert get_span_recorder().summary()["aws.knowledge_base.retrieve"]["count"] == 2